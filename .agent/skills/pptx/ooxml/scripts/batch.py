@@ -0,0 +1,246 @@
+"""Unpack, transform and repack many Office documents in one process pool.
+
+    python ooxml/scripts/batch.py "decks/**/*.pptx" --transform my_edits.py:update --output-dir out
+    python ooxml/scripts/batch.py --manifest decks.txt --transform my_edits.py:update --max-temp-mb 2048
+
+The transform is called as `function(unpacked_dir, source_path)` and edits the
+unpacked files in place. Without --transform the documents are only repacked.
+Each document is unpacked into its own temporary directory, which is removed as
+soon as it is repacked. Documents are scheduled so that their unpacked sizes
+(read from the zip central directory) stay within --max-temp-mb. A failure in one
+document is reported and does not stop the others.
+"""
+import argparse
+import glob
+import importlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout
+from functools import lru_cache
+
+from pack import pack
+from unpack import unpack
+
+DEFAULT_MAX_TEMP_MB = 1024
+
+
+@lru_cache(maxsize=None)
+def load_transform(spec):
+    """`module:function` or `path/to/file.py:function` (loaded once per worker process)."""
+    target, _, function = spec.rpartition(":")
+    if not target or not function:
+        raise ValueError(f"Transform must be module:function or file.py:function, got {spec}")
+    if target.endswith(".py"):
+        module_spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(target))[0], target)
+        module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(target)
+    return getattr(module, function)
+
+
+def read_manifest(path):
+    """One document per line, optionally `input<TAB>output`. Blank lines and # comments are skipped."""
+    jobs = []
+    base_dir = os.path.dirname(os.path.abspath(path))
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            source, _, output = line.partition("\t")
+            source = os.path.join(base_dir, source.strip())
+            jobs.append((source, os.path.join(base_dir, output.strip()) if output.strip() else None))
+    return jobs
+
+
+def expand_patterns(patterns):
+    """Documents matching the paths or glob patterns (`**` is recursive), in order and without duplicates."""
+    sources = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        sources.extend(match for match in matches if match not in sources)
+    return sources
+
+
+def unpacked_size(path):
+    """Bytes the document takes on disk once unpacked (0 if it cannot be read; the worker reports why)."""
+    try:
+        with zipfile.ZipFile(path) as zip_ref:
+            return sum(info.file_size for info in zip_ref.infolist())
+    except (OSError, zipfile.BadZipFile):
+        return 0
+
+
+def process_document(source, output, transform_spec, temp_root):
+    """Unpack, transform and repack one document. Runs in a worker process and never raises."""
+    started_at = time.perf_counter()
+    result = {"source": source, "output": output, "status": "ok", "error": None,
+              "seconds": 0.0, "input_bytes": 0, "output_bytes": 0}
+    work_dir = tempfile.mkdtemp(prefix="ooxml_batch_", dir=temp_root)
+    try:
+        unpacked_dir = os.path.join(work_dir, "unpacked")
+        # pack/unpack print progress and call sys.exit on missing files
+        with redirect_stdout(io.StringIO()):
+            unpack(source, unpacked_dir)
+            result["input_bytes"] = os.path.getsize(source)
+            if transform_spec:
+                load_transform(transform_spec)(unpacked_dir, source)
+            os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+            # Unchanged parts are copied from the source without recompressing; one thread per process
+            pack(unpacked_dir, output, previous=source, workers=1)
+        result["output_bytes"] = os.path.getsize(output)
+    except (Exception, SystemExit) as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}" if str(e) else traceback.format_exc(limit=1).strip()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    result["seconds"] = time.perf_counter() - started_at
+    return result
+
+
+def run_batch(jobs, transform_spec=None, workers=None, max_temp_bytes=DEFAULT_MAX_TEMP_MB * 1024 * 1024, temp_root=None):
+    """
+    Process (source, output) pairs across a process pool and return one result per job in input order.
+
+    A document starts only while the unpacked sizes of the documents in progress fit in
+    max_temp_bytes; a document larger than the budget runs on its own. If a worker process
+    dies, the documents it took down are retried one at a time so only the culprit fails.
+    """
+    workers = workers or os.cpu_count() or 1
+    # (index, source, output, unpacked size, run alone)
+    queue = [(index, source, output, unpacked_size(source), False) for index, (source, output) in enumerate(jobs)]
+    results = {}
+    in_flight = {}
+    temp_in_use = 0
+    # Workers unpack under one directory that is removed even if a worker is killed mid-document
+    batch_dir = tempfile.mkdtemp(prefix="ooxml_batch_", dir=temp_root)
+    executor = ProcessPoolExecutor(max_workers=workers)
+
+    def can_start(entry):
+        if not in_flight:
+            return True
+        alone = entry[4] or any(running[4] for running in in_flight.values())
+        return not alone and len(in_flight) < workers and temp_in_use + entry[3] <= max_temp_bytes
+
+    try:
+        while queue or in_flight:
+            while queue and can_start(queue[0]):
+                entry = queue.pop(0)
+                future = executor.submit(process_document, entry[1], entry[2], transform_spec, batch_dir)
+                in_flight[future] = entry
+                temp_in_use += entry[3]
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            broken = False
+            retry = []
+            for future in done:
+                entry = in_flight.pop(future)
+                index, source, output, size, alone = entry
+                temp_in_use -= size
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    # A worker died (e.g. killed for running out of memory)
+                    broken = True
+                    if not alone:
+                        retry.append(entry)
+                        continue
+                    result = {"source": source, "output": output, "status": "error",
+                              "error": "Worker process terminated abruptly",
+                              "seconds": 0.0, "input_bytes": 0, "output_bytes": 0}
+                results[index] = result
+                status = "ok" if result["status"] == "ok" else f"FAILED: {result['error']}"
+                print(f"[{len(results)}/{len(jobs)}] {source} ({result['seconds']:.1f}s) {status}", flush=True)
+
+            if broken:
+                executor.shutdown(wait=False, cancel_futures=True)
+                retry += list(in_flight.values())
+                queue = [entry[:4] + (True,) for entry in sorted(retry)] + queue
+                in_flight = {}
+                temp_in_use = 0
+                executor = ProcessPoolExecutor(max_workers=workers)
+    finally:
+        executor.shutdown(wait=True)
+        shutil.rmtree(batch_dir, ignore_errors=True)
+    return [results[index] for index in range(len(jobs))]
+
+
+def print_summary(results, elapsed):
+    ok = [result for result in results if result["status"] == "ok"]
+    input_bytes = sum(result["input_bytes"] for result in ok)
+    output_bytes = sum(result["output_bytes"] for result in ok)
+    print("-" * 80)
+    print(f"Documents: {len(results)} ({len(ok)} ok, {len(results) - len(ok)} failed) in {elapsed:.1f}s")
+    if elapsed > 0:
+        print(f"Throughput: {len(ok) / elapsed:.2f} documents/s, {input_bytes / 1e6 / elapsed:.1f} MB/s "
+              f"({input_bytes / 1e6:.1f} MB in, {output_bytes / 1e6:.1f} MB out)")
+    for result in results:
+        if result["status"] != "ok":
+            print(f"Failed: {result['source']}: {result['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Unpack, transform and repack many Office documents in parallel")
+    parser.add_argument("documents", nargs="*", help="Document paths or glob patterns (quote patterns; ** is recursive)")
+    parser.add_argument("--manifest", help="File with one document per line, optionally followed by a tab and the output path")
+    parser.add_argument("--transform", help="module:function or path/to/file.py:function called as function(unpacked_dir, source_path)")
+    parser.add_argument("--output-dir", help="Write outputs here under their original file names (default: replace the documents)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--max-temp-mb", type=int, default=DEFAULT_MAX_TEMP_MB,
+                        help=f"Upper bound for unpacked documents on disk at once (default: {DEFAULT_MAX_TEMP_MB})")
+    parser.add_argument("--temp-dir", help="Where documents are unpacked (default: the system temp directory)")
+    parser.add_argument("--report", help="Save per-document results as JSON to this path")
+    args = parser.parse_args()
+
+    jobs = read_manifest(args.manifest) if args.manifest else []
+    jobs.extend((source, None) for source in expand_patterns(args.documents))
+    if not jobs:
+        print("Error: no documents given (pass paths, glob patterns or --manifest)")
+        sys.exit(1)
+
+    outputs = {}
+    for i, (source, output) in enumerate(jobs):
+        if output is None:
+            output = os.path.join(args.output_dir, os.path.basename(source)) if args.output_dir else source
+        if output in outputs:
+            print(f"Error: {outputs[output]} and {source} would both be written to {output}")
+            sys.exit(1)
+        outputs[output] = source
+        jobs[i] = (source, output)
+
+    if args.transform:
+        # Fail before starting the pool if the transform cannot be imported
+        try:
+            load_transform(args.transform)
+        except Exception as e:
+            print(f"Error: cannot load transform {args.transform}: {e}")
+            sys.exit(1)
+
+    print(f"Processing {len(jobs)} documents with {args.workers or os.cpu_count()} workers "
+          f"(temp budget: {args.max_temp_mb} MB)")
+    started_at = time.perf_counter()
+    results = run_batch(jobs, args.transform, args.workers, args.max_temp_mb * 1024 * 1024, args.temp_dir)
+    print_summary(results, time.perf_counter() - started_at)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Saved report to {args.report}")
+
+    if any(result["status"] != "ok" for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Compare pack.py and ArchiveWorkspace against plain zipfile packing on a media-heavy deck.
+
+Without --deck, a synthetic deck is built from sales_presentation_standardized.pptx
+plus incompressible images, EMF drawings and extra slides.
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from contextlib import redirect_stdout
+from io import StringIO
+
+from pack import pack
+from unpack import unpack
+from workspace import ArchiveWorkspace
+
+BASE_DECK = os.path.join(os.path.dirname(__file__), "..", "..", "scripts", "sales_presentation_standardized.pptx")
+
+
+def pack_zipfile(input_dir, output_path):
+    """The previous pack.py: ZIP_DEFLATED for every file in os.walk order."""
+    with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zip_ref:
+        for root, dirs, files in os.walk(input_dir):
+            for file in files:
+                file_path = os.path.join(root, file)
+                zip_ref.write(file_path, os.path.relpath(file_path, input_dir))
+
+
+def build_media_deck(work_dir, images, image_kb, slides):
+    """Unpacked synthetic deck: the base deck plus media and copies of its first slide."""
+    deck_dir = os.path.join(work_dir, "deck")
+    with redirect_stdout(StringIO()):
+        unpack(BASE_DECK, deck_dir)
+    media_dir = os.path.join(deck_dir, "ppt", "media")
+    os.makedirs(media_dir, exist_ok=True)
+    for i in range(images):
+        with open(os.path.join(media_dir, f"photo{i + 1}.png"), "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n" + os.urandom(image_kb * 1024))
+        with open(os.path.join(media_dir, f"chart{i + 1}.emf"), "wb") as f:
+            f.write(b"\x01\x00\x00\x00" + b"EMR_POLYLINE16 " * (image_kb * 8))
+    slide_dir = os.path.join(deck_dir, "ppt", "slides")
+    with open(os.path.join(slide_dir, "slide1.xml"), "rb") as f:
+        slide = f.read()
+    for i in range(slides):
+        with open(os.path.join(slide_dir, f"slide{1000 + i}.xml"), "wb") as f:
+            f.write(slide)
+    return deck_dir
+
+
+def unpack_edit_pack(archive_path, work_dir, output_path):
+    """Edit one slide the old way: extract everything, change the file, pack everything."""
+    unpacked_dir = os.path.join(work_dir, "edit_unpacked")
+    unpack(archive_path, unpacked_dir)
+    slide_path = os.path.join(unpacked_dir, *first_slide(archive_path).split("/"))
+    with open(slide_path, "ab") as f:
+        f.write(b"\n")
+    pack(unpacked_dir, output_path)
+
+
+def workspace_edit(archive_path, output_path):
+    with ArchiveWorkspace(archive_path) as workspace:
+        slide = first_slide(archive_path)
+        workspace.write(slide, workspace.read(slide) + b"\n")
+        workspace.save(output_path)
+
+
+def first_slide(archive_path):
+    with zipfile.ZipFile(archive_path) as zip_ref:
+        return min(name for name in zip_ref.namelist() if name.startswith(("ppt/slides/slide", "word/document")))
+
+
+def timed(func, *args, **kwargs):
+    started_at = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        func(*args, **kwargs)
+    return time.perf_counter() - started_at
+
+
+def digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deck", help="Benchmark this .pptx/.docx instead of a synthetic deck")
+    parser.add_argument("--images", type=int, default=40, help="Synthetic deck: number of PNG and EMF files each (default: 40)")
+    parser.add_argument("--image-kb", type=int, default=2048, help="Synthetic deck: size of each image in KB (default: 2048)")
+    parser.add_argument("--slides", type=int, default=300, help="Synthetic deck: extra slides (default: 300)")
+    parser.add_argument("--workers", type=int, help="pack.py worker threads (default: CPU count)")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="benchmark_pack_")
+    try:
+        if args.deck:
+            deck_dir = os.path.join(work_dir, "deck")
+            with redirect_stdout(StringIO()):
+                unpack(args.deck, deck_dir)
+        else:
+            deck_dir = build_media_deck(work_dir, args.images, args.image_kb, args.slides)
+        input_bytes = sum(
+            os.path.getsize(os.path.join(root, file)) for root, dirs, files in os.walk(deck_dir) for file in files
+        )
+
+        old_path = os.path.join(work_dir, "zipfile.pptx")
+        new_path = os.path.join(work_dir, "pack.pptx")
+        again_path = os.path.join(work_dir, "pack_again.pptx")
+        results = [
+            ("zipfile (ZIP_DEFLATED, os.walk order)", timed(pack_zipfile, deck_dir, old_path), old_path),
+            ("pack.py", timed(pack, deck_dir, new_path, workers=args.workers), new_path),
+            ("pack.py (second run)", timed(pack, deck_dir, again_path, workers=args.workers), again_path)
+        ]
+
+        # Edit one slide and repack, reusing the unchanged entries of the previous archive
+        slide_dir = os.path.join(deck_dir, "ppt", "slides")
+        slide_path = os.path.join(slide_dir, min(name for name in os.listdir(slide_dir) if name.endswith(".xml")))
+        with open(slide_path, "ab") as f:
+            f.write(b"\n")
+        edited_path = os.path.join(work_dir, "pack_edited.pptx")
+        results.append((
+            "pack.py --previous (1 slide edited)",
+            timed(pack, deck_dir, edited_path, previous=new_path, workers=args.workers),
+            edited_path
+        ))
+
+        # Edit one slide of the packed archive: full unpack/pack versus the lazy workspace
+        unpacked_path = os.path.join(work_dir, "unpack_edit_pack.pptx")
+        workspace_path = os.path.join(work_dir, "workspace_edit.pptx")
+        results.append((
+            "unpack.py + pack.py (1 slide edited)",
+            timed(unpack_edit_pack, new_path, work_dir, unpacked_path),
+            unpacked_path
+        ))
+        results.append((
+            "ArchiveWorkspace (1 slide edited)",
+            timed(workspace_edit, new_path, workspace_path),
+            workspace_path
+        ))
+
+        print(f"Deck: {args.deck or 'synthetic'} ({input_bytes / 1e6:.1f} MB unpacked, workers: {args.workers or os.cpu_count()})")
+        print(f"{'mode':<38} {'time':>8} {'size':>10}")
+        for label, seconds, path in results:
+            print(f"{label:<38} {seconds:>7.2f}s {os.path.getsize(path) / 1e6:>8.1f}MB")
+        print(f"Speedup: {results[0][1] / results[1][1]:.1f}x cold, {results[0][1] / results[3][1]:.1f}x with --previous")
+        print(f"Editing one slide: {results[4][1] / results[5][1]:.1f}x faster with ArchiveWorkspace")
+        print(f"Deterministic output: {'yes' if digest(new_path) == digest(again_path) else 'NO'}")
+
+        for label, seconds, path in results:
+            with zipfile.ZipFile(path) as zip_ref:
+                if zip_ref.testzip() is not None:
+                    print(f"Error: {label} produced a corrupt archive")
+                    sys.exit(1)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
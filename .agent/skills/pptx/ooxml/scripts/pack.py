@@ -1,23 +1,116 @@
-import zipfile
+import argparse
 import os
 import sys
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from workspace import ArchiveWorkspace
+from zip_raw import DEFAULT_LEVEL, ZIP_STORED, RawZipWriter, compression_method, deflate, read_raw
+
+CONTENT_TYPES = "[Content_Types].xml"
+
+
+def entry_names(input_dir):
+    """Part names in archive order: [Content_Types].xml first, then sorted, so every run writes the same bytes."""
+    names = []
+    for root, dirs, files in os.walk(input_dir):
+        for file in files:
+            names.append(os.path.relpath(os.path.join(root, file), input_dir).replace(os.sep, "/"))
+    return sorted(names, key=lambda name: (name != CONTENT_TYPES, name))
+
 
-def pack(input_dir, output_path):
+def prepare_entry(input_dir, name, previous_path, previous_entries, level):
+    """Read and compress one part, or copy its compressed bytes from the previous archive if unchanged."""
+    with open(os.path.join(input_dir, name), "rb") as f:
+        data = f.read()
+    crc = zlib.crc32(data)
+    method = compression_method(name, data)
+
+    info = previous_entries.get(name)
+    if info is not None and info.CRC == crc and info.file_size == len(data) and info.compress_type == method:
+        with open(previous_path, "rb") as fp:
+            return name, read_raw(fp, info), method, crc, len(data), True
+
+    payload = data if method == ZIP_STORED else deflate(data, level)
+    return name, payload, method, crc, len(data), False
+
+
+def pack(input_dir, output_path, previous=None, workers=None, level=DEFAULT_LEVEL):
     if not os.path.exists(input_dir):
         print(f"Error: {input_dir} not found")
         sys.exit(1)
 
-    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
-        for root, dirs, files in os.walk(input_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, input_dir)
-                zip_ref.write(file_path, arcname)
-    
-    print(f"Packed {input_dir} into {output_path}")
+    previous_entries = {}
+    if previous:
+        if not os.path.exists(previous):
+            print(f"Error: {previous} not found")
+            sys.exit(1)
+        with zipfile.ZipFile(previous) as zip_ref:
+            previous_entries = {info.filename: info for info in zip_ref.infolist() if not info.is_dir()}
 
-if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python pack.py <input_directory> <office_file>")
+    workers = workers or os.cpu_count() or 1
+    counts = {"deflated": 0, "stored": 0, "reused": 0}
+
+    # Written to a temporary file first so `previous` may be the archive being replaced
+    temp_path = f"{output_path}.tmp"
+    try:
+        with RawZipWriter(temp_path) as writer, ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+
+            def write_next():
+                name, payload, method, crc, size, reused = pending.popleft().result()
+                writer.add(name, payload, method, crc, size)
+                counts["reused" if reused else "stored" if method == ZIP_STORED else "deflated"] += 1
+
+            # At most a few parts per worker are held in memory at once
+            for name in entry_names(input_dir):
+                pending.append(executor.submit(prepare_entry, input_dir, name, previous, previous_entries, level))
+                if len(pending) >= workers * 4:
+                    write_next()
+            while pending:
+                write_next()
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    print(
+        f"Packed {input_dir} into {output_path} "
+        f"({counts['deflated']} deflated, {counts['stored']} stored, {counts['reused']} reused)"
+    )
+
+
+def pack_onto(input_dir, base, output_path, level=DEFAULT_LEVEL):
+    """Overlay the files in input_dir (e.g. from unpack.py --parts) onto the archive base."""
+    if not os.path.exists(input_dir):
+        print(f"Error: {input_dir} not found")
         sys.exit(1)
-    pack(sys.argv[1], sys.argv[2])
+    if not os.path.exists(base):
+        print(f"Error: {base} not found")
+        sys.exit(1)
+
+    with ArchiveWorkspace(base) as workspace:
+        for name in entry_names(input_dir):
+            with open(os.path.join(input_dir, name), "rb") as f:
+                workspace.write(name, f.read())
+        modified = workspace.modified
+        workspace.save(output_path, level=level)
+
+    print(f"Packed {input_dir} onto {base} into {output_path} ({len(modified)} parts changed, other entries copied)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack an unpacked Office document directory into a file")
+    parser.add_argument("input_directory")
+    parser.add_argument("office_file")
+    parser.add_argument("--previous", help="Earlier archive of the same document; unchanged parts are copied without recompressing")
+    parser.add_argument("--workers", type=int, help="Threads compressing XML parts (default: CPU count)")
+    parser.add_argument("--base", help="Keep every part of this archive and replace only the files in input_directory")
+    parser.add_argument("--level", type=int, default=DEFAULT_LEVEL, help=f"Deflate level 1-9 (default: {DEFAULT_LEVEL})")
+    args = parser.parse_args()
+    if args.base:
+        pack_onto(args.input_directory, args.base, args.office_file, level=args.level)
+    else:
+        pack(args.input_directory, args.office_file, previous=args.previous, workers=args.workers, level=args.level)
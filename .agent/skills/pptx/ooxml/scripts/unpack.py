@@ -1,24 +1,48 @@
+import argparse
 import zipfile
 import os
 import sys
 import shutil
 
-def unpack(pptx_path, output_dir):
+from workspace import ArchiveWorkspace
+
+def unpack(pptx_path, output_dir, parts=None):
     if not os.path.exists(pptx_path):
         print(f"Error: {pptx_path} not found")
         sys.exit(1)
-    
+
+    if parts:
+        # Only the requested parts are decompressed; the rest of output_dir is left as is
+        with ArchiveWorkspace(pptx_path) as workspace:
+            for part in parts:
+                if part not in workspace:
+                    print(f"Error: {part} not found in {pptx_path}")
+                    sys.exit(1)
+                part_path = os.path.join(output_dir, *part.split("/"))
+                os.makedirs(os.path.dirname(part_path), exist_ok=True)
+                with open(part_path, "wb") as f:
+                    f.write(workspace.read(part))
+        print(f"Unpacked {len(parts)} parts of {pptx_path} to {output_dir}")
+        return
+
     if os.path.exists(output_dir):
         shutil.rmtree(output_dir)
     os.makedirs(output_dir)
 
     with zipfile.ZipFile(pptx_path, 'r') as zip_ref:
         zip_ref.extractall(output_dir)
-    
+
     print(f"Unpacked {pptx_path} to {output_dir}")
 
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python unpack.py <office_file> <output_directory>")
-        sys.exit(1)
-    unpack(sys.argv[1], sys.argv[2])
+    parser = argparse.ArgumentParser(description="Unpack an Office document into a directory")
+    parser.add_argument("office_file")
+    parser.add_argument("output_directory")
+    parser.add_argument(
+        "--parts",
+        nargs="+",
+        metavar="PART",
+        help="Extract only these parts (e.g. ppt/slides/slide3.xml); repack with pack.py --base <office_file>"
+    )
+    args = parser.parse_args()
+    unpack(args.office_file, args.output_directory, parts=args.parts)
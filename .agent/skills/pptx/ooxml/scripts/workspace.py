@@ -0,0 +1,110 @@
+"""Edit parts of an Office document without extracting or recompressing the whole archive.
+
+    with ArchiveWorkspace("deck.pptx") as workspace:
+        xml = workspace.read_text("ppt/slides/slide3.xml")
+        workspace.write("ppt/slides/slide3.xml", xml.replace("Draft", "Final"))
+        workspace.save("deck_final.pptx")
+
+Only the central directory is read when opening. Parts are decompressed when read,
+and saving copies the compressed bytes of every untouched entry verbatim, so the
+cost of an edit is proportional to the edited parts (plus a sequential copy).
+"""
+import os
+import zipfile
+import zlib
+
+from zip_raw import DEFAULT_LEVEL, ZIP_STORED, RawZipWriter, compression_method, deflate
+
+
+class ArchiveWorkspace:
+    def __init__(self, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.path = path
+        self._open()
+
+    def _open(self):
+        self._zip = zipfile.ZipFile(self.path)
+        self._infos = {info.filename: info for info in self._zip.infolist()}
+        self._staged = {}
+        self._deleted = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self._zip.close()
+
+    def names(self):
+        """Part names in archive order, including added and excluding deleted parts."""
+        names = [name for name in self._infos if name not in self._deleted]
+        return names + [name for name in self._staged if name not in self._infos]
+
+    def __contains__(self, name):
+        return name in self._staged or (name in self._infos and name not in self._deleted)
+
+    @property
+    def modified(self):
+        """Parts written or deleted since the workspace was opened or last saved."""
+        return sorted(set(self._staged) | self._deleted)
+
+    def info(self, name):
+        """zipfile.ZipInfo of an original part (None for added parts)."""
+        return self._infos.get(name)
+
+    def read(self, name):
+        if name in self._staged:
+            return self._staged[name]
+        if name in self._deleted or name not in self._infos:
+            raise KeyError(f"No part named {name}")
+        return self._zip.read(name)
+
+    def read_text(self, name, encoding="utf-8"):
+        return self.read(name).decode(encoding)
+
+    def write(self, name, data):
+        """Replace or add a part (str is encoded as UTF-8). Writing identical bytes leaves it untouched."""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        info = self._infos.get(name)
+        self._deleted.discard(name)
+        if info is not None and info.CRC == zlib.crc32(data) and info.file_size == len(data):
+            self._staged.pop(name, None)
+            return
+        self._staged[name] = data
+
+    def delete(self, name):
+        if name not in self:
+            raise KeyError(f"No part named {name}")
+        self._staged.pop(name, None)
+        if name in self._infos:
+            self._deleted.add(name)
+
+    def save(self, output_path=None, level=DEFAULT_LEVEL):
+        """
+        Write the archive (to the source path if output_path is omitted). Untouched entries keep
+        their compressed bytes; written parts are compressed like pack.py does.
+        """
+        output_path = output_path or self.path
+        temp_path = f"{output_path}.tmp"
+        try:
+            with RawZipWriter(temp_path) as writer, open(self.path, "rb") as source:
+                for name in self.names():
+                    if name in self._staged:
+                        data = self._staged[name]
+                        method = compression_method(name, data)
+                        payload = data if method == ZIP_STORED else deflate(data, level)
+                        writer.add(name, payload, method, zlib.crc32(data), len(data))
+                    else:
+                        writer.copy_entry(source, self._infos[name])
+            # The source is closed before the replace so saving over it also works on Windows
+            self.close()
+            os.replace(temp_path, output_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self.path = output_path
+        self._open()
@@ -0,0 +1,148 @@
+"""Read and write zip entries as raw (already compressed) bytes.
+
+zipfile always recompresses what it writes. These helpers let pack.py compress
+parts in parallel, and pack.py and workspace.py copy unchanged entries from an
+existing archive verbatim.
+"""
+import os
+import struct
+import zlib
+
+LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+END_RECORD = struct.Struct("<IHHHHIIH")
+
+LOCAL_HEADER_SIGNATURE = 0x04034B50
+CENTRAL_HEADER_SIGNATURE = 0x02014B50
+END_RECORD_SIGNATURE = 0x06054B50
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+VERSION = 20
+UTF8_FLAG = 0x800
+ZIP32_LIMIT = 0xFFFFFFFF
+
+# 1980-01-01 00:00:00, the earliest DOS timestamp, so the output does not depend on file mtimes
+FIXED_DOS_TIME = 0
+FIXED_DOS_DATE = (1 << 5) | 1
+
+DEFAULT_LEVEL = 6
+COPY_CHUNK_SIZE = 1 << 20
+
+# Media that is usually already compressed; deflating it again costs time and saves nothing.
+# EMF/WMF are uncompressed drawing records and still shrink well, so they stay deflated.
+STORED_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".jpe", ".gif", ".webp", ".wdp", ".jxr", ".emz", ".wmz",
+    ".mp3", ".m4a", ".aac", ".mp4", ".m4v", ".mov", ".wmv", ".avi", ".webm",
+    ".xlsx", ".xlsm", ".docx", ".pptx", ".zip", ".ttf", ".odttf", ".fntdata"
+}
+
+# Some encoders write barely compressed PNGs, so a sample is deflated at level 1 first and
+# the file is stored only if the sample shrinks by less than 5%
+COMPRESSIBILITY_SAMPLE = 64 * 1024
+STORE_RATIO = 0.95
+
+
+def deflate(data, level=DEFAULT_LEVEL):
+    """Raw deflate stream for a zip entry (zlib releases the GIL, so threads run in parallel)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compression_method(name, data):
+    if os.path.splitext(name)[1].lower() not in STORED_EXTENSIONS:
+        return ZIP_DEFLATED
+    sample = data[:COMPRESSIBILITY_SAMPLE]
+    return ZIP_STORED if len(zlib.compress(sample, 1)) >= len(sample) * STORE_RATIO else ZIP_DEFLATED
+
+
+def _seek_to_data(fp, info):
+    fp.seek(info.header_offset)
+    header = LOCAL_HEADER.unpack(fp.read(LOCAL_HEADER.size))
+    if header[0] != LOCAL_HEADER_SIGNATURE:
+        raise ValueError(f"Bad local header for {info.filename}")
+    if info.flag_bits & 0x1:
+        raise ValueError(f"Encrypted entries are not supported: {info.filename}")
+    fp.seek(header[9] + header[10], 1)
+
+
+def read_raw(fp, info):
+    """Compressed bytes of `info` (a zipfile.ZipInfo) from the archive file object `fp`."""
+    _seek_to_data(fp, info)
+    data = fp.read(info.compress_size)
+    if len(data) != info.compress_size:
+        raise ValueError(f"Truncated entry: {info.filename}")
+    return data
+
+
+def iter_raw(fp, info, chunk_size=COPY_CHUNK_SIZE):
+    """Compressed bytes of `info` in chunks, for copying large media without holding it in memory."""
+    _seek_to_data(fp, info)
+    remaining = info.compress_size
+    while remaining:
+        chunk = fp.read(min(chunk_size, remaining))
+        if not chunk:
+            raise ValueError(f"Truncated entry: {info.filename}")
+        remaining -= len(chunk)
+        yield chunk
+
+
+class RawZipWriter:
+    """Writes entries whose compressed bytes, CRC and sizes are already known."""
+
+    def __init__(self, path):
+        self._file = open(path, "wb")
+        self._offset = 0
+        self._entries = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+
+    def _write(self, data):
+        self._file.write(data)
+        self._offset += len(data)
+
+    def _add_header(self, name, method, crc, compress_size, file_size):
+        if max(file_size, compress_size, self._offset + compress_size) > ZIP32_LIMIT:
+            raise ValueError(f"{name}: archives over 4 GB (zip64) are not supported")
+        encoded = name.encode("utf-8")
+        flags = 0 if name.isascii() else UTF8_FLAG
+        self._entries.append((encoded, flags, method, crc, compress_size, file_size, self._offset))
+        self._write(LOCAL_HEADER.pack(
+            LOCAL_HEADER_SIGNATURE, VERSION, flags, method, FIXED_DOS_TIME, FIXED_DOS_DATE,
+            crc, compress_size, file_size, len(encoded), 0
+        ))
+        self._write(encoded)
+
+    def add(self, name, payload, method, crc, file_size):
+        """Append one entry. `payload` is stored as-is (raw deflate data for ZIP_DEFLATED)."""
+        self._add_header(name, method, crc, len(payload), file_size)
+        self._write(payload)
+
+    def copy_entry(self, fp, info):
+        """Append the entry `info` of the archive `fp` without decompressing it."""
+        self._add_header(info.filename, info.compress_type, info.CRC, info.compress_size, info.file_size)
+        for chunk in iter_raw(fp, info):
+            self._write(chunk)
+
+    def close(self):
+        central_offset = self._offset
+        for encoded, flags, method, crc, compress_size, file_size, offset in self._entries:
+            self._write(CENTRAL_HEADER.pack(
+                CENTRAL_HEADER_SIGNATURE, VERSION, VERSION, flags, method, FIXED_DOS_TIME, FIXED_DOS_DATE,
+                crc, compress_size, file_size, len(encoded), 0, 0, 0, 0, 0, offset
+            ))
+            self._write(encoded)
+        if len(self._entries) > 0xFFFF or self._offset > ZIP32_LIMIT:
+            raise ValueError("archives with more than 65535 entries (zip64) are not supported")
+        self._write(END_RECORD.pack(
+            END_RECORD_SIGNATURE, 0, 0, len(self._entries), len(self._entries),
+            self._offset - central_offset, central_offset, 0
+        ))
+        self._file.close()
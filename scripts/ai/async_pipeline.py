@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+議事録 → GitHub Issues の非同期パイプライン
+
+抽出・正規化・Issue作成・Projects追加・フィールド設定を上限付きのキューでつないだ
+ステージとして asyncio で並行に実行します。Geminiがタスクを生成している間に
+Issue作成とProjectsの更新を進め、ステージごとのキューの深さと処理時間を計測します。
+ブロッキングするAPI呼び出し（Gemini・PyGithub・GraphQL）はスレッドで実行します。
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from pipeline_journal import PipelineJournal, STAGE_FIELDS_SET, STAGE_PROJECT_ADDED
+
+# ステージ間のキューに溜める最大件数（上流が速すぎる場合はここで待たせる）
+PIPELINE_QUEUE_SIZE = 8
+
+# ステージ名（表示順）
+STAGE_NAMES = ("extract", "normalize", "create", "project", "fields")
+
+# キューの終端を示す値
+_DONE = object()
+
+
+class StageStats:
+    """1つのステージの計測値"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: List[float] = []
+        self.errors = 0
+        # 期限を過ぎたため処理しなかった件数
+        self.dropped = 0
+        # 入力キューの深さ（キューに入れた時点で計測）
+        self.max_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+
+    def sample_depth(self, depth: int) -> None:
+        self.max_depth = max(self.max_depth, depth)
+        self._depth_total += depth
+        self._depth_samples += 1
+
+    def row(self) -> str:
+        """レポートの1行"""
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        average = sum(latencies) / count if count else 0.0
+        p95 = latencies[min(count - 1, int(count * 0.95))] if count else 0.0
+        mean_depth = self._depth_total / self._depth_samples if self._depth_samples else 0.0
+        return (
+            f"{self.name:<10} {count:>5} {average:>9.2f}s {p95:>9.2f}s "
+            f"{mean_depth:>6.1f} {self.max_depth:>5} {self.errors:>5} {self.dropped:>5}"
+        )
+
+
+class IssuePipeline:
+    """抽出からProjectsのフィールド設定までを並行に実行するパイプライン"""
+
+    def __init__(
+        self,
+        analyzer,
+        integrator,
+        dry_run: bool = False,
+        add_to_project: bool = True,
+        journal: Optional[PipelineJournal] = None,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        time_limit: Optional[float] = None
+    ):
+        """
+        Args:
+            analyzer: MeetingAnalyzer（タスクの正規化に使う）
+            integrator: GitHubIntegrator
+            dry_run: Trueの場合、実際には作成せずログのみ
+            add_to_project: Trueの場合、Projects v2にも追加
+            journal: チェックポイントジャーナル（完了済みのステージはスキップし、完了したステージを記録）
+            queue_size: ステージ間のキューの最大件数
+            time_limit: 全体の実行時間の上限（秒）。過ぎると新しい処理を始めず、
+                        実行中のリクエストの完了を待って終了する（--resume で続きから再開できる）
+        """
+        self.analyzer = analyzer
+        self.integrator = integrator
+        self.dry_run = dry_run
+        self.add_to_project = add_to_project
+        self.journal = journal
+        self.queue_size = max(1, queue_size)
+        self.time_limit = time_limit
+        # GitHubのステージはそれぞれ max_workers 並列（全体の同時実行数はスロットルが制御する）
+        self.workers = integrator.max_workers
+
+        self.stats = {name: StageStats(name) for name in STAGE_NAMES}
+        # 正規化したタスク（届いた順）と、抽出を最後まで終えたか（ジャーナルへの記録に使う）
+        self.normalized_tasks: List[Dict] = []
+        self.extracted_all = False
+        self.timed_out = False
+        self.elapsed = 0.0
+        self._deadline = None
+        # 抽出スレッドに停止を伝える
+        self._stop = threading.Event()
+
+    def _expired(self) -> bool:
+        """実行時間の上限を過ぎたか"""
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            if not self.timed_out:
+                self.timed_out = True
+                self._stop.set()
+                print(f"Warning: Time limit ({self.time_limit:g}s) reached, not starting new work")
+            return True
+        return False
+
+    async def _put(self, queue: asyncio.Queue, item, consumer: str) -> None:
+        """下流のキューに入れる（満杯なら空くまで待つ）"""
+        await queue.put(item)
+        self.stats[consumer].sample_depth(queue.qsize())
+
+    async def _run_stage(
+        self,
+        name: str,
+        inbox: asyncio.Queue,
+        handler,
+        workers: int,
+        outbox: Optional[asyncio.Queue] = None,
+        consumer: Optional[str] = None,
+        consumer_workers: int = 1
+    ) -> None:
+        """
+        入力キューが終端に達するまでハンドラを実行し、結果を下流のキューに渡す
+
+        Args:
+            name: ステージ名
+            inbox: 入力キュー
+            handler: 1件を処理するコルーチン関数（下流に渡す値のリストを返す）
+            workers: 並列に処理するワーカー数
+            outbox: 下流のキュー
+            consumer: 下流のステージ名
+            consumer_workers: 下流のワーカー数（終端をワーカーの数だけ送る）
+        """
+        stats = self.stats[name]
+
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    return
+                if self._expired():
+                    stats.dropped += 1
+                    continue
+                started = time.monotonic()
+                try:
+                    results = await handler(item)
+                except Exception as e:
+                    stats.errors += 1
+                    print(f"Error: {name} stage failed: {e}")
+                    continue
+                stats.latencies.append(time.monotonic() - started)
+                for result in results:
+                    await self._put(outbox, result, consumer)
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        if outbox is not None:
+            for _ in range(consumer_workers):
+                await outbox.put(_DONE)
+
+    async def _extract(self, source: Iterable[Dict], outbox: asyncio.Queue) -> None:
+        """
+        抽出スレッドから届いたタスクを下流に渡す
+
+        Geminiのストリームは途中で中断できないため、専用のデーモンスレッドで読み、
+        期限を過ぎた場合はスレッドを待たずに終端を送ります。
+        """
+        loop = asyncio.get_running_loop()
+        stats = self.stats["extract"]
+        finished = loop.create_future()
+
+        def forward(task: Dict) -> bool:
+            """下流のキューに入れる（満杯なら空くまでこのスレッドを止める）。イベントループが終了していればFalse"""
+            try:
+                asyncio.run_coroutine_threadsafe(self._put(outbox, task, "normalize"), loop).result()
+            except (RuntimeError, CancelledError):
+                # 期限切れでイベントループが先に終了している
+                return False
+            return True
+
+        def produce():
+            last = time.monotonic()
+            try:
+                for task in source:
+                    if self._stop.is_set():
+                        return
+                    now = time.monotonic()
+                    stats.latencies.append(now - last)
+                    last = now
+                    if not forward(task):
+                        return
+                self.extracted_all = not self._stop.is_set()
+            except Exception as e:
+                stats.errors += 1
+                print(f"Error: extract stage failed: {e}")
+            finally:
+                try:
+                    loop.call_soon_threadsafe(lambda: finished.done() or finished.set_result(None))
+                except RuntimeError:
+                    # 期限切れでイベントループが先に終了している
+                    pass
+
+        threading.Thread(target=produce, name="pipeline-extract", daemon=True).start()
+
+        timeout = None if self._deadline is None else max(0.0, self._deadline - time.monotonic())
+        try:
+            await asyncio.wait_for(asyncio.shield(finished), timeout)
+        except asyncio.TimeoutError:
+            self._expired()
+        await outbox.put(_DONE)
+
+    async def _run(self, source: Iterable[Dict]) -> List[Dict]:
+        """パイプライン全体を実行し、Issue情報を (タスクの番号, Issue情報) で返す"""
+        integrator = self.integrator
+        journal = self.journal
+        project_id = await asyncio.to_thread(integrator.resolve_project_id) if self.add_to_project else None
+        await asyncio.to_thread(integrator.prepare_issue_index)
+
+        raw_tasks = asyncio.Queue(self.queue_size)
+        normalized = asyncio.Queue(self.queue_size)
+        to_project = asyncio.Queue(self.queue_size)
+        to_fields = asyncio.Queue(self.queue_size)
+
+        results: List[tuple] = []
+        claimed = set()
+        counter = {"index": 0}
+
+        async def normalize(task: Dict) -> List:
+            counter["index"] += 1
+            normalized_task, diagnostics = self.analyzer.schema.normalize(task, counter["index"])
+            self.analyzer.diagnostics.extend(diagnostics)
+            if normalized_task is None:
+                return []
+            self.normalized_tasks.append(normalized_task)
+            return [(counter["index"], normalized_task)]
+
+        async def create(item: tuple) -> List:
+            index, task = item
+            print(f"\n[{index}] Processing: {task['title']}")
+            fingerprint, issue_info = await asyncio.to_thread(
+                integrator.process_task_issue, task, claimed, self.dry_run, journal
+            )
+            if not issue_info:
+                return []
+            results.append((index, issue_info))
+            if not project_id:
+                return []
+            item_id, pending = integrator.project_progress(fingerprint, issue_info, journal)
+            if not pending:
+                return []
+            return [(fingerprint, task, issue_info, item_id)]
+
+        async def add_to_project(item: tuple) -> List:
+            fingerprint, task, issue_info, item_id = item
+            if item_id is None:
+                item_id = await asyncio.to_thread(integrator.add_project_item, issue_info["node_id"], project_id)
+                if item_id is None:
+                    return []
+                issue_info["project_item_id"] = item_id
+                if journal:
+                    journal.record(fingerprint, STAGE_PROJECT_ADDED, {"item_id": item_id})
+            return [(fingerprint, task, issue_info, item_id)]
+
+        async def set_fields(item: tuple) -> List:
+            fingerprint, task, issue_info, item_id = item
+
+            def on_stage(stage: str, data: Dict) -> None:
+                if journal and stage == STAGE_FIELDS_SET:
+                    journal.record(fingerprint, stage, data)
+
+            # item_id を渡すとProjectsへの追加は行わず、フィールド設定のみ
+            await asyncio.to_thread(
+                integrator.add_issue_to_project,
+                issue_info["node_id"],
+                task,
+                project_id,
+                dry_run=self.dry_run,
+                item_id=item_id,
+                on_stage=on_stage
+            )
+            return []
+
+        workers = self.workers
+        await asyncio.gather(
+            self._extract(source, raw_tasks),
+            self._run_stage("normalize", raw_tasks, normalize, 1, normalized, "create", workers),
+            self._run_stage("create", normalized, create, workers, to_project, "project", workers),
+            self._run_stage("project", to_project, add_to_project, workers, to_fields, "fields", workers),
+            self._run_stage("fields", to_fields, set_fields, workers)
+        )
+        return results
+
+    def run(self, source: Iterable[Dict]) -> List[Dict]:
+        """
+        パイプラインを実行する
+
+        Args:
+            source: 抽出されたタスクのイテレータ（ストリーミング抽出・ジャーナルのタスクなど）
+
+        Returns:
+            Issue情報のリスト（タスクの順。インデックスに記録済みのIssueは "existing": True 付き）
+        """
+        started_at = time.monotonic()
+        if self.time_limit:
+            self._deadline = started_at + self.time_limit
+
+        async def main():
+            # to_thread で使うスレッド数（Issue作成・Projects追加・フィールド設定の各ステージ分）
+            loop = asyncio.get_running_loop()
+            loop.set_default_executor(ThreadPoolExecutor(max_workers=3 * self.workers + 1))
+            return await self._run(source)
+
+        results = asyncio.run(main())
+        self.elapsed = time.monotonic() - started_at
+
+        if self.integrator.semantic_index is not None:
+            self.integrator.semantic_index.save()
+        return [issue_info for _, issue_info in sorted(results, key=lambda result: result[0])]
+
+    def report(self) -> str:
+        """ステージごとの件数・処理時間・キューの深さのレポート"""
+        lines = [
+            f"パイプライン: {self.elapsed:.1f}s{'（時間制限で打ち切り）' if self.timed_out else ''}",
+            f"{'stage':<10} {'items':>5} {'avg':>10} {'p95':>10} {'depth':>6} {'max':>5} {'err':>5} {'drop':>5}"
+        ]
+        lines.extend(stats.row() for stats in self.stats.values())
+        return "\n".join(lines)
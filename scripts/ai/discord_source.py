@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+DiscordのエクスポートJSONをタスク抽出のソースにするアダプター
+
+`ドキュメント/Discordトーク/export.json` のような {id, username, content, timestamp} の
+フラットな配列を1メッセージずつ読み込み（全体を読み込まない）、時間の間隔とメンションへの返信で
+会話ウィンドウにまとめます。前回処理した最後のメッセージID（既読位置）とそのファイル上の位置を
+.cache/discord/ に保存し、次回はその位置から読むため、新しいウィンドウだけを抽出に回せます。
+"""
+
+import hashlib
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from json_stream import iter_json_array
+from local_cache import cache_path, read_json, write_json
+from note_chunker import estimate_tokens
+
+# この間隔（秒）を超えて次のメッセージが来たら別の会話とみなす
+WINDOW_GAP_SECONDS = 30 * 60
+
+# メンションされた相手の返信は、この間隔（秒）までは同じ会話とみなす
+MENTION_REPLY_GAP_SECONDS = 12 * 60 * 60
+
+# 1ウィンドウの最大トークン数（概算。超えたら会話の途中でも区切る）
+WINDOW_MAX_TOKENS = 6000
+
+# 既読位置のファイルが書き換えられていないか確認するため、直前のこのバイト数のハッシュを保存する
+ANCHOR_BYTES = 4096
+
+MENTION_PATTERN = re.compile(r"<@[!&]?\d+>")
+MESSAGE_LINK_PATTERN = re.compile(r"https://(?:\w+\.)?discord(?:app)?\.com/channels/\d+/\d+/(\d+)")
+
+
+def _parse_timestamp(value: str) -> datetime:
+    timestamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)
+
+
+class ConversationWindow:
+    """会話ウィンドウ（時間的にまとまったメッセージの列）"""
+
+    def __init__(self):
+        self.messages: List[Dict] = []
+        self.tokens = 0
+        self.first_id: Optional[int] = None
+        self.last_id: Optional[int] = None
+        self.end_offset: Optional[int] = None
+        self.start: Optional[datetime] = None
+        self.end: Optional[datetime] = None
+        # 返信を待っているメンションの送信者（別の人が発言したら解消）
+        self.pending_mention_from: Optional[str] = None
+
+    def add(self, message: Dict, message_id: int, timestamp: datetime, offset: int) -> None:
+        self.messages.append({
+            "username": message.get("username") or "unknown",
+            "timestamp": timestamp,
+            "content": message.get("content") or ""
+        })
+        self.tokens += estimate_tokens(message.get("content") or "")
+        if self.first_id is None:
+            self.first_id = message_id
+            self.start = timestamp
+        self.last_id = message_id
+        self.end = timestamp
+        self.end_offset = offset
+
+        username = self.messages[-1]["username"]
+        if MENTION_PATTERN.search(self.messages[-1]["content"]):
+            self.pending_mention_from = username
+        elif self.pending_mention_from and username != self.pending_mention_from:
+            self.pending_mention_from = None
+
+    def continues_with(self, message: Dict, timestamp: datetime, window_gap: float, mention_gap: float) -> bool:
+        """メッセージがこの会話の続きかどうか"""
+        gap = (timestamp - self.end).total_seconds()
+        if gap <= window_gap:
+            return True
+        username = message.get("username") or "unknown"
+        if self.pending_mention_from and username != self.pending_mention_from and gap <= mention_gap:
+            return True
+        # このウィンドウのメッセージへのリンク（引用返信）
+        for linked_id in MESSAGE_LINK_PATTERN.findall(message.get("content") or ""):
+            if self.first_id <= int(linked_id) <= self.last_id:
+                return True
+        return False
+
+    def to_dict(self) -> Dict:
+        """
+        抽出に渡すウィンドウ
+
+        Returns:
+            {"first_id", "last_id", "end_offset", "start", "end", "participants", "messages", "text"}
+        """
+        participants = list(dict.fromkeys(message["username"] for message in self.messages))
+        lines = [
+            f"# Discordの会話 {self.start:%Y-%m-%d %H:%M}〜{self.end:%Y-%m-%d %H:%M} (UTC)",
+            "",
+            f"参加者: {', '.join(participants)}",
+            ""
+        ]
+        for message in self.messages:
+            lines.append(f"**{message['username']}** ({message['timestamp']:%m-%d %H:%M}):")
+            lines.append(message["content"])
+            lines.append("")
+        return {
+            "first_id": str(self.first_id),
+            "last_id": str(self.last_id),
+            "end_offset": self.end_offset,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "participants": participants,
+            "messages": len(self.messages),
+            "text": "\n".join(lines)
+        }
+
+
+class DiscordExportSource:
+    """DiscordのエクスポートJSONから新しい会話ウィンドウを読み出すクラス"""
+
+    def __init__(
+        self,
+        path: str,
+        window_gap: float = WINDOW_GAP_SECONDS,
+        mention_gap: float = MENTION_REPLY_GAP_SECONDS,
+        max_tokens: int = WINDOW_MAX_TOKENS,
+        reset: bool = False
+    ):
+        """
+        Args:
+            path: エクスポートJSONのパス
+            window_gap: 別の会話とみなすメッセージの間隔（秒）
+            mention_gap: メンションへの返信を同じ会話とみなす間隔（秒）
+            max_tokens: 1ウィンドウの最大トークン数（概算）
+            reset: Trueの場合、保存された既読位置を使わずに最初から読む
+        """
+        self.path = Path(path)
+        self.window_gap = window_gap
+        self.mention_gap = mention_gap
+        self.max_tokens = max_tokens
+        source_id = hashlib.sha256(str(self.path.resolve()).encode("utf-8")).hexdigest()[:16]
+        self.state_file = cache_path("discord", f"{source_id}.json")
+        self.state = {} if reset else (read_json(self.state_file) or {})
+        self.stats = {"scanned": 0, "skipped": 0, "windows": 0, "held_back": 0, "resumed_at": None}
+
+    @property
+    def high_water_mark(self) -> Optional[int]:
+        """前回処理した最後のメッセージID"""
+        value = self.state.get("high_water_mark")
+        return int(value) if value else None
+
+    def _anchor(self, offset: int) -> str:
+        """ファイル上の位置の直前 ANCHOR_BYTES バイトのハッシュ"""
+        with open(self.path, 'rb') as f:
+            f.seek(max(0, offset - ANCHOR_BYTES))
+            return hashlib.sha256(f.read(min(offset, ANCHOR_BYTES))).hexdigest()
+
+    def _resume_offset(self) -> Optional[int]:
+        """既読位置から読み始められる場合はそのバイト位置（ファイルが書き換えられていればNone）"""
+        offset = self.state.get("offset")
+        if not offset or offset > self.path.stat().st_size:
+            return None
+        return offset if self._anchor(offset) == self.state.get("anchor") else None
+
+    def _messages(self) -> Iterator[tuple]:
+        """既読位置より新しいメッセージ (ID, タイムスタンプ, メッセージ, 直後のバイト位置)"""
+        high_water_mark = self.high_water_mark
+        with open(self.path, 'rb') as f:
+            offset = self._resume_offset()
+            if offset is not None:
+                f.seek(offset)
+                self.stats["resumed_at"] = offset
+            for end_offset, message in iter_json_array(f, in_array=offset is not None):
+                self.stats["scanned"] += 1
+                if not isinstance(message, dict) or not message.get("id") or not message.get("timestamp"):
+                    self.stats["skipped"] += 1
+                    continue
+                message_id = int(message["id"])
+                if high_water_mark is not None and message_id <= high_water_mark:
+                    # エクスポートが作り直された場合は先頭から読み、既読のメッセージを飛ばす
+                    self.stats["skipped"] += 1
+                    continue
+                yield message_id, _parse_timestamp(message["timestamp"]), message, end_offset
+
+    def iter_windows(self, now: Optional[datetime] = None) -> Iterator[Dict]:
+        """
+        既読位置より新しい会話ウィンドウを古い順に読み出す
+
+        最後のウィンドウは、最後のメッセージから window_gap が経っていない場合は
+        会話が続いている可能性があるため返さず、次回に回します。
+
+        Args:
+            now: 現在時刻（省略時は現在のUTC時刻）
+
+        Yields:
+            ConversationWindow.to_dict の辞書
+        """
+        now = now or datetime.now(timezone.utc)
+        window = None
+        for message_id, timestamp, message, end_offset in self._messages():
+            if window and not window.continues_with(message, timestamp, self.window_gap, self.mention_gap):
+                self.stats["windows"] += 1
+                yield window.to_dict()
+                window = None
+            if window is None:
+                window = ConversationWindow()
+            window.add(message, message_id, timestamp, end_offset)
+            if window.tokens >= self.max_tokens:
+                self.stats["windows"] += 1
+                yield window.to_dict()
+                window = None
+
+        if window:
+            if (now - window.end).total_seconds() < self.window_gap:
+                self.stats["held_back"] = len(window.messages)
+                return
+            self.stats["windows"] += 1
+            yield window.to_dict()
+
+    def commit(self, window: Dict) -> None:
+        """
+        ウィンドウまで処理したことを記録する（次回はこのウィンドウの後から読む）
+
+        Args:
+            window: iter_windows が返したウィンドウ
+        """
+        if self.high_water_mark is not None and int(window["last_id"]) <= self.high_water_mark:
+            return
+        self.state = {
+            "source": str(self.path),
+            "high_water_mark": window["last_id"],
+            "offset": window["end_offset"],
+            "anchor": self._anchor(window["end_offset"]),
+            "updated_at": datetime.now().isoformat()
+        }
+        write_json(self.state_file, self.state)
+
+    def summary(self) -> str:
+        """読み込みの集計"""
+        stats = self.stats
+        resumed = f"前回の位置（{stats['resumed_at']}バイト目）から" if stats["resumed_at"] is not None else "先頭から"
+        held_back = f" / 会話中のため次回に回したメッセージ: {stats['held_back']}件" if stats["held_back"] else ""
+        return (
+            f"Discord: {resumed}{stats['scanned']}件を読み込み（既読・不正: {stats['skipped']}件） / "
+            f"新しい会話: {stats['windows']}件{held_back}"
+        )
@@ -7,53 +7,298 @@ GitHub IssuesとProjectsを作成するスクリプト
 
 import json
 import os
+import random
+import re
 import sys
-from typing import List, Dict, Optional
-from datetime import datetime
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Dict, Optional
+from datetime import datetime, timezone
 from pathlib import Path
 
-try:
-    from github import Github, GithubException
+from github_transport import GitHubTransport, DEFAULT_TIMEOUT, IDEMPOTENT_METHODS
+from issue_index import IssueIndex, task_fingerprint
+from issue_plan import ACTION_CREATE, ACTION_UPDATE, ACTION_COMMENT, ACTION_SKIP, plan_summary, read_plan, write_plan
+from pipeline_journal import PipelineJournal, STAGE_ISSUE_CREATED, STAGE_PROJECT_ADDED, STAGE_FIELDS_SET
+from project_schema import ProjectSchemaResolver
+from repo_metadata import RepoMetadataCache
+from rate_limiter import RateLimitGovernor, RESOURCE_CORE, RESOURCE_GRAPHQL, creates_content
+from tracing import Tracer, TRACE_FORMATS, TRACE_FORMAT_JSONL
+
+if TYPE_CHECKING:
     import requests
-    from dotenv import load_dotenv
-except ImportError:
-    print("Error: Required packages not found. Please run: pip install -r requirements.txt")
-    sys.exit(1)
 
-# 環境変数の読み込み
-load_dotenv()
+# GitHub設定の既定値（環境変数 GITHUB_OWNER / GITHUB_REPO で変更可能）
+DEFAULT_GITHUB_OWNER = "kochan17"
+DEFAULT_GITHUB_REPO = "co-co"
+
+# APIエンドポイント（GitHub Enterprise Serverやローカルのスタブでは
+# 環境変数 GITHUB_API_URL / GITHUB_GRAPHQL_URL で変更可能。GitHub Actionsと同じ変数名）
+DEFAULT_API_URL = "https://api.github.com"
+
+# バッチモードの既定値
+# 1リクエストにまとめるmutationの最大数と、1リクエストあたりのコスト予算
+# (GitHubのセカンダリレート制限ではmutation 1件を5ポイントとして計算する)
+BATCH_MAX_OPERATIONS = 20
+BATCH_MAX_COST = 100
+MUTATION_COST = 5
+
+# タスクのキーと project_config.json の fields キーの対応
+PROJECT_FIELD_KEYS = {
+    "status": "status_field",
+    "priority": "priority_field",
+    "size": "size_field",
+    "type": "type_field",
+    "team": "team_field",
+    "business_impact": "impact_field",
+    "due_date": "due_date_field"
+}
+
+# Projects v2のフィールド型ごとの値の渡し方 (入力フィールド名, GraphQL型)
+FIELD_VALUE_INPUTS = {
+    "DATE": ("date", "Date!"),
+    "SINGLE_SELECT": ("singleSelectOptionId", "String!"),
+    "TEXT": ("text", "String!"),
+    "NUMBER": ("number", "Float!")
+}
+
+# セカンダリレート制限時の待機設定
+# Retry-Afterヘッダーがない場合は最低1分待つ（GitHubの推奨）
+SECONDARY_RATE_LIMIT_WAIT = 60
+SECONDARY_RATE_LIMIT_RETRIES = 3
+
+# 既存Issueの一覧を取得するときの1ページあたりの件数（GitHubの上限）
+ISSUES_PER_PAGE = 100
+
+# プランの適用時に、Projects v2へまとめて追加する前に溜めるIssue数
+PLAN_PROJECT_FLUSH = 50
+
+
+def pygithub():
+    """
+    PyGithub を読み込む（読み込みに時間がかかるため、--help などでは読み込まない）
+
+    Returns:
+        github モジュール
+    """
+    try:
+        import github
+    except ImportError:
+        print("Error: Required packages not found. Please run: pip install -r requirements.txt")
+        sys.exit(1)
+    return github
+
 
-# GitHub設定
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-GITHUB_OWNER = os.getenv("GITHUB_OWNER", "kochan17")
-GITHUB_REPO = os.getenv("GITHUB_REPO", "co-co")
-GITHUB_PROJECT_NUMBER = os.getenv("GITHUB_PROJECT_NUMBER")
+class OfflineError(Exception):
+    """オフライン（計画のみ）のモードでGitHub APIを呼び出そうとしたことを示す例外"""
 
-if not GITHUB_TOKEN:
-    print("Error: GITHUB_TOKEN not found in environment variables")
-    sys.exit(1)
+
+class SecondaryRateLimitError(Exception):
+    """GitHubのセカンダリレート制限に達したことを示す例外"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdaptiveThrottle:
+    """
+    同時実行数を適応的に調整するスロットル
+
+    セカンダリレート制限に達すると同時実行数を半分にして全体を待機させ、
+    成功が続くと1ずつ上限（max_in_flight）まで戻します（AIMD方式）。
+    """
+
+    def __init__(self, max_in_flight: int):
+        """
+        Args:
+            max_in_flight: 同時に実行するリクエストの上限
+        """
+        self.max_in_flight = max(1, max_in_flight)
+        self.limit = self.max_in_flight
+        self.in_flight = 0
+        self.resume_at = 0.0
+        self.successes = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """実行枠が空き、待機時間が過ぎるまでブロックする"""
+        with self._condition:
+            while True:
+                wait = self.resume_at - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                elif self.in_flight >= self.limit:
+                    self._condition.wait()
+                else:
+                    break
+            self.in_flight += 1
+
+    def release(self, retry_after: Optional[float] = None) -> None:
+        """
+        実行枠を返却する
+
+        Args:
+            retry_after: レート制限に達した場合の待機秒数（成功時はNone）
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if retry_after is not None:
+                self.limit = max(1, self.limit // 2)
+                self.successes = 0
+                self.resume_at = max(self.resume_at, time.monotonic() + retry_after)
+            else:
+                self.successes += 1
+                if self.limit < self.max_in_flight and self.successes >= self.limit:
+                    self.limit += 1
+                    self.successes = 0
+            self._condition.notify_all()
 
 
 class GitHubIntegrator:
     """GitHub IssuesとProjectsを統合するクラス"""
 
-    def __init__(self, token: str, owner: str, repo: str):
+    def __init__(
+        self,
+        token: str,
+        owner: str,
+        repo: str,
+        batch_max_operations: int = BATCH_MAX_OPERATIONS,
+        batch_max_cost: int = BATCH_MAX_COST,
+        max_workers: int = 1,
+        timeout: float = DEFAULT_TIMEOUT[1],
+        use_index: bool = True,
+        on_existing: str = "skip",
+        semantic_dedupe: Optional[str] = None,
+        similarity_threshold: Optional[float] = None,
+        semantic_model: Optional[str] = None,
+        offline: bool = False,
+        tracer: Optional[Tracer] = None
+    ):
         """
         Args:
-            token: GitHub Personal Access Token
+            token: GitHub Personal Access Token（offlineの場合は不要）
             owner: リポジトリオーナー
             repo: リポジトリ名
+            batch_max_operations: バッチモードで1リクエストにまとめるmutationの最大数
+            batch_max_cost: バッチモードで1リクエストあたりに使うコストの上限
+            max_workers: Issue作成を並列実行する最大数（1の場合は逐次実行）
+            timeout: GitHub APIの読み込みタイムアウト（秒）
+            use_index: Falseの場合、作成済みIssueのインデックスを使わない（重複チェックなし）
+            on_existing: 作成済みのタスクの扱い（"skip": 何もしない / "update": Issueを更新）
+            semantic_dedupe: 既存のオープンなIssueと意味的に似たタスクの扱い
+                             （None: 検出しない / "flag": 類似Issueを本文に記載して作成 / "merge": 作成せず既存Issueにコメント）
+            similarity_threshold: 類似とみなすコサイン類似度（省略時は semantic_index の既定値）
+            semantic_model: sentence-transformers のモデル名（省略時は文字n-gramのハッシュTF-IDF）
+            offline: Trueの場合、GitHubに接続しない（キャッシュ済みのメタデータで計画を作成する build_plan・Dry-run用）
+            tracer: REST・GraphQLの呼び出しを記録するトレーサー（MeetingAnalyzerと共有すると1つのトレースになる）
         """
-        self.github = Github(token)
+        self.offline = offline
+        self.api_url = os.getenv("GITHUB_API_URL", DEFAULT_API_URL).rstrip("/")
+        self.graphql_url = os.getenv("GITHUB_GRAPHQL_URL", f"{self.api_url}/graphql")
+        if offline:
+            self.github = None
+            self.transport = None
+        else:
+            # REST (PyGithub) とGraphQLの両方で接続プールとタイムアウトを揃える
+            # (PyGithubはRequesterの中で自前の requests.Session を作るため、接続プールは別になる)
+            pool_size = max(1, max_workers)
+            github = pygithub()
+            # リクエスト間隔はPyGithubの固定の待機ではなく RateLimitGovernor で制御する
+            # PyGithubの既定のリトライはPOSTも5xxで再送して重複作成になりうるため、
+            # 冪等なメソッドだけをリトライする（送信前の接続エラーはメソッドによらずリトライされる）
+            self.github = github.Github(
+                token,
+                base_url=self.api_url,
+                timeout=int(timeout),
+                pool_size=pool_size,
+                per_page=ISSUES_PER_PAGE,
+                retry=github.GithubRetry(allowed_methods=IDEMPOTENT_METHODS),
+                seconds_between_requests=0,
+                seconds_between_writes=0
+            )
+            self.transport = GitHubTransport(
+                token,
+                pool_size=pool_size,
+                timeout=(DEFAULT_TIMEOUT[0], timeout)
+            )
         self.token = token
         self.owner = owner
         self.repo = repo
-        self.repository = self.github.get_repo(f"{owner}/{repo}")
+        # リポジトリの取得は1往復かかるため、最初に使うときまで遅らせる
+        self._repository = None
+        self.batch_max_operations = max(1, batch_max_operations)
+        self.batch_max_cost = max(MUTATION_COST, batch_max_cost)
+
+        # GraphQLの往復回数（バッチモードの効果測定用）
+        self.graphql_round_trips = 0
+        self._stats_lock = threading.Lock()
+
+        # 並列実行とセカンダリレート制限の制御
+        self.max_workers = max(1, max_workers)
+        self.throttle = AdaptiveThrottle(self.max_workers)
+        # REST・GraphQL共通のレート制限（残量の追跡とセカンダリレート制限の先回り）
+        self.governor = RateLimitGovernor()
+        self.tracer = tracer or Tracer()
         
         # 設定ファイルの読み込み
         self.config = self._load_config()
         self.project_config = self._load_project_config()
 
+        # Projects v2のフィールドID・選択肢IDの解決（ディスクキャッシュ付き。オフラインではキャッシュのみ）
+        self.schema_resolver = ProjectSchemaResolver(self._graphql, offline=offline)
+
+        # 作成済みIssueのインデックス（再実行時の重複作成を防ぐ）
+        if on_existing not in ("skip", "update"):
+            raise ValueError(f"Invalid on_existing: {on_existing}")
+        self.issue_index = IssueIndex(owner, repo, enabled=use_index)
+        self.on_existing = on_existing
+
+        # 既存Issueとの意味的な重複検出（NumPyが必要なため、有効な場合のみ読み込む）
+        if semantic_dedupe not in (None, "flag", "merge"):
+            raise ValueError(f"Invalid semantic_dedupe: {semantic_dedupe}")
+        self.semantic_dedupe = semantic_dedupe
+        self.semantic_index = None
+        if semantic_dedupe:
+            from semantic_index import SemanticIndex, SIMILARITY_THRESHOLD, create_embedder
+            self.semantic_index = SemanticIndex(
+                owner,
+                repo,
+                embedder=create_embedder(semantic_model),
+                threshold=similarity_threshold if similarity_threshold is not None else SIMILARITY_THRESHOLD
+            )
+
+        # リポジトリのNode ID・ラベル・アサイン可能なユーザー・Project ID（ETagで再検証するディスクキャッシュ）
+        self.metadata = RepoMetadataCache(
+            owner,
+            repo,
+            self.api_url,
+            get=None if offline else self._conditional_get,
+            offline=offline
+        )
+        # 警告は実行ごとに1回だけ出す
+        self._reported_metadata = set()
+
+    @property
+    def repository(self):
+        """PyGithubのRepository（最初に使うときに取得する）"""
+        if self._repository is None:
+            self._require_online()
+            full_name = f"{self.owner}/{self.repo}"
+            # 存在の確認はメタデータキャッシュの条件付きリクエストで済ませ、PyGithubでは取得しない
+            if self.metadata.repository() is not None:
+                self._repository = self.github.get_repo(full_name, lazy=True)
+            else:
+                self._repository = self.github.get_repo(full_name)
+        return self._repository
+
+    def _require_online(self) -> None:
+        """オフラインのモードならOfflineErrorを送出する"""
+        if self.offline:
+            raise OfflineError("GitHub API is not available in offline (plan) mode")
+
     def _load_config(self) -> Dict:
         """Issue設定ファイルを読み込む"""
         config_path = Path(__file__).parent.parent.parent / ".github" / "config" / "issue_template.json"
@@ -121,22 +366,64 @@ class GitHubIntegrator:
         
         return labels
 
-    def create_issue(self, task: Dict, dry_run: bool = False) -> Optional[Dict]:
+    def _report_once(self, key: str, message: str) -> None:
+        with self._stats_lock:
+            if key in self._reported_metadata:
+                return
+            self._reported_metadata.add(key)
+        print(message)
+
+    def _validate_assignee(self, assignee: Optional[str]) -> Optional[str]:
         """
-        GitHub Issueを作成
+        アサインできないユーザーを除く（存在しないユーザーを指定するとIssueの作成が422で失敗するため）
+
+        Args:
+            assignee: GitHubユーザー名
+
+        Returns:
+            アサインできるユーザー名（確認できない場合はそのまま、アサインできない場合はNone）
+        """
+        if not assignee:
+            return None
+        assignable = self.metadata.assignable_users()
+        if assignable is None or assignee.lower() in assignable:
+            return assignee
+        self._report_once(
+            f"assignee:{assignee}",
+            f"Warning: {assignee} cannot be assigned in {self.owner}/{self.repo}; creating issues without an assignee "
+            "(check assignees_mapping in issue_template.json)"
+        )
+        return None
+
+    def _report_missing_labels(self, labels: List[str]) -> None:
+        """
+        リポジトリにないラベルを知らせる（Issueの作成時にGitHubが既定の色で作成する）
+
+        Args:
+            labels: ラベル名のリスト
+        """
+        existing = self.metadata.labels()
+        if existing is None:
+            return
+        for label in labels:
+            if label not in existing:
+                self._report_once(
+                    f"label:{label}",
+                    f"Note: Label '{label}' does not exist in {self.owner}/{self.repo} and will be created with the default color"
+                )
+
+    def _build_issue_body(self, task: Dict) -> str:
+        """
+        タスクからIssue本文を組み立てる
 
         Args:
             task: タスク情報
-            dry_run: Trueの場合、実際には作成せずログのみ
 
         Returns:
-            作成されたIssue情報（dry_runの場合はNone）
+            Issue本文（Markdown）
         """
-        title = task.get("title", "")
         description = task.get("description", "")
-        assignee = self._map_assignee(task.get("assignee", ""))
-        labels = self._get_labels(task)
-        
+
         # Issue本文の構築
         body_parts = []
         
@@ -166,26 +453,75 @@ class GitHubIntegrator:
             deps = "\n".join([f"- {dep}" for dep in task["dependencies"]])
             body_parts.append(f"## 依存関係\n\n{deps}")
         
-        body = "\n\n".join(body_parts)
+        return "\n\n".join(body_parts)
+
+    def issue_payload(self, task: Dict, similar: Optional[List[Dict]] = None) -> Dict:
+        """
+        タスクからIssueの作成・更新に送るREST APIのペイロードを組み立てる
+
+        Args:
+            task: タスク情報
+            similar: 本文に記載する類似Issue（find_similar_issues の結果）
+
+        Returns:
+            {"title", "body", "assignees", "labels"}
+        """
+        assignee = self._validate_assignee(self._map_assignee(task.get("assignee", "")))
+        labels = self._get_labels(task)
+        self._report_missing_labels(labels)
+        body = self._build_issue_body(task)
+        if similar:
+            similar_lines = "\n".join(
+                f"- #{issue['number']} {issue['title']}（類似度 {issue['score']:.2f}）" for issue in similar
+            )
+            body += f"\n\n## 類似Issue\n\n{similar_lines}"
+        return {
+            "title": task.get("title", ""),
+            "body": body,
+            "assignees": [assignee] if assignee else [],
+            "labels": labels
+        }
+
+    def create_issue(self, task: Dict, dry_run: bool = False, similar: Optional[List[Dict]] = None) -> Optional[Dict]:
+        """
+        GitHub Issueを作成
+
+        Args:
+            task: タスク情報
+            dry_run: Trueの場合、実際には作成せずログのみ
+            similar: 本文に記載する類似Issue（find_similar_issues の結果）
+
+        Returns:
+            作成されたIssue情報（dry_runの場合はNone）
+        """
+        payload = self.issue_payload(task, similar)
         
         if dry_run:
             print(f"\n[DRY RUN] Would create issue:")
-            print(f"  Title: {title}")
-            print(f"  Assignee: {assignee or 'None'}")
-            print(f"  Labels: {', '.join(labels) or 'None'}")
-            print(f"  Body preview: {body[:100]}...")
+            print(f"  Title: {payload['title']}")
+            print(f"  Assignee: {', '.join(payload['assignees']) or 'None'}")
+            print(f"  Labels: {', '.join(payload['labels']) or 'None'}")
+            print(f"  Body preview: {payload['body'][:100]}...")
             return None
-        
+
+        return self._submit_issue(payload)
+
+    def _submit_issue(self, payload: Dict) -> Optional[Dict]:
+        """
+        ペイロードのとおりにIssueを作成する
+
+        Args:
+            payload: issue_payload の戻り値
+
+        Returns:
+            作成されたIssue情報（失敗した場合はNone）
+        """
+        title = payload["title"]
         try:
             # Issueの作成
             print(f"Creating issue: {title}")
             
-            issue = self.repository.create_issue(
-                title=title,
-                body=body,
-                assignees=[assignee] if assignee else [],
-                labels=labels
-            )
+            issue = self._rest(self.repository.create_issue, **payload)
             
             print(f"✓ Created issue #{issue.number}: {title}")
             
@@ -196,43 +532,394 @@ class GitHubIntegrator:
                 "node_id": issue.node_id  # Projects v2に追加するために必要
             }
             
-        except GithubException as e:
+        except pygithub().GithubException as e:
             print(f"Error creating issue: {e}")
             return None
 
-    def set_project_field_value(self, item_id: str, field_id: str, value: str, project_id: str) -> bool:
+    def update_issue(self, existing: Dict, task: Dict, dry_run: bool = False) -> Optional[Dict]:
         """
-        Projects v2のフィールド値を設定 (Date型用)
+        作成済みのIssueをタスクの内容で更新
+
+        Args:
+            existing: インデックスに記録されたIssue情報
+            task: タスク情報
+            dry_run: Trueの場合、実際には更新せずログのみ
+
+        Returns:
+            更新したIssue情報（失敗した場合はNone）
+        """
+        payload = self.issue_payload(task)
+
+        if dry_run:
+            print(f"[DRY RUN] Would update existing issue #{existing['number']}: {payload['title']}")
+            return None
+
+        return self._edit_issue(existing, payload)
+
+    def _edit_issue(self, existing: Dict, payload: Dict) -> Optional[Dict]:
+        """
+        作成済みのIssueをペイロードのとおりに更新する
+
+        Args:
+            existing: インデックスに記録されたIssue情報
+            payload: issue_payload の戻り値
+
+        Returns:
+            更新したIssue情報（失敗した場合はNone）
+        """
+        try:
+            issue = self._rest(self.repository.get_issue, existing["number"], write=False)
+            self._rest(issue.edit, content=False, **payload)
+            print(f"✓ Updated issue #{existing['number']}: {payload['title']}")
+            return dict(existing, title=payload["title"], existing=True)
+
+        except pygithub().GithubException as e:
+            print(f"Error updating issue #{existing['number']}: {e}")
+            return None
+
+    def sync_issue_index(self, since: Optional[str] = None) -> int:
+        """
+        リポジトリの既存Issueを1回のページング取得でインデックスに登録
+
+        作成済みIssueのインデックスと、意味的な重複検出のベクトルインデックスの両方を更新します。
+        クローズされたIssueもクローズを反映するために取得しますが、どちらのインデックスでも
+        重複の判定にはオープンなIssueだけを使います。
+
+        Args:
+            since: この時刻（ISO 8601）以降に更新されたIssueだけを取得する（省略時は全件）
+
+        Returns:
+            取得したIssue数
+        """
+        if not self.issue_index.enabled and self.semantic_index is None:
+            return 0
+
+        print("Syncing issue index from existing issues..." + (f" (since {since})" if since else ""))
+        started_at = datetime.now(timezone.utc).isoformat()
+        kwargs = {"state": "all"}
+        if since:
+            kwargs["since"] = datetime.fromisoformat(since)
+        try:
+            # リポジトリの解決（メタデータの再検証）はスロットルの枠を使うため、枠の外で済ませる
+            repository = self.repository
+
+            def list_issues():
+                return list(repository.get_issues(**kwargs))
+
+            issues = self._rest(list_issues, write=False)
+        except pygithub().GithubException as e:
+            print(f"Warning: Failed to list existing issues: {e}")
+            return 0
+
+        count = self.issue_index.sync(issues)
+        print(f"✓ Indexed {count} open issues")
+
+        if self.semantic_index is not None:
+            embedded = self.semantic_index.update(issues)
+            self.semantic_index.mark_synced(started_at)
+            self.semantic_index.save()
+            print(f"✓ Semantic index: {len(self.semantic_index)} issues ({embedded} embedded)")
+        return len(issues)
+
+    def find_similar_issues(self, task: Dict) -> List[Dict]:
+        """
+        タスクと意味的に似たオープンなIssueを探す
+
+        Args:
+            task: タスク情報
+
+        Returns:
+            類似Issue {"number", "title", "url", "score"} のリスト（類似度の高い順）
+        """
+        if self.semantic_index is None:
+            return []
+        return self.semantic_index.find_similar(task.get("title", ""), task.get("description", ""))
+
+    def merge_comment(self, task: Dict) -> str:
+        """
+        似ている既存Issueにまとめるときのコメント本文
+
+        Args:
+            task: タスク情報
+
+        Returns:
+            コメント本文（Markdown）
+        """
+        comment_parts = [f"## 会議で再度言及されました\n\n**{task.get('title', '')}**"]
+        if task.get("description"):
+            comment_parts.append(task["description"])
+        if task.get("context"):
+            comment_parts.append(f"> {task['context']}")
+        return "\n\n".join(comment_parts)
+
+    def merge_into_issue(
+        self,
+        similar: Dict,
+        task: Dict,
+        dry_run: bool = False,
+        body: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        新しいIssueを作成せず、似ている既存Issueに会議での言及をコメントする
+
+        Args:
+            similar: find_similar_issues の結果の1件
+            task: タスク情報
+            dry_run: Trueの場合、実際にはコメントせずログのみ
+            body: コメント本文（省略時は merge_comment で組み立てる）
+
+        Returns:
+            既存Issueの情報（dry_runの場合はNone）
+        """
+        if dry_run:
+            print(f"[DRY RUN] Would comment on similar issue #{similar['number']} instead of creating")
+            return None
+
+        try:
+            issue = self._rest(self.repository.get_issue, similar["number"], write=False)
+            self._rest(issue.create_comment, body if body is not None else self.merge_comment(task))
+            print(f"✓ Merged into similar issue #{similar['number']} (similarity: {similar['score']:.2f})")
+            return {
+                "number": issue.number,
+                "url": issue.html_url,
+                "title": issue.title,
+                "node_id": issue.node_id,
+                "existing": True,
+                "merged": True
+            }
+
+        except pygithub().GithubException as e:
+            print(f"Error commenting on issue #{similar['number']}: {e}")
+            return None
+
+    def _secondary_rate_limit_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        例外がセカンダリレート制限によるものなら待機秒数を返す
+
+        Args:
+            error: 発生した例外
+            attempt: 試行回数（0始まり）
+
+        Returns:
+            待機秒数（セカンダリレート制限でない場合はNone）
+        """
+        retry_after = None
+        if isinstance(error, SecondaryRateLimitError):
+            retry_after = error.retry_after
+        elif isinstance(error, pygithub().GithubException) and error.status in (403, 429):
+            headers = error.headers or {}
+            message = json.dumps(error.data, ensure_ascii=False).lower()
+            if "retry-after" not in {key.lower() for key in headers} and "secondary rate limit" not in message:
+                return None
+            for key, value in headers.items():
+                if key.lower() == "retry-after":
+                    retry_after = float(value)
+        else:
+            return None
+
+        if retry_after is None:
+            retry_after = SECONDARY_RATE_LIMIT_WAIT * (2 ** attempt)
+        # 複数ワーカーが同時に再開しないようにジッターを加える
+        return retry_after + random.uniform(0, 1)
+
+    def _with_backoff(self, func: Callable, *args, **kwargs):
+        """
+        スロットルの枠内で関数を実行し、セカンダリレート制限時は待機して再試行する
+
+        Args:
+            func: 実行する関数
+            *args, **kwargs: 関数の引数
+
+        Returns:
+            関数の戻り値
+        """
+        for attempt in range(SECONDARY_RATE_LIMIT_RETRIES + 1):
+            self.throttle.acquire()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                delay = self._secondary_rate_limit_delay(e, attempt)
+                if delay is None or attempt == SECONDARY_RATE_LIMIT_RETRIES:
+                    self.throttle.release()
+                    raise
+                self.throttle.release(retry_after=delay)
+                span = self.tracer.current()
+                if span:
+                    span.add("retries")
+                print(f"Warning: Secondary rate limit hit, backing off {delay:.1f}s (limit: {self.throttle.limit})")
+                continue
+            self.throttle.release()
+            return result
+
+    def _rest(self, func: Callable, *args, write: bool = True, content: Optional[bool] = None, **kwargs):
+        """
+        REST API（PyGithub）の呼び出しをレート制限ガバナーとバックオフ付きで実行する
+
+        Args:
+            func: 実行するPyGithubのメソッド
+            *args, **kwargs: メソッドの引数
+            write: コンテンツを作成・変更する呼び出しか（Falseは読み取り）
+            content: コンテンツを作成する呼び出しか（省略時は write と同じ。Issueの編集はFalse）
+
+        Returns:
+            メソッドの戻り値
+        """
+        def call():
+            waited = self.governor.acquire(RESOURCE_CORE, write=write, content=content)
+            if waited:
+                span.add("rate_limit_wait", waited)
+            try:
+                return func(*args, **kwargs)
+            except pygithub().GithubException as e:
+                self.governor.observe(e.headers, RESOURCE_CORE)
+                span.set(status_code=e.status)
+                raise
+            finally:
+                self._observe_rest_rate_limit()
+
+        request_bytes = len(json.dumps(kwargs, ensure_ascii=False, default=str).encode("utf-8")) if kwargs else None
+        with self.tracer.span(f"rest.{func.__name__}", write=write, request_bytes=request_bytes) as span:
+            return self._with_backoff(call)
+
+    def _conditional_get(self, url: str, headers: Dict) -> "requests.Response":
+        """
+        メタデータの条件付きGET（If-None-Match）をレート制限ガバナーとバックオフ付きで送る
+
+        Args:
+            url: リクエストURL
+            headers: 追加のヘッダー（If-None-Match）
+
+        Returns:
+            レスポンス（304を含む）
+        """
+        self._require_online()
+
+        def get():
+            waited = self.governor.acquire(RESOURCE_CORE)
+            if waited:
+                span.add("rate_limit_wait", waited)
+            response = self.transport.get(url, headers=headers)
+            span.set(status_code=response.status_code, response_bytes=len(response.content))
+            # 304もレート制限のヘッダーを返す（残量は減らない）
+            self.governor.observe(response.headers, RESOURCE_CORE)
+            if response.status_code in (403, 429) and (
+                "Retry-After" in response.headers or "secondary rate limit" in response.text.lower()
+            ):
+                retry_after = response.headers.get("Retry-After")
+                raise SecondaryRateLimitError(
+                    "REST secondary rate limit",
+                    retry_after=float(retry_after) if retry_after else None
+                )
+            return response
+
+        with self.tracer.span("rest.conditional_get", write=False, conditional="If-None-Match" in headers) as span:
+            return self._with_backoff(get)
+
+    def _observe_rest_rate_limit(self) -> None:
+        """PyGithubが最後のレスポンスから読み取ったレート制限をガバナーに渡す"""
+        requester = getattr(self.github, "requester", None)
+        if requester is None:
+            return
+        remaining, limit = requester.rate_limiting
+        if limit < 0:
+            return
+        reset = requester.rate_limiting_resettime or None
+        self.governor.update(RESOURCE_CORE, limit=limit, remaining=remaining, reset=reset)
+
+    def _graphql(self, query: str, variables: Optional[Dict] = None, operations: int = 1) -> Dict:
+        """
+        GraphQL APIにリクエストを送信する
+
+        Args:
+            query: GraphQLクエリまたはmutation
+            variables: クエリ変数
+            operations: mutationに含まれる操作の数（トレースに記録する。レート制限は1リクエストとして数える）
+
+        Returns:
+            レスポンスのJSON
+        """
+        self._require_online()
+        write = query.lstrip().startswith("mutation")
+        # フィールドの値の変更だけのmutationはコンテンツ作成数に数えない
+        content = write and creates_content(query)
+
+        payload = {"query": query, "variables": variables or {}}
+
+        def post() -> Dict:
+            waited = self.governor.acquire(RESOURCE_GRAPHQL, write=write, content=content)
+            if waited:
+                span.add("rate_limit_wait", waited)
+            with self._stats_lock:
+                self.graphql_round_trips += 1
+            # queryは再送しても安全なので5xxもリトライする
+            response = self.transport.post(self.graphql_url, json=payload, idempotent=not write)
+            span.set(status_code=response.status_code, response_bytes=len(response.content))
+            # rateLimit はQueryのフィールドでmutationでは選択できないため、mutationの残量は
+            # X-RateLimit-* ヘッダー（X-RateLimit-Resource: graphql）から取り込む
+            self.governor.observe(response.headers, RESOURCE_GRAPHQL)
+            if response.status_code in (403, 429) and (
+                "Retry-After" in response.headers or "secondary rate limit" in response.text.lower()
+            ):
+                retry_after = response.headers.get("Retry-After")
+                raise SecondaryRateLimitError(
+                    "GraphQL secondary rate limit",
+                    retry_after=float(retry_after) if retry_after else None
+                )
+            response.raise_for_status()
+            body = response.json()
+            # queryは rateLimit { cost remaining resetAt limit } を選択してコストと残量を返す
+            rate_limit = (body.get("data") or {}).get("rateLimit")
+            if rate_limit:
+                span.set(cost=rate_limit.get("cost"))
+            self.governor.observe_graphql(rate_limit)
+            if "errors" in body:
+                span.set(graphql_errors=len(body["errors"]))
+            return body
+
+        request_bytes = len(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+        with self.tracer.span(
+            "graphql.mutation" if write else "graphql.query",
+            operations=operations,
+            request_bytes=request_bytes
+        ) as span:
+            return self._with_backoff(post)
+
+    def set_project_field_value(
+        self,
+        item_id: str,
+        field_id: str,
+        value,
+        project_id: str,
+        data_type: str = "DATE"
+    ) -> bool:
+        """
+        Projects v2のフィールド値を設定
 
         Args:
             item_id: Project Item ID
             field_id: Field ID
-            value: 設定する値 (YYYY-MM-DD)
+            value: 設定する値（Date型はYYYY-MM-DD、Single Select型は選択肢ID）
             project_id: Project ID
+            data_type: フィールドの型 (DATE/SINGLE_SELECT/TEXT/NUMBER)
 
         Returns:
             成功した場合True
         """
-        graphql_url = "https://api.github.com/graphql"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        }
-
+        input_name, gql_type = FIELD_VALUE_INPUTS[data_type]
         mutation = """
-        mutation($projectId: ID!, $itemId: ID!, $fieldId: ID!, $value: Date!) {
+        mutation($projectId: ID!, $itemId: ID!, $fieldId: ID!, $value: %s) {
           updateProjectV2ItemFieldValue(input: {
             projectId: $projectId,
             itemId: $itemId,
             fieldId: $fieldId,
-            value: { date: $value }
+            value: { %s: $value }
           }) {
             projectV2Item {
               id
             }
           }
         }
-        """
+        """ % (gql_type, input_name)
 
         variables = {
             "projectId": project_id,
@@ -242,12 +929,8 @@ class GitHubIntegrator:
           }
 
         try:
-            response = requests.post(
-                graphql_url,
-                headers=headers,
-                json={"query": mutation, "variables": variables}
-            )
-            result = response.json()
+            with self.tracer.span("project.set_fields", fields=1, data_type=data_type):
+                result = self._graphql(mutation, variables)
             if "errors" in result:
                 # Type mismatch or field not found
                 return False
@@ -256,23 +939,84 @@ class GitHubIntegrator:
             print(f"Error setting field value: {e}")
             return False
 
-    def add_issue_to_project(self, issue_node_id: str, task: Dict, project_id: str, dry_run: bool = False) -> bool:
+    def add_issue_to_project(
+        self,
+        issue_node_id: str,
+        task: Dict,
+        project_id: str,
+        dry_run: bool = False,
+        item_id: Optional[str] = None,
+        on_stage: Optional[Callable[[str, Dict], None]] = None
+    ) -> bool:
         """
         IssueをProjects v2に追加し、カスタムフィールドを設定
+
+        Args:
+            issue_node_id: IssueのNode ID
+            task: タスク情報
+            project_id: Project ID
+            dry_run: Trueの場合、実際には追加せずログのみ
+            item_id: 追加済みの場合のProject Item ID（指定するとフィールド設定のみ行う）
+            on_stage: ステージ完了時に呼ぶ関数 (ステージ名, 結果)
+
+        Returns:
+            成功した場合True
         """
         if dry_run:
             print(f"[DRY RUN] Would add issue to project and set fields:")
-            if task.get("due_date"):
-                print(f"  Due Date: {task.get('due_date')}")
+            for field_key, value in self._project_field_settings(task):
+                print(f"  {self.project_config['fields'][field_key]}: {value}")
             return True
 
-        graphql_url = "https://api.github.com/graphql"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        }
+        try:
+            # Step 1: IssueをProjectに追加
+            if item_id is None:
+                item_id = self.add_project_item(issue_node_id, project_id)
+                if item_id is None:
+                    return False
+                if on_stage:
+                    on_stage(STAGE_PROJECT_ADDED, {"item_id": item_id})
+
+            # Step 2: カスタムフィールドを設定
+            field_values, warnings = self._resolve_field_values(task, project_id)
+            for warning in warnings:
+                print(f"Warning: {warning}")
+            all_set = True
+            for field_value in field_values:
+                success = self.set_project_field_value(
+                    item_id,
+                    field_value["field_id"],
+                    field_value["value"],
+                    project_id,
+                    data_type=field_value["data_type"]
+                )
+                if success:
+                    print(f"✓ Set {field_value['field_name']}: {field_value['label']}")
+                else:
+                    all_set = False
+                    print(f"Warning: Could not set {field_value['field_name']}")
+                    # フィールド構成が変わった可能性があるため次回は再取得する
+                    self.schema_resolver.invalidate(project_id)
+
+            if all_set and on_stage:
+                on_stage(STAGE_FIELDS_SET, {"fields": [field_value["field_name"] for field_value in field_values]})
+            return True
+
+        except Exception as e:
+            print(f"Error adding to project: {e}")
+            return False
 
-        # Step 1: IssueをProjectに追加
+    def add_project_item(self, issue_node_id: str, project_id: str) -> Optional[str]:
+        """
+        IssueをProjects v2に追加する（フィールドは設定しない）
+
+        Args:
+            issue_node_id: IssueのNode ID
+            project_id: Project ID
+
+        Returns:
+            Project Item ID（失敗した場合はNone）
+        """
         add_mutation = """
         mutation($projectId: ID!, $contentId: ID!) {
           addProjectV2ItemById(input: {projectId: $projectId, contentId: $contentId}) {
@@ -288,47 +1032,304 @@ class GitHubIntegrator:
             "contentId": issue_node_id
         }
 
+        with self.tracer.span("project.add", items=1):
+            result = self._graphql(add_mutation, variables)
+        if "errors" in result:
+            print(f"Error adding to project: {result['errors']}")
+            return None
+
+        item_id = result["data"]["addProjectV2ItemById"]["item"]["id"]
+        print(f"✓ Added to project (item_id: {item_id})")
+        self.issue_index.set_project_item(issue_node_id, item_id)
+        return item_id
+
+    def _normalize_due_date(self, due_date: str) -> Optional[str]:
+        """
+        期限をProjects v2のDate型に渡せる形式 (YYYY-MM-DD) に変換
+
+        Args:
+            due_date: タスクの期限
+
+        Returns:
+            YYYY-MM-DD形式の日付（変換できない場合はNone）
+        """
+        # もし YYYY/MM/DD などの形式なら変換を試みる
+        clean_date = due_date.replace("/", "-")
         try:
-            response = requests.post(
-                graphql_url,
-                headers=headers,
-                json={"query": add_mutation, "variables": variables}
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            if "errors" in result:
-                print(f"Error adding to project: {result['errors']}")
-                return False
-            
-            item_id = result["data"]["addProjectV2ItemById"]["item"]["id"]
-            print(f"✓ Added to project (item_id: {item_id})")
-
-            # Step 2: Due Date を設定 (もし存在すれば)
-            due_date = task.get("due_date")
-            if due_date:
-                # フィールドIDは一旦固定 (PVTF_lAHOBAle8s4BN_dbzg800SA)
-                # 本来的には動的に取得すべきだが、まずは動作優先
-                due_date_field_id = "PVTF_lAHOBAle8s4BN_dbzg800SA"
-                
-                # 日付形式の簡易バリデーション/変換 (YYYY-MM-DD)
-                try:
-                    # もし YYYY/MM/DD などの形式なら変換を試みる
-                    clean_date = due_date.replace("/", "-")
-                    # 基本的なYYYY-MM-DD形式かチェック
-                    datetime.strptime(clean_date, "%Y-%m-%d")
-                    
-                    success = self.set_project_field_value(item_id, due_date_field_id, clean_date, project_id)
-                    if success:
-                        print(f"✓ Set Due Date: {clean_date}")
-                except Exception:
-                    print(f"Warning: Could not set due_date '{due_date}' (invalid format)")
+            # 基本的なYYYY-MM-DD形式かチェック
+            datetime.strptime(clean_date, "%Y-%m-%d")
+        except ValueError:
+            return None
+        return clean_date
 
-            return True
+    def _project_field_settings(self, task: Dict) -> List[tuple]:
+        """
+        タスクからProjects v2に設定するフィールドと値を取り出す
 
-        except Exception as e:
-            print(f"Error adding to project: {e}")
-            return False
+        Args:
+            task: タスク情報
+
+        Returns:
+            (project_config.json のフィールドキー, 値) のリスト
+        """
+        fields = self.project_config.get("fields", {})
+        defaults = self.project_config.get("default_values", {})
+
+        settings = []
+        for task_key, field_key in PROJECT_FIELD_KEYS.items():
+            value = task.get(task_key) or defaults.get(task_key)
+            if value and field_key in fields:
+                settings.append((field_key, value))
+        return settings
+
+    def _resolve_field_values(self, task: Dict, project_id: str) -> tuple:
+        """
+        タスクのフィールド値をProjects v2のフィールドID・選択肢IDに解決
+
+        Args:
+            task: タスク情報
+            project_id: Project ID
+
+        Returns:
+            (解決できたフィールド値のリスト, 警告メッセージのリスト)
+        """
+        field_values = []
+        warnings = []
+
+        for field_key, value in self._project_field_settings(task):
+            field_name = self.project_config["fields"][field_key]
+
+            field = self.schema_resolver.resolve(project_id, field_name)
+            if not field:
+                warnings.append(f"Project field '{field_name}' not found")
+                continue
+
+            data_type = field["data_type"]
+            if data_type == "DATE":
+                resolved_value = self._normalize_due_date(value)
+                if not resolved_value:
+                    warnings.append(f"Could not set {field_name} '{value}' (invalid format)")
+                    continue
+            elif data_type == "SINGLE_SELECT":
+                option = self.schema_resolver.resolve(project_id, field_name, option_name=value)
+                if not option:
+                    warnings.append(f"Option '{value}' not found in project field '{field_name}'")
+                    continue
+                resolved_value = option["option_id"]
+            elif data_type == "NUMBER":
+                resolved_value = float(value)
+            elif data_type == "TEXT":
+                resolved_value = str(value)
+            else:
+                warnings.append(f"Unsupported field type {data_type} for '{field_name}'")
+                continue
+
+            field_values.append({
+                "field_name": field_name,
+                "field_id": field["field_id"],
+                "data_type": data_type,
+                "value": resolved_value,
+                "label": value
+            })
+
+        return field_values, warnings
+
+    def _split_batches(self, operations: List[Dict]) -> List[List[Dict]]:
+        """
+        mutationを操作数とコスト予算の範囲内でリクエスト単位に分割
+
+        Args:
+            operations: mutation操作のリスト
+
+        Returns:
+            リクエストごとの操作リスト
+        """
+        batches = []
+        current = []
+        current_cost = 0
+
+        for operation in operations:
+            cost = operation.get("cost", MUTATION_COST)
+            if current and (
+                len(current) >= self.batch_max_operations
+                or current_cost + cost > self.batch_max_cost
+            ):
+                batches.append(current)
+                current = []
+                current_cost = 0
+            current.append(operation)
+            current_cost += cost
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def _run_batched_mutations(self, operations: List[Dict]) -> Dict[str, Dict]:
+        """
+        複数のmutationをエイリアス付きの1つのGraphQLドキュメントにまとめて実行
+
+        各操作は以下のキーを持つ:
+            alias: 結果を識別するエイリアス
+            field: mutationフィールド（変数は "$" + 変数名 で参照）
+            selection: 取得するフィールド
+            variables: {変数名: (GraphQL型, 値)}
+
+        Args:
+            operations: mutation操作のリスト
+
+        Returns:
+            エイリアスごとの結果 {"data": ..., "errors": [...]}
+        """
+        results = {}
+
+        for batch in self._split_batches(operations):
+            declarations = []
+            fields = []
+            variables = {}
+            for operation in batch:
+                alias = operation["alias"]
+                field = operation["field"]
+                for name, (gql_type, value) in operation["variables"].items():
+                    var_name = f"{alias}_{name}"
+                    declarations.append(f"${var_name}: {gql_type}")
+                    variables[var_name] = value
+                    field = re.sub(rf"\${name}\b", f"${var_name}", field)
+                fields.append(f"  {alias}: {field} {{ {operation['selection']} }}")
+
+            document = "mutation({}) {{\n{}\n}}".format(", ".join(declarations), "\n".join(fields))
+
+            try:
+                result = self._graphql(document, variables, operations=len(batch))
+            except Exception as e:
+                for operation in batch:
+                    results[operation["alias"]] = {"data": None, "errors": [str(e)]}
+                continue
+
+            data = result.get("data") or {}
+            for operation in batch:
+                results[operation["alias"]] = {"data": data.get(operation["alias"]), "errors": []}
+
+            # エラーはpathの先頭（エイリアス）で各操作に振り分ける
+            # pathがないエラー（構文エラー等）はバッチ内の全操作に適用
+            for error in result.get("errors", []):
+                message = error.get("message", str(error))
+                path = error.get("path") or []
+                if path and path[0] in results:
+                    results[path[0]]["errors"].append(message)
+                else:
+                    for operation in batch:
+                        results[operation["alias"]]["errors"].append(message)
+
+        return results
+
+    def add_issues_to_project_batch(self, entries: List[Dict], project_id: str) -> List[Dict]:
+        """
+        複数のIssueをまとめてProjects v2に追加し、カスタムフィールドを設定
+
+        addProjectV2ItemById と updateProjectV2ItemFieldValue を
+        それぞれエイリアス付きのmutationにまとめて送信します。
+
+        Args:
+            entries: {"node_id": IssueのNode ID, "task": タスク情報} のリスト
+                     （"item_id" を含むエントリは追加済みとしてフィールド設定のみ行う。
+                      "field_values" を含むエントリは解決済みの値をそのまま設定する）
+            project_id: Project ID
+
+        Returns:
+            Issueごとの結果 {"node_id", "item_id", "added", "fields", "failed_fields", "errors"} のリスト（入力順）
+        """
+        item_results = [
+            {
+                "node_id": entry["node_id"],
+                "item_id": entry.get("item_id"),
+                "added": False,
+                "fields": {},
+                "failed_fields": [],
+                "errors": []
+            }
+            for entry in entries
+        ]
+
+        # Step 1: IssueをまとめてProjectに追加（追加済みのものは除く）
+        add_operations = [
+            {
+                "alias": f"add{i}",
+                "field": "addProjectV2ItemById(input: {projectId: $projectId, contentId: $contentId})",
+                "selection": "item { id }",
+                "variables": {
+                    "projectId": ("ID!", project_id),
+                    "contentId": ("ID!", entry["node_id"])
+                }
+            }
+            for i, entry in enumerate(entries)
+            if not entry.get("item_id")
+        ]
+        with self.tracer.span("project.add", items=len(add_operations), batched=True):
+            add_results = self._run_batched_mutations(add_operations)
+
+        for i, item_result in enumerate(item_results):
+            if item_result["item_id"]:
+                continue
+            result = add_results.get(f"add{i}", {})
+            if result.get("data"):
+                item_result["item_id"] = result["data"]["item"]["id"]
+                item_result["added"] = True
+            else:
+                item_result["errors"].extend(result.get("errors") or ["Failed to add item to project"])
+
+        # Step 2: 全カスタムフィールドをまとめて設定
+        field_operations = []
+        for i, (entry, item_result) in enumerate(zip(entries, item_results)):
+            if not item_result["item_id"]:
+                continue
+
+            if "field_values" in entry:
+                # 計画（build_plan）で解決済みのフィールド値
+                field_values, warnings = entry["field_values"], []
+            else:
+                field_values, warnings = self._resolve_field_values(entry["task"], project_id)
+            item_result["errors"].extend(warnings)
+
+            for j, field_value in enumerate(field_values):
+                input_name, gql_type = FIELD_VALUE_INPUTS[field_value["data_type"]]
+                field_operations.append({
+                    "alias": f"field{i}_{j}",
+                    "field": (
+                        "updateProjectV2ItemFieldValue(input: {projectId: $projectId, itemId: $itemId, "
+                        f"fieldId: $fieldId, value: {{{input_name}: $value}}}})"
+                    ),
+                    "selection": "projectV2Item { id }",
+                    "variables": {
+                        "projectId": ("ID!", project_id),
+                        "itemId": ("ID!", item_result["item_id"]),
+                        "fieldId": ("ID!", field_value["field_id"]),
+                        "value": (gql_type, field_value["value"])
+                    },
+                    "index": i,
+                    "field_name": field_value["field_name"],
+                    "field_value": field_value["label"]
+                })
+
+        with self.tracer.span("project.set_fields", fields=len(field_operations), batched=True):
+            field_results = self._run_batched_mutations(field_operations)
+        stale_schema = False
+        for operation in field_operations:
+            result = field_results.get(operation["alias"], {})
+            item_result = item_results[operation["index"]]
+            if result.get("errors"):
+                stale_schema = True
+                item_result["failed_fields"].append(operation["field_name"])
+                item_result["errors"].extend(
+                    f"{operation['field_name']}: {message}" for message in result["errors"]
+                )
+            else:
+                item_result["fields"][operation["field_name"]] = operation["field_value"]
+
+        # フィールド構成が変わった可能性があるため次回は再取得する
+        if stale_schema:
+            self.schema_resolver.invalidate(project_id)
+
+        return item_results
 
     def get_project_id(self, project_number: int) -> Optional[str]:
         """
@@ -340,11 +1341,12 @@ class GitHubIntegrator:
         Returns:
             Project Node ID（見つからない場合はNone）
         """
-        graphql_url = "https://api.github.com/graphql"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        }
+        project_id = self.metadata.project_id(project_number)
+        if project_id:
+            return project_id
+        if self.offline:
+            print(f"Warning: Project #{project_number} is not cached (run once online to cache it)")
+            return None
 
         query = """
         query($owner: String!, $number: Int!) {
@@ -354,6 +1356,7 @@ class GitHubIntegrator:
               title
             }
           }
+          rateLimit { cost remaining resetAt limit }
         }
         """
 
@@ -363,14 +1366,7 @@ class GitHubIntegrator:
         }
 
         try:
-            response = requests.post(
-                graphql_url,
-                headers=headers,
-                json={"query": query, "variables": variables}
-            )
-            response.raise_for_status()
-            
-            result = response.json()
+            result = self._graphql(query, variables)
             if "errors" in result:
                 print(f"Error fetching project: {result['errors']}")
                 return None
@@ -378,6 +1374,7 @@ class GitHubIntegrator:
             project = result["data"]["user"]["projectV2"]
             if project:
                 print(f"Found project: {project['title']} (ID: {project['id']})")
+                self.metadata.set_project_id(project_number, project["id"], project["title"])
                 return project["id"]
             else:
                 print(f"Project #{project_number} not found")
@@ -387,60 +1384,548 @@ class GitHubIntegrator:
             print(f"Error fetching project: {e}")
             return None
 
-    def create_issues_from_tasks(self, tasks: List[Dict], dry_run: bool = False, add_to_project: bool = True) -> List[Dict]:
+    def resolve_project_id(self) -> Optional[str]:
+        """
+        環境変数 GITHUB_PROJECT_NUMBER のProjects v2のIDを取得
+
+        Returns:
+            Project ID（未設定・取得できない場合はNone）
+        """
+        project_number = os.getenv("GITHUB_PROJECT_NUMBER")
+        if not project_number:
+            return None
+        try:
+            project_number = int(project_number)
+        except ValueError:
+            print(f"Warning: Invalid project number: {project_number}")
+            return None
+        return self.get_project_id(project_number)
+
+    def prepare_issue_index(self) -> None:
+        """
+        Issue作成前にインデックスを準備する
+
+        インデックスが空（初回実行・別の環境）の場合は既存Issueから埋め、
+        ベクトルインデックスは前回の同期以降に更新されたIssueだけ取り込みます。
+        オフラインでは同期せず、手元のインデックスをそのまま使います。
+        """
+        if self.offline:
+            if self.issue_index.enabled and len(self.issue_index) == 0:
+                print("Note: Issue index is empty (offline), duplicate check uses no existing issues")
+            return
+        if (self.issue_index.enabled and len(self.issue_index) == 0) or (
+            self.semantic_index is not None and not self.semantic_index.synced_at
+        ):
+            self.sync_issue_index()
+        elif self.semantic_index is not None:
+            self.sync_issue_index(since=self.semantic_index.synced_at)
+
+    @staticmethod
+    def project_progress(
+        fingerprint: Optional[str],
+        issue_info: Dict,
+        journal: Optional[PipelineJournal] = None
+    ) -> tuple:
+        """
+        IssueのProjects v2への追加状況を調べる
+
+        Args:
+            fingerprint: タスクのフィンガープリント
+            issue_info: Issue情報
+            journal: チェックポイントジャーナル
+
+        Returns:
+            (追加済みのProject Item ID, Projectsの処理が残っているか)
+        """
+        added = journal.get(fingerprint, STAGE_PROJECT_ADDED) if journal else None
+        if added:
+            return added["item_id"], journal.get(fingerprint, STAGE_FIELDS_SET) is None
+        # 既存Issueにまとめたタスクは既存Issueのフィールドを上書きしない
+        return None, not (issue_info.get("project_item_id") or issue_info.get("merged"))
+
+    def process_task_issue(
+        self,
+        task: Dict,
+        claimed: set,
+        dry_run: bool = False,
+        journal: Optional[PipelineJournal] = None
+    ) -> tuple:
+        """
+        タスク1件のIssueを用意する（作成済みならスキップ・更新、類似Issueがあればまとめる）
+
+        Args:
+            task: タスク情報
+            claimed: この実行で処理済みのフィンガープリント（同じタスクの重複処理を防ぐ）
+            dry_run: Trueの場合、実際には作成せずログのみ
+            journal: チェックポイントジャーナル
+
+        Returns:
+            (フィンガープリント, Issue情報（作成しなかった場合はNone）)
+        """
+        fingerprint = task_fingerprint(task.get("title"))
+        with self._stats_lock:
+            duplicate = fingerprint in claimed
+            claimed.add(fingerprint)
+        if fingerprint and duplicate:
+            # 先に処理中の同じタスクのIssueが記録済みなら番号も表示する
+            original = self.issue_index.get(fingerprint)
+            print("Skip: duplicate task in this batch" + (f" (#{original['number']})" if original else ""))
+            return fingerprint, None
+
+        journaled = journal.get(fingerprint, STAGE_ISSUE_CREATED) if journal else None
+        existing = None if journaled else self.issue_index.get(fingerprint)
+        if journaled:
+            print(f"Resume: issue #{journaled['number']} already created")
+            return fingerprint, dict(journaled)
+        if existing:
+            if self.on_existing == "update":
+                return fingerprint, self.update_issue(existing, task, dry_run=dry_run)
+            print(f"Skip: already created as #{existing['number']} ({existing['url']})")
+            return fingerprint, dict(existing, existing=True)
+
+        similar = self.find_similar_issues(task)
+        for issue in similar:
+            print(f"Similar issue: #{issue['number']} {issue['title']} (similarity: {issue['score']:.2f})")
+
+        if similar and self.semantic_dedupe == "merge":
+            issue_info = self.merge_into_issue(similar[0], task, dry_run=dry_run)
+        else:
+            # Issue作成
+            issue_info = self.create_issue(task, dry_run=dry_run, similar=similar)
+            if issue_info and self.semantic_index is not None:
+                # 同じ実行内の後続タスクとも比較できるようにする
+                self.semantic_index.update([{
+                    "number": issue_info["number"],
+                    "title": issue_info["title"],
+                    "body": f"## 説明\n\n{task.get('description', '')}",
+                    "url": issue_info["url"],
+                    "state": "open",
+                    "updated_at": None
+                }])
+        if issue_info:
+            self.issue_index.record(fingerprint, issue_info)
+            if journal:
+                journal.record(fingerprint, STAGE_ISSUE_CREATED, issue_info)
+        return fingerprint, issue_info
+
+    def create_issues_from_tasks(
+        self,
+        tasks: Iterable[Dict],
+        dry_run: bool = False,
+        add_to_project: bool = True,
+        batch: bool = False,
+        journal: Optional[PipelineJournal] = None
+    ) -> List[Dict]:
         """
         タスクリストからIssuesを一括作成
 
         Args:
-            tasks: タスク情報のリスト
+            tasks: タスク情報のリスト（ストリーミング抽出のイテレータも可。届いた順に作成を開始）
             dry_run: Trueの場合、実際には作成せずログのみ
             add_to_project: Trueの場合、Projects v2にも追加
+            batch: Trueの場合、Projects v2への追加とフィールド設定をまとめて送信
+            journal: チェックポイントジャーナル（完了済みのステージはスキップし、完了したステージを記録）
 
         Returns:
-            作成されたIssue情報のリスト
+            作成されたIssue情報のリスト（インデックスに記録済みのIssueは "existing": True 付きで含む）
         """
         created_issues = []
+        pending_project_entries = []
+        add_immediately = add_to_project and not dry_run and not batch
         
         # Projects v2のIDを取得
-        project_id = None
-        if add_to_project and GITHUB_PROJECT_NUMBER:
-            try:
-                project_number = int(GITHUB_PROJECT_NUMBER)
-                project_id = self.get_project_id(project_number)
-            except ValueError:
-                print(f"Warning: Invalid project number: {GITHUB_PROJECT_NUMBER}")
+        project_id = self.resolve_project_id() if add_to_project else None
 
-        for i, task in enumerate(tasks, 1):
-            print(f"\n[{i}/{len(tasks)}] Processing: {task.get('title', 'Untitled')}")
-            
-            # Issue作成
-            issue_info = self.create_issue(task, dry_run=dry_run)
+        is_stream = not isinstance(tasks, (list, tuple))
+        total = "?" if is_stream else len(tasks)
+
+        self.prepare_issue_index()
+
+        # 同じ実行内で同じタスクが複数回出てきた場合は最初の1回だけ処理する
+        claimed = set()
+
+        def process_task(i: int, task: Dict) -> Optional[Dict]:
+            print(f"\n[{i}/{total}] Processing: {task.get('title', 'Untitled')}")
+
+            fingerprint, issue_info = self.process_task_issue(task, claimed, dry_run=dry_run, journal=journal)
             
-            if issue_info:
-                created_issues.append(issue_info)
-                
-                # Projects v2に追加
-                if add_to_project and project_id and not dry_run:
+            # Projects v2に追加（追加済みのIssueは除く。ジャーナルでフィールド設定が未完了ならその続きから）
+            if issue_info and add_immediately and project_id:
+                item_id, pending = self.project_progress(fingerprint, issue_info, journal)
+                if pending:
                     self.add_issue_to_project(
                         issue_info["node_id"],
                         task,
                         project_id,
-                        dry_run=dry_run
+                        dry_run=dry_run,
+                        item_id=item_id,
+                        on_stage=(lambda stage, data: journal.record(fingerprint, stage, data)) if journal else None
                     )
-        
+            return issue_info
+
+        started_at = time.monotonic()
+        if is_stream or (self.max_workers > 1 and len(tasks) > 1):
+            # 並列実行（結果は入力順に並べる）
+            # ストリームの場合は次のタスクを待つ間も作成を進める
+            consumed = []
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = []
+                for i, task in enumerate(tasks, 1):
+                    consumed.append(task)
+                    futures.append(executor.submit(process_task, i, task))
+                results = [future.result() for future in futures]
+            tasks = consumed
+        else:
+            results = [process_task(i, task) for i, task in enumerate(tasks, 1)]
+        elapsed = time.monotonic() - started_at
+
+        for task, issue_info in zip(tasks, results):
+            if issue_info:
+                created_issues.append(issue_info)
+                if batch and add_to_project and project_id and not dry_run:
+                    fingerprint = task_fingerprint(task.get("title"))
+                    item_id, pending = self.project_progress(fingerprint, issue_info, journal)
+                    if pending:
+                        pending_project_entries.append({
+                            "node_id": issue_info["node_id"],
+                            "task": task,
+                            "item_id": item_id,
+                            "fingerprint": fingerprint
+                        })
+
+        if tasks and not dry_run:
+            print(
+                f"\nProcessed {len(tasks)} tasks in {elapsed:.1f}s "
+                f"({len(tasks) / elapsed if elapsed > 0 else 0:.2f} tasks/s, workers: {self.max_workers})"
+            )
+
+        if self.semantic_index is not None:
+            self.semantic_index.save()
+
+        # バッチモード: 作成したIssueをまとめてProjects v2に追加
+        if pending_project_entries:
+            print(f"\nAdding {len(pending_project_entries)} issues to project (batched)...")
+            item_results = self.add_issues_to_project_batch(pending_project_entries, project_id)
+            issues_by_node_id = {issue["node_id"]: issue for issue in created_issues}
+            for entry, item_result in zip(pending_project_entries, item_results):
+                issue_info = issues_by_node_id[item_result["node_id"]]
+                issue_info["project_item_id"] = item_result["item_id"]
+                self.issue_index.set_project_item(item_result["node_id"], item_result["item_id"])
+                if journal and item_result["added"]:
+                    journal.record(entry["fingerprint"], STAGE_PROJECT_ADDED, {"item_id": item_result["item_id"]})
+                if journal and item_result["item_id"] and not item_result["failed_fields"]:
+                    journal.record(entry["fingerprint"], STAGE_FIELDS_SET, {"fields": list(item_result["fields"])})
+                for message in item_result["errors"]:
+                    print(f"Error updating project item for #{issue_info['number']}: {message}")
+                if item_result["item_id"] and not item_result["errors"]:
+                    print(f"✓ #{issue_info['number']} added to project (item_id: {item_result['item_id']})")
+
         return created_issues
 
+    def build_plan(
+        self,
+        tasks: Iterable[Dict],
+        add_to_project: bool = True,
+        source_file: Optional[str] = None
+    ) -> tuple:
+        """
+        タスクごとに送信するRESTとGraphQLのペイロードを組み立てて実行計画にする
+
+        GitHubには接続せず、作成済みIssueのインデックス・ベクトルインデックスと、
+        キャッシュ済みのProject ID・フィールド構成だけを使います（offline=True で使う想定）。
+        エントリはタスクが届いた順に組み立てるため、ストリーミング抽出のイテレータも渡せます。
+
+        Args:
+            tasks: 正規化されたタスクのイテレータ
+            add_to_project: Trueの場合、Projects v2への追加とフィールド値も計画する
+            source_file: 議事録ファイルのパス（ヘッダーに記録する）
+
+        Returns:
+            (ヘッダー, エントリのイテレータ)。issue_plan.write_plan にそのまま渡す
+            （各エントリは "action", "request": {"method", "path", "body"},
+             "project": {"content_id", "field_values"}, "warnings", "title" などを持つ）
+        """
+        project_id = self.resolve_project_id() if add_to_project else None
+        self.prepare_issue_index()
+
+        # 計画時の対応表とフィールドID・選択肢ID（適用する環境に設定ファイルがなくても読めるように）
+        schema = self.schema_resolver.get_schema(project_id) if project_id else None
+        fields = {}
+        for field_name in self.project_config.get("fields", {}).values():
+            field = (schema or {}).get("fields", {}).get(field_name)
+            if field:
+                fields[field_name] = {"id": field["id"], "data_type": field["data_type"], "options": field["options"]}
+        header = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "repository": f"{self.owner}/{self.repo}",
+            "project_id": project_id,
+            "source_file": source_file,
+            "labels": {
+                "type": self.config.get("type_labels", {}),
+                "priority": self.config.get("priority_labels", {})
+            },
+            "assignees": self.config.get("assignees_mapping", {}),
+            "fields": fields
+        }
+        return header, self._plan_entries(tasks, project_id)
+
+    def _plan_entries(self, tasks: Iterable[Dict], project_id: Optional[str]) -> Iterator[Dict]:
+        """build_plan のエントリを1件ずつ組み立てる"""
+        issues_path = f"/repos/{self.owner}/{self.repo}/issues"
+        claimed = set()
+        for i, task in enumerate(tasks, 1):
+            fingerprint = task_fingerprint(task.get("title"))
+            title = task.get("title", "Untitled")
+            entry = {"index": i, "fingerprint": fingerprint, "action": ACTION_SKIP, "title": title, "warnings": []}
+            if fingerprint and fingerprint in claimed:
+                entry["reason"] = "duplicate"
+                print(f"[{i}] {entry['action']}: {title}")
+                yield entry
+                continue
+            claimed.add(fingerprint)
+
+            existing = self.issue_index.get(fingerprint)
+            if existing:
+                entry["issue"] = existing
+                if self.on_existing == "update":
+                    entry["action"] = ACTION_UPDATE
+                    entry["request"] = {
+                        "method": "PATCH",
+                        "path": f"{issues_path}/{existing['number']}",
+                        "body": self.issue_payload(task)
+                    }
+                else:
+                    entry["reason"] = "existing"
+            else:
+                similar = self.find_similar_issues(task)
+                if similar:
+                    entry["similar"] = similar
+                if similar and self.semantic_dedupe == "merge":
+                    entry["action"] = ACTION_COMMENT
+                    entry["issue"] = similar[0]
+                    entry["request"] = {
+                        "method": "POST",
+                        "path": f"{issues_path}/{similar[0]['number']}/comments",
+                        "body": {"body": self.merge_comment(task)}
+                    }
+                else:
+                    entry["action"] = ACTION_CREATE
+                    entry["request"] = {"method": "POST", "path": issues_path, "body": self.issue_payload(task, similar)}
+
+            # 既存Issueにまとめたタスク・Projectsに追加済みのIssueはProjectsを更新しない
+            if project_id and entry["action"] != ACTION_COMMENT and not (existing and existing.get("project_item_id")):
+                field_values, warnings = self._resolve_field_values(task, project_id)
+                entry["project"] = {
+                    "content_id": existing["node_id"] if existing else None,
+                    "field_values": field_values
+                }
+                entry["warnings"].extend(warnings)
+
+            print(f"[{i}] {entry['action']}: {title}")
+            for warning in entry["warnings"]:
+                print(f"  Warning: {warning}")
+            yield entry
+
+    def apply_plan(self, header: Dict, entries: Iterable[Dict]) -> List[Dict]:
+        """
+        build_plan で作成した実行計画を適用する
+
+        エントリは1件ずつ読みながら（実行中の件数を max_workers の2倍までに抑えて）適用します。
+        Issueの作成・更新・コメントはプランのペイロードをそのまま送信し、Projects v2への追加と
+        フィールド設定は PLAN_PROJECT_FLUSH 件ごとにエイリアス付きのmutationでまとめて送信します。
+        計画の後に別の実行で作成されたタスクは、インデックスで検出してスキップします。
+
+        Args:
+            header: issue_plan.read_plan が返すヘッダー
+            entries: issue_plan.read_plan が返すエントリのイテレータ
+
+        Returns:
+            Issue情報のリスト（作成済みのIssueは "existing": True 付き）
+        """
+        repository = f"{self.owner}/{self.repo}"
+        if header["repository"] != repository:
+            raise ValueError(f"Plan is for {header['repository']}, not {repository}")
+        project_id = header.get("project_id")
+
+        issues = []
+        project_entries = []
+        count = 0
+
+        def apply_entry(entry: Dict) -> Optional[Dict]:
+            action = entry["action"]
+            fingerprint = entry["fingerprint"]
+            print(f"\n[{entry['index']}] Applying ({action}): {entry['title']}")
+
+            existing = self.issue_index.get(fingerprint)
+            if action == ACTION_SKIP:
+                if entry.get("reason") != "existing":
+                    print(f"Skip: {entry.get('reason')}")
+                    return None
+                existing = existing or entry["issue"]
+                print(f"Skip: already created as #{existing['number']} ({existing['url']})")
+                return dict(existing, existing=True)
+            if action == ACTION_UPDATE:
+                return self._edit_issue(existing or entry["issue"], entry["request"]["body"])
+            if existing:
+                # 計画の後に別の実行で作成・まとめられている
+                print(f"Skip: already created as #{existing['number']} ({existing['url']})")
+                return dict(existing, existing=True)
+
+            if action == ACTION_COMMENT:
+                issue_info = self.merge_into_issue(entry["issue"], {}, body=entry["request"]["body"]["body"])
+            else:
+                issue_info = self._submit_issue(entry["request"]["body"])
+            if issue_info:
+                self.issue_index.record(fingerprint, issue_info)
+            return issue_info
+
+        def flush_project_entries() -> None:
+            if not project_entries:
+                return
+            print(f"\nAdding {len(project_entries)} issues to project (batched)...")
+            item_results = self.add_issues_to_project_batch(project_entries, project_id)
+            for entry, item_result in zip(project_entries, item_results):
+                issue_info = entry["issue"]
+                issue_info["project_item_id"] = item_result["item_id"]
+                self.issue_index.set_project_item(item_result["node_id"], item_result["item_id"])
+                for message in item_result["errors"]:
+                    print(f"Error updating project item for #{issue_info['number']}: {message}")
+                if item_result["item_id"] and not item_result["errors"]:
+                    print(f"✓ #{issue_info['number']} added to project (item_id: {item_result['item_id']})")
+            project_entries.clear()
+
+        def collect(entry: Dict, issue_info: Optional[Dict]) -> None:
+            if not issue_info:
+                return
+            issues.append(issue_info)
+            # 既存Issueにまとめたタスク・Projectsに追加済みのIssueはProjectsを更新しない
+            if project_id and entry.get("project") and not (issue_info.get("project_item_id") or issue_info.get("merged")):
+                project_entries.append({
+                    "node_id": issue_info["node_id"],
+                    "field_values": entry["project"]["field_values"],
+                    "issue": issue_info
+                })
+                if len(project_entries) >= PLAN_PROJECT_FLUSH:
+                    flush_project_entries()
+
+        started_at = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight = deque()
+            for entry in entries:
+                count += 1
+                in_flight.append((entry, executor.submit(apply_entry, entry)))
+                # プランを先読みしすぎないよう、実行中の件数を制限する（結果はプランの順に集める）
+                while len(in_flight) > 2 * self.max_workers:
+                    done_entry, future = in_flight.popleft()
+                    collect(done_entry, future.result())
+            while in_flight:
+                done_entry, future = in_flight.popleft()
+                collect(done_entry, future.result())
+        elapsed = time.monotonic() - started_at
+        flush_project_entries()
+        print(f"\nApplied {count} plan entries in {elapsed:.1f}s (workers: {self.max_workers})")
+
+        return issues
+
 
 def main():
     """メイン処理"""
     import argparse
 
     parser = argparse.ArgumentParser(description="GitHub IssuesとProjectsを作成")
-    parser.add_argument("--input", "-i", required=True, help="タスクJSONファイルのパス")
-    parser.add_argument("--dry-run", action="store_true", help="Dry-runモード（実際には作成しない）")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", "-i", help="タスクJSONファイルのパス")
+    source.add_argument("--apply-plan", help="--plan で作成したプランを適用（Issue作成とProjectsへのまとめての追加）")
+    source.add_argument("--show-metadata", action="store_true", help="キャッシュ済みのリポジトリのメタデータ（ラベル・アサイン可能なユーザー・Project ID）を表示して終了")
+    parser.add_argument("--plan", help="GitHubに接続せず、送信するペイロードをプランとしてこのパスに保存（キャッシュ済みのメタデータを使う）")
+    parser.add_argument("--dry-run", action="store_true", help="Dry-runモード（GitHubに接続せず、キャッシュ済みのメタデータで作成内容を表示）")
     parser.add_argument("--no-project", action="store_true", help="Projects v2には追加しない")
+    parser.add_argument("--batch", action="store_true", help="Projects v2への追加とフィールド設定をまとめて送信")
+    parser.add_argument("--batch-size", type=int, default=BATCH_MAX_OPERATIONS, help="1リクエストにまとめるmutationの最大数")
+    parser.add_argument("--batch-max-cost", type=int, default=BATCH_MAX_COST, help="1リクエストあたりのコスト予算")
+    parser.add_argument("--max-workers", type=int, default=1, help="Issue作成を並列実行する最大数")
+    parser.add_argument("--no-index", action="store_true", help="作成済みIssueのインデックスを使わない（重複チェックなし）")
+    parser.add_argument("--sync-index", action="store_true", help="作成前に既存Issueの一覧からインデックスを更新")
+    parser.add_argument("--update-existing", action="store_true", help="作成済みのタスクはスキップせずIssueを更新")
+    parser.add_argument("--semantic-dedupe", choices=["flag", "merge"], help="既存Issueと意味的に似たタスクの扱い")
+    parser.add_argument("--similarity-threshold", type=float, help="類似とみなすコサイン類似度")
+    parser.add_argument("--semantic-model", help="sentence-transformersのモデル名（省略時はハッシュTF-IDF）")
+    parser.add_argument("--refresh-metadata", action="store_true", help="リポジトリのメタデータのキャッシュを破棄して取得し直す")
+    parser.add_argument("--trace", help="REST・GraphQLの呼び出しごとの処理時間・ペイロードサイズ・リトライ回数をトレースとして保存")
+    parser.add_argument("--trace-format", choices=TRACE_FORMATS, default=TRACE_FORMAT_JSONL, help="--trace の形式（jsonl / otlp）")
     args = parser.parse_args()
 
+    # 環境変数の読み込み
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        print("Error: Required packages not found. Please run: pip install -r requirements.txt")
+        sys.exit(1)
+    load_dotenv()
+
+    owner = os.getenv("GITHUB_OWNER", DEFAULT_GITHUB_OWNER)
+    repo = os.getenv("GITHUB_REPO", DEFAULT_GITHUB_REPO)
+
+    if args.show_metadata:
+        # キャッシュを読むだけなのでGitHubには接続しない
+        metadata = RepoMetadataCache(owner, repo, os.getenv("GITHUB_API_URL", DEFAULT_API_URL), offline=True)
+        if args.refresh_metadata:
+            metadata.invalidate()
+        print(metadata.describe())
+        return
+
+    if args.apply_plan and args.dry_run:
+        print("Error: --apply-plan は --dry-run と一緒に使えません（送信内容はプランファイルで確認してください）")
+        sys.exit(1)
+
+    # プランの作成とDry-runはGitHubに接続しないため、トークンは不要
+    token = os.getenv("GITHUB_TOKEN")
+    offline = bool(args.plan) or args.dry_run
+    if not token and not offline:
+        print("Error: GITHUB_TOKEN not found in environment variables")
+        sys.exit(1)
+
+    tracer = Tracer()
+    if args.trace:
+        tracer.export_on_exit(args.trace, args.trace_format)
+
+    if args.apply_plan:
+        try:
+            header, entries = read_plan(args.apply_plan)
+        except FileNotFoundError:
+            print(f"Error: File not found: {args.apply_plan}")
+            sys.exit(1)
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"Error: Invalid plan: {e}")
+            sys.exit(1)
+
+        print(f"Applying plan {args.apply_plan} (created at {header['created_at']}, source: {header.get('source_file') or '-'})")
+        integrator = GitHubIntegrator(
+            token,
+            owner,
+            repo,
+            batch_max_operations=args.batch_size,
+            batch_max_cost=args.batch_max_cost,
+            max_workers=args.max_workers,
+            use_index=not args.no_index,
+            tracer=tracer
+        )
+        if args.refresh_metadata:
+            integrator.metadata.invalidate()
+        try:
+            created_issues = integrator.apply_plan(header, entries)
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+        existing_count = sum(1 for issue in created_issues if issue.get("existing"))
+        print("\n" + "="*80)
+        print(f"✓ {len(created_issues) - existing_count}個のIssueを作成しました（作成済み: {existing_count}個）")
+        print(f"GraphQLリクエスト数: {integrator.graphql_round_trips}")
+        print(integrator.governor.summary())
+        print(integrator.metadata.summary())
+        return
+
     # タスクの読み込み
     try:
         with open(args.input, 'r', encoding='utf-8') as f:
@@ -460,14 +1945,44 @@ def main():
     print(f"Loaded {len(tasks)} tasks from {args.input}")
 
     # GitHubIntegratorの初期化
-    integrator = GitHubIntegrator(GITHUB_TOKEN, GITHUB_OWNER, GITHUB_REPO)
+    integrator = GitHubIntegrator(
+        token,
+        owner,
+        repo,
+        batch_max_operations=args.batch_size,
+        batch_max_cost=args.batch_max_cost,
+        max_workers=args.max_workers,
+        use_index=not args.no_index,
+        on_existing="update" if args.update_existing else "skip",
+        semantic_dedupe=args.semantic_dedupe,
+        similarity_threshold=args.similarity_threshold,
+        semantic_model=args.semantic_model,
+        offline=offline,
+        tracer=tracer
+    )
+    if args.refresh_metadata:
+        integrator.metadata.invalidate()
+
+    if args.plan:
+        # オフライン: 送信するペイロードをプランに書き出す
+        header, entries = integrator.build_plan(tasks, add_to_project=not args.no_project, source_file=args.input)
+        print(plan_summary(write_plan(args.plan, header, entries)))
+        print(f"適用するには: python scripts/ai/github_integrator.py --apply-plan {args.plan}")
+        return
+
+    if args.sync_index:
+        if offline:
+            print("Note: --dry-run ではGitHubに接続しないため、--sync-index は使わず手元のインデックスで重複を確認します")
+        else:
+            integrator.sync_issue_index()
 
     # Issuesの作成
     add_to_project = not args.no_project
     created_issues = integrator.create_issues_from_tasks(
         tasks,
         dry_run=args.dry_run,
-        add_to_project=add_to_project
+        add_to_project=add_to_project,
+        batch=args.batch
     )
 
     # 結果のサマリー
@@ -478,12 +1993,16 @@ def main():
     if args.dry_run:
         print(f"[DRY RUN] {len(tasks)}個のIssueが作成される予定です")
     else:
-        print(f"✓ {len(created_issues)}個のIssueを作成しました")
+        existing_count = sum(1 for issue in created_issues if issue.get("existing"))
+        print(f"✓ {len(created_issues) - existing_count}個のIssueを作成しました（作成済み: {existing_count}個）")
+        print(f"GraphQLリクエスト数: {integrator.graphql_round_trips}")
+        print(integrator.governor.summary())
+        print(integrator.metadata.summary())
         
         if created_issues:
             print("\n作成されたIssue:")
             for issue in created_issues:
-                print(f"  - #{issue['number']}: {issue['title']}")
+                print(f"  - #{issue['number']}: {issue['title']}{'（作成済み）' if issue.get('existing') else ''}")
                 print(f"    {issue['url']}")
 
 
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+GitHub APIへのHTTP通信をまとめるトランスポート層
+
+接続プール付きの requests.Session を共有し、タイムアウト・リトライ・gzipを
+GraphQLと条件付きGETに一律で適用します。REST（PyGithub）はPyGithubの
+Requesterが自前の requests.Session（同じ pool_size のkeep-alive接続プール）を
+持つため、このセッションは通しません。
+"""
+
+import random
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    import requests
+
+# タイムアウト（接続, 読み込み）秒
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+# リトライ設定
+DEFAULT_MAX_RETRIES = 3
+RETRY_BACKOFF_BASE = 1.0
+RETRY_BACKOFF_MAX = 60.0
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# 冪等でないリクエスト（POST・PATCH）は5xxでは処理済みの可能性があり、
+# リトライすると重複して作成されるため、429だけをリトライする
+NON_IDEMPOTENT_RETRY_STATUS_CODES = frozenset({429})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class GitHubTransport:
+    """GitHub API用の共有HTTPトランスポート"""
+
+    def __init__(
+        self,
+        token: str,
+        pool_size: int = 10,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES
+    ):
+        """
+        Args:
+            token: GitHub Personal Access Token
+            pool_size: ホストごとに保持するkeep-alive接続数
+            timeout: 既定のタイムアウト（秒、または (接続, 読み込み) のタプル）
+            max_retries: 5xx/429と通信エラー時の最大リトライ回数
+        """
+        # requests は読み込みに時間がかかるため、トランスポートを作るまで読み込まない
+        try:
+            import requests
+            from requests.adapters import HTTPAdapter
+        except ImportError:
+            print("Error: Required packages not found. Please run: pip install -r requirements.txt")
+            sys.exit(1)
+        self._requests = requests
+
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {token}",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+            "User-Agent": "co-co-meeting-automation"
+        })
+
+        # 通信の統計（接続再利用の効果測定用）
+        self.stats = {"requests": 0, "retries": 0}
+        self._stats_lock = threading.Lock()
+
+    def _retry_delay(self, response: Optional["requests.Response"], attempt: int) -> float:
+        """
+        次のリトライまでの待機秒数を計算
+
+        Retry-Afterヘッダーがあればそれに従い、なければジッター付きの指数バックオフ
+
+        Args:
+            response: 直前のレスポンス（通信エラーの場合はNone）
+            attempt: 試行回数（0始まり）
+
+        Returns:
+            待機秒数
+        """
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return float(retry_after)
+                except ValueError:
+                    pass
+        backoff = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * (2 ** attempt))
+        return random.uniform(0, backoff)
+
+    def _not_sent(self, error: Exception) -> bool:
+        """
+        通信エラーがリクエストの送信前（接続の確立中）に起きたかを判定
+
+        Args:
+            error: requests の ConnectionError または Timeout
+
+        Returns:
+            接続できずにリクエストを送っていない場合True
+        """
+        if isinstance(error, self._requests.ConnectTimeout):
+            return True
+        # 接続の拒否などは MaxRetryError(reason=NewConnectionError) に包まれて届く
+        # (NewConnectionError は ConnectTimeoutError のサブクラス)
+        from urllib3.exceptions import ConnectTimeoutError
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, ConnectTimeoutError)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        timeout: Optional[Timeout] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs
+    ) -> "requests.Response":
+        """
+        HTTPリクエストを送信し、5xx/429と通信エラーはリトライする
+
+        冪等でないリクエストは、429と送信前の通信エラー（接続できなかった場合）だけをリトライする
+
+        Args:
+            method: HTTPメソッド
+            url: リクエストURL
+            timeout: この呼び出しのタイムアウト（省略時は既定値）
+            idempotent: リトライしても安全か（省略時はHTTPメソッドで判定。GraphQLのqueryはTrueを渡す）
+            **kwargs: requests.Session.request に渡す引数
+
+        Returns:
+            レスポンス（リトライ上限に達した場合は最後のレスポンス）
+        """
+        timeout = timeout or self.timeout
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        retry_status_codes = RETRY_STATUS_CODES if idempotent else NON_IDEMPOTENT_RETRY_STATUS_CODES
+
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                with self._stats_lock:
+                    self.stats["requests"] += 1
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+                if response.status_code not in retry_status_codes or attempt == self.max_retries:
+                    return response
+            except (self._requests.ConnectionError, self._requests.Timeout) as error:
+                if attempt == self.max_retries or not (idempotent or self._not_sent(error)):
+                    raise
+
+            delay = self._retry_delay(response, attempt)
+            with self._stats_lock:
+                self.stats["retries"] += 1
+            status = response.status_code if response is not None else "connection error"
+            print(f"Warning: GitHub API {status}, retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+
+        return response
+
+    def post(self, url: str, **kwargs) -> "requests.Response":
+        """POSTリクエストを送信"""
+        return self.request("POST", url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> "requests.Response":
+        """GETリクエストを送信"""
+        return self.request("GET", url, **kwargs)
+
+    def close(self) -> None:
+        """接続プールを閉じる"""
+        self.session.close()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+作成済みIssueのローカルインデックス
+
+正規化したタスクタイトルのフィンガープリントから、作成済みのIssue番号と
+Projects v2のItem IDを引けるようにSQLiteに保存します。再実行や部分的な失敗後の
+リトライで同じタスクのIssueを重複して作成しないために使います。
+既存Issueからの同期ではオープンなIssueだけを登録し、クローズされたIssueは取り除くため、
+完了済みのIssueと同じタイトルの新しいタスクは新しいIssueとして作成されます。
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from local_cache import cache_path
+
+
+def task_fingerprint(title: str) -> Optional[str]:
+    """
+    タイトルからフィンガープリントを計算する
+
+    全角半角・大文字小文字・空白・記号の違いを無視します。
+    LLMの出力は説明文が実行ごとに揺れるため、タイトルのみを使います。
+
+    Args:
+        title: タスク（またはIssue）のタイトル
+
+    Returns:
+        SHA-256のハッシュ値（タイトルが空の場合はNone）
+    """
+    normalized = unicodedata.normalize("NFKC", str(title or "")).lower()
+    normalized = re.sub(r"[\s\W_]+", "", normalized)
+    if not normalized:
+        return None
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class IssueIndex:
+    """タスクのフィンガープリント → 作成済みIssue のインデックス"""
+
+    def __init__(self, owner: str, repo: str, path: Optional[Path] = None, enabled: bool = True):
+        """
+        Args:
+            owner: リポジトリオーナー
+            repo: リポジトリ名
+            path: SQLiteファイルのパス（省略時は .cache/github/issue_index_{owner}_{repo}.sqlite3）
+            enabled: Falseの場合、参照・記録をすべてバイパス
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if enabled:
+            safe_name = re.sub(r"[^A-Za-z0-9_-]", "_", f"{owner}_{repo}")
+            self.path = path or cache_path("github", f"issue_index_{safe_name}.sqlite3")
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS issues ("
+                " fingerprint TEXT PRIMARY KEY,"
+                " number INTEGER NOT NULL,"
+                " node_id TEXT NOT NULL,"
+                " url TEXT NOT NULL,"
+                " title TEXT NOT NULL,"
+                " project_item_id TEXT,"
+                " updated_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS issues_node_id ON issues (node_id)")
+            self._conn.commit()
+
+    def get(self, fingerprint: Optional[str]) -> Optional[Dict]:
+        """
+        フィンガープリントから作成済みIssueを取得する
+
+        Args:
+            fingerprint: task_fingerprint の値
+
+        Returns:
+            {"number", "node_id", "url", "title", "project_item_id"}（ない場合はNone）
+        """
+        if not self.enabled or not fingerprint:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT number, node_id, url, title, project_item_id FROM issues WHERE fingerprint = ?",
+                (fingerprint,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("number", "node_id", "url", "title", "project_item_id"), row))
+
+    def record(self, fingerprint: Optional[str], issue: Dict) -> None:
+        """
+        作成したIssueを記録する
+
+        Args:
+            fingerprint: task_fingerprint の値
+            issue: {"number", "node_id", "url", "title"}（"project_item_id" は任意）
+        """
+        if not self.enabled or not fingerprint:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO issues (fingerprint, number, node_id, url, title, project_item_id, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (fingerprint) DO UPDATE SET"
+                " number = excluded.number, node_id = excluded.node_id, url = excluded.url,"
+                " title = excluded.title, updated_at = excluded.updated_at,"
+                " project_item_id = COALESCE(excluded.project_item_id, issues.project_item_id)",
+                (
+                    fingerprint, issue["number"], issue["node_id"], issue["url"], issue["title"],
+                    issue.get("project_item_id"), time.time()
+                )
+            )
+            self._conn.commit()
+
+    def set_project_item(self, node_id: str, item_id: str) -> None:
+        """
+        IssueのProjects v2 Item IDを記録する
+
+        Args:
+            node_id: IssueのNode ID
+            item_id: Project Item ID
+        """
+        if not self.enabled or not item_id:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE issues SET project_item_id = ?, updated_at = ? WHERE node_id = ?",
+                (item_id, time.time(), node_id)
+            )
+            self._conn.commit()
+
+    def sync(self, issues: Iterable) -> int:
+        """
+        既存のIssue一覧からインデックスを埋める
+
+        オープンなIssueだけを登録し、クローズされたIssueを指すエントリは削除します。
+        同じフィンガープリントのIssueが複数ある場合は番号の小さい（古い）方を残し、
+        残さなかったIssueは番号とともに表示します。記録済みのProject Item IDは保持します。
+
+        Args:
+            issues: PyGithubのIssueオブジェクト（number, node_id, html_url, title, state, pull_request）
+
+        Returns:
+            インデックスに登録したIssue数
+        """
+        if not self.enabled:
+            return 0
+
+        rows = {}
+        closed = []
+        for issue in issues:
+            if getattr(issue, "pull_request", None):
+                continue
+            if getattr(issue, "state", "open") != "open":
+                closed.append((issue.number,))
+                continue
+            fingerprint = task_fingerprint(issue.title)
+            if not fingerprint:
+                continue
+            row = (fingerprint, issue.number, issue.node_id, issue.html_url, issue.title)
+            kept = rows.get(fingerprint)
+            if kept is not None:
+                original, duplicate = sorted((kept, row), key=lambda item: item[1])
+                print(f"Skip: #{duplicate[1]} {duplicate[4]} is a duplicate of #{original[1]}")
+                row = original
+            rows[fingerprint] = row
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany("DELETE FROM issues WHERE number = ?", closed)
+            self._conn.executemany(
+                "INSERT INTO issues (fingerprint, number, node_id, url, title, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (fingerprint) DO UPDATE SET"
+                " number = excluded.number, node_id = excluded.node_id, url = excluded.url,"
+                " title = excluded.title, updated_at = excluded.updated_at,"
+                " project_item_id = CASE WHEN issues.number = excluded.number"
+                " THEN issues.project_item_id ELSE NULL END",
+                [row + (now,) for row in rows.values()]
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def __len__(self) -> int:
+        if not self.enabled:
+            return 0
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM issues").fetchone()[0]
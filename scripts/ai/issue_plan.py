@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Issue作成の実行計画（プラン）の読み書き
+
+プランは、タスクごとに送信するREST（Issueの作成・更新・コメント）と
+GraphQL（Projects v2のフィールド値）のペイロードをまとめたJSON Linesファイルです。
+1行目のヘッダーに計画時のラベル・担当者の対応表とフィールドID・選択肢IDを持ち、
+2行目以降はタスク1件につき1行のレコードです（フィールドはヘッダーを参照して名前と値だけを持つ）。
+GitHubIntegrator.build_plan でネットワークを使わずに作成し、apply_plan で1行ずつ読みながら適用します。
+"""
+
+import json
+import os
+import tempfile
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Tuple
+
+# プランの形式とバージョン（互換性のない変更をしたら上げる）
+PLAN_FORMAT = "issue-plan"
+PLAN_VERSION = 2
+
+# プランのエントリの種類
+ACTION_CREATE = "create"
+ACTION_UPDATE = "update"
+ACTION_COMMENT = "comment"
+ACTION_SKIP = "skip"
+
+
+def _dumps(data: Dict) -> str:
+    """1行分のJSON（空白なし）"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _compact_entry(entry: Dict) -> Dict:
+    """エントリのフィールド値を {フィールド名: 値} に縮める（IDと型はヘッダーにある）"""
+    project = entry.get("project")
+    if not project:
+        return entry
+    fields = {field_value["field_name"]: field_value["value"] for field_value in project["field_values"]}
+    return dict(entry, project={"content_id": project["content_id"], "fields": fields})
+
+
+def _expand_entry(header: Dict, record: Dict) -> Dict:
+    """レコードのフィールド値をヘッダーのフィールドID・型で元に戻す"""
+    project = record.get("project")
+    if not project:
+        return record
+    field_values = []
+    for field_name, value in project["fields"].items():
+        field = header["fields"][field_name]
+        labels = {option_id: name for name, option_id in field.get("options", {}).items()}
+        field_values.append({
+            "field_name": field_name,
+            "field_id": field["id"],
+            "data_type": field["data_type"],
+            "value": value,
+            "label": labels.get(value, value)
+        })
+    return dict(record, project={"content_id": project["content_id"], "field_values": field_values})
+
+
+def write_plan(path: str, header: Dict, entries: Iterable[Dict]) -> Dict:
+    """
+    プランをファイルに書き出す（エントリは届いた順に1行ずつ書き、最後にアトミックに置き換える）
+
+    Args:
+        path: 保存先のパス
+        header: GitHubIntegrator.build_plan が返すヘッダー
+        entries: GitHubIntegrator.build_plan が返すエントリのイテレータ
+
+    Returns:
+        {"actions": Counter(種類 → 件数), "warnings": 警告の件数}
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    stats = {"actions": Counter(), "warnings": 0}
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(_dumps({"format": PLAN_FORMAT, "version": PLAN_VERSION, **header}) + "\n")
+            for entry in entries:
+                f.write(_dumps(_compact_entry(entry)) + "\n")
+                stats["actions"][entry["action"]] += 1
+                stats["warnings"] += len(entry.get("warnings", []))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    print(f"✓ プランを保存しました: {path}")
+    return stats
+
+
+def read_plan(path: str) -> Tuple[Dict, Iterator[Dict]]:
+    """
+    プランを開く（ヘッダーだけを読み、エントリは1行ずつ読み込む）
+
+    Args:
+        path: プランファイルのパス
+
+    Returns:
+        (ヘッダー, エントリのイテレータ)
+
+    Raises:
+        ValueError: プランではない・対応していないバージョンの場合
+    """
+    f = open(path, 'r', encoding='utf-8')
+    try:
+        try:
+            header = json.loads(f.readline())
+        except json.JSONDecodeError:
+            header = None
+        if not isinstance(header, dict) or header.get("format") != PLAN_FORMAT:
+            raise ValueError(f"Not an issue plan: {path}")
+        if header.get("version") != PLAN_VERSION:
+            raise ValueError(f"Unsupported plan version: {header.get('version')} (expected {PLAN_VERSION})")
+    except BaseException:
+        f.close()
+        raise
+
+    def entries() -> Iterator[Dict]:
+        with f:
+            for line in f:
+                if line.strip():
+                    yield _expand_entry(header, json.loads(line))
+
+    return header, entries()
+
+
+def plan_summary(stats: Dict) -> str:
+    """
+    プランのエントリ数の集計
+
+    Args:
+        stats: write_plan の戻り値
+
+    Returns:
+        "プラン: 作成 X / 更新 Y / コメント Z / スキップ W" 形式の文字列
+    """
+    counts = stats["actions"]
+    return (
+        f"プラン: 作成 {counts[ACTION_CREATE]} / 更新 {counts[ACTION_UPDATE]} / "
+        f"コメント {counts[ACTION_COMMENT]} / スキップ {counts[ACTION_SKIP]}（警告: {stats['warnings']}件）"
+    )
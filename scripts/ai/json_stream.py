@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+JSON配列のインクリメンタルパーサー
+
+ストリーミングで届くテキストからJSON配列の要素を、閉じた時点で1つずつ取り出します。
+配列の前にあるマークダウンのコードブロック記号（```json）などは読み飛ばします。
+大きなJSON配列のファイルは iter_json_array で全体を読み込まずに1要素ずつ読めます。
+"""
+
+import codecs
+import json
+import re
+from typing import Any, BinaryIO, Iterator, List, Tuple
+
+WHITESPACE = " \t\r\n"
+
+# iter_json_array で一度に読み込むバイト数
+READ_CHUNK_SIZE = 1 << 20
+
+_SKIP_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+# 読み込み単位の終わりまで続く数値の途中（"-15", "1.", "2e+" など）
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*")
+
+
+class JSONArrayStreamParser:
+    """JSON配列の要素を逐次取り出すパーサー"""
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._start = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.started = False
+        self.finished = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        テキストを追加し、完成した要素を返す
+
+        Args:
+            chunk: 追加するテキスト
+
+        Returns:
+            このチャンクで閉じた要素のリスト
+
+        Raises:
+            json.JSONDecodeError: 要素が不正なJSONの場合
+        """
+        buffer = self._buffer + chunk
+        items = []
+        i = self._pos
+
+        while i < len(buffer) and not self.finished:
+            char = buffer[i]
+
+            if not self.started:
+                if char == "[":
+                    self.started = True
+                i += 1
+                continue
+
+            if self._start is None:
+                if char in WHITESPACE or char == ",":
+                    i += 1
+                    continue
+                if char == "]":
+                    self.finished = True
+                    i += 1
+                    break
+                self._start = i
+
+            end = None
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 0:
+                        end = i + 1
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    end = i + 1
+            elif self._depth == 0 and char in ",]":
+                # 数値・true/false/null などのスカラー要素
+                end = i
+                if char == "]":
+                    self.finished = True
+
+            if end is not None:
+                items.append(json.loads(buffer[self._start:end]))
+                self._start = None
+
+            i += 1
+
+        # 処理済みの部分をバッファから捨てる
+        keep_from = self._start if self._start is not None else i
+        self._buffer = buffer[keep_from:]
+        self._pos = i - keep_from
+        if self._start is not None:
+            self._start = 0
+        return items
+
+
+def iter_json_array(stream: BinaryIO, chunk_size: int = READ_CHUNK_SIZE, in_array: bool = False) -> Iterator[Tuple[int, Any]]:
+    """
+    ファイルのJSON配列の要素を1つずつ読み込む（ファイル全体を読み込まない）
+
+    要素のデコードは json.JSONDecoder.raw_decode で行うため、JSONArrayStreamParser より速く、
+    使うメモリは読み込み単位と1要素分だけです。
+
+    Args:
+        stream: バイナリモードで開いたファイル（現在位置から読む）
+        chunk_size: 一度に読み込むバイト数
+        in_array: Trueの場合、現在位置を配列の途中（要素の直後）として読む（前回の読み込み位置から再開する場合）
+
+    Yields:
+        (要素の直後のバイト位置, 要素)
+
+    Raises:
+        json.JSONDecodeError: 配列ではない・不正なJSONの場合
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    # buffer[mark] のバイト位置（要素の終わりごとに進める）
+    mark = 0
+    offset = stream.tell()
+    started = in_array
+    eof = False
+
+    def fill() -> None:
+        nonlocal buffer, pos, mark, eof
+        buffer = buffer[mark:]
+        pos -= mark
+        mark = 0
+        data = stream.read(chunk_size)
+        eof = not data
+        buffer += utf8.decode(data, final=eof)
+
+    while True:
+        pos = _SKIP_WHITESPACE.match(buffer, pos).end()
+        if pos >= len(buffer):
+            if eof:
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+            fill()
+            continue
+
+        char = buffer[pos]
+        if not started:
+            if char != "[":
+                raise json.JSONDecodeError("Expecting '['", buffer, pos)
+            started = True
+            pos += 1
+            continue
+        if char == "]":
+            return
+        if char == ",":
+            pos += 1
+            continue
+
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # 要素の途中で読み込み単位が終わった
+            fill()
+            continue
+        if not eof and _NUMBER_TAIL.fullmatch(buffer, end):
+            # 数値などは続きがあるかもしれない（"1." まで読んだ場合は 1 として読めてしまう）
+            fill()
+            continue
+
+        offset += len(buffer[mark:end].encode("utf-8"))
+        mark = pos = end
+        yield offset, item
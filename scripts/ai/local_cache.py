@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+自動化スクリプト共通のローカルキャッシュ
+
+キャッシュはリポジトリ直下の .cache/ に保存します（環境変数 AUTOMATION_CACHE_DIR で変更可能）。
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+# キャッシュディレクトリ
+CACHE_DIR = Path(os.getenv("AUTOMATION_CACHE_DIR", Path(__file__).parent.parent.parent / ".cache"))
+
+
+def cache_path(*parts: str) -> Path:
+    """
+    キャッシュディレクトリ内のパスを返す（親ディレクトリは作成する）
+
+    Args:
+        *parts: CACHE_DIRからの相対パス要素
+
+    Returns:
+        キャッシュファイルのパス
+    """
+    path = CACHE_DIR.joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def read_json(path: Path) -> Optional[Any]:
+    """
+    JSONキャッシュを読み込む
+
+    Args:
+        path: キャッシュファイルのパス
+
+    Returns:
+        読み込んだデータ（存在しない・壊れている場合はNone）
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def write_json(path: Path, data: Any) -> None:
+    """
+    JSONキャッシュをアトミックに書き込む（途中で中断しても壊れたファイルを残さない）
+
+    Args:
+        path: キャッシュファイルのパス
+        data: 書き込むデータ
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -6,33 +6,49 @@ Gemini 2.5 Proを使用して、会議議事録のMarkdownファイルから
 実行可能なアクションアイテムを抽出し、構造化されたJSONで返却します。
 """
 
+import hashlib
 import json
 import os
 import sys
+import threading
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Dict, Optional
+from datetime import datetime
 import re
 
-try:
-    import google.generativeai as genai
-    from dotenv import load_dotenv
-except ImportError:
-    print("Error: Required packages not found. Please run: pip install -r requirements.txt")
-    sys.exit(1)
-
-# 環境変数の読み込み
-load_dotenv()
-
-# Gemini APIの設定
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")
-
-if not GOOGLE_API_KEY:
-    print("Error: GOOGLE_API_KEY not found in environment variables")
-    sys.exit(1)
-
-genai.configure(api_key=GOOGLE_API_KEY)
+from json_stream import JSONArrayStreamParser
+from local_cache import cache_path, read_json, write_json
+from note_chunker import (
+    HEADING_PATTERN,
+    build_windows,
+    estimate_tokens,
+    split_sections,
+    strip_generated_sections
+)
+from response_cache import ResponseCache
+from task_schema import TaskDiagnostics, TaskSchema
+from tracing import Tracer, TRACE_FORMATS, TRACE_FORMAT_JSONL
+
+# Gemini APIの設定（モデル名は環境変数 GEMINI_MODEL で変更可能）
+DEFAULT_GEMINI_MODEL = "gemini-2.0-flash-exp"
+
+# google.generativeai は読み込みに時間がかかるため、最初のAPI呼び出しまで読み込まない
+# （--help やキャッシュから抽出できる場合の起動を速くする）
+_genai = None
+_genai_lock = threading.Lock()
+
+# 長い議事録の分割設定
+# 1回のリクエストに含める議事録のトークン数（概算）と、ウィンドウ間で重ねるトークン数
+CHUNK_TOKENS = 8000
+CHUNK_OVERLAP_TOKENS = 400
+EXTRACTION_MAX_WORKERS = 4
+
+# 一貫性のある出力のため低めに設定
+EXTRACTION_TEMPERATURE = 0.2
 
 # プロンプトテンプレート
 EXTRACTION_PROMPT = """あなたは経験豊富なプロジェクトマネージャーです。
@@ -86,15 +102,96 @@ EXTRACTION_PROMPT = """あなたは経験豊富なプロジェクトマネージ
 """
 
 
+def load_genai():
+    """
+    google.generativeai を読み込み、APIキーを設定する（初回のみ）
+
+    Returns:
+        google.generativeai モジュール
+    """
+    global _genai
+    with _genai_lock:
+        if _genai is None:
+            try:
+                import google.generativeai as genai
+            except ImportError:
+                print("Error: Required packages not found. Please run: pip install -r requirements.txt")
+                sys.exit(1)
+
+            api_key = os.getenv("GOOGLE_API_KEY")
+            if not api_key:
+                print("Error: GOOGLE_API_KEY not found in environment variables")
+                sys.exit(1)
+            genai.configure(api_key=api_key)
+            _genai = genai
+    return _genai
+
+
+def usage_attributes(response) -> Dict:
+    """
+    Geminiのレスポンスのトークン数（usage_metadata）をスパンの属性にする
+
+    Args:
+        response: generate_content の戻り値（ストリーミングの場合は最後まで読んだもの）
+
+    Returns:
+        {"prompt_tokens", "output_tokens", "total_tokens"}（取得できない値は含まない）
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return {}
+    attributes = {
+        "prompt_tokens": getattr(usage, "prompt_token_count", None),
+        "output_tokens": getattr(usage, "candidates_token_count", None),
+        "total_tokens": getattr(usage, "total_token_count", None)
+    }
+    return {key: value for key, value in attributes.items() if isinstance(value, int)}
+
+
 class MeetingAnalyzer:
     """会議議事録を解析してタスクを抽出するクラス"""
 
-    def __init__(self, model_name: str = GEMINI_MODEL):
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        chunk_tokens: int = CHUNK_TOKENS,
+        chunk_overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+        max_workers: int = EXTRACTION_MAX_WORKERS,
+        use_cache: bool = True,
+        tracer: Optional[Tracer] = None
+    ):
         """
         Args:
-            model_name: 使用するGeminiモデル名
+            model_name: 使用するGeminiモデル名（省略時は環境変数 GEMINI_MODEL）
+            chunk_tokens: 1回のリクエストに含める議事録のトークン数（これを超える議事録は分割）
+            chunk_overlap_tokens: 分割したウィンドウ間で重ねるトークン数
+            max_workers: 分割したウィンドウを並列に抽出する最大数
+            use_cache: Falseの場合、LLMレスポンスキャッシュをバイパス
+            tracer: プロンプト作成・モデル呼び出し・JSONパース・正規化を記録するトレーサー
         """
-        self.model = genai.GenerativeModel(model_name)
+        self.model_name = model_name or os.getenv("GEMINI_MODEL", DEFAULT_GEMINI_MODEL)
+        self._model = None
+        self.cache = ResponseCache(enabled=use_cache)
+        self.chunk_tokens = chunk_tokens
+        self.chunk_overlap_tokens = chunk_overlap_tokens
+        self.max_workers = max(1, max_workers)
+
+        # タスクのスキーマ（有効値・別名の辞書）と検証・正規化の診断情報
+        self.schema = TaskSchema()
+        self.diagnostics = TaskDiagnostics()
+
+        # ストリーミング抽出の計測値（最初のタスクまでの秒数など）
+        self.stream_stats: Dict = {}
+
+        # ステージごとの処理時間・ペイロードサイズ・トークン数
+        self.tracer = tracer or Tracer()
+
+    @property
+    def model(self):
+        """Geminiのモデル（最初のAPI呼び出し時に作成）"""
+        if self._model is None:
+            self._model = load_genai().GenerativeModel(self.model_name)
+        return self._model
 
     def read_meeting_notes(self, file_path: str) -> str:
         """
@@ -120,6 +217,9 @@ class MeetingAnalyzer:
         """
         議事録からタスクを抽出する
 
+        トークン予算を超える議事録は見出し単位のウィンドウに分割して並列に抽出し、
+        結果を結合・重複除去します。
+
         Args:
             meeting_notes: 議事録の内容
             retry_count: リトライ回数
@@ -127,128 +227,434 @@ class MeetingAnalyzer:
         Returns:
             抽出されたタスクのリスト
         """
-        prompt = EXTRACTION_PROMPT.format(meeting_notes=meeting_notes)
+        if estimate_tokens(meeting_notes) <= self.chunk_tokens:
+            return self._extract_from_text(meeting_notes, retry_count) or []
 
-        for attempt in range(retry_count):
-            try:
-                print(f"Gemini APIにリクエスト中... (試行 {attempt + 1}/{retry_count})")
-                
-                response = self.model.generate_content(
-                    prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=0.2,  # 一貫性のある出力のため低めに設定
-                    )
+        windows = build_windows(meeting_notes, self.chunk_tokens, self.chunk_overlap_tokens)
+        print(f"議事録を{len(windows)}個のウィンドウに分割して抽出します")
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(windows))) as executor:
+            task_lists = list(executor.map(lambda window: self._extract_from_text(window, retry_count), windows))
+
+        failed = sum(1 for task_list in task_lists if task_list is None)
+        if failed:
+            print(f"Warning: {failed}個のウィンドウで抽出に失敗しました（残りのウィンドウの結果を使います）")
+
+        tasks = self.merge_tasks(task_lists)
+        print(f"✓ 結合・重複除去後: {len(tasks)}個のタスク")
+        return tasks
+
+    def extract_tasks_stream(self, meeting_notes: str, retry_count: int = 3) -> Iterator[Dict]:
+        """
+        Geminiのストリーミング応答からタスクを1つずつ取り出す
+
+        JSON配列の要素が閉じた時点でタスクをyieldするため、モデルの生成中でも
+        後続の正規化・Issue作成を始められます。トークン予算を超える議事録は
+        ウィンドウごとの結合・重複除去が必要なため、通常の抽出にフォールバックします。
+
+        計測値は self.stream_stats に保存されます:
+            time_to_first_task: リクエスト開始から最初のタスクまでの秒数
+            total_time: 抽出全体の秒数
+            tasks: 取り出したタスク数
+
+        Args:
+            meeting_notes: 議事録の内容
+            retry_count: リトライ回数（最初のタスクを返す前のエラーのみリトライ）
+
+        Yields:
+            抽出されたタスク
+        """
+        started_at = time.monotonic()
+        self.stream_stats = {"time_to_first_task": None, "total_time": None, "tasks": 0}
+
+        def emit(tasks: Iterable[Dict]) -> Iterator[Dict]:
+            for task in tasks:
+                if self.stream_stats["time_to_first_task"] is None:
+                    self.stream_stats["time_to_first_task"] = time.monotonic() - started_at
+                    print(f"✓ 最初のタスクまで {self.stream_stats['time_to_first_task']:.2f}s")
+                self.stream_stats["tasks"] += 1
+                yield task
+
+        if estimate_tokens(meeting_notes) > self.chunk_tokens:
+            print("Note: 議事録がトークン予算を超えるため、ストリーミングせずに分割抽出します")
+            yield from emit(self.extract_tasks(meeting_notes, retry_count))
+        else:
+            yield from emit(self._extract_stream_from_text(meeting_notes, retry_count))
+
+        self.stream_stats["total_time"] = time.monotonic() - started_at
+        print(
+            f"✓ ストリーミング抽出: {self.stream_stats['tasks']}個のタスク "
+            f"(合計 {self.stream_stats['total_time']:.2f}s)"
+        )
+
+    def _extract_stream_from_text(self, meeting_notes: str, retry_count: int = 3) -> Iterator[Dict]:
+        """
+        1回のストリーミングリクエストで議事録からタスクを抽出する
+
+        Args:
+            meeting_notes: 議事録の内容
+            retry_count: リトライ回数
+
+        Yields:
+            抽出されたタスク
+        """
+        # yieldをまたぐため、スパンは現在のスパンにせず明示的に開始・終了する
+        extract_span = self.tracer.start("extract", notes_chars=len(meeting_notes), stream=True)
+        try:
+            cache_key = ResponseCache.make_key(
+                self.model_name, EXTRACTION_PROMPT, EXTRACTION_TEMPERATURE, meeting_notes
+            )
+            cached_tasks = self.cache.get(cache_key)
+            if cached_tasks is not None:
+                print(f"✓ キャッシュから{len(cached_tasks)}個のタスクを読み込みました")
+                extract_span.set(cache_hit=True, tasks=len(cached_tasks))
+                yield from cached_tasks
+                return
+
+            with self.tracer.span("prompt.build", parent=extract_span) as span:
+                prompt = EXTRACTION_PROMPT.format(meeting_notes=meeting_notes)
+                span.set(prompt_chars=len(prompt), prompt_tokens_estimate=estimate_tokens(prompt))
+
+            for attempt in range(retry_count):
+                if attempt:
+                    extract_span.add("retries")
+                parser = JSONArrayStreamParser()
+                tasks = []
+                response_text = ""
+                # JSONパースはチャンクの受信と交互に行うため、パース時間は model.call の属性に含める
+                # （yield中に利用側で使った時間も consumer_ms として分けて記録する）
+                call_span = self.tracer.start(
+                    "model.call",
+                    parent=extract_span,
+                    model=self.model_name,
+                    attempt=attempt + 1,
+                    stream=True
                 )
+                started_at = time.perf_counter()
+                parse_seconds = 0.0
+                consumer_seconds = 0.0
+                try:
+                    print(f"Gemini APIにストリーミングでリクエスト中... (試行 {attempt + 1}/{retry_count})")
+
+                    response = self.model.generate_content(
+                        prompt,
+                        generation_config=load_genai().types.GenerationConfig(
+                            temperature=EXTRACTION_TEMPERATURE,
+                        ),
+                        stream=True
+                    )
+
+                    for chunk in response:
+                        response_text += chunk.text
+                        parse_started_at = time.perf_counter()
+                        parsed = parser.feed(chunk.text)
+                        parse_seconds += time.perf_counter() - parse_started_at
+                        for task in parsed:
+                            if not isinstance(task, dict):
+                                continue
+                            if not tasks:
+                                call_span.set(time_to_first_task_ms=round((time.perf_counter() - started_at) * 1000, 3))
+                            tasks.append(task)
+                            yielded_at = time.perf_counter()
+                            yield task
+                            consumer_seconds += time.perf_counter() - yielded_at
+
+                    if not parser.finished:
+                        raise ValueError("Response is not a complete JSON array")
+
+                    call_span.set(
+                        response_chars=len(response_text),
+                        parse_ms=round(parse_seconds * 1000, 3),
+                        consumer_ms=round(consumer_seconds * 1000, 3),
+                        tasks=len(tasks),
+                        **usage_attributes(response)
+                    )
+                    call_span.end()
+                    print(f"✓ {len(tasks)}個のタスクを抽出しました")
+                    extract_span.set(tasks=len(tasks))
+                    self.cache.put(cache_key, tasks)
+                    return
+
+                except Exception as e:
+                    call_span.set(response_chars=len(response_text), tasks=len(tasks))
+                    call_span.end(error=e)
+                    print(f"Warning: Streaming extraction failed (試行 {attempt + 1}/{retry_count}): {e}")
+                    if tasks:
+                        # 既に後続の処理に渡したタスクを重複させないため、途中からはリトライしない
+                        print(f"Error: {len(tasks)}個のタスクを返した後に中断しました")
+                        return
+                    if attempt < retry_count - 1:
+                        print("リトライします...")
+                        continue
+                    print("Error: Failed to parse Gemini streaming response as JSON")
+                    print(f"Response: {response_text[:500]}...")
+                    return
+                finally:
+                    # 利用側がストリームを途中で閉じた場合
+                    call_span.end()
+        finally:
+            extract_span.end()
+
+    def extract_tasks_incremental(self, meeting_notes: str, source: str, retry_count: int = 3) -> List[Dict]:
+        """
+        変更されたセクションだけを再抽出する
+
+        議事録を見出し単位のセクションに分け、セクションごとのハッシュと抽出結果を
+        .cache/sections/ に保存します。再実行時はハッシュが一致するセクションの結果を再利用し、
+        変更・追加されたセクションのみGemini APIに送ります。
+        自動追記された「作成されたGitHub Issues」セクションは対象外です。
+
+        Args:
+            meeting_notes: 議事録の内容
+            source: 議事録ファイルのパス（保存先の識別に使用）
+            retry_count: リトライ回数
 
-                # レスポンステキストの取得
-                response_text = response.text.strip()
-                
-                # マークダウンのコードブロックを除去
-                response_text = re.sub(r'^```json\s*', '', response_text)
-                response_text = re.sub(r'^```\s*', '', response_text)
-                response_text = re.sub(r'\s*```$', '', response_text)
-                response_text = response_text.strip()
+        Returns:
+            抽出されたタスクのリスト
+        """
+        source_id = hashlib.sha256(str(Path(source).resolve()).encode("utf-8")).hexdigest()[:16]
+        state_file = cache_path("sections", f"{source_id}.json")
+        # モデルやプロンプトが変わった場合は以前の結果を使わない
+        extractor_key = ResponseCache.make_key(self.model_name, EXTRACTION_PROMPT, EXTRACTION_TEMPERATURE, "")
+
+        state = read_json(state_file) or {}
+        previous = {}
+        if state.get("extractor_key") == extractor_key:
+            previous = {entry["hash"]: entry["tasks"] for entry in state.get("sections", [])}
+
+        sections = split_sections(strip_generated_sections(meeting_notes))
+        hashes = [hashlib.sha256(section.strip().encode("utf-8")).hexdigest() for section in sections]
+
+        def has_body(section: str) -> bool:
+            # 見出しだけのセクションはGeminiに送らない
+            lines = section.strip().split("\n", 1)
+            if not HEADING_PATTERN.match(lines[0]):
+                return bool(lines[0])
+            return len(lines) == 2 and bool(lines[1].strip())
+
+        changed = [
+            i for i, (section, section_hash) in enumerate(zip(sections, hashes))
+            if section_hash not in previous and has_body(section)
+        ]
+        print(f"セクション: {len(sections)}個（変更あり: {len(changed)}個）")
+
+        results = {}
+        if changed:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(changed))) as executor:
+                extracted = executor.map(lambda i: self._extract_from_text(sections[i], retry_count), changed)
+                results = dict(zip(changed, extracted))
+
+        section_entries = []
+        task_lists = []
+        for i, (section, section_hash) in enumerate(zip(sections, hashes)):
+            if i in results:
+                tasks = results[i]
+                if tasks is None:
+                    # 抽出に失敗したセクションは保存せず、次回再抽出する
+                    continue
+            else:
+                tasks = previous.get(section_hash, [])
+            section_entries.append({"hash": section_hash, "tasks": tasks})
+            task_lists.append(tasks)
+
+        write_json(state_file, {
+            "source": str(source),
+            "extractor_key": extractor_key,
+            "updated_at": datetime.now().isoformat(),
+            "sections": section_entries
+        })
+
+        tasks = self.merge_tasks(task_lists)
+        print(f"✓ {len(tasks)}個のタスク（{len(changed)}セクションを再抽出）")
+        return tasks
+
+    def extract_tasks_by_window(self, windows: Iterable[Dict], retry_count: int = 3) -> Iterator[tuple]:
+        """
+        会話ウィンドウ（DiscordExportSource.iter_windows など）ごとにタスクを抽出する
+
+        ウィンドウは必要な分だけ読み進め、同時に抽出中のウィンドウは max_workers の2倍までに
+        抑えるため、ウィンドウがいくつあってもメモリ使用量は一定です。結果は入力の順に返します。
+
+        Args:
+            windows: "text" を持つウィンドウの辞書のイテラブル
+            retry_count: リトライ回数
+
+        Yields:
+            (ウィンドウ, 抽出されたタスクのリスト（抽出に失敗した場合はNone）)
+        """
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for window in windows:
+                pending.append((window, executor.submit(self._extract_from_text, window["text"], retry_count)))
+                if len(pending) >= self.max_workers * 2:
+                    window, future = pending.popleft()
+                    yield window, future.result()
+            while pending:
+                window, future = pending.popleft()
+                yield window, future.result()
+
+    @staticmethod
+    def _task_key(task: Dict) -> str:
+        """重複判定用にタイトルを正規化する（全角半角・大文字小文字・空白・記号の違いを無視）"""
+        title = unicodedata.normalize("NFKC", str(task.get("title", ""))).lower()
+        return re.sub(r"[\s\W_]+", "", title)
+
+    def merge_tasks(self, task_lists: List[Optional[List[Dict]]]) -> List[Dict]:
+        """
+        ウィンドウごとの抽出結果を結合し、重複を除去する
 
-                # JSONパース
-                tasks = json.loads(response_text)
+        ウィンドウ順・出現順で最初のタスクを残し、重複したタスクからは
+        空のフィールドの補完と依存関係の統合のみを行います（結果は決定的）。
 
-                if not isinstance(tasks, list):
-                    raise ValueError("Response is not a JSON array")
+        Args:
+            task_lists: ウィンドウごとのタスクのリスト（抽出に失敗したウィンドウはNone）
 
-                print(f"✓ {len(tasks)}個のタスクを抽出しました")
-                return tasks
+        Returns:
+            結合されたタスクのリスト
+        """
+        merged: Dict[str, Dict] = {}
 
-            except json.JSONDecodeError as e:
-                print(f"Warning: JSON parse error (試行 {attempt + 1}/{retry_count}): {e}")
-                if attempt < retry_count - 1:
-                    print("リトライします...")
+        for tasks in task_lists:
+            for task in tasks or []:
+                if not isinstance(task, dict):
+                    continue
+                key = self._task_key(task)
+                if not key:
                     continue
-                else:
-                    print("Error: Failed to parse Gemini response as JSON")
-                    print(f"Response: {response_text[:500]}...")
-                    return []
 
-            except Exception as e:
-                print(f"Error: Gemini API request failed: {e}")
-                if attempt < retry_count - 1:
-                    print("リトライします...")
+                if key not in merged:
+                    merged[key] = dict(task)
                     continue
-                else:
-                    return []
 
-        return []
+                existing = merged[key]
+                for field, value in task.items():
+                    if field == "dependencies":
+                        deps = list(existing.get("dependencies") or [])
+                        deps.extend(dep for dep in value or [] if dep not in deps)
+                        existing["dependencies"] = deps
+                    elif not existing.get(field) and value:
+                        existing[field] = value
+
+        return list(merged.values())
+
+    def _extract_from_text(self, meeting_notes: str, retry_count: int = 3) -> Optional[List[Dict]]:
+        """
+        1回のリクエストで議事録（またはその一部）からタスクを抽出する
+
+        Args:
+            meeting_notes: 議事録の内容
+            retry_count: リトライ回数
+
+        Returns:
+            抽出されたタスクのリスト（抽出に失敗した場合はNone）
+        """
+        with self.tracer.span("extract", notes_chars=len(meeting_notes)) as extract_span:
+            cache_key = ResponseCache.make_key(
+                self.model_name, EXTRACTION_PROMPT, EXTRACTION_TEMPERATURE, meeting_notes
+            )
+            cached_tasks = self.cache.get(cache_key)
+            if cached_tasks is not None:
+                print(f"✓ キャッシュから{len(cached_tasks)}個のタスクを読み込みました")
+                extract_span.set(cache_hit=True, tasks=len(cached_tasks))
+                return cached_tasks
+
+            with self.tracer.span("prompt.build") as span:
+                prompt = EXTRACTION_PROMPT.format(meeting_notes=meeting_notes)
+                span.set(prompt_chars=len(prompt), prompt_tokens_estimate=estimate_tokens(prompt))
+
+            for attempt in range(retry_count):
+                if attempt:
+                    extract_span.add("retries")
+                try:
+                    print(f"Gemini APIにリクエスト中... (試行 {attempt + 1}/{retry_count})")
+
+                    with self.tracer.span("model.call", model=self.model_name, attempt=attempt + 1) as span:
+                        response = self.model.generate_content(
+                            prompt,
+                            generation_config=load_genai().types.GenerationConfig(
+                                temperature=EXTRACTION_TEMPERATURE,
+                            )
+                        )
+
+                        # レスポンステキストの取得
+                        response_text = response.text.strip()
+                        span.set(response_chars=len(response_text), **usage_attributes(response))
+
+                    with self.tracer.span("json.parse", response_chars=len(response_text)) as span:
+                        # マークダウンのコードブロックを除去
+                        response_text = re.sub(r'^```json\s*', '', response_text)
+                        response_text = re.sub(r'^```\s*', '', response_text)
+                        response_text = re.sub(r'\s*```$', '', response_text)
+                        response_text = response_text.strip()
+
+                        # JSONパース
+                        tasks = json.loads(response_text)
+
+                        if not isinstance(tasks, list):
+                            raise ValueError("Response is not a JSON array")
+                        span.set(tasks=len(tasks))
+
+                    print(f"✓ {len(tasks)}個のタスクを抽出しました")
+                    extract_span.set(tasks=len(tasks))
+                    self.cache.put(cache_key, tasks)
+                    return tasks
+
+                except json.JSONDecodeError as e:
+                    print(f"Warning: JSON parse error (試行 {attempt + 1}/{retry_count}): {e}")
+                    if attempt < retry_count - 1:
+                        print("リトライします...")
+                        continue
+                    else:
+                        print("Error: Failed to parse Gemini response as JSON")
+                        print(f"Response: {response_text[:500]}...")
+                        return None
+
+                except Exception as e:
+                    print(f"Error: Gemini API request failed: {e}")
+                    if attempt < retry_count - 1:
+                        print("リトライします...")
+                        continue
+                    else:
+                        return None
+
+            return None
 
     def validate_and_normalize_tasks(self, tasks: List[Dict]) -> List[Dict]:
         """
         タスクのバリデーションと正規化
 
+        短縮形の値（"P1"、"M" など）は有効値に補正し、解決できない値はデフォルト値にします。
+        補正・置き換え・スキップの内容は self.diagnostics に記録します。
+
         Args:
             tasks: 抽出されたタスクのリスト
 
         Returns:
             バリデーション・正規化されたタスクのリスト
         """
-        normalized_tasks = []
-
-        valid_priorities = ["P0 (Critical)", "P1 (High)", "P2 (Medium)", "P3 (Low)"]
-        valid_sizes = ["XS (< 1日)", "S (1-2日)", "M (3-5日)", "L (1-2週)", "XL (2週以上)"]
-        valid_types = ["Feature", "Bug", "Chore", "Research", "Meeting Action"]
-        valid_teams = ["Product", "Engineering", "Sales", "Operations", "All"]
-        valid_impacts = ["High", "Medium", "Low"]
-
-        for i, task in enumerate(tasks):
-            # 必須フィールドのチェック
-            if not task.get("title"):
-                print(f"Warning: Task {i+1} missing title, skipping")
-                continue
-
-            # デフォルト値の設定
-            normalized_task = {
-                "title": task.get("title", "").strip(),
-                "description": task.get("description", "").strip(),
-                "assignee": task.get("assignee", "").strip(),
-                "priority": task.get("priority", "P2 (Medium)"),
-                "size": task.get("size", "M (3-5日)"),
-                "due_date": task.get("due_date"),
-                "type": task.get("type", "Meeting Action"),
-                "team": task.get("team", "Product"),
-                "business_impact": task.get("business_impact", "Medium"),
-                "dependencies": task.get("dependencies", []),
-                "context": task.get("context", "").strip()
-            }
-
-            # バリデーション
-            if normalized_task["priority"] not in valid_priorities:
-                print(f"Warning: Invalid priority '{normalized_task['priority']}' for task '{normalized_task['title']}', using default")
-                normalized_task["priority"] = "P2 (Medium)"
-
-            if normalized_task["size"] not in valid_sizes:
-                print(f"Warning: Invalid size '{normalized_task['size']}' for task '{normalized_task['title']}', using default")
-                normalized_task["size"] = "M (3-5日)"
-
-            if normalized_task["type"] not in valid_types:
-                print(f"Warning: Invalid type '{normalized_task['type']}' for task '{normalized_task['title']}', using default")
-                normalized_task["type"] = "Meeting Action"
-
-            if normalized_task["team"] not in valid_teams:
-                print(f"Warning: Invalid team '{normalized_task['team']}' for task '{normalized_task['title']}', using default")
-                normalized_task["team"] = "Product"
-
-            if normalized_task["business_impact"] not in valid_impacts:
-                print(f"Warning: Invalid impact '{normalized_task['business_impact']}' for task '{normalized_task['title']}', using default")
-                normalized_task["business_impact"] = "Medium"
-
-            # due_dateのバリデーション
-            if normalized_task["due_date"]:
-                try:
-                    datetime.strptime(normalized_task["due_date"], "%Y-%m-%d")
-                except ValueError:
-                    print(f"Warning: Invalid date format '{normalized_task['due_date']}' for task '{normalized_task['title']}', setting to None")
-                    normalized_task["due_date"] = None
+        with self.tracer.span("normalize", tasks=len(tasks)) as span:
+            normalized_tasks, diagnostics = self.schema.normalize_tasks(tasks)
+            self.diagnostics.extend(diagnostics)
+            span.set(normalized=len(normalized_tasks), diagnostics=len(diagnostics))
+        return normalized_tasks
 
-            normalized_tasks.append(normalized_task)
+    def iter_normalized_tasks(self, tasks: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        タスクを1つずつ検証・正規化する（ストリーミング抽出と組み合わせて使う）
 
-        return normalized_tasks
+        Args:
+            tasks: 抽出されたタスクのイテレータ
+
+        Yields:
+            バリデーション・正規化されたタスク
+        """
+        for i, task in enumerate(tasks, 1):
+            with self.tracer.span("normalize", tasks=1) as span:
+                normalized_task, diagnostics = self.schema.normalize(task, i)
+                self.diagnostics.extend(diagnostics)
+                span.set(normalized=int(normalized_task is not None), diagnostics=len(diagnostics))
+            if normalized_task is not None:
+                yield normalized_task
 
 
 def main():
@@ -259,10 +665,34 @@ def main():
     parser.add_argument("--file", "-f", required=True, help="議事録ファイルのパス")
     parser.add_argument("--output", "-o", help="出力JSONファイルのパス（省略時は標準出力）")
     parser.add_argument("--test", action="store_true", help="テストモード（結果を表示のみ）")
+    parser.add_argument("--chunk-tokens", type=int, default=CHUNK_TOKENS, help="1回のリクエストに含める議事録のトークン数（超える場合は分割）")
+    parser.add_argument("--max-workers", type=int, default=EXTRACTION_MAX_WORKERS, help="分割したウィンドウを並列に抽出する最大数")
+    parser.add_argument("--no-cache", action="store_true", help="LLMレスポンスキャッシュを使わない")
+    parser.add_argument("--incremental", action="store_true", help="前回から変更されたセクションのみ再抽出")
+    parser.add_argument("--stream", action="store_true", help="ストリーミングで抽出し、タスクが届いた順に検証する")
+    parser.add_argument("--trace", help="プロンプト作成・モデル呼び出し・JSONパース・正規化の処理時間とトークン数をトレースとして保存")
+    parser.add_argument("--trace-format", choices=TRACE_FORMATS, default=TRACE_FORMAT_JSONL, help="--trace の形式（jsonl / otlp）")
     args = parser.parse_args()
 
+    # 環境変数の読み込み
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        print("Error: Required packages not found. Please run: pip install -r requirements.txt")
+        sys.exit(1)
+    load_dotenv()
+
+    tracer = Tracer()
+    if args.trace:
+        tracer.export_on_exit(args.trace, args.trace_format)
+
     # MeetingAnalyzerの初期化
-    analyzer = MeetingAnalyzer()
+    analyzer = MeetingAnalyzer(
+        chunk_tokens=args.chunk_tokens,
+        max_workers=args.max_workers,
+        use_cache=not args.no_cache,
+        tracer=tracer
+    )
 
     # 議事録の読み込み
     print(f"議事録を読み込んでいます: {args.file}")
@@ -270,21 +700,32 @@ def main():
 
     # タスクの抽出
     print("タスクを抽出しています...")
-    tasks = analyzer.extract_tasks(meeting_notes)
+    if args.stream and not args.incremental:
+        # 抽出と検証・正規化を重ねて実行
+        normalized_tasks = list(analyzer.iter_normalized_tasks(analyzer.extract_tasks_stream(meeting_notes)))
+        if not normalized_tasks:
+            print("Error: No tasks extracted")
+            sys.exit(1)
+    else:
+        if args.incremental:
+            tasks = analyzer.extract_tasks_incremental(meeting_notes, args.file)
+        else:
+            tasks = analyzer.extract_tasks(meeting_notes)
 
-    if not tasks:
-        print("Error: No tasks extracted")
-        sys.exit(1)
+        if not tasks:
+            print("Error: No tasks extracted")
+            sys.exit(1)
 
-    # バリデーションと正規化
-    print("タスクを検証・正規化しています...")
-    normalized_tasks = analyzer.validate_and_normalize_tasks(tasks)
+        # バリデーションと正規化
+        print("タスクを検証・正規化しています...")
+        normalized_tasks = analyzer.validate_and_normalize_tasks(tasks)
 
     # 結果の出力
     output_data = {
         "source_file": args.file,
         "extracted_at": datetime.now().isoformat(),
-        "tasks": normalized_tasks
+        "tasks": normalized_tasks,
+        "diagnostics": analyzer.diagnostics.entries
     }
 
     if args.test:
@@ -305,6 +746,8 @@ def main():
     else:
         print(json.dumps(output_data, ensure_ascii=False, indent=2))
 
+    print(analyzer.cache.summary())
+    print(analyzer.diagnostics.summary())
     print(f"\n✓ 完了: {len(normalized_tasks)}個のタスクを抽出しました")
 
 
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+議事録をMarkdownの見出し単位で分割するモジュール
+
+長い議事録を、トークン予算に収まるウィンドウ（前のウィンドウとの重なり付き）に分割します。
+"""
+
+import re
+from typing import List
+
+# 見出し行（コードブロック外の "# " 〜 "###### "）
+HEADING_PATTERN = re.compile(r"^#{1,6}\s")
+FENCE_PATTERN = re.compile(r"^\s*(```|~~~)")
+
+# auto_create_issues.py が議事録に追記するセクションの見出し
+ISSUES_SECTION_HEADING = "## 作成されたGitHub Issues"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    テキストのトークン数を概算する
+
+    日本語などの非ASCII文字は1文字 ≒ 1トークン、ASCIIは4文字 ≒ 1トークンとして数えます。
+
+    Args:
+        text: 対象のテキスト
+
+    Returns:
+        概算トークン数
+    """
+    ascii_chars = sum(1 for char in text if char.isascii())
+    return (len(text) - ascii_chars) + (ascii_chars + 3) // 4
+
+
+def split_sections(text: str) -> List[str]:
+    """
+    Markdownの見出しでテキストをセクションに分割する
+
+    コードブロック内の "#" は見出しとして扱いません。
+    各セクションは見出し行から次の見出しの直前までです（最初の見出しより前の部分も1セクション）。
+
+    Args:
+        text: Markdownテキスト
+
+    Returns:
+        セクションのリスト（結合すると元のテキストに戻る）
+    """
+    sections = []
+    current = []
+    in_fence = False
+
+    for line in text.splitlines(keepends=True):
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        elif not in_fence and HEADING_PATTERN.match(line) and current:
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+
+    if current:
+        sections.append("".join(current))
+    return sections
+
+
+def strip_generated_sections(text: str) -> str:
+    """
+    自動追記されたIssueリンクのセクションを取り除く
+
+    ISSUES_SECTION_HEADING から、同じかそれより上位の次の見出し（またはファイル末尾）までを削除します。
+
+    Args:
+        text: Markdownテキスト
+
+    Returns:
+        自動追記部分を除いたテキスト
+    """
+    kept = []
+    skipping = False
+    for section in split_sections(text):
+        heading = section.split("\n", 1)[0].rstrip()
+        if heading == ISSUES_SECTION_HEADING:
+            skipping = True
+            continue
+        if skipping:
+            level = len(heading) - len(heading.lstrip("#"))
+            if not HEADING_PATTERN.match(heading) or level > 2:
+                continue
+            skipping = False
+        kept.append(section)
+    return "".join(kept).rstrip() + "\n"
+
+
+def _split_oversized(section: str, max_tokens: int) -> List[str]:
+    """
+    予算を超えるセクションを行単位で分割する
+
+    Args:
+        section: セクションのテキスト
+        max_tokens: 1つあたりのトークン予算
+
+    Returns:
+        予算内に収まるテキストのリスト
+    """
+    pieces = []
+    current = []
+    current_tokens = 0
+
+    for line in section.splitlines(keepends=True):
+        line_tokens = estimate_tokens(line)
+        if current and current_tokens + line_tokens > max_tokens:
+            pieces.append("".join(current))
+            current = []
+            current_tokens = 0
+        current.append(line)
+        current_tokens += line_tokens
+
+    if current:
+        pieces.append("".join(current))
+    return pieces
+
+
+def _tail(text: str, max_tokens: int) -> str:
+    """
+    テキストの末尾から予算内に収まる行を取り出す（ウィンドウ間の重なり用）
+
+    Args:
+        text: 対象のテキスト
+        max_tokens: トークン予算
+
+    Returns:
+        末尾のテキスト
+    """
+    lines = []
+    tokens = 0
+    for line in reversed(text.splitlines(keepends=True)):
+        line_tokens = estimate_tokens(line)
+        if tokens + line_tokens > max_tokens:
+            break
+        lines.append(line)
+        tokens += line_tokens
+    return "".join(reversed(lines))
+
+
+def build_windows(text: str, max_tokens: int, overlap_tokens: int = 0) -> List[str]:
+    """
+    見出し境界でトークン予算に収まるウィンドウに分割する
+
+    セクションを順に詰め、予算を超える場合は新しいウィンドウを始めます。
+    2つ目以降のウィンドウには、前のウィンドウの末尾（overlap_tokens分）を先頭に付けます。
+
+    Args:
+        text: Markdownテキスト
+        max_tokens: 1ウィンドウあたりのトークン予算（重なり分を除く）
+        overlap_tokens: 前のウィンドウと重ねるトークン数
+
+    Returns:
+        ウィンドウのリスト
+    """
+    pieces = []
+    for section in split_sections(text):
+        if estimate_tokens(section) > max_tokens:
+            pieces.extend(_split_oversized(section, max_tokens))
+        else:
+            pieces.append(section)
+
+    windows = []
+    current = []
+    current_tokens = 0
+    for piece in pieces:
+        piece_tokens = estimate_tokens(piece)
+        if current and current_tokens + piece_tokens > max_tokens:
+            windows.append("".join(current))
+            current = []
+            current_tokens = 0
+        current.append(piece)
+        current_tokens += piece_tokens
+    if current:
+        windows.append("".join(current))
+
+    if overlap_tokens <= 0:
+        return windows
+
+    overlapped = windows[:1]
+    for previous, window in zip(windows, windows[1:]):
+        overlap = _tail(previous, overlap_tokens)
+        overlapped.append(overlap + window if overlap else window)
+    return overlapped
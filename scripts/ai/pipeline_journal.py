@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Issue作成パイプラインのチェックポイントジャーナル
+
+議事録ごとに、タスクの抽出結果と各タスクの完了したステージ
+（Issue作成・Projects追加・フィールド設定）をJSON Linesで追記します。
+途中で失敗した実行を --resume で再開すると、完了済みのステージをスキップします。
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from local_cache import cache_path
+
+# タスクごとのステージ（この順に進む）
+STAGE_ISSUE_CREATED = "issue_created"
+STAGE_PROJECT_ADDED = "project_added"
+STAGE_FIELDS_SET = "fields_set"
+
+
+class PipelineJournal:
+    """追記専用のチェックポイントジャーナル"""
+
+    def __init__(self, path: Path, resume: bool = False):
+        """
+        Args:
+            path: ジャーナルファイルのパス
+            resume: Trueの場合、既存のジャーナルを読み込んで続きから記録する
+                    （Falseの場合は新しいジャーナルを始める）
+        """
+        self.path = path
+        self.tasks: Optional[List[Dict]] = None
+        self.stages: Dict[str, Dict[str, Dict]] = {}
+        self._lock = threading.Lock()
+
+        if resume:
+            self._load()
+        else:
+            path.unlink(missing_ok=True)
+
+    @classmethod
+    def for_source(cls, source: str, resume: bool = False) -> "PipelineJournal":
+        """
+        議事録ファイルごとのジャーナルを開く
+
+        Args:
+            source: 議事録ファイルのパス
+            resume: Trueの場合、既存のジャーナルから再開
+
+        Returns:
+            .cache/journal/ 配下のジャーナル
+        """
+        source_id = hashlib.sha256(str(Path(source).resolve()).encode("utf-8")).hexdigest()[:16]
+        return cls(cache_path("journal", f"{source_id}.jsonl"), resume=resume)
+
+    def _load(self) -> None:
+        """ジャーナルを読み込む（書き込み途中で壊れた最終行は無視する）"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get("event") == "extracted":
+                self.tasks = entry["tasks"]
+            elif entry.get("fingerprint"):
+                self.stages.setdefault(entry["fingerprint"], {})[entry["event"]] = entry.get("data") or {}
+
+    def _append(self, entry: Dict) -> None:
+        """1行追記してディスクに書き出す（クラッシュしても記録済みの行は残る）"""
+        entry["at"] = datetime.now().isoformat()
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def record_extracted(self, tasks: List[Dict]) -> None:
+        """
+        抽出・正規化したタスクを記録する
+
+        Args:
+            tasks: 正規化されたタスクのリスト
+        """
+        self.tasks = tasks
+        self._append({"event": "extracted", "tasks": tasks})
+
+    def record(self, fingerprint: Optional[str], stage: str, data: Optional[Dict] = None) -> None:
+        """
+        タスクのステージ完了を記録する
+
+        Args:
+            fingerprint: タスクのフィンガープリント
+            stage: STAGE_* のいずれか
+            data: ステージの結果（Issue情報、Project Item IDなど）
+        """
+        if not fingerprint:
+            return
+        with self._lock:
+            self.stages.setdefault(fingerprint, {})[stage] = data or {}
+        self._append({"event": stage, "fingerprint": fingerprint, "data": data or {}})
+
+    def get(self, fingerprint: Optional[str], stage: str) -> Optional[Dict]:
+        """
+        完了したステージの結果を取得する
+
+        Args:
+            fingerprint: タスクのフィンガープリント
+            stage: STAGE_* のいずれか
+
+        Returns:
+            記録された結果（未完了の場合はNone）
+        """
+        with self._lock:
+            return self.stages.get(fingerprint, {}).get(stage)
+
+    def summary(self) -> str:
+        """完了済みステージ数のサマリー文字列"""
+        counts = {STAGE_ISSUE_CREATED: 0, STAGE_PROJECT_ADDED: 0, STAGE_FIELDS_SET: 0}
+        with self._lock:
+            for stages in self.stages.values():
+                for stage in stages:
+                    if stage in counts:
+                        counts[stage] += 1
+        return (
+            f"ジャーナル: Issue作成 {counts[STAGE_ISSUE_CREATED]} / "
+            f"Projects追加 {counts[STAGE_PROJECT_ADDED]} / フィールド設定 {counts[STAGE_FIELDS_SET]}"
+        )
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Projects v2のフィールド構成を解決するモジュール
+
+1回のGraphQLクエリでプロジェクトの全フィールドとSingle Selectの選択肢IDを取得し、
+プロジェクトIDごとにディスクへキャッシュします。
+"""
+
+import re
+import time
+from typing import Callable, Dict, Optional
+
+from local_cache import cache_path, read_json, write_json
+
+# キャッシュの有効期限（秒）
+SCHEMA_CACHE_TTL = 24 * 60 * 60
+
+SCHEMA_QUERY = """
+query($projectId: ID!) {
+  node(id: $projectId) {
+    ... on ProjectV2 {
+      id
+      fields(first: 100) {
+        nodes {
+          ... on ProjectV2FieldCommon {
+            id
+            name
+            dataType
+          }
+          ... on ProjectV2SingleSelectField {
+            options {
+              id
+              name
+            }
+          }
+        }
+      }
+    }
+  }
+  rateLimit { cost remaining resetAt limit }
+}
+"""
+
+
+class ProjectSchemaResolver:
+    """Projects v2のフィールドIDと選択肢IDを解決するクラス"""
+
+    def __init__(self, graphql: Callable[[str, Dict], Dict], ttl: int = SCHEMA_CACHE_TTL, offline: bool = False):
+        """
+        Args:
+            graphql: GraphQLクエリを実行する関数 (query, variables) -> レスポンスJSON
+            ttl: キャッシュの有効期限（秒）
+            offline: Trueの場合、取得せずにキャッシュだけを使う（期限切れのキャッシュも使う）
+        """
+        self.graphql = graphql
+        self.ttl = ttl
+        self.offline = offline
+        self._schemas: Dict[str, Dict] = {}
+        # 同じ実行中に再取得するのは1回まで
+        self._refreshed = set()
+
+    def _cache_file(self, project_id: str):
+        safe_id = re.sub(r"[^A-Za-z0-9_-]", "_", project_id)
+        return cache_path("github", f"project_schema_{safe_id}.json")
+
+    def _fetch(self, project_id: str) -> Optional[Dict]:
+        """
+        GraphQLでフィールド構成を取得してキャッシュに保存
+
+        Args:
+            project_id: Project ID
+
+        Returns:
+            フィールド構成（取得できない場合はNone）
+        """
+        try:
+            result = self.graphql(SCHEMA_QUERY, {"projectId": project_id})
+        except Exception as e:
+            print(f"Error fetching project fields: {e}")
+            return None
+
+        node = (result.get("data") or {}).get("node")
+        if "errors" in result or not node:
+            print(f"Error fetching project fields: {result.get('errors')}")
+            return None
+
+        fields = {}
+        for field in node["fields"]["nodes"]:
+            if not field.get("name"):
+                continue
+            fields[field["name"]] = {
+                "id": field["id"],
+                "data_type": field.get("dataType"),
+                "options": {option["name"]: option["id"] for option in field.get("options") or []}
+            }
+
+        schema = {"project_id": project_id, "fetched_at": time.time(), "fields": fields}
+        write_json(self._cache_file(project_id), schema)
+        self._schemas[project_id] = schema
+        print(f"✓ Loaded {len(fields)} project fields")
+        return schema
+
+    def get_schema(self, project_id: str, refresh: bool = False) -> Optional[Dict]:
+        """
+        フィールド構成を取得（キャッシュが有効ならキャッシュを使う）
+
+        Args:
+            project_id: Project ID
+            refresh: Trueの場合、キャッシュを無視して再取得
+
+        Returns:
+            {"project_id", "fetched_at", "fields": {フィールド名: {"id", "data_type", "options"}}}
+        """
+        if not refresh:
+            schema = self._schemas.get(project_id)
+            if schema is None:
+                schema = read_json(self._cache_file(project_id))
+            # プロジェクトIDが一致しない・期限切れのキャッシュは使わない（オフラインでは期限切れも使う）
+            if (
+                schema
+                and schema.get("project_id") == project_id
+                and (self.offline or time.time() - schema.get("fetched_at", 0) < self.ttl)
+            ):
+                self._schemas[project_id] = schema
+                return schema
+
+        if self.offline:
+            if project_id not in self._refreshed:
+                print(f"Warning: Project fields for {project_id} are not cached (run once online to cache them)")
+                self._refreshed.add(project_id)
+            return None
+
+        self._refreshed.add(project_id)
+        return self._fetch(project_id)
+
+    def invalidate(self, project_id: str) -> None:
+        """
+        キャッシュを破棄する（次回は再取得される）
+
+        Args:
+            project_id: Project ID
+        """
+        self._schemas.pop(project_id, None)
+        self._cache_file(project_id).unlink(missing_ok=True)
+
+    def resolve(self, project_id: str, field_name: str, option_name: Optional[str] = None) -> Optional[Dict]:
+        """
+        フィールド名（と選択肢名）からIDを解決する
+
+        キャッシュに見つからない場合はフィールド構成が変わった可能性があるため、
+        1回だけ再取得してから解決を試みます。
+
+        Args:
+            project_id: Project ID
+            field_name: フィールド名
+            option_name: Single Selectの選択肢名
+
+        Returns:
+            {"field_id", "data_type", "option_id"}（見つからない場合はNone）
+        """
+        for _ in range(2):
+            schema = self.get_schema(project_id)
+            if not schema:
+                return None
+
+            field = schema["fields"].get(field_name)
+            if field and (option_name is None or option_name in field["options"]):
+                return {
+                    "field_id": field["id"],
+                    "data_type": field["data_type"],
+                    "option_id": field["options"].get(option_name) if option_name else None
+                }
+
+            if self.offline or project_id in self._refreshed:
+                return None
+            self.invalidate(project_id)
+
+        return None
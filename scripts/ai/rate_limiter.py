@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+GitHub REST・GraphQL共通のレート制限ガバナー
+
+レスポンスヘッダー（X-RateLimit-*）とGraphQLの rateLimit { cost remaining resetAt } から
+プライマリレート制限の残量をリソース（core / graphql）ごとに追跡し、残量が少なくなったら
+リセットまで均等に間隔を空けます。セカンダリレート制限（コンテンツ作成数・ポイント/分）は
+送信時刻のスライディングウィンドウで先回りして守り、待機回数・待機時間などをメトリクスとして公開します。
+"""
+
+import bisect
+import json
+import re
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Mapping, Optional
+
+# リソース名（X-RateLimit-Resource ヘッダーの値）
+RESOURCE_CORE = "core"
+RESOURCE_GRAPHQL = "graphql"
+
+# セカンダリレート制限（GitHubのドキュメントの上限）
+# コンテンツ作成（Issue作成・コメントなど）のリクエスト数と、1分あたりのポイント
+# （RESTのGET・GraphQLのクエリは1ポイント、POST・PATCH・mutationは5ポイント。
+#   どちらもHTTPリクエスト単位で数え、エイリアス付きmutationも1リクエスト）
+CONTENT_CREATION_PER_MINUTE = 80
+CONTENT_CREATION_PER_HOUR = 500
+POINTS_PER_MINUTE = {RESOURCE_CORE: 900, RESOURCE_GRAPHQL: 2000}
+READ_POINTS = 1
+WRITE_POINTS = 5
+
+# コンテンツを作成しないmutation（既存のアイテムの値の変更）
+NON_CONTENT_MUTATION = re.compile(r"^(update|clear)\w*$")
+
+# プライマリの残量がこの割合を下回ったら、リセットまで均等に間隔を空ける
+PRIMARY_RESERVE_RATIO = 0.1
+
+
+def creates_content(mutation: str) -> bool:
+    """
+    GraphQLのmutationがコンテンツを作成するか（updateProjectV2ItemFieldValue などの変更のみなら False）
+
+    Args:
+        mutation: GraphQLのmutationドキュメント
+
+    Returns:
+        コンテンツを作成するフィールドを1つでも含む場合True
+    """
+    fields = re.findall(r"(\w+)\s*\(\s*input\s*:", mutation)
+    return not fields or any(not NON_CONTENT_MUTATION.match(field) for field in fields)
+
+
+class SlidingWindow:
+    """期間内に送ったリクエストの時刻と量を記録するスライディングウィンドウ"""
+
+    def __init__(self, limit: float, period: float):
+        """
+        Args:
+            limit: 期間あたりの上限
+            period: 期間（秒）
+        """
+        self.limit = limit
+        self.period = period
+        # (時刻, 量) を時刻順に保持する
+        self._entries = deque()
+        self._total = 0.0
+
+    def _expire(self, now: float) -> None:
+        while self._entries and self._entries[0][0] <= now - self.period:
+            self._total -= self._entries.popleft()[1]
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """
+        amount を送れるようになるまでの秒数（呼び出し元でロックを取る）
+
+        Args:
+            amount: 送る量
+            now: 現在時刻（monotonic）
+
+        Returns:
+            待機秒数（今すぐ送れる場合は0）
+        """
+        self._expire(now)
+        excess = self._total + amount - self.limit
+        if excess <= 0:
+            return 0.0
+        # 古い記録から順に期間外に出て、超過分が空くまで待つ
+        for at, recorded in self._entries:
+            excess -= recorded
+            if excess <= 0:
+                return at + self.period - now
+        # 1回で上限を超える量は、ウィンドウが空になった時点で送る
+        return (self._entries[-1][0] + self.period - now) if self._entries else 0.0
+
+    def record(self, amount: float, now: float) -> None:
+        """送った量を記録する（呼び出し元でロックを取る）"""
+        if self._entries and now < self._entries[-1][0]:
+            # 並列のスレッドで時刻が前後した場合も時刻順に保つ
+            index = bisect.bisect_right([at for at, _ in self._entries], now)
+            self._entries.insert(index, (now, amount))
+        else:
+            self._entries.append((now, amount))
+        self._total += amount
+
+
+class RateLimitGovernor:
+    """REST・GraphQLのレート制限をまとめて管理するガバナー"""
+
+    def __init__(
+        self,
+        content_per_minute: int = CONTENT_CREATION_PER_MINUTE,
+        content_per_hour: int = CONTENT_CREATION_PER_HOUR,
+        points_per_minute: Optional[Dict[str, int]] = None,
+        reserve_ratio: float = PRIMARY_RESERVE_RATIO,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            content_per_minute: 1分あたりのコンテンツ作成数の上限
+            content_per_hour: 1時間あたりのコンテンツ作成数の上限
+            points_per_minute: リソースごとの1分あたりのポイントの上限
+            reserve_ratio: プライマリの残量がこの割合を下回ったら均等に間隔を空ける
+            clock: 現在時刻（monotonic）を返す関数
+            sleep: 待機する関数
+        """
+        self.reserve_ratio = reserve_ratio
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+        points_per_minute = points_per_minute or POINTS_PER_MINUTE
+        self._content_windows = [
+            SlidingWindow(content_per_minute, 60),
+            SlidingWindow(content_per_hour, 60 * 60)
+        ]
+        self._point_windows = {resource: SlidingWindow(limit, 60) for resource, limit in points_per_minute.items()}
+
+        # リソースごとのプライマリレート制限 {"limit", "remaining", "used", "reset"（UNIX時刻）}
+        self.budgets: Dict[str, Dict] = {}
+        # 均等割りのときの次に実行できる時刻（monotonic）
+        self._next_slot: Dict[str, float] = {}
+        self._metrics = {
+            "calls": {},
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "primary_waits": 0,
+            "secondary_waits": 0,
+            "graphql_cost": 0
+        }
+
+    def _primary_wait(self, resource: str, now: float) -> float:
+        """プライマリレート制限の残量から待機秒数を決める（ロック内で呼ぶ）"""
+        slot = max(self._next_slot.get(resource, now), now)
+        budget = self.budgets.get(resource)
+        if not budget or budget["remaining"] is None or budget["reset"] is None:
+            return slot - now
+
+        reset_in = budget["reset"] - time.time()
+        if reset_in <= 0:
+            # リセット時刻を過ぎた（次のレスポンスで新しいウィンドウの残量に更新される）
+            return slot - now
+        if budget["remaining"] <= 0:
+            # 使い切った: リセットまで全員を待たせ、リセット後のウィンドウから1つ使う
+            self._next_slot[resource] = max(slot, now + reset_in)
+            budget["remaining"] = (budget["limit"] or 1) - 1
+            return self._next_slot[resource] - now
+
+        budget["remaining"] -= 1
+        if budget["limit"] and budget["remaining"] >= budget["limit"] * self.reserve_ratio:
+            return slot - now
+
+        # 残量が少ない: リセットまでの時間を残りの回数で均等に割る
+        self._next_slot[resource] = slot + reset_in / (budget["remaining"] + 1)
+        return slot - now
+
+    def acquire(self, resource: str, write: bool = False, content: Optional[bool] = None) -> float:
+        """
+        リクエストを送る前に呼び、必要なら上限に触れないように待機する
+
+        セカンダリレート制限はHTTPリクエスト単位で数えます（エイリアス付きmutationも1リクエスト）。
+
+        Args:
+            resource: RESOURCE_CORE（REST）または RESOURCE_GRAPHQL
+            write: POST・PATCH・mutation（5ポイント）か
+            content: コンテンツを作成するリクエストか（省略時は write と同じ）
+
+        Returns:
+            待機した秒数
+        """
+        content = write if content is None else content
+        windows = []
+        if resource in self._point_windows:
+            windows.append((self._point_windows[resource], WRITE_POINTS if write else READ_POINTS))
+        if content:
+            windows.extend((window, 1) for window in self._content_windows)
+
+        secondary = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                wait = max((window.wait_time(amount, now) for window, amount in windows), default=0.0)
+                if wait <= 0:
+                    calls = self._metrics["calls"]
+                    calls[resource] = calls.get(resource, 0) + 1
+                    primary = self._primary_wait(resource, now)
+                    # 実際に送る時刻で記録する
+                    for window, amount in windows:
+                        window.record(amount, now + primary)
+                    if secondary + primary > 0:
+                        self._metrics["waits"] += 1
+                        self._metrics["wait_seconds"] += secondary + primary
+                        self._metrics["primary_waits" if primary >= secondary else "secondary_waits"] += 1
+                    break
+            # 待っている間に他のスレッドが送ることがあるため、待機後にもう一度確かめる
+            self._sleep(wait)
+            secondary += wait
+
+        if primary > 0:
+            self._sleep(primary)
+        return secondary + primary
+
+    def observe(self, headers: Optional[Mapping], resource: Optional[str] = None) -> None:
+        """
+        レスポンスヘッダーのレート制限を取り込む
+
+        Args:
+            headers: レスポンスヘッダー（X-RateLimit-Limit / Remaining / Used / Reset / Resource）
+            resource: X-RateLimit-Resource がない場合のリソース名
+        """
+        if not headers:
+            return
+        headers = {key.lower(): value for key, value in headers.items()}
+        if "x-ratelimit-remaining" not in headers:
+            return
+        try:
+            self.update(
+                headers.get("x-ratelimit-resource") or resource or RESOURCE_CORE,
+                limit=int(headers["x-ratelimit-limit"]) if "x-ratelimit-limit" in headers else None,
+                remaining=int(headers["x-ratelimit-remaining"]),
+                reset=float(headers["x-ratelimit-reset"]) if "x-ratelimit-reset" in headers else None,
+                used=int(headers["x-ratelimit-used"]) if "x-ratelimit-used" in headers else None
+            )
+        except ValueError:
+            return
+
+    def observe_graphql(self, rate_limit: Optional[Dict]) -> None:
+        """
+        GraphQLのレスポンスの rateLimit { cost remaining resetAt limit } を取り込む
+
+        Args:
+            rate_limit: レスポンスの data.rateLimit
+        """
+        if not rate_limit:
+            return
+        reset = None
+        if rate_limit.get("resetAt"):
+            from datetime import datetime
+            reset = datetime.fromisoformat(rate_limit["resetAt"].replace("Z", "+00:00")).timestamp()
+        with self._lock:
+            self._metrics["graphql_cost"] += rate_limit.get("cost") or 0
+        self.update(RESOURCE_GRAPHQL, limit=rate_limit.get("limit"), remaining=rate_limit.get("remaining"), reset=reset)
+
+    def update(
+        self,
+        resource: str,
+        limit: Optional[int] = None,
+        remaining: Optional[int] = None,
+        reset: Optional[float] = None,
+        used: Optional[int] = None
+    ) -> None:
+        """
+        プライマリレート制限の残量を更新する
+
+        並列に送ったリクエストのレスポンスは順不同で届くため、同じリセット時刻の間は
+        少ない方の残量を使います。
+
+        Args:
+            resource: リソース名
+            limit: 上限
+            remaining: 残量
+            reset: リセット時刻（UNIX時刻）
+            used: 使用量
+        """
+        with self._lock:
+            budget = self.budgets.setdefault(resource, {"limit": None, "remaining": None, "used": None, "reset": None})
+            if reset is not None and budget["reset"] is not None and reset < budget["reset"] - 1:
+                # 前のウィンドウのレスポンスが遅れて届いた
+                return
+            new_window = reset is not None and budget["reset"] is not None and reset > budget["reset"] + 1
+            if remaining is not None:
+                if not new_window and budget["remaining"] is not None:
+                    remaining = min(remaining, budget["remaining"])
+                budget["remaining"] = remaining
+            if limit is not None:
+                budget["limit"] = limit
+            if used is not None:
+                budget["used"] = used
+            if reset is not None:
+                budget["reset"] = reset
+            if new_window:
+                # 前のウィンドウの均等割りの予定は使わない
+                self._next_slot.pop(resource, None)
+
+    def metrics(self) -> Dict:
+        """
+        現在の状態
+
+        Returns:
+            {"budgets": リソースごとの残量, "calls", "waits", "wait_seconds",
+             "primary_waits", "secondary_waits", "graphql_cost"}
+        """
+        with self._lock:
+            snapshot = json.loads(json.dumps(self._metrics))
+            snapshot["budgets"] = {resource: dict(budget) for resource, budget in self.budgets.items()}
+        return snapshot
+
+    def summary(self) -> str:
+        """メトリクスのサマリー文字列"""
+        metrics = self.metrics()
+        budgets = []
+        for resource, budget in sorted(metrics["budgets"].items()):
+            if budget["remaining"] is not None:
+                budgets.append(f"{resource} 残り {budget['remaining']}/{budget['limit'] or '?'}")
+        return (
+            f"レート制限: {' / '.join(budgets) or '情報なし'} / "
+            f"待機 {metrics['waits']}回（{metrics['wait_seconds']:.1f}s、プライマリ {metrics['primary_waits']} / "
+            f"セカンダリ {metrics['secondary_waits']}）"
+        )
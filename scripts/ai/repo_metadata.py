@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+リポジトリのメタデータ（Node ID・ラベル・アサイン可能なユーザー・Project ID）をキャッシュするモジュール
+
+REST APIのレスポンスをETagと一緒に .cache/github/ に保存し、次の実行では
+If-None-Match で再検証します。変更がなければGitHubは304を返し、304はプライマリの
+レート制限を消費しないため、繰り返しの実行ではメタデータの取得が条件付きリクエストだけになります。
+Project ID（GraphQL）はETagに対応していないため、無効化するまで再取得しません。
+"""
+
+import re
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from local_cache import cache_path, read_json, write_json
+
+# ラベル・アサイン可能なユーザーの1ページあたりの件数（REST APIの上限）
+METADATA_PER_PAGE = 100
+
+RESOURCE_REPOSITORY = "repository"
+RESOURCE_LABELS = "labels"
+RESOURCE_ASSIGNEES = "assignees"
+
+
+def _repository_fields(data: Dict) -> Dict:
+    return {
+        "id": data.get("id"),
+        "node_id": data.get("node_id"),
+        "full_name": data.get("full_name"),
+        "default_branch": data.get("default_branch")
+    }
+
+
+def _label_fields(data: List[Dict]) -> List[Dict]:
+    return [{"name": label["name"], "color": label.get("color")} for label in data]
+
+
+def _assignee_fields(data: List[Dict]) -> List[str]:
+    return [user["login"] for user in data]
+
+
+class RepoMetadataCache:
+    """リポジトリのメタデータをETagで再検証しながらキャッシュするクラス"""
+
+    def __init__(
+        self,
+        owner: str,
+        repo: str,
+        api_url: str,
+        get: Optional[Callable[[str, Dict], Any]] = None,
+        offline: bool = False
+    ):
+        """
+        Args:
+            owner: リポジトリオーナー
+            repo: リポジトリ名
+            api_url: REST APIのベースURL
+            get: 条件付きGETを送る関数 (url, headers) -> requests.Response
+            offline: Trueの場合、再検証せずにキャッシュだけを使う
+        """
+        self.owner = owner
+        self.repo = repo
+        self.api_url = api_url.rstrip("/")
+        self.get = get
+        self.offline = offline or get is None
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{owner}_{repo}")
+        self.cache_file = cache_path("github", f"repo_metadata_{safe_name}.json")
+        self._data: Dict = read_json(self.cache_file) or {}
+        # 再検証するのは実行ごとに1回まで（並列ワーカーからの同時呼び出しはロックで1回にまとめる）
+        self._validated: Set[str] = set()
+        self._lock = threading.Lock()
+        self.not_modified = 0
+        self.fetched = 0
+
+    def _save(self) -> None:
+        write_json(self.cache_file, self._data)
+
+    def _revalidate(self, resource: str, url: str, fields: Callable, paginated: bool) -> Optional[Any]:
+        """
+        キャッシュ済みのページをIf-None-Matchで再検証し、変更されたページだけ取得し直す
+
+        Args:
+            resource: キャッシュのキー
+            url: 最初のページのURL
+            fields: レスポンスJSONからキャッシュする値を取り出す関数
+            paginated: Linkヘッダーの次のページもたどるか
+
+        Returns:
+            ページの値（ページ分割されている場合は連結したリスト。取得できない場合はNone）
+        """
+        with self._lock:
+            entry = self._data.get(resource)
+            if resource in self._validated or self.offline:
+                return self._values(entry, paginated)
+
+            cached_pages = {page["url"]: page for page in (entry or {}).get("pages", [])}
+            pages = []
+            try:
+                while url:
+                    cached = cached_pages.get(url)
+                    headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else {}
+                    response = self.get(url, headers)
+                    if response.status_code == 304 and cached:
+                        self.not_modified += 1
+                        page = cached
+                    else:
+                        response.raise_for_status()
+                        self.fetched += 1
+                        page = {
+                            "url": url,
+                            "etag": response.headers.get("ETag"),
+                            "next": response.links.get("next", {}).get("url") if paginated else None,
+                            "data": fields(response.json())
+                        }
+                    pages.append(page)
+                    url = page.get("next")
+            except Exception as e:
+                # 取得できなければ前回のキャッシュを使う（この実行では再試行しない）
+                self._validated.add(resource)
+                print(f"Warning: Could not revalidate {resource} of {self.owner}/{self.repo}: {e}")
+                return self._values(entry, paginated)
+
+            self._data[resource] = {"checked_at": datetime.now().isoformat(), "pages": pages}
+            self._save()
+            self._validated.add(resource)
+            return self._values(self._data[resource], paginated)
+
+    @staticmethod
+    def _values(entry: Optional[Dict], paginated: bool) -> Optional[Any]:
+        if not entry or not entry.get("pages"):
+            return None
+        if not paginated:
+            return entry["pages"][0]["data"]
+        return [value for page in entry["pages"] for value in page["data"]]
+
+    def repository(self) -> Optional[Dict]:
+        """
+        リポジトリの基本情報
+
+        Returns:
+            {"id", "node_id", "full_name", "default_branch"}（取得できない場合はNone）
+        """
+        url = f"{self.api_url}/repos/{self.owner}/{self.repo}"
+        return self._revalidate(RESOURCE_REPOSITORY, url, _repository_fields, paginated=False)
+
+    def labels(self) -> Optional[Dict[str, Dict]]:
+        """
+        リポジトリに存在するラベル
+
+        Returns:
+            {ラベル名: {"name", "color"}}（取得できない場合はNone）
+        """
+        url = f"{self.api_url}/repos/{self.owner}/{self.repo}/labels?per_page={METADATA_PER_PAGE}"
+        labels = self._revalidate(RESOURCE_LABELS, url, _label_fields, paginated=True)
+        return None if labels is None else {label["name"]: label for label in labels}
+
+    def assignable_users(self) -> Optional[Set[str]]:
+        """
+        Issueにアサインできるユーザー
+
+        Returns:
+            ログイン名（小文字）の集合（取得できない場合はNone）
+        """
+        url = f"{self.api_url}/repos/{self.owner}/{self.repo}/assignees?per_page={METADATA_PER_PAGE}"
+        logins = self._revalidate(RESOURCE_ASSIGNEES, url, _assignee_fields, paginated=True)
+        return None if logins is None else {login.lower() for login in logins}
+
+    def project_id(self, project_number: int) -> Optional[str]:
+        """
+        キャッシュ済みのProject ID
+
+        Args:
+            project_number: プロジェクト番号
+
+        Returns:
+            Project Node ID（キャッシュにない場合はNone）
+        """
+        with self._lock:
+            project = self._data.get("projects", {}).get(str(project_number))
+        return project["id"] if project else None
+
+    def set_project_id(self, project_number: int, project_id: str, title: Optional[str] = None) -> None:
+        """
+        取得したProject IDをキャッシュに保存
+
+        Args:
+            project_number: プロジェクト番号
+            project_id: Project Node ID
+            title: プロジェクト名
+        """
+        with self._lock:
+            self._data.setdefault("projects", {})[str(project_number)] = {
+                "id": project_id,
+                "title": title,
+                "fetched_at": datetime.now().isoformat()
+            }
+            self._save()
+
+    def invalidate(self) -> None:
+        """キャッシュを削除する（次に使うときにすべて取得し直す）"""
+        with self._lock:
+            self._data = {}
+            self._validated.clear()
+            self.cache_file.unlink(missing_ok=True)
+
+    def describe(self) -> str:
+        """
+        キャッシュの内容を人が読める形式で返す
+
+        Returns:
+            キャッシュの内容
+        """
+        lines = [f"Metadata cache: {self.cache_file}"]
+        if not self._data:
+            lines.append("  (empty)")
+            return "\n".join(lines)
+
+        def checked(resource: str) -> str:
+            entry = self._data.get(resource) or {}
+            etags = ", ".join(page.get("etag") or "-" for page in entry.get("pages", []))
+            return f"checked at {entry.get('checked_at', '-')}, ETag: {etags or '-'}"
+
+        repository = self._values(self._data.get(RESOURCE_REPOSITORY), paginated=False)
+        if repository:
+            lines.append(f"  Repository: {repository['full_name']} (node ID: {repository['node_id']}; {checked(RESOURCE_REPOSITORY)})")
+        labels = self._values(self._data.get(RESOURCE_LABELS), paginated=True)
+        if labels is not None:
+            lines.append(f"  Labels ({len(labels)}; {checked(RESOURCE_LABELS)}):")
+            lines.extend(f"    - {label['name']}" for label in labels)
+        assignees = self._values(self._data.get(RESOURCE_ASSIGNEES), paginated=True)
+        if assignees is not None:
+            lines.append(f"  Assignable users ({len(assignees)}; {checked(RESOURCE_ASSIGNEES)}):")
+            lines.extend(f"    - {login}" for login in assignees)
+        for number, project in sorted(self._data.get("projects", {}).items()):
+            lines.append(
+                f"  Project #{number}: {project.get('title') or '-'} (ID: {project['id']}; fetched at {project['fetched_at']})"
+            )
+        return "\n".join(lines)
+
+    def summary(self) -> str:
+        """
+        この実行での再検証の結果
+
+        Returns:
+            サマリー文字列
+        """
+        return f"メタデータの再検証: 304 Not Modified {self.not_modified}件 / 取得 {self.fetched}件"
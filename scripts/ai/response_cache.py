@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+LLMレスポンスのキャッシュ
+
+(モデル名, プロンプトテンプレート, temperature, 入力テキスト) のハッシュをキーに、
+抽出結果をSQLiteに保存します。同じ議事録の再実行ではGemini APIを呼び出しません。
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from local_cache import cache_path
+
+# エビクション設定
+CACHE_MAX_ENTRIES = 1000
+CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+
+class ResponseCache:
+    """コンテンツアドレス方式のLLMレスポンスキャッシュ"""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_age: float = CACHE_MAX_AGE,
+        enabled: bool = True
+    ):
+        """
+        Args:
+            path: SQLiteファイルのパス（省略時は .cache/llm/responses.sqlite3）
+            max_entries: 保持する最大エントリ数（超えた分は最終利用が古い順に削除）
+            max_age: エントリの有効期限（秒）
+            enabled: Falseの場合、読み書きをすべてバイパス
+        """
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if enabled:
+            self.path = path or cache_path("llm", "responses.sqlite3")
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(model_name: str, prompt_template: str, temperature: float, text: str) -> str:
+        """
+        キャッシュキーを計算する
+
+        Args:
+            model_name: モデル名
+            prompt_template: プロンプトテンプレート
+            temperature: 生成時のtemperature
+            text: 入力テキスト
+
+        Returns:
+            SHA-256のハッシュ値
+        """
+        digest = hashlib.sha256()
+        for part in (model_name, prompt_template, repr(float(temperature)), text):
+            encoded = part.encode("utf-8")
+            # 区切りの曖昧さをなくすため長さを前置する
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        キャッシュから値を取得する
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            保存された値（ない・期限切れの場合はNone）
+        """
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ? AND created_at >= ?",
+                (key, now - self.max_age)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        キャッシュに値を保存し、古いエントリを削除する
+
+        Args:
+            key: キャッシュキー
+            value: JSONに変換可能な値
+        """
+        if not self.enabled:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.max_age,))
+            self._conn.execute(
+                "DELETE FROM responses WHERE key NOT IN ("
+                " SELECT key FROM responses ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def summary(self) -> str:
+        """ヒット・ミス数のサマリー文字列"""
+        if not self.enabled:
+            return "LLMキャッシュ: 無効"
+        return f"LLMキャッシュ: ヒット {self.hits} / ミス {self.misses}"
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+既存Issueとの意味的な重複を検出するローカルベクトルインデックス
+
+既存Issueのタイトルと説明をベクトル化してNumPy配列でディスクに保存し、
+新しいタスクと似たIssueをコサイン類似度で探します。
+ベクトル化は既定で文字n-gramのハッシュTF-IDF（CPUのみ・追加の依存なし）を使い、
+sentence-transformers がインストールされていればモデル名を指定して埋め込みモデルも使えます。
+"""
+
+import os
+import re
+import sys
+import tempfile
+import threading
+import unicodedata
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    print("Error: Required packages not found. Please run: pip install -r requirements.txt")
+    sys.exit(1)
+
+from local_cache import cache_path, read_json, write_json
+
+# 既定の類似度しきい値（これ以上を重複候補とする）
+SIMILARITY_THRESHOLD = 0.6
+
+# ハッシュTF-IDFの次元数と文字n-gramの長さ
+HASHING_DIM = 1024
+NGRAM_SIZES = (2, 3)
+
+# Issue本文のうち、ベクトル化に使う「説明」セクション
+DESCRIPTION_SECTION = re.compile(r"^## 説明\s*\n(.*?)(?=^## |\Z)", re.MULTILINE | re.DOTALL)
+BODY_MAX_CHARS = 1000
+
+
+def issue_text(title: str, body: Optional[str]) -> str:
+    """
+    Issueからベクトル化するテキストを取り出す
+
+    自動作成したIssueの本文はメタデータ（優先度・サイズなど）が共通で類似度を押し上げるため、
+    「## 説明」セクションがあればそれだけを使います。
+
+    Args:
+        title: Issueのタイトル
+        body: Issueの本文
+
+    Returns:
+        タイトルと説明を連結したテキスト
+    """
+    body = body or ""
+    match = DESCRIPTION_SECTION.search(body)
+    description = match.group(1) if match else body
+    return f"{title}\n{description.strip()[:BODY_MAX_CHARS]}"
+
+
+class HashingEmbedder:
+    """文字n-gramをハッシュしてベクトル化する（TF部分。IDFはインデックス側で掛ける）"""
+
+    name = f"hashing-tfidf-{HASHING_DIM}"
+    dim = HASHING_DIM
+    # 文書頻度によるIDF重み付けを行う
+    uses_idf = True
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        """
+        テキストをサブリニアTFのベクトルに変換する
+
+        Args:
+            texts: テキストのリスト
+
+        Returns:
+            (len(texts), dim) のfloat32配列
+        """
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            normalized = unicodedata.normalize("NFKC", text).lower()
+            normalized = re.sub(r"[\s\W_]+", "", normalized)
+            counts = Counter()
+            for n in NGRAM_SIZES:
+                for i in range(len(normalized) - n + 1):
+                    # hash() は実行ごとに変わるため、安定したcrc32を使う
+                    counts[zlib.crc32(normalized[i:i + n].encode("utf-8")) % self.dim] += 1
+            for bucket, count in counts.items():
+                vectors[row, bucket] = 1.0 + np.log(count)
+        return vectors
+
+
+class SentenceTransformerEmbedder:
+    """sentence-transformers の埋め込みモデルでベクトル化する（CPUで実行）"""
+
+    uses_idf = False
+
+    def __init__(self, model_name: str):
+        """
+        Args:
+            model_name: sentence-transformers のモデル名
+        """
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.name = f"st-{model_name}"
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        return np.asarray(self.model.encode(texts, normalize_embeddings=True), dtype=np.float32)
+
+
+def create_embedder(model_name: Optional[str] = None):
+    """
+    埋め込みモデルを作成する
+
+    Args:
+        model_name: sentence-transformers のモデル名（省略時はハッシュTF-IDF）
+
+    Returns:
+        Embedder（モデルが使えない場合はハッシュTF-IDFにフォールバック）
+    """
+    if model_name:
+        try:
+            return SentenceTransformerEmbedder(model_name)
+        except ImportError:
+            print("Warning: sentence-transformers not installed, falling back to hashing TF-IDF")
+    return HashingEmbedder()
+
+
+class SemanticIndex:
+    """既存Issueのベクトルインデックス"""
+
+    def __init__(
+        self,
+        owner: str,
+        repo: str,
+        embedder=None,
+        threshold: float = SIMILARITY_THRESHOLD
+    ):
+        """
+        Args:
+            owner: リポジトリオーナー
+            repo: リポジトリ名
+            embedder: ベクトル化に使うEmbedder（省略時はハッシュTF-IDF）
+            threshold: 重複とみなすコサイン類似度
+        """
+        self.embedder = embedder or HashingEmbedder()
+        self.threshold = threshold
+        self._lock = threading.Lock()
+
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{owner}_{repo}_{self.embedder.name}")
+        self._vectors_file = cache_path("semantic", f"{safe_name}.npy")
+        self._meta_file = cache_path("semantic", f"{safe_name}.json")
+
+        # 行ごとのIssue情報とベクトル（TF）。ベクトルは追加のたびにコピーしないよう余裕を持って確保し、
+        # 先頭 len(entries) 行を使う
+        self.entries: List[Dict] = []
+        self._positions: Dict[int, int] = {}
+        self._vectors = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        # 検索用の統計（追加・更新した行の分だけ差分で更新し、全体は作り直さない）
+        # IDFを使う場合は文書頻度とベクトルの要素ごとの2乗（IDFで重み付けしたノルムの計算用）、
+        # 使わない場合は行ごとのノルム
+        self._document_frequency = np.zeros(self.embedder.dim, dtype=np.int64)
+        self._squares = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self._norms = np.zeros(0, dtype=np.float32)
+        self._dirty = False
+        # 最後に既存Issueを同期した時刻（ISO 8601、次回はこれ以降に更新されたIssueだけ取得する）
+        self.synced_at: Optional[str] = None
+        self._load()
+
+    def _load(self) -> None:
+        """ディスクからインデックスを読み込む（壊れている・次元が違う場合は空から始める）"""
+        meta = read_json(self._meta_file)
+        if not meta or meta.get("embedder") != self.embedder.name:
+            return
+        try:
+            vectors = np.load(self._vectors_file)
+        except (FileNotFoundError, ValueError):
+            return
+        if vectors.shape != (len(meta["entries"]), self.embedder.dim):
+            return
+
+        self.entries = meta["entries"]
+        self.synced_at = meta.get("synced_at")
+        self._positions = {entry["number"]: row for row, entry in enumerate(self.entries)}
+        self._write_rows(list(range(len(self.entries))), vectors.astype(np.float32, copy=False))
+
+    def save(self) -> None:
+        """変更があればインデックスをアトミックに保存する"""
+        with self._lock:
+            if not self._dirty:
+                return
+            fd, tmp_path = tempfile.mkstemp(dir=self._vectors_file.parent, suffix=".npy.tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.save(f, self._vectors[:len(self.entries)])
+                os.replace(tmp_path, self._vectors_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            write_json(self._meta_file, {
+                "embedder": self.embedder.name,
+                "synced_at": self.synced_at,
+                "entries": self.entries
+            })
+            self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def mark_synced(self, synced_at: str) -> None:
+        """
+        既存Issueの同期時刻を記録する
+
+        Args:
+            synced_at: 同期を開始した時刻（ISO 8601）
+        """
+        with self._lock:
+            self.synced_at = synced_at
+            self._dirty = True
+
+    def update(self, issues: Iterable) -> int:
+        """
+        Issueをインデックスに追加・更新する（変更のないIssueは再ベクトル化しない）
+
+        Args:
+            issues: PyGithubのIssueオブジェクト、または
+                    {"number", "title", "body", "url", "state", "updated_at"} の辞書
+
+        Returns:
+            ベクトル化したIssue数
+        """
+        infos = []
+        for issue in issues:
+            if isinstance(issue, dict):
+                info = dict(issue)
+            else:
+                if getattr(issue, "pull_request", None):
+                    continue
+                info = {
+                    "number": issue.number,
+                    "title": issue.title,
+                    "body": issue.body,
+                    "url": issue.html_url,
+                    "state": issue.state,
+                    "updated_at": issue.updated_at.isoformat() if issue.updated_at else None
+                }
+            infos.append(info)
+
+        # 同じIssueが複数回渡された場合は最後のものを使う
+        pending = {}
+        with self._lock:
+            for info in infos:
+                row = self._positions.get(info["number"])
+                if row is not None and self.entries[row].get("updated_at") == info.get("updated_at"):
+                    if self.entries[row].get("state") != info.get("state"):
+                        self.entries[row]["state"] = info.get("state")
+                        self._dirty = True
+                    continue
+                pending[info["number"]] = info
+        pending = list(pending.values())
+
+        if not pending:
+            return 0
+
+        vectors = self.embedder.embed([issue_text(info["title"], info.get("body")) for info in pending])
+        with self._lock:
+            rows = []
+            for info in pending:
+                entry = {
+                    "number": info["number"],
+                    "title": info["title"],
+                    "url": info.get("url"),
+                    "state": info.get("state", "open"),
+                    "updated_at": info.get("updated_at")
+                }
+                row = self._positions.get(info["number"])
+                if row is None:
+                    row = len(self.entries)
+                    self._positions[info["number"]] = row
+                    self.entries.append(entry)
+                else:
+                    self.entries[row] = entry
+                rows.append(row)
+            self._write_rows(rows, vectors)
+            self._dirty = True
+        return len(pending)
+
+    @staticmethod
+    def _reserve(buffer: "np.ndarray", rows: int) -> "np.ndarray":
+        """
+        配列の行数を rows 以上にする（足りない場合は倍に広げてコピーするため、追加は償却 O(dim)）
+
+        Args:
+            buffer: 配列
+            rows: 必要な行数
+
+        Returns:
+            rows 行以上の配列（足りていれば buffer をそのまま返す）
+        """
+        if len(buffer) >= rows:
+            return buffer
+        grown = np.zeros((max(rows, 2 * len(buffer)),) + buffer.shape[1:], dtype=buffer.dtype)
+        grown[:len(buffer)] = buffer
+        return grown
+
+    def _write_rows(self, rows: List[int], vectors: "np.ndarray") -> None:
+        """
+        ベクトルを書き込み、検索用の統計を書き込んだ行の分だけ更新する（ロック内で呼ぶ）
+
+        Args:
+            rows: 行番号（len(entries) 未満）
+            vectors: 各行のベクトル
+        """
+        count = len(self.entries)
+        self._vectors = self._reserve(self._vectors, count)
+        if self.embedder.uses_idf:
+            # 確保したばかりの行はゼロのため、新しい行でも古いベクトルの分を引いてよい
+            self._document_frequency -= np.count_nonzero(self._vectors[rows], axis=0)
+            self._document_frequency += np.count_nonzero(vectors, axis=0)
+            self._squares = self._reserve(self._squares, count)
+            self._squares[rows] = vectors * vectors
+        else:
+            self._norms = self._reserve(self._norms, count)
+            self._norms[rows] = np.linalg.norm(vectors, axis=1)
+        self._vectors[rows] = vectors
+
+    def find_similar(self, title: str, description: str = "", limit: int = 3) -> List[Dict]:
+        """
+        タスクに似たオープンなIssueを探す
+
+        Args:
+            title: タスクのタイトル
+            description: タスクの説明
+            limit: 返す候補の最大数
+
+        Returns:
+            類似度がしきい値以上のIssue {"number", "title", "url", "score"} のリスト（類似度の高い順）
+        """
+        if not self.entries:
+            return []
+
+        query = self.embedder.embed([f"{title}\n{description[:BODY_MAX_CHARS]}"])[0]
+        with self._lock:
+            count = len(self.entries)
+            if self.embedder.uses_idf:
+                # IDFで重み付けしたコサイン類似度: v・(idf²∘q) / (‖idf∘v‖ ‖idf∘q‖)
+                idf = np.log((1.0 + count) / (1.0 + self._document_frequency)).astype(np.float32) + 1.0
+                query = query * idf
+                weights = query * idf
+                norms = np.sqrt(self._squares[:count] @ (idf * idf))
+            else:
+                weights = query
+                norms = self._norms[:count]
+            query_norm = np.linalg.norm(query)
+            if query_norm == 0:
+                return []
+            scores = (self._vectors[:count] @ weights) / (np.where(norms == 0, 1.0, norms) * query_norm)
+            entries = self.entries
+
+        candidates = np.flatnonzero(scores >= self.threshold)
+        candidates = candidates[np.argsort(-scores[candidates])]
+        results = []
+        for row in candidates:
+            entry = entries[row]
+            if entry.get("state") != "open":
+                continue
+            results.append({
+                "number": entry["number"],
+                "title": entry["title"],
+                "url": entry.get("url"),
+                "score": float(scores[row])
+            })
+            if len(results) >= limit:
+                break
+        return results
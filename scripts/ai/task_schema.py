@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+抽出タスクのスキーマ（検証・正規化）
+
+フィールドごとの有効値・デフォルト値・別名を起動時に一度だけ辞書へコンパイルし、
+LLMが返した短縮形（"P1" → "P1 (High)"、"M" → "M (3-5日)" など）を
+デフォルト値に戻さずに補正します。補正・デフォルト値への置き換え・スキップは
+printせず、構造化された診断情報として記録します。
+"""
+
+import re
+import threading
+import unicodedata
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 選択肢フィールドの有効値（先頭がデフォルト値ではないため default で指定）と別名
+# 別名は正規化キー（NFKC・小文字・空白と記号を除去）で引く
+CHOICE_FIELDS = {
+    "priority": {
+        "values": ["P0 (Critical)", "P1 (High)", "P2 (Medium)", "P3 (Low)"],
+        "default": "P2 (Medium)",
+        "aliases": {
+            "P0 (Critical)": ["critical", "urgent", "緊急", "最優先"],
+            "P1 (High)": ["high", "高"],
+            "P2 (Medium)": ["medium", "med", "normal", "中"],
+            "P3 (Low)": ["low", "backlog", "低"]
+        }
+    },
+    "size": {
+        "values": ["XS (< 1日)", "S (1-2日)", "M (3-5日)", "L (1-2週)", "XL (2週以上)"],
+        "default": "M (3-5日)",
+        "aliases": {
+            "XS (< 1日)": ["extrasmall", "xsmall", "極小"],
+            "S (1-2日)": ["small", "小"],
+            "M (3-5日)": ["medium", "中"],
+            "L (1-2週)": ["large", "大"],
+            "XL (2週以上)": ["extralarge", "xlarge", "特大"]
+        }
+    },
+    "type": {
+        "values": ["Feature", "Bug", "Chore", "Research", "Meeting Action"],
+        "default": "Meeting Action",
+        "aliases": {
+            "Feature": ["feat", "enhancement", "機能"],
+            "Bug": ["fix", "bugfix", "defect", "バグ", "不具合"],
+            "Chore": ["task", "maintenance", "雑務"],
+            "Research": ["investigation", "spike", "調査", "リサーチ"],
+            "Meeting Action": ["action", "actionitem", "meeting", "アクション", "アクションアイテム"]
+        }
+    },
+    "team": {
+        "values": ["Product", "Engineering", "Sales", "Operations", "All"],
+        "default": "Product",
+        "aliases": {
+            "Product": ["pm", "プロダクト"],
+            "Engineering": ["eng", "dev", "development", "開発", "エンジニアリング"],
+            "Sales": ["biz", "business", "営業", "セールス"],
+            "Operations": ["ops", "運用", "オペレーション"],
+            "All": ["everyone", "全員", "全体"]
+        }
+    },
+    "business_impact": {
+        "values": ["High", "Medium", "Low"],
+        "default": "Medium",
+        "aliases": {
+            "High": ["h", "高", "大"],
+            "Medium": ["m", "med", "mid", "中"],
+            "Low": ["l", "低", "小"]
+        }
+    }
+}
+
+# 選択肢フィールドごとに覚えておく入力値の最大数
+RESOLVED_CACHE_SIZE = 4096
+
+# 期限として扱わない値（LLMが null の代わりに返す文字列）
+EMPTY_DATE_VALUES = frozenset({"", "null", "none", "n/a", "na", "tbd", "なし", "未定", "-"})
+
+# YYYY-MM-DD / YYYY/MM/DD / YYYY.M.D / YYYY年M月D日
+DATE_PATTERN = re.compile(r"(\d{4})\s*[-/.年]\s*(\d{1,2})\s*[-/.月]\s*(\d{1,2})\s*日?")
+
+# 正規化キーの計算で取り除く文字
+KEY_STRIP_PATTERN = re.compile(r"[\s\W_]+")
+TOKEN_PATTERN = re.compile(r"[^\s\W_]+")
+
+# 診断情報の種類
+ACTION_REPAIRED = "repaired"
+ACTION_DEFAULTED = "defaulted"
+ACTION_SKIPPED = "skipped"
+
+
+def _text(value) -> str:
+    """テキストフィールドの前後の空白を除去する（None は空文字）"""
+    if isinstance(value, str):
+        return value.strip()
+    return "" if value is None else str(value).strip()
+
+
+def _key(value: str) -> str:
+    """別名辞書を引くための正規化キー"""
+    return KEY_STRIP_PATTERN.sub("", unicodedata.normalize("NFKC", value).lower())
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(value: str) -> Optional[str]:
+    """
+    期限をYYYY-MM-DD形式に変換する（同じ値は何度も現れるためキャッシュする）
+
+    Args:
+        value: 期限の文字列
+
+    Returns:
+        YYYY-MM-DD形式の日付（変換できない場合はNone）
+    """
+    match = DATE_PATTERN.fullmatch(unicodedata.normalize("NFKC", value).strip())
+    if not match:
+        return None
+    try:
+        return date(int(match.group(1)), int(match.group(2)), int(match.group(3))).isoformat()
+    except ValueError:
+        return None
+
+
+class _ChoiceField:
+    """1つの選択肢フィールドのコンパイル済みルックアップ"""
+
+    def __init__(self, spec: Dict):
+        self.default = spec["default"]
+        self.lookup: Dict[str, str] = {}
+        for value in spec["values"]:
+            # "P1 (High)" → "p1high", "p1", "high"
+            self.lookup[_key(value)] = value
+            head, _, detail = value.partition("(")
+            self.lookup.setdefault(_key(head), value)
+            if detail and not any(c.isdigit() for c in detail):
+                self.lookup.setdefault(_key(detail), value)
+        for value, aliases in spec.get("aliases", {}).items():
+            for alias in aliases:
+                self.lookup.setdefault(_key(alias), value)
+
+        # 入力値 → (有効値, 診断の種類)。有効値と未指定は診断なしで登録しておき、
+        # それ以外の入力も同じ値は何度も現れるため解決結果を覚えておく
+        self.resolved: Dict = {value: (value, None) for value in spec["values"]}
+        self.resolved[None] = (self.default, None)
+        self.resolved[""] = (self.default, None)
+
+    def resolve(self, raw) -> Tuple[str, Optional[str]]:
+        """
+        値を有効値に解決する
+
+        Args:
+            raw: LLMが返した値
+
+        Returns:
+            (有効値, ACTION_REPAIRED / ACTION_DEFAULTED（有効値そのものの場合はNone）)
+        """
+        if not isinstance(raw, (str, int, float)):
+            return self.default, ACTION_DEFAULTED
+
+        normalized = unicodedata.normalize("NFKC", str(raw)).lower()
+        resolved = self.lookup.get(KEY_STRIP_PATTERN.sub("", normalized))
+        if resolved is None:
+            # "P1 - 高優先度" や "M (3-5 days)" のように先頭のトークンで判別できるもの
+            for token in TOKEN_PATTERN.findall(normalized):
+                resolved = self.lookup.get(token)
+                if resolved is not None:
+                    break
+
+        result = (self.default, ACTION_DEFAULTED) if resolved is None else (resolved, ACTION_REPAIRED)
+        if len(self.resolved) < RESOLVED_CACHE_SIZE:
+            self.resolved[raw] = result
+        return result
+
+
+class TaskDiagnostics:
+    """検証・正規化の診断情報（スレッドセーフ）"""
+
+    def __init__(self):
+        self.entries: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def extend(self, entries: Iterable[Dict]) -> None:
+        with self._lock:
+            self.entries.extend(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def summary(self) -> str:
+        """補正・デフォルト値・スキップ件数のサマリー文字列"""
+        counts = {ACTION_REPAIRED: 0, ACTION_DEFAULTED: 0, ACTION_SKIPPED: 0}
+        with self._lock:
+            for entry in self.entries:
+                counts[entry["action"]] += 1
+        return (
+            f"タスク検証: 補正 {counts[ACTION_REPAIRED]} / "
+            f"デフォルト値 {counts[ACTION_DEFAULTED]} / スキップ {counts[ACTION_SKIPPED]}"
+        )
+
+
+class TaskSchema:
+    """コンパイル済みのタスクスキーマ"""
+
+    def __init__(self, choice_fields: Dict = CHOICE_FIELDS):
+        """
+        Args:
+            choice_fields: 選択肢フィールドの定義（CHOICE_FIELDS と同じ形式）
+        """
+        self.fields = {name: _ChoiceField(spec) for name, spec in choice_fields.items()}
+
+    def _choice(self, name: str, task: Dict, index: int, title: str, diagnostics: List[Dict]) -> str:
+        """選択肢フィールドを解決し、補正・デフォルト値に置き換えた場合は診断情報に記録する"""
+        field = self.fields[name]
+        raw = task.get(name)
+        try:
+            value, action = field.resolved[raw]
+        except KeyError:
+            value, action = field.resolve(raw)
+        except TypeError:
+            # リストなどハッシュできない値
+            value, action = field.resolve(raw)
+        if action is not None:
+            diagnostics.append({
+                "task": index, "title": title, "field": name, "value": raw,
+                "action": action, "result": value
+            })
+        return value
+
+    def normalize(self, task: Dict, index: int = 0) -> Tuple[Optional[Dict], List[Dict]]:
+        """
+        タスク1件を検証・正規化する
+
+        Args:
+            task: 抽出されたタスク
+            index: タスクの番号（診断情報に記録する）
+
+        Returns:
+            (正規化されたタスク（スキップした場合はNone）, 診断情報のリスト)
+            診断情報は {"task", "title", "field", "value", "action", "result"}
+        """
+        diagnostics = []
+        if not isinstance(task, dict):
+            diagnostics.append({
+                "task": index, "title": None, "field": None, "value": repr(task)[:100],
+                "action": ACTION_SKIPPED, "result": None
+            })
+            return None, diagnostics
+
+        title = _text(task.get("title"))
+        if not title:
+            diagnostics.append({
+                "task": index, "title": None, "field": "title", "value": task.get("title"),
+                "action": ACTION_SKIPPED, "result": None
+            })
+            return None, diagnostics
+
+        dependencies = task.get("dependencies")
+        if not isinstance(dependencies, list):
+            dependencies = [dependencies.strip()] if isinstance(dependencies, str) and dependencies.strip() else []
+
+        # キー順は従来の出力と揃える
+        choice = self._choice
+        normalized_task = {
+            "title": title,
+            "description": _text(task.get("description")),
+            "assignee": _text(task.get("assignee")),
+            "priority": choice("priority", task, index, title, diagnostics),
+            "size": choice("size", task, index, title, diagnostics),
+            "due_date": self._due_date(task.get("due_date"), index, title, diagnostics),
+            "type": choice("type", task, index, title, diagnostics),
+            "team": choice("team", task, index, title, diagnostics),
+            "business_impact": choice("business_impact", task, index, title, diagnostics),
+            "dependencies": dependencies,
+            "context": _text(task.get("context"))
+        }
+        return normalized_task, diagnostics
+
+    @staticmethod
+    def _due_date(raw, index: int, title: str, diagnostics: List[Dict]) -> Optional[str]:
+        """期限を検証・補正する（不正な値はNoneにして診断情報に記録）"""
+        if raw is None:
+            return None
+        raw_text = raw if isinstance(raw, str) else str(raw)
+        parsed = _parse_date(raw_text)
+        if parsed == raw_text:
+            return parsed
+        if parsed is None and raw_text.strip().lower() in EMPTY_DATE_VALUES:
+            return None
+        diagnostics.append({
+            "task": index, "title": title, "field": "due_date", "value": raw,
+            "action": ACTION_DEFAULTED if parsed is None else ACTION_REPAIRED, "result": parsed
+        })
+        return parsed
+
+    def normalize_tasks(self, tasks: Iterable[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        タスクのリストを検証・正規化する
+
+        Args:
+            tasks: 抽出されたタスクのリスト
+
+        Returns:
+            (正規化されたタスクのリスト, 診断情報のリスト)
+        """
+        normalized_tasks = []
+        diagnostics = []
+        for i, task in enumerate(tasks, 1):
+            normalized_task, task_diagnostics = self.normalize(task, i)
+            if task_diagnostics:
+                diagnostics.extend(task_diagnostics)
+            if normalized_task is not None:
+                normalized_tasks.append(normalized_task)
+        return normalized_tasks, diagnostics
+
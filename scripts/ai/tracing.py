@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+議事録 → GitHub Issues パイプラインのステージごとの計測（トレース）
+
+MeetingAnalyzer（プロンプト作成・モデル呼び出し・JSONパース・正規化）と
+GitHubIntegrator（REST・GraphQLの呼び出し）の各処理をスパンとして記録します。
+スパンは処理時間・ペイロードサイズ・リトライ回数・トークン数などを属性に持ち、
+JSON Lines（1スパン1行）または OpenTelemetry の OTLP/JSON 形式で書き出せます。
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# 出力形式
+TRACE_FORMAT_JSONL = "jsonl"
+TRACE_FORMAT_OTLP = "otlp"
+TRACE_FORMATS = (TRACE_FORMAT_JSONL, TRACE_FORMAT_OTLP)
+
+# OTLPのリソース属性 service.name とスコープ名
+SERVICE_NAME = "meeting-issue-pipeline"
+SCOPE_NAME = "scripts.ai.tracing"
+
+# OTLPのステータスコード
+_STATUS_OK = 1
+_STATUS_ERROR = 2
+
+# サマリーで合計を表示する属性
+SUMMED_ATTRIBUTES = ("retries", "prompt_tokens", "output_tokens")
+
+
+class Span:
+    """1つの処理の計測値"""
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"], attributes: Dict):
+        self.name = name
+        self.trace_id = tracer.trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = {key: value for key, value in attributes.items() if value is not None}
+        self.start_unix_nano = time.time_ns()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+        self.thread = threading.current_thread().name
+        self._tracer = tracer
+        self._started_at = time.perf_counter()
+
+    def set(self, **attributes) -> None:
+        """属性を設定する（値がNoneの属性は設定しない）"""
+        self.attributes.update({key: value for key, value in attributes.items() if value is not None})
+
+    def add(self, key: str, amount: float = 1) -> None:
+        """数値の属性に加算する（リトライ回数など）"""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        """
+        スパンを終了して記録する（2回目以降の呼び出しは無視）
+
+        Args:
+            error: 処理が失敗した場合の例外
+        """
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._started_at
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        self._tracer._record(self)
+
+    def to_dict(self) -> Dict:
+        """JSON Lines の1行"""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_unix_nano": self.start_unix_nano,
+            "duration_ms": round(self.duration * 1000, 3),
+            "thread": self.thread,
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+            "attributes": self.attributes
+        }
+
+
+def _otlp_value(value) -> Dict:
+    """属性値をOTLPの AnyValue に変換する"""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP/JSON では64ビット整数を文字列で表す
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+class Tracer:
+    """スパンを記録するトレーサー（スレッドごとに現在のスパンを追跡する）"""
+
+    def __init__(self, service_name: str = SERVICE_NAME):
+        """
+        Args:
+            service_name: OTLPのリソース属性 service.name
+        """
+        self.service_name = service_name
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def current(self) -> Optional[Span]:
+        """このスレッドで実行中のスパン（なければNone）"""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def start(self, name: str, parent: Optional[Span] = None, **attributes) -> Span:
+        """
+        スパンを開始する（現在のスパンにはしない。ジェネレーターのようにyieldをまたぐ処理用）
+
+        Args:
+            name: スパン名
+            parent: 親スパン（省略時はこのスレッドの現在のスパン）
+            **attributes: 属性
+
+        Returns:
+            開始したスパン（終了時に end() を呼ぶ）
+        """
+        return Span(self, name, parent or self.current(), attributes)
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[Span] = None, **attributes) -> Iterator[Span]:
+        """
+        ブロックの処理をスパンとして記録する（ブロック内ではこのスパンが現在のスパンになる）
+
+        Args:
+            name: スパン名
+            parent: 親スパン（省略時はこのスレッドの現在のスパン）
+            **attributes: 属性
+
+        Yields:
+            スパン
+        """
+        span = self.start(name, parent, **attributes)
+        stack = self._stack()
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.end(error=e)
+            raise
+        finally:
+            stack.pop()
+            span.end()
+
+    def finished_spans(self) -> List[Span]:
+        """終了したスパンを開始順に並べたリスト"""
+        with self._lock:
+            return sorted(self.spans, key=lambda span: span.start_unix_nano)
+
+    def to_otlp(self) -> Dict:
+        """OTLP/JSON（ExportTraceServiceRequest）形式の辞書"""
+        spans = []
+        for span in self.finished_spans():
+            otlp_span = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_unix_nano),
+                "endTimeUnixNano": str(span.start_unix_nano + int(span.duration * 1e9)),
+                "attributes": [
+                    {"key": key, "value": _otlp_value(value)}
+                    for key, value in dict(span.attributes, **{"thread.name": span.thread}).items()
+                ],
+                "status": {"code": _STATUS_ERROR, "message": span.error} if span.error else {"code": _STATUS_OK}
+            }
+            if span.parent_id:
+                otlp_span["parentSpanId"] = span.parent_id
+            spans.append(otlp_span)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": spans}]
+            }]
+        }
+
+    def export(self, path: str, fmt: str = TRACE_FORMAT_JSONL) -> None:
+        """
+        記録したスパンをファイルに書き出す
+
+        Args:
+            path: 出力先のパス
+            fmt: TRACE_FORMAT_JSONL（1スパン1行）または TRACE_FORMAT_OTLP（OTLP/JSON）
+        """
+        if fmt not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format: {fmt}")
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        spans = self.finished_spans()
+        with open(path, 'w', encoding='utf-8') as f:
+            if fmt == TRACE_FORMAT_OTLP:
+                json.dump(self.to_otlp(), f, ensure_ascii=False)
+            else:
+                for span in spans:
+                    f.write(json.dumps(span.to_dict(), ensure_ascii=False) + "\n")
+        print(f"✓ トレースを保存しました: {path}（{len(spans)}スパン）")
+
+    def export_on_exit(self, path: str, fmt: str = TRACE_FORMAT_JSONL) -> None:
+        """
+        プロセスの終了時（sys.exit を含む）にサマリーを表示してトレースを書き出す
+
+        Args:
+            path: 出力先のパス
+            fmt: 出力形式
+        """
+        def export():
+            print(self.summary())
+            self.export(path, fmt)
+
+        atexit.register(export)
+
+    def summary(self) -> str:
+        """スパン名ごとの件数・合計・平均・p95とリトライ回数・トークン数のレポート"""
+        durations = defaultdict(list)
+        totals = defaultdict(lambda: defaultdict(float))
+        errors = defaultdict(int)
+        for span in self.finished_spans():
+            durations[span.name].append(span.duration)
+            errors[span.name] += bool(span.error)
+            for key in SUMMED_ATTRIBUTES:
+                totals[span.name][key] += span.attributes.get(key, 0)
+
+        lines = [
+            "トレース:",
+            f"{'span':<22} {'count':>5} {'total':>10} {'avg':>10} {'p95':>10} {'err':>4} {'retry':>5} {'tokens(in/out)':>15}"
+        ]
+        for name, values in durations.items():
+            values = sorted(values)
+            count = len(values)
+            p95 = values[min(count - 1, int(count * 0.95))]
+            tokens = ""
+            if totals[name]["prompt_tokens"] or totals[name]["output_tokens"]:
+                tokens = f"{int(totals[name]['prompt_tokens'])}/{int(totals[name]['output_tokens'])}"
+            lines.append(
+                f"{name:<22} {count:>5} {sum(values):>9.2f}s {sum(values) / count:>9.2f}s {p95:>9.2f}s "
+                f"{errors[name]:>4} {int(totals[name]['retries']):>5} {tokens:>15}"
+            )
+        return "\n".join(lines)
@@ -9,29 +9,40 @@ GitHub IssuesとProjects v2に自動登録します。
 import json
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, List, Optional
 import argparse
 
 # スクリプトのディレクトリをパスに追加
 sys.path.insert(0, str(Path(__file__).parent / "ai"))
 
 try:
-    from meeting_analyzer import MeetingAnalyzer
-    from github_integrator import GitHubIntegrator
+    from meeting_analyzer import MeetingAnalyzer, CHUNK_TOKENS
+    from note_chunker import ISSUES_SECTION_HEADING
+    from github_integrator import (
+        GitHubIntegrator,
+        BATCH_MAX_OPERATIONS,
+        BATCH_MAX_COST,
+        DEFAULT_GITHUB_OWNER,
+        DEFAULT_GITHUB_REPO
+    )
+    from issue_plan import plan_summary, write_plan
+    from pipeline_journal import PipelineJournal
+    from async_pipeline import IssuePipeline, PIPELINE_QUEUE_SIZE
+    from tracing import Tracer, TRACE_FORMATS, TRACE_FORMAT_JSONL
+    from discord_source import DiscordExportSource, WINDOW_GAP_SECONDS
     from dotenv import load_dotenv
 except ImportError as e:
     print(f"Error: Failed to import required modules: {e}")
     print("Please run: pip install -r requirements.txt")
     sys.exit(1)
 
-# 環境変数の読み込み
-load_dotenv()
-
-# GitHub設定
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-GITHUB_OWNER = os.getenv("GITHUB_OWNER", "kochan17")
-GITHUB_REPO = os.getenv("GITHUB_REPO", "co-co")
+# ディレクトリモードの既定値
+MEETING_FILE_PATTERN = "**/*_議事録.md"
+FILE_WORKERS = 2
 
 
 def append_issues_to_meeting_notes(meeting_file: str, issues: list) -> None:
@@ -50,12 +61,12 @@ def append_issues_to_meeting_notes(meeting_file: str, issues: list) -> None:
             content = f.read()
 
         # 既にIssuesセクションがある場合は追記しない
-        if "## 作成されたGitHub Issues" in content:
+        if ISSUES_SECTION_HEADING in content:
             print("Note: Issues section already exists in meeting notes")
             return
 
         # Issuesセクションを追加
-        issues_section = "\n\n## 作成されたGitHub Issues\n\n"
+        issues_section = f"\n\n{ISSUES_SECTION_HEADING}\n\n"
         issues_section += f"_自動生成: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_\n\n"
         
         for issue in issues:
@@ -70,27 +81,493 @@ def append_issues_to_meeting_notes(meeting_file: str, issues: list) -> None:
         print(f"Warning: Failed to update meeting notes: {e}")
 
 
+def find_meeting_files(meeting_dir: str, pattern: str = MEETING_FILE_PATTERN) -> List[Path]:
+    """
+    ディレクトリから議事録ファイルを探す
+
+    Args:
+        meeting_dir: 探索するディレクトリ
+        pattern: ファイル名のglobパターン（"**/" で再帰）
+
+    Returns:
+        議事録ファイルのパスのリスト（パス順）
+    """
+    return sorted(path for path in Path(meeting_dir).glob(pattern) if path.is_file())
+
+
+def extract_normalized_tasks(analyzer: MeetingAnalyzer, meeting_file: str, incremental: bool = False) -> list:
+    """
+    議事録を読み込み、タスクを抽出・正規化する
+
+    Args:
+        analyzer: MeetingAnalyzer
+        meeting_file: 議事録ファイルのパス
+        incremental: Trueの場合、変更されたセクションのみ再抽出
+
+    Returns:
+        正規化されたタスクのリスト（抽出できなかった場合は空）
+    """
+    meeting_notes = analyzer.read_meeting_notes(meeting_file)
+    if incremental:
+        tasks = analyzer.extract_tasks_incremental(meeting_notes, meeting_file)
+    else:
+        tasks = analyzer.extract_tasks(meeting_notes)
+
+    if not tasks:
+        return []
+    return analyzer.validate_and_normalize_tasks(tasks)
+
+
+def open_journal(meeting_file: str, args: argparse.Namespace) -> Optional[PipelineJournal]:
+    """
+    議事録のチェックポイントジャーナルを開く
+
+    --resume の場合は前回のジャーナルから再開し、それ以外は新しく始めます。
+    Dry-run・プランの作成では何も作成しないため、ジャーナルを使いません（前回のジャーナルも残す）。
+
+    Args:
+        meeting_file: 議事録ファイルのパス
+        args: コマンドライン引数
+
+    Returns:
+        ジャーナル（Dry-run・プランの作成の場合はNone）
+    """
+    if args.dry_run or args.plan:
+        return None
+    journal = PipelineJournal.for_source(meeting_file, resume=args.resume)
+    if args.resume:
+        if journal.tasks is None:
+            print(f"Note: {meeting_file}: 再開できるジャーナルがないため、最初から実行します")
+        else:
+            print(f"再開: {meeting_file}（{journal.summary()}）")
+    return journal
+
+
+def tasks_output_path(meeting_file: str, output_dir: str = None) -> Path:
+    """議事録ごとの中間ファイル（抽出されたタスクJSON）のパス"""
+    directory = Path(output_dir) if output_dir else Path(meeting_file).parent
+    return directory / f"{Path(meeting_file).stem}_tasks.json"
+
+
+def process_meeting_dir(
+    analyzer: MeetingAnalyzer,
+    integrator: GitHubIntegrator,
+    meeting_files: List[Path],
+    args: argparse.Namespace
+) -> List[Dict]:
+    """
+    複数の議事録を抽出→作成のパイプラインで処理する
+
+    抽出はfile_workers個のスレッドで並列に行い、抽出が終わった議事録から順に
+    Issue作成に回します（作成中も後続の議事録の抽出が進む）。
+    analyzerとintegratorは全ファイルで共有します。
+
+    Args:
+        analyzer: 共有するMeetingAnalyzer
+        integrator: 共有するGitHubIntegrator
+        meeting_files: 議事録ファイルのリスト
+        args: コマンドライン引数
+
+    Returns:
+        議事録ごとの結果 {"file", "status", "tasks", "issues", "existing", "extract_time", "create_time", "error"} のリスト（入力順）
+    """
+    def extract_stage(meeting_file: str) -> tuple:
+        started_at = time.monotonic()
+        journal = open_journal(meeting_file, args)
+        if journal and journal.tasks is not None:
+            # 再開時はジャーナルに記録された抽出結果を使う
+            return journal.tasks, time.monotonic() - started_at, journal
+        tasks = extract_normalized_tasks(analyzer, meeting_file, incremental=args.incremental)
+        if journal and tasks:
+            journal.record_extracted(tasks)
+        return tasks, time.monotonic() - started_at, journal
+
+    reports = {}
+    with ThreadPoolExecutor(max_workers=max(1, args.file_workers)) as executor:
+        futures = {executor.submit(extract_stage, str(path)): str(path) for path in meeting_files}
+
+        for future in as_completed(futures):
+            meeting_file = futures[future]
+            report = {
+                "file": meeting_file,
+                "status": "ok",
+                "tasks": 0,
+                "issues": 0,
+                "existing": 0,
+                "extract_time": 0.0,
+                "create_time": 0.0,
+                "error": None
+            }
+            reports[meeting_file] = report
+
+            try:
+                tasks, report["extract_time"], journal = future.result()
+            except (Exception, SystemExit) as e:
+                # read_meeting_notes は読み込みに失敗するとsys.exitするため、SystemExitも1ファイルの失敗として扱う
+                report["status"] = "error"
+                report["error"] = f"抽出に失敗しました: {e}"
+                print(f"Error: {meeting_file}: {report['error']}")
+                continue
+
+            if not tasks:
+                report["status"] = "no_tasks"
+                print(f"Note: {meeting_file}: タスクが抽出されませんでした")
+                continue
+
+            report["tasks"] = len(tasks)
+            print(f"\n[{meeting_file}] {len(tasks)}個のタスクからIssueを作成しています...")
+            print("-"*80)
+            save_tasks(tasks_output_path(meeting_file, args.output_dir), meeting_file, tasks)
+
+            started_at = time.monotonic()
+            try:
+                created_issues = integrator.create_issues_from_tasks(
+                    tasks,
+                    dry_run=args.dry_run,
+                    add_to_project=not args.no_project,
+                    batch=args.batch,
+                    journal=journal
+                )
+            except Exception as e:
+                report["status"] = "error"
+                report["error"] = f"Issue作成に失敗しました: {e}"
+                print(f"Error: {meeting_file}: {report['error']}")
+                continue
+            finally:
+                report["create_time"] = time.monotonic() - started_at
+
+            report["existing"] = sum(1 for issue in created_issues if issue.get("existing"))
+            report["issues"] = len(created_issues) - report["existing"]
+            if not args.dry_run and created_issues:
+                append_issues_to_meeting_notes(meeting_file, created_issues)
+
+    return [reports[str(path)] for path in meeting_files]
+
+
+def process_discord_export(
+    analyzer: MeetingAnalyzer,
+    integrator: GitHubIntegrator,
+    args: argparse.Namespace
+) -> bool:
+    """
+    DiscordのエクスポートJSONの新しい会話からタスクを抽出してIssueを作成する
+
+    エクスポートを1メッセージずつ読み込んで会話ウィンドウにまとめ、前回の既読位置より
+    新しいウィンドウだけを抽出します。すべてのタスクのIssueを用意できた場合（Dry-runでない場合）、
+    抽出に成功した先頭からの連続したウィンドウまでを既読として記録します（失敗したウィンドウ以降は
+    次回再抽出）。Issueの作成に失敗したタスクがある場合は既読位置を進めず、次回すべて再抽出します
+    （作成済みのIssueはインデックスでスキップされます）。
+
+    Args:
+        analyzer: MeetingAnalyzer
+        integrator: GitHubIntegrator
+        args: コマンドライン引数
+
+    Returns:
+        すべてのウィンドウの抽出とすべてのタスクのIssue作成に成功した場合はTrue
+    """
+    source = DiscordExportSource(
+        args.discord_export,
+        window_gap=args.discord_gap * 60,
+        reset=args.discord_reset
+    )
+    if source.high_water_mark is not None:
+        print(f"既読位置: メッセージID {source.high_water_mark}（{source.state.get('updated_at')}）")
+
+    task_lists = []
+    windows = 0
+    last_extracted = None
+    failed = False
+    for window, tasks in analyzer.extract_tasks_by_window(source.iter_windows()):
+        windows += 1
+        print(
+            f"会話 {window['start'][:16]}〜{window['end'][11:16]}: {window['messages']}件のメッセージ"
+            f"（{', '.join(window['participants'])}）"
+        )
+        if tasks is None:
+            print(f"Warning: 会話 {window['first_id']}〜{window['last_id']} の抽出に失敗しました（次回再抽出します）")
+            failed = True
+            continue
+        if not failed:
+            last_extracted = window
+        task_lists.append(tasks)
+    print(source.summary())
+
+    if not windows:
+        print("✓ 新しい会話はありません")
+        return True
+
+    normalized_tasks = analyzer.validate_and_normalize_tasks(analyzer.merge_tasks(task_lists))
+    print(f"✓ {windows}件の会話から{len(normalized_tasks)}個のタスクを抽出しました")
+    print(analyzer.cache.summary())
+    print(analyzer.diagnostics.summary())
+
+    if normalized_tasks:
+        save_tasks(tasks_output_path(args.discord_export, args.output_dir), args.discord_export, normalized_tasks)
+        print("\n[Step 2/2] GitHub IssuesとProjectsを作成しています...")
+        print("-"*80)
+        created_issues = integrator.create_issues_from_tasks(
+            normalized_tasks,
+            dry_run=args.dry_run,
+            add_to_project=not args.no_project,
+            batch=args.batch
+        )
+        print(f"✓ {len(created_issues)}個のIssueを処理しました")
+        if not args.dry_run and len(created_issues) < len(normalized_tasks):
+            print(
+                f"Warning: {len(normalized_tasks) - len(created_issues)}個のタスクのIssue作成に失敗したため、"
+                "既読位置を更新しません（次回再抽出します）"
+            )
+            return False
+
+    if not args.dry_run and last_extracted:
+        source.commit(last_extracted)
+        print(f"✓ 既読位置を更新しました: メッセージID {last_extracted['last_id']}")
+    return not failed
+
+
+def print_batch_report(reports: List[Dict], dry_run: bool = False) -> None:
+    """
+    議事録ごとの結果を表示
+
+    Args:
+        reports: process_meeting_dir の戻り値
+        dry_run: Dry-runモードかどうか
+    """
+    issue_label = "予定Issue" if dry_run else "作成Issue"
+
+    def issue_count(report: Dict) -> int:
+        return report["tasks"] - report["existing"] if dry_run else report["issues"]
+
+    print(f"{'状態':<10} {'タスク':>6} {issue_label:>8} {'作成済み':>8} {'抽出(s)':>8} {'作成(s)':>8}  議事録")
+    for report in reports:
+        print(
+            f"{report['status']:<10} {report['tasks']:>6} {issue_count(report):>8} {report['existing']:>8} "
+            f"{report['extract_time']:>8.1f} {report['create_time']:>8.1f}  {report['file']}"
+        )
+        if report["error"]:
+            print(f"{'':<10} → {report['error']}")
+
+    total_tasks = sum(report["tasks"] for report in reports)
+    total_issues = sum(issue_count(report) for report in reports)
+    total_existing = sum(report["existing"] for report in reports)
+    failed = sum(1 for report in reports if report["status"] == "error")
+    print("-"*80)
+    print(
+        f"議事録: {len(reports)}件（失敗: {failed}件） / タスク: {total_tasks}個 / "
+        f"Issue: {total_issues}個（作成済み: {total_existing}個）"
+    )
+
+
+def pipeline_source(analyzer: MeetingAnalyzer, meeting_notes: str, meeting_file: str, incremental: bool = False):
+    """
+    パイプラインに流すタスクを抽出する（パイプラインの抽出スレッドで実行される）
+
+    Args:
+        analyzer: MeetingAnalyzer
+        meeting_notes: 議事録の内容
+        meeting_file: 議事録ファイルのパス
+        incremental: Trueの場合、変更されたセクションのみ再抽出（ストリーミングしない）
+
+    Yields:
+        抽出されたタスク（未正規化）
+    """
+    if incremental:
+        yield from analyzer.extract_tasks_incremental(meeting_notes, meeting_file) or []
+    else:
+        yield from analyzer.extract_tasks_stream(meeting_notes)
+
+
+def save_tasks(output_file: Path, meeting_file: str, tasks: list) -> None:
+    """
+    抽出されたタスクを中間ファイルに保存
+
+    Args:
+        output_file: 保存先のパス
+        meeting_file: 議事録ファイルのパス
+        tasks: 正規化されたタスクのリスト
+    """
+    task_data = {
+        "source_file": meeting_file,
+        "extracted_at": datetime.now().isoformat(),
+        "tasks": tasks
+    }
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(task_data, f, ensure_ascii=False, indent=2)
+    
+    print(f"✓ タスクを保存しました: {output_file}")
+
+
 def main():
     """メイン処理"""
     parser = argparse.ArgumentParser(
         description="会議議事録からGitHub IssuesとProjectsを自動作成"
     )
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         "--meeting-file",
         "-f",
-        required=True,
         help="議事録ファイルのパス"
     )
+    source.add_argument(
+        "--meeting-dir",
+        "-d",
+        help="議事録ディレクトリのパス（配下の議事録をまとめて処理）"
+    )
+    source.add_argument(
+        "--discord-export",
+        help="DiscordのエクスポートJSONのパス（前回の実行より新しい会話からタスクを抽出）"
+    )
+    parser.add_argument(
+        "--discord-gap",
+        type=float,
+        default=WINDOW_GAP_SECONDS / 60,
+        help=f"--discord-export で別の会話とみなすメッセージの間隔（分、デフォルト: {WINDOW_GAP_SECONDS // 60}）"
+    )
+    parser.add_argument(
+        "--discord-reset",
+        action="store_true",
+        help="--discord-export の既読位置を使わず、エクスポートの最初から処理"
+    )
+    parser.add_argument(
+        "--pattern",
+        default=MEETING_FILE_PATTERN,
+        help=f"--meeting-dir で対象にするファイルのglobパターン（デフォルト: {MEETING_FILE_PATTERN}）"
+    )
+    parser.add_argument(
+        "--file-workers",
+        type=int,
+        default=FILE_WORKERS,
+        help=f"--meeting-dir で議事録を並列に抽出する最大数（デフォルト: {FILE_WORKERS}）"
+    )
+    parser.add_argument(
+        "--report",
+        help="--meeting-dir の議事録ごとの結果をJSONで保存するパス"
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
-        help="Dry-runモード（実際には作成しない）"
+        help="Dry-runモード（GitHubに接続せず、キャッシュ済みのメタデータで作成内容を表示）"
     )
     parser.add_argument(
         "--no-project",
         action="store_true",
         help="Projects v2には追加しない"
     )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Projects v2への追加とフィールド設定をまとめて送信"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BATCH_MAX_OPERATIONS,
+        help=f"1リクエストにまとめるmutationの最大数（デフォルト: {BATCH_MAX_OPERATIONS}）"
+    )
+    parser.add_argument(
+        "--batch-max-cost",
+        type=int,
+        default=BATCH_MAX_COST,
+        help=f"1リクエストあたりのコスト予算（デフォルト: {BATCH_MAX_COST}）"
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=1,
+        help="Issue作成を並列実行する最大数（デフォルト: 1 = 逐次実行）"
+    )
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=CHUNK_TOKENS,
+        help=f"1回のGeminiリクエストに含める議事録のトークン数。超える議事録は見出し単位で分割して並列抽出（デフォルト: {CHUNK_TOKENS}）"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="LLMレスポンスキャッシュを使わない（同じ議事録でもGemini APIを呼び出す）"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="前回の実行から変更されたセクションのみGeminiに送って再抽出"
+    )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="作成済みIssueのインデックスを使わない（同じタスクでも新しいIssueを作成）"
+    )
+    parser.add_argument(
+        "--sync-index",
+        action="store_true",
+        help="作成前にリポジトリの既存Issue一覧からインデックスを更新"
+    )
+    parser.add_argument(
+        "--refresh-metadata",
+        action="store_true",
+        help="リポジトリのメタデータ（ラベル・アサイン可能なユーザー・Project ID）のキャッシュを破棄して取得し直す"
+    )
+    parser.add_argument(
+        "--update-existing",
+        action="store_true",
+        help="作成済みのタスクはスキップせず、Issueの内容を更新"
+    )
+    parser.add_argument(
+        "--semantic-dedupe",
+        choices=["flag", "merge"],
+        help="既存のオープンなIssueと意味的に似たタスクの扱い（flag: 類似Issueを本文に記載して作成 / merge: 作成せず既存Issueにコメント）"
+    )
+    parser.add_argument(
+        "--similarity-threshold",
+        type=float,
+        help="--semantic-dedupe で類似とみなすコサイン類似度（デフォルト: 0.6）"
+    )
+    parser.add_argument(
+        "--semantic-model",
+        help="--semantic-dedupe で使うsentence-transformersのモデル名（省略時は文字n-gramのハッシュTF-IDF）"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="前回中断した実行をジャーナルから再開（抽出と完了済みのIssue作成・Projects追加・フィールド設定をスキップ）"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Geminiの応答をストリーミングで受け取り、届いたタスクから順にIssueを作成"
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="抽出・正規化・Issue作成・Projects追加・フィールド設定を上限付きキューでつなぎ、非同期に並行実行"
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        help="--pipeline 全体の実行時間の上限（秒）。過ぎると新しい処理を始めずに終了（--resume で再開）"
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=PIPELINE_QUEUE_SIZE,
+        help=f"--pipeline のステージ間のキューの最大件数（デフォルト: {PIPELINE_QUEUE_SIZE}）"
+    )
+    parser.add_argument(
+        "--plan",
+        help="GitHubに接続せず、各タスクで送信するペイロードをプラン（JSON Lines）としてこのパスに保存（github_integrator.py --apply-plan で適用）"
+    )
+    parser.add_argument(
+        "--trace",
+        help="ステージごとの処理時間・ペイロードサイズ・リトライ回数・トークン数をトレースとしてこのパスに保存"
+    )
+    parser.add_argument(
+        "--trace-format",
+        choices=TRACE_FORMATS,
+        default=TRACE_FORMAT_JSONL,
+        help="--trace の形式（jsonl: 1スパン1行 / otlp: OpenTelemetryのOTLP/JSON）"
+    )
     parser.add_argument(
         "--output-dir",
         "-o",
@@ -101,64 +578,274 @@ def main():
     print("="*80)
     print("会議議事録 → GitHub Issues & Projects 自動作成")
     print("="*80)
-    print(f"議事録: {args.meeting_file}")
+    if args.discord_export:
+        print(f"Discord: {args.discord_export}")
+    else:
+        print(f"議事録: {args.meeting_file or args.meeting_dir + '/' + args.pattern}")
     print(f"Dry-run: {args.dry_run}")
     print(f"Projects追加: {not args.no_project}")
     print("="*80)
 
-    # 環境変数のチェック
+    # 環境変数の読み込みとチェック（--help では読み込まない）
+    load_dotenv()
+    github_token = os.getenv("GITHUB_TOKEN")
+
+    if args.plan:
+        if args.meeting_dir or args.discord_export:
+            print("Error: --plan は --meeting-file と一緒に使ってください")
+            sys.exit(1)
+        if args.pipeline:
+            print("Note: --plan では --pipeline は使わず、抽出したタスクから順にプランを書き出します")
+            args.pipeline = False
+
     if not os.getenv("GOOGLE_API_KEY"):
         print("Error: GOOGLE_API_KEY not found in environment variables")
         print("Please set it in .env file or export it")
         sys.exit(1)
 
-    if not GITHUB_TOKEN:
+    # プランの作成とDry-runはGitHubに接続しないため、トークンは不要
+    offline = bool(args.plan) or args.dry_run
+    if not github_token and not offline:
         print("Error: GITHUB_TOKEN not found in environment variables")
         print("Please set it in .env file or export it")
         sys.exit(1)
 
+    # 抽出とGitHubへの送信を1つのトレースに記録する（異常終了時も終了時に書き出す）
+    tracer = Tracer()
+    if args.trace:
+        tracer.export_on_exit(args.trace, args.trace_format)
+
+    analyzer = MeetingAnalyzer(chunk_tokens=args.chunk_tokens, use_cache=not args.no_cache, tracer=tracer)
+    integrator = GitHubIntegrator(
+        github_token,
+        os.getenv("GITHUB_OWNER", DEFAULT_GITHUB_OWNER),
+        os.getenv("GITHUB_REPO", DEFAULT_GITHUB_REPO),
+        batch_max_operations=args.batch_size,
+        batch_max_cost=args.batch_max_cost,
+        max_workers=args.max_workers,
+        use_index=not args.no_index,
+        on_existing="update" if args.update_existing else "skip",
+        semantic_dedupe=args.semantic_dedupe,
+        similarity_threshold=args.similarity_threshold,
+        semantic_model=args.semantic_model,
+        offline=offline,
+        tracer=tracer
+    )
+    if args.refresh_metadata:
+        integrator.metadata.invalidate()
+    if args.sync_index and args.dry_run:
+        print("Note: --dry-run ではGitHubに接続しないため、--sync-index は使わず手元のインデックスで重複を確認します")
+    elif args.sync_index and not offline:
+        integrator.sync_issue_index()
+
+    # ディレクトリモード: analyzerとintegratorを共有して全議事録を処理
+    if args.meeting_dir:
+        meeting_files = find_meeting_files(args.meeting_dir, args.pattern)
+        if not meeting_files:
+            print(f"Error: No meeting files matched: {args.meeting_dir}/{args.pattern}")
+            sys.exit(1)
+        if args.stream or args.pipeline:
+            print("Note: --meeting-dir では --stream / --pipeline は使わず、議事録単位で抽出します")
+
+        print(f"\n{len(meeting_files)}件の議事録を処理します（抽出の並列数: {args.file_workers}）")
+        reports = process_meeting_dir(analyzer, integrator, meeting_files, args)
+
+        print("\n" + "="*80)
+        print("議事録ごとの結果:")
+        print("="*80)
+        print_batch_report(reports, dry_run=args.dry_run)
+        print(analyzer.cache.summary())
+        print(analyzer.diagnostics.summary())
+        if not args.dry_run:
+            print(f"GraphQLリクエスト数: {integrator.graphql_round_trips}")
+            print(integrator.governor.summary())
+            print(integrator.metadata.summary())
+
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump({"generated_at": datetime.now().isoformat(), "files": reports}, f, ensure_ascii=False, indent=2)
+            print(f"✓ 結果を保存しました: {args.report}")
+
+        if any(report["status"] == "error" for report in reports):
+            sys.exit(1)
+        print("\n✓ すべての処理が完了しました")
+        return
+
+    # Discordモード: エクスポートの新しい会話だけを抽出
+    if args.discord_export:
+        if not Path(args.discord_export).is_file():
+            print(f"Error: File not found: {args.discord_export}")
+            sys.exit(1)
+        if args.stream or args.pipeline or args.incremental or args.resume:
+            print("Note: --discord-export では --stream / --pipeline / --incremental / --resume は使わず、新しい会話ごとに抽出します")
+
+        print("\n[Step 1/2] Discordの新しい会話からタスクを抽出しています...")
+        print("-"*80)
+        succeeded = process_discord_export(analyzer, integrator, args)
+        if not args.dry_run:
+            print(f"GraphQLリクエスト数: {integrator.graphql_round_trips}")
+            print(integrator.governor.summary())
+            print(integrator.metadata.summary())
+        if not succeeded:
+            sys.exit(1)
+        print("\n✓ すべての処理が完了しました")
+        return
+
     # ステップ1: 議事録からタスクを抽出
     print("\n[Step 1/3] 議事録からタスクを抽出しています...")
     print("-"*80)
     
-    analyzer = MeetingAnalyzer()
     meeting_notes = analyzer.read_meeting_notes(args.meeting_file)
-    tasks = analyzer.extract_tasks(meeting_notes)
+    output_file = tasks_output_path(args.meeting_file, args.output_dir)
+    journal = open_journal(args.meeting_file, args)
+    resumed_tasks = journal.tasks if journal else None
 
-    if not tasks:
-        print("Error: No tasks extracted from meeting notes")
-        sys.exit(1)
+    if args.stream and args.incremental:
+        print("Warning: --incremental と --stream は同時に使えないため、ストリーミングせずに抽出します")
 
-    normalized_tasks = analyzer.validate_and_normalize_tasks(tasks)
-    
-    print(f"✓ {len(normalized_tasks)}個のタスクを抽出しました")
+    if args.plan:
+        # プランモード: GitHubに接続せず、抽出したタスクから順に送信するペイロードをプランに書き出す
+        normalized_tasks = []
+        if args.stream and not args.incremental:
+            tasks = analyzer.iter_normalized_tasks(analyzer.extract_tasks_stream(meeting_notes))
+        else:
+            if args.incremental:
+                tasks = analyzer.extract_tasks_incremental(meeting_notes, args.meeting_file)
+            else:
+                tasks = analyzer.extract_tasks(meeting_notes)
+            tasks = analyzer.validate_and_normalize_tasks(tasks or [])
 
-    # タスクの一時保存
-    output_dir = Path(args.output_dir) if args.output_dir else Path(args.meeting_file).parent
-    output_file = output_dir / f"{Path(args.meeting_file).stem}_tasks.json"
-    
-    task_data = {
-        "source_file": args.meeting_file,
-        "extracted_at": datetime.now().isoformat(),
-        "tasks": normalized_tasks
-    }
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(task_data, f, ensure_ascii=False, indent=2)
-    
-    print(f"✓ タスクを保存しました: {output_file}")
+        def plan_tasks():
+            for task in tasks:
+                normalized_tasks.append(task)
+                yield task
 
-    # ステップ2: GitHub IssuesとProjectsを作成
-    print("\n[Step 2/3] GitHub IssuesとProjectsを作成しています...")
-    print("-"*80)
-    
-    integrator = GitHubIntegrator(GITHUB_TOKEN, GITHUB_OWNER, GITHUB_REPO)
-    
-    created_issues = integrator.create_issues_from_tasks(
-        normalized_tasks,
-        dry_run=args.dry_run,
-        add_to_project=not args.no_project
-    )
+        print("\n[Step 2/2] プランを作成しています（GitHubには接続しません）...")
+        print("-"*80)
+
+        header, entries = integrator.build_plan(
+            plan_tasks(),
+            add_to_project=not args.no_project,
+            source_file=args.meeting_file
+        )
+        stats = write_plan(args.plan, header, entries)
+        if not normalized_tasks:
+            print("Error: No tasks extracted from meeting notes")
+            sys.exit(1)
+
+        print(f"✓ {len(normalized_tasks)}個のタスクを抽出しました")
+        print(analyzer.cache.summary())
+        print(analyzer.diagnostics.summary())
+        print(plan_summary(stats))
+        save_tasks(output_file, args.meeting_file, normalized_tasks)
+        print(f"適用するには: python scripts/ai/github_integrator.py --apply-plan {args.plan}")
+        return
+    elif args.pipeline:
+        # パイプラインモード: 抽出からフィールド設定までの各ステージを並行に実行
+        if args.batch:
+            print("Note: --pipeline では --batch は使わず、IssueごとにProjectsへ追加します")
+        if resumed_tasks is not None:
+            print(f"✓ ジャーナルから{len(resumed_tasks)}個のタスクを読み込みました（抽出をスキップ）")
+            source = iter(resumed_tasks)
+        else:
+            source = pipeline_source(analyzer, meeting_notes, args.meeting_file, incremental=args.incremental)
+
+        print("\n[Step 2/3] パイプラインで抽出とGitHub Issues・Projectsの作成を並行に実行しています...")
+        print("-"*80)
+
+        pipeline = IssuePipeline(
+            analyzer,
+            integrator,
+            dry_run=args.dry_run,
+            add_to_project=not args.no_project,
+            journal=journal,
+            queue_size=args.queue_size,
+            time_limit=args.time_limit
+        )
+        created_issues = pipeline.run(source)
+        normalized_tasks = pipeline.normalized_tasks
+
+        if not normalized_tasks:
+            print("Error: No tasks extracted from meeting notes")
+            sys.exit(1)
+        if journal and resumed_tasks is None and pipeline.extracted_all:
+            journal.record_extracted(normalized_tasks)
+
+        print("\n" + pipeline.report())
+        print(analyzer.cache.summary())
+        print(analyzer.diagnostics.summary())
+        if pipeline.timed_out:
+            print("Warning: 時間制限のため一部のタスクを処理していません。--resume で続きから再開できます")
+        save_tasks(output_file, args.meeting_file, normalized_tasks)
+    elif args.stream and not args.incremental and resumed_tasks is None:
+        # ストリーミングモード: 抽出中に届いたタスクから正規化・Issue作成を始める
+        normalized_tasks = []
+
+        def stream_tasks():
+            for task in analyzer.iter_normalized_tasks(analyzer.extract_tasks_stream(meeting_notes)):
+                normalized_tasks.append(task)
+                yield task
+
+        print("\n[Step 2/3] 抽出と並行してGitHub IssuesとProjectsを作成しています...")
+        print("-"*80)
+
+        created_issues = integrator.create_issues_from_tasks(
+            stream_tasks(),
+            dry_run=args.dry_run,
+            add_to_project=not args.no_project,
+            batch=args.batch,
+            journal=journal
+        )
+
+        if not normalized_tasks:
+            print("Error: No tasks extracted from meeting notes")
+            sys.exit(1)
+        if journal:
+            journal.record_extracted(normalized_tasks)
+
+        print(f"✓ {len(normalized_tasks)}個のタスクを抽出しました")
+        if analyzer.stream_stats.get("time_to_first_task") is not None:
+            print(f"最初のタスクまで: {analyzer.stream_stats['time_to_first_task']:.2f}s")
+        print(analyzer.cache.summary())
+        print(analyzer.diagnostics.summary())
+        save_tasks(output_file, args.meeting_file, normalized_tasks)
+    else:
+        if resumed_tasks is not None:
+            # 再開時はジャーナルに記録された抽出結果を使う
+            normalized_tasks = resumed_tasks
+            print(f"✓ ジャーナルから{len(normalized_tasks)}個のタスクを読み込みました（抽出をスキップ）")
+        else:
+            if args.incremental:
+                tasks = analyzer.extract_tasks_incremental(meeting_notes, args.meeting_file)
+            else:
+                tasks = analyzer.extract_tasks(meeting_notes)
+
+            if not tasks:
+                print("Error: No tasks extracted from meeting notes")
+                sys.exit(1)
+
+            normalized_tasks = analyzer.validate_and_normalize_tasks(tasks)
+            if journal:
+                journal.record_extracted(normalized_tasks)
+            
+            print(f"✓ {len(normalized_tasks)}個のタスクを抽出しました")
+            print(analyzer.cache.summary())
+            print(analyzer.diagnostics.summary())
+
+        # タスクの一時保存
+        save_tasks(output_file, args.meeting_file, normalized_tasks)
+
+        # ステップ2: GitHub IssuesとProjectsを作成
+        print("\n[Step 2/3] GitHub IssuesとProjectsを作成しています...")
+        print("-"*80)
+        
+        created_issues = integrator.create_issues_from_tasks(
+            normalized_tasks,
+            dry_run=args.dry_run,
+            add_to_project=not args.no_project,
+            batch=args.batch,
+            journal=journal
+        )
 
     # ステップ3: 議事録にIssueリンクを追記
     if not args.dry_run and created_issues:
@@ -175,12 +862,18 @@ def main():
     if args.dry_run:
         print(f"[DRY RUN] {len(normalized_tasks)}個のIssueが作成される予定です")
     else:
-        print(f"✓ {len(created_issues)}個のIssueを作成しました")
+        existing_count = sum(1 for issue in created_issues if issue.get("existing"))
+        print(f"✓ {len(created_issues) - existing_count}個のIssueを作成しました（作成済み: {existing_count}個）")
+        print(f"GraphQLリクエスト数: {integrator.graphql_round_trips}")
+        print(integrator.governor.summary())
+        print(integrator.metadata.summary())
+        if journal:
+            print(journal.summary())
         
         if created_issues:
             print("\n作成されたIssue:")
             for issue in created_issues:
-                print(f"  #{issue['number']}: {issue['title']}")
+                print(f"  #{issue['number']}: {issue['title']}{'（作成済み）' if issue.get('existing') else ''}")
                 print(f"  → {issue['url']}")
 
     print("\n✓ すべての処理が完了しました")
@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+"""
+議事録 → GitHub Issues パイプラインのベンチマーク
+
+Gemini APIの代わりにプロセス内の偽の GenerativeModel（応答の遅延とタスク数を指定可能）を、
+GitHub APIの代わりにローカルのHTTPスタブ（REST・GraphQL）を使い、以下をタスク数ごとに計測します。
+
+- extract: MeetingAnalyzer.extract_tasks
+- extract_long: タスクごとに見出しのセクションを持つ議事録での MeetingAnalyzer.extract_tasks
+  （文書の大きさがタスク数に比例し、トークン予算を超えるとウィンドウに分割して並列に抽出する）
+- normalize: MeetingAnalyzer.validate_and_normalize_tasks
+- create: GitHubIntegrator.create_issues_from_tasks（Projects v2への追加・フィールド設定を含む）
+- main: auto_create_issues.main（議事録の読み込みから議事録へのIssueリンクの追記まで）
+
+レート制限ガバナーは既定の上限のまま仮想の時計で動かし、実際には眠らずに待機するはずだった秒数を
+「ガバナー待機」として処理時間とは別に表示します。
+
+同じ条件のベースライン（リポジトリで管理する benchmarks/pipeline_baseline.jsonl。なければ
+.cache/benchmarks/pipeline.jsonl に記録した前回の結果）と比較して、許容範囲を超えて遅くなったケース
+（処理時間またはガバナー待機）を表示します（その場合は終了コード1）。結果は .cache/benchmarks/pipeline.jsonl に
+1実行1行で追記し、--update-baseline でベースラインの同じ条件の行を置き換えます。
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+SCRIPTS_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPTS_DIR.parent
+sys.path[:0] = [str(SCRIPTS_DIR), str(SCRIPTS_DIR / "ai")]
+
+from local_cache import cache_path  # noqa: E402
+
+# ベースライン（条件ごとに1行。--update-baseline で更新してコミットする）
+BASELINE_FILE = REPO_ROOT / "benchmarks" / "pipeline_baseline.jsonl"
+
+# 計測するタスク数とケース
+DEFAULT_SIZES = (1, 10, 100, 1000)
+CASES = ("extract", "extract_long", "normalize", "create", "main")
+
+# タスクの元データ（タイトルに連番を付けて必要な数だけ複製する）
+SAMPLE_TASKS_FILE = REPO_ROOT / "tests" / "sample_tasks.json"
+
+# 前回より遅くなったとみなす割合（中央値の比較）と、計測誤差として無視する差（秒）
+REGRESSION_TOLERANCE = 0.25
+REGRESSION_MIN_SECONDS = 0.01
+
+# スタブのリポジトリとプロジェクト
+STUB_OWNER = "bench"
+STUB_REPO = "bench"
+STUB_PROJECT_ID = "PVT_bench"
+
+# スタブのプライマリレート制限（1時間あたり。1000タスクでも残量が減りすぎないようにする）
+STUB_RATE_LIMIT = 1_000_000
+
+# 偽のGeminiが返すトークン数（1タスクあたりの概算）
+FAKE_OUTPUT_TOKENS_PER_TASK = 120
+
+# extract_long の議事録の1セクションあたりの本文（約300トークン）
+LONG_NOTES_SECTION_BODY = "議題について議論した。" * 30
+
+
+def load_sample_tasks() -> List[Dict]:
+    """tests/sample_tasks.json のタスク"""
+    with open(SAMPLE_TASKS_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)["tasks"]
+
+
+def make_tasks(count: int, run_id: str) -> List[Dict]:
+    """
+    ベンチマーク用のタスクを作る
+
+    Args:
+        count: タスク数
+        run_id: タイトルに付ける実行ごとのID（作成済みIssueのインデックスでスキップされないようにする）
+
+    Returns:
+        タスクのリスト
+    """
+    samples = load_sample_tasks()
+    tasks = []
+    for i in range(count):
+        task = dict(samples[i % len(samples)])
+        task["title"] = f"{task['title']}（{run_id}-{i + 1}）"
+        tasks.append(task)
+    return tasks
+
+
+class FakeGenerativeModel:
+    """google.generativeai.GenerativeModel の代わり（固定の遅延のあとで指定のタスクをJSONで返す）"""
+
+    # 次の呼び出しで返すタスクと遅延（秒）
+    tasks: List[Dict] = []
+    latency = 0.0
+    calls = 0
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def generate_content(self, prompt: str, generation_config=None, stream: bool = False):
+        FakeGenerativeModel.calls += 1
+        time.sleep(self.latency)
+        text = json.dumps(self.tasks, ensure_ascii=False)
+        usage = SimpleNamespace(
+            prompt_token_count=len(prompt) // 2,
+            candidates_token_count=len(self.tasks) * FAKE_OUTPUT_TOKENS_PER_TASK,
+            total_token_count=len(prompt) // 2 + len(self.tasks) * FAKE_OUTPUT_TOKENS_PER_TASK
+        )
+        if not stream:
+            return SimpleNamespace(text=text, usage_metadata=usage)
+        return iter(SimpleNamespace(text=text[i:i + 256]) for i in range(0, len(text), 256))
+
+
+def fake_genai() -> SimpleNamespace:
+    """google.generativeai の代わりのモジュール"""
+    return SimpleNamespace(
+        GenerativeModel=FakeGenerativeModel,
+        types=SimpleNamespace(GenerationConfig=lambda **kwargs: kwargs),
+        configure=lambda **kwargs: None
+    )
+
+
+def stub_schema_fields(project_config: Dict) -> List[Dict]:
+    """project_config.json のフィールドからスタブのProjects v2のフィールド構成を作る"""
+    names = project_config["fields"]
+    options = {
+        "status_field": "status_options",
+        "priority_field": "priority_options",
+        "size_field": "size_options",
+        "type_field": "type_options",
+        "team_field": "team_options",
+        "impact_field": "impact_options"
+    }
+    fields = []
+    for i, (key, name) in enumerate(names.items()):
+        if key in options:
+            fields.append({
+                "id": f"F{i}",
+                "name": name,
+                "dataType": "SINGLE_SELECT",
+                "options": [
+                    {"id": f"O{i}_{j}", "name": option}
+                    for j, option in enumerate(project_config.get(options[key], []))
+                ]
+            })
+        elif key == "due_date_field":
+            fields.append({"id": f"F{i}", "name": name, "dataType": "DATE"})
+    return fields
+
+
+class GitHubStubServer:
+    """GitHub REST・GraphQLのローカルスタブ（リクエストごとに固定の遅延を入れる）"""
+
+    def __init__(self, latency: float = 0.0):
+        """
+        Args:
+            latency: 1リクエストあたりの遅延（秒）
+        """
+        self.latency = latency
+        self.counts = {"rest": 0, "graphql": 0}
+        self._lock = threading.Lock()
+        self._issue_number = 0
+        self.reset = int(time.time()) + 3600
+        with open(REPO_ROOT / ".github" / "config" / "project_config.json", 'r', encoding='utf-8') as f:
+            self._fields = stub_schema_fields(json.load(f))
+        with open(REPO_ROOT / ".github" / "config" / "issue_template.json", 'r', encoding='utf-8') as f:
+            issue_config = json.load(f)
+        self._labels = sorted(set(issue_config.get("type_labels", {}).values()) | set(issue_config.get("priority_labels", {}).values()))
+        self._assignees = sorted(set(issue_config.get("assignees_mapping", {}).values()))
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> "GitHubStubServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _issue(self, number: int, title: str) -> Dict:
+        return {
+            "number": number,
+            "title": title,
+            "state": "open",
+            "node_id": f"I_{number}",
+            "url": f"{self.url}/repos/{STUB_OWNER}/{STUB_REPO}/issues/{number}",
+            "html_url": f"https://github.com/{STUB_OWNER}/{STUB_REPO}/issues/{number}"
+        }
+
+    def _rest(self, method: str, path: str, body: Dict):
+        repo_path = f"/repos/{STUB_OWNER}/{STUB_REPO}"
+        path = path.split("?", 1)[0]
+        if method == "GET" and path == repo_path:
+            return 200, {
+                "id": 1,
+                "node_id": "R_bench",
+                "name": STUB_REPO,
+                "full_name": f"{STUB_OWNER}/{STUB_REPO}",
+                "default_branch": "main",
+                "url": f"{self.url}{repo_path}"
+            }
+        if method == "GET" and path == f"{repo_path}/labels":
+            return 200, [{"name": name, "color": "ededed"} for name in self._labels]
+        if method == "GET" and path == f"{repo_path}/assignees":
+            return 200, [{"login": login} for login in self._assignees]
+        if method == "GET" and path == f"{repo_path}/issues":
+            return 200, []
+        if method == "POST" and path == f"{repo_path}/issues":
+            with self._lock:
+                self._issue_number += 1
+                number = self._issue_number
+            return 201, self._issue(number, body.get("title", ""))
+        match = re.fullmatch(rf"{repo_path}/issues/(\d+)", path)
+        if match:
+            return 200, self._issue(int(match.group(1)), body.get("title", ""))
+        return 404, {"message": "Not Found"}
+
+    def _graphql(self, query: str) -> Dict:
+        if "projectV2(number" in query:
+            return {"data": {"user": {"projectV2": {"id": STUB_PROJECT_ID, "title": "Benchmark"}}}}
+        if "fields(first" in query:
+            return {"data": {"node": {"id": STUB_PROJECT_ID, "fields": {"nodes": self._fields}}}}
+        data = {}
+        for alias, field in re.findall(r"(?:(\w+):\s*)?(addProjectV2ItemById|updateProjectV2ItemFieldValue)\(", query):
+            if field == "addProjectV2ItemById":
+                data[alias or field] = {"item": {"id": f"PVTI_{len(data)}"}}
+            else:
+                data[alias or field] = {"projectV2Item": {"id": "PVTI"}}
+        return {"data": data}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # 接続を再利用する（ヘッダーと本文を別々に書くため、Nagleで遅延しないようにする）
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *_):
+                pass
+
+            def _handle(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                time.sleep(stub.latency)
+                if self.path == "/graphql":
+                    resource = "graphql"
+                    status, response = 200, stub._graphql(body.get("query", ""))
+                else:
+                    resource = "core"
+                    status, response = stub._rest(method, self.path, body)
+                kind = "graphql" if resource == "graphql" else "rest"
+                with stub._lock:
+                    stub.counts[kind] += 1
+                    remaining = STUB_RATE_LIMIT - stub.counts[kind]
+
+                payload = json.dumps(response).encode("utf-8")
+                # GETはETagを返し、If-None-Match が一致すれば本文なしの304を返す
+                etag = f'"{hashlib.sha1(payload).hexdigest()}"' if method == "GET" and status == 200 else None
+                if etag and self.headers.get("If-None-Match") == etag:
+                    status, payload = 304, b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("X-RateLimit-Limit", str(STUB_RATE_LIMIT))
+                self.send_header("X-RateLimit-Remaining", str(remaining))
+                self.send_header("X-RateLimit-Reset", str(stub.reset))
+                self.send_header("X-RateLimit-Resource", resource)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def do_PATCH(self):
+                self._handle("PATCH")
+
+        return Handler
+
+
+class VirtualClock:
+    """ガバナー用の時計（sleep は眠らずに時計を進め、待機した秒数を積算する）"""
+
+    def __init__(self):
+        self.offset = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> float:
+        return time.monotonic() + self.offset
+
+    def sleep(self, seconds: float) -> None:
+        with self._lock:
+            self.offset += seconds
+
+
+def git_revision() -> Optional[str]:
+    """計測したコードのコミット（未コミットの変更があれば末尾に + を付ける）"""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return revision + ("+" if dirty else "")
+
+
+class PipelineBenchmark:
+    """ケースごとの計測を行うクラス"""
+
+    def __init__(self, work_dir: Path, stub: GitHubStubServer, governor_clock: VirtualClock, args: argparse.Namespace):
+        self.work_dir = work_dir
+        self.stub = stub
+        self.governor_clock = governor_clock
+        self.args = args
+        self._runs = 0
+
+    def _run_id(self) -> str:
+        self._runs += 1
+        return f"run{self._runs}"
+
+    def _meeting_file(self) -> Path:
+        path = self.work_dir / f"{self._runs:04d}_議事録.md"
+        path.write_text("# ベンチマーク\n\n## アクションアイテム\n\n- 資料を作成する\n", encoding='utf-8')
+        return path
+
+    @staticmethod
+    def _long_notes(tasks: List[Dict]) -> str:
+        """タスクごとに1セクションの議事録（extract_long 用）"""
+        sections = [
+            f"## 議題 {i + 1}\n\n{LONG_NOTES_SECTION_BODY}\n\n- {task['title']}\n\n"
+            for i, task in enumerate(tasks)
+        ]
+        return "# ベンチマーク\n\n" + "".join(sections)
+
+    def _integrator(self):
+        from github_integrator import GitHubIntegrator
+        return GitHubIntegrator(os.environ["GITHUB_TOKEN"], STUB_OWNER, STUB_REPO, max_workers=self.args.max_workers)
+
+    def prepare(self, case: str, size: int) -> Callable[[], int]:
+        """
+        ケースの準備をして、計測する処理を返す（準備は計測に含めない）
+
+        Args:
+            case: ケース名
+            size: タスク数
+
+        Returns:
+            計測する処理（処理したタスク数を返す）
+        """
+        from meeting_analyzer import MeetingAnalyzer
+
+        tasks = make_tasks(size, self._run_id())
+        FakeGenerativeModel.tasks = tasks
+
+        if case == "extract":
+            analyzer = MeetingAnalyzer(use_cache=False)
+            notes = self._meeting_file().read_text(encoding='utf-8')
+            return lambda: len(analyzer.extract_tasks(notes))
+
+        if case == "extract_long":
+            # 偽のGeminiはどのウィンドウにも全タスクを返すため、結果は結合・重複除去で size 件になる
+            analyzer = MeetingAnalyzer(use_cache=False)
+            notes = self._long_notes(tasks)
+            return lambda: len(analyzer.extract_tasks(notes))
+
+        if case == "normalize":
+            analyzer = MeetingAnalyzer(use_cache=False)
+            return lambda: len(analyzer.validate_and_normalize_tasks(tasks))
+
+        if case == "create":
+            integrator = self._integrator()
+            normalized_tasks = MeetingAnalyzer(use_cache=False).validate_and_normalize_tasks(tasks)
+            return lambda: len(integrator.create_issues_from_tasks(normalized_tasks, batch=self.args.batch))
+
+        import auto_create_issues
+        argv = [
+            "auto_create_issues.py",
+            "--meeting-file", str(self._meeting_file()),
+            "--output-dir", str(self.work_dir),
+            "--no-cache",
+            "--max-workers", str(self.args.max_workers)
+        ]
+        if self.args.batch:
+            argv.append("--batch")
+
+        def run_main() -> int:
+            with patched_argv(argv):
+                auto_create_issues.main()
+            return size
+
+        return run_main
+
+    def measure(self, case: str, size: int) -> Dict:
+        """
+        ケースを繰り返し実行して計測する
+
+        Returns:
+            {"median", "min", "runs", "rest", "graphql", "governor_wait"}
+            （秒・1回あたりのリクエスト数・レート制限ガバナーの待機秒数の中央値）
+        """
+        timings = []
+        governor_waits = []
+        requests = {"rest": 0, "graphql": 0}
+        for _ in range(self.args.repeat):
+            run = self.prepare(case, size)
+            before = dict(self.stub.counts)
+            waited_before = self.governor_clock.offset
+            output = io.StringIO()
+            try:
+                with contextlib.redirect_stdout(output):
+                    started_at = time.perf_counter()
+                    processed = run()
+                    timings.append(time.perf_counter() - started_at)
+                    governor_waits.append(self.governor_clock.offset - waited_before)
+            except SystemExit:
+                raise RuntimeError(f"{case}: exited\n{output.getvalue()[-2000:]}")
+            if processed != size:
+                raise RuntimeError(f"{case}: expected {size} tasks, got {processed}")
+            for key in requests:
+                requests[key] = self.stub.counts[key] - before[key]
+        return {
+            "median": statistics.median(timings),
+            "min": min(timings),
+            "runs": timings,
+            "rest": requests["rest"],
+            "graphql": requests["graphql"],
+            "governor_wait": statistics.median(governor_waits)
+        }
+
+
+@contextlib.contextmanager
+def patched_argv(argv: List[str]):
+    saved = sys.argv
+    sys.argv = argv
+    try:
+        yield
+    finally:
+        sys.argv = saved
+
+
+def read_records(path: Path) -> List[Dict]:
+    """JSON Lines の結果のファイル（なければ空）"""
+    if not path.exists():
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def previous_record(history_file: Path, params: Dict) -> Optional[Dict]:
+    """同じ条件で記録した最後の結果"""
+    previous = None
+    for record in read_records(history_file):
+        if record.get("params") == params:
+            previous = record
+    return previous
+
+
+def update_baseline(baseline_file: Path, record: Dict) -> None:
+    """
+    ベースラインの同じ条件の行を置き換える（なければ追加する）
+
+    Args:
+        baseline_file: ベースラインのファイル
+        record: 今回の結果
+    """
+    records = [existing for existing in read_records(baseline_file) if existing.get("params") != record["params"]]
+    records.append(record)
+    baseline_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(baseline_file, 'w', encoding='utf-8') as f:
+        for existing in records:
+            f.write(json.dumps(existing, ensure_ascii=False) + "\n")
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="偽のGeminiとGitHubのスタブで抽出からIssue作成までを計測")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES), help="計測するタスク数（カンマ区切り）")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"計測するケース（カンマ区切り: {', '.join(CASES)}）")
+    parser.add_argument("--repeat", type=int, default=3, help="ケースごとの繰り返し回数（中央値を記録）")
+    parser.add_argument("--model-latency", type=float, default=0.0, help="偽のGeminiの応答の遅延（秒）")
+    parser.add_argument("--github-latency", type=float, default=0.0, help="GitHubのスタブの1リクエストあたりの遅延（秒）")
+    parser.add_argument("--max-workers", type=int, default=1, help="Issue作成の並列数")
+    parser.add_argument("--batch", action="store_true", help="Projects v2への追加とフィールド設定をまとめて送信")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE, help="前回の中央値からこの割合を超えて遅くなったら失敗")
+    parser.add_argument("--history", default=str(cache_path("benchmarks", "pipeline.jsonl")), help="結果を追記するファイル")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE), help="比較するベースライン（条件ごとに1行）")
+    parser.add_argument("--update-baseline", action="store_true", help="ベースラインの同じ条件の行を今回の結果で置き換える")
+    parser.add_argument("--no-record", action="store_true", help="結果を記録しない")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    cases = [case for case in args.cases.split(",") if case]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        print(f"Error: Unknown cases: {', '.join(sorted(unknown))}")
+        sys.exit(1)
+
+    history_file = Path(args.history)
+    baseline_file = Path(args.baseline)
+    params = {
+        "model_latency": args.model_latency,
+        "github_latency": args.github_latency,
+        "max_workers": args.max_workers,
+        "batch": args.batch,
+        "repeat": args.repeat
+    }
+
+    stub = GitHubStubServer(latency=args.github_latency).start()
+    with tempfile.TemporaryDirectory(prefix="benchmark_pipeline_") as work_dir:
+        # キャッシュ（作成済みIssueのインデックス・スキーマなど）は一時ディレクトリに置く
+        import local_cache
+        local_cache.CACHE_DIR = Path(work_dir) / "cache"
+        os.environ.update({
+            "GOOGLE_API_KEY": "benchmark",
+            "GITHUB_TOKEN": "benchmark",
+            "GITHUB_OWNER": STUB_OWNER,
+            "GITHUB_REPO": STUB_REPO,
+            "GITHUB_PROJECT_NUMBER": "1",
+            "GITHUB_API_URL": stub.url,
+            "GITHUB_GRAPHQL_URL": f"{stub.url}/graphql"
+        })
+        os.environ.pop("GEMINI_MODEL", None)
+
+        import github_integrator
+        import meeting_analyzer
+        from rate_limiter import RateLimitGovernor
+        meeting_analyzer._genai = fake_genai()
+        FakeGenerativeModel.latency = args.model_latency
+        # ガバナーは既定の上限のまま仮想の時計で動かす。待機しても眠らず、待機秒数は
+        # 処理時間とは別に「ガバナー待機」として表示する（実際の実行ではこの分だけ遅くなる）
+        governor_clock = VirtualClock()
+        github_integrator.RateLimitGovernor = partial(RateLimitGovernor, clock=governor_clock, sleep=governor_clock.sleep)
+
+        benchmark = PipelineBenchmark(Path(work_dir), stub, governor_clock, args)
+        results: Dict[str, Dict[str, Dict]] = {}
+        try:
+            for case in cases:
+                for size in sizes:
+                    print(f"計測中: {case} × {size}タスク...", flush=True)
+                    results.setdefault(case, {})[str(size)] = benchmark.measure(case, size)
+        finally:
+            stub.stop()
+
+    # 計測環境が変わったときは --update-baseline で取り直す
+    baseline_record = previous_record(baseline_file, params)
+    previous = baseline_record or previous_record(history_file, params)
+    regressions = []
+    print(f"\n{'case':<12} {'tasks':>6} {'median':>11} {'min':>11} {'REST':>6} {'GraphQL':>8} {'ガバナー待機':>10} {'前回比':>8}")
+    for case, by_size in results.items():
+        for size, result in by_size.items():
+            change = ""
+            baseline = ((previous or {}).get("results", {}).get(case) or {}).get(size)
+            if baseline:
+                ratio = result["median"] / baseline["median"] - 1 if baseline["median"] else 0.0
+                change = f"{ratio:+.0%}"
+                if ratio > args.tolerance and result["median"] - baseline["median"] > REGRESSION_MIN_SECONDS:
+                    regressions.append(
+                        f"{case} × {size}タスク: {baseline['median'] * 1000:.1f}ms → {result['median'] * 1000:.1f}ms ({change})"
+                    )
+                baseline_wait = baseline.get("governor_wait")
+                if baseline_wait is not None and result["governor_wait"] > baseline_wait * (1 + args.tolerance) + REGRESSION_MIN_SECONDS:
+                    regressions.append(
+                        f"{case} × {size}タスク: ガバナー待機 {baseline_wait:.1f}s → {result['governor_wait']:.1f}s"
+                    )
+            print(
+                f"{case:<12} {size:>6} {result['median'] * 1000:>9.1f}ms {result['min'] * 1000:>9.1f}ms "
+                f"{result['rest']:>6} {result['graphql']:>8} {result['governor_wait']:>11.1f}s {change:>8}"
+            )
+
+    if previous:
+        source = baseline_file if baseline_record else history_file
+        print(f"\n比較対象: {previous['recorded_at']}（{previous.get('revision') or '-'}、{source}）")
+    record = {
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "params": params,
+        "results": results
+    }
+    if not args.no_record:
+        history_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(history_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print(f"✓ 結果を記録しました: {history_file}")
+    if args.update_baseline:
+        update_baseline(baseline_file, record)
+        print(f"✓ ベースラインを更新しました: {baseline_file}")
+        return
+
+    if regressions:
+        print(f"Error: 前回より{args.tolerance:.0%}を超えて遅くなりました:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+CLIの起動時間のベンチマーク
+
+各CLIのモジュールを `python -X importtime` で読み込み、読み込み時間（累積）が
+予算内に収まっているかを確認します。あわせて `--help` の実行時間を計測します。
+重い依存（google.generativeai・PyGithub・requests・NumPy）は初回の使用時まで
+読み込まないため、これらが起動時に読み込まれると予算を超えます。
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SCRIPTS_DIR = Path(__file__).parent
+
+# CLIのモジュール名 → スクリプトのパス
+CLI_MODULES = {
+    "auto_create_issues": SCRIPTS_DIR / "auto_create_issues.py",
+    "meeting_analyzer": SCRIPTS_DIR / "ai" / "meeting_analyzer.py",
+    "github_integrator": SCRIPTS_DIR / "ai" / "github_integrator.py"
+}
+
+# モジュールの読み込み時間の予算（ミリ秒、累積）
+IMPORT_TIME_BUDGET_MS = 100
+
+# 起動時に読み込まれてはいけない重い依存
+HEAVY_MODULES = ("google.generativeai", "github", "requests", "numpy")
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure_import(module: str) -> Tuple[float, List[Tuple[float, str]]]:
+    """
+    モジュールの読み込み時間を計測する
+
+    Args:
+        module: モジュール名
+
+    Returns:
+        (累積の読み込み時間（ミリ秒）, 直接読み込んだモジュールの (累積ミリ秒, 名前) のリスト)
+    """
+    code = (
+        f"import sys; sys.path[:0] = [{str(SCRIPTS_DIR)!r}, {str(SCRIPTS_DIR / 'ai')!r}]; "
+        f"import {module}"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    )
+    # -X importtime は子モジュールを親より先に出力する
+    total = 0.0
+    children = []
+    pending = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative_ms = int(match.group(2)) / 1000
+        depth = len(match.group(3)) // 2
+        name = match.group(4)
+        if depth == 0:
+            if name == module:
+                total = cumulative_ms
+                children = pending
+            pending = []
+        elif depth == 1:
+            pending.append((cumulative_ms, name))
+    return total, sorted(children, reverse=True)
+
+
+def loaded_heavy_modules(module: str) -> List[str]:
+    """モジュールの読み込みで一緒に読み込まれた重い依存"""
+    code = (
+        f"import sys; sys.path[:0] = [{str(SCRIPTS_DIR)!r}, {str(SCRIPTS_DIR / 'ai')!r}]; "
+        f"import {module}; "
+        f"print('\\n'.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    return result.stdout.split()
+
+
+def measure_help(script: Path, runs: int) -> float:
+    """`--help` の実行時間の中央値（ミリ秒）"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, str(script), "--help"], capture_output=True)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="CLIの起動時間（import time）のベンチマーク")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_TIME_BUDGET_MS, help=f"モジュールの読み込み時間の予算（デフォルト: {IMPORT_TIME_BUDGET_MS}ms）")
+    parser.add_argument("--runs", type=int, default=5, help="--help の実行時間を計測する回数")
+    parser.add_argument("--top", type=int, default=5, help="表示する読み込みの重いモジュールの数")
+    args = parser.parse_args()
+
+    results: Dict[str, bool] = {}
+    for module, script in CLI_MODULES.items():
+        total, children = measure_import(module)
+        heavy = loaded_heavy_modules(module)
+        help_ms = measure_help(script, args.runs)
+        ok = total <= args.budget_ms and not heavy
+        results[module] = ok
+
+        print(f"{'✓' if ok else '✗'} {module}: import {total:.1f}ms (予算 {args.budget_ms:.0f}ms) / --help {help_ms:.0f}ms")
+        for cumulative_ms, name in children[:args.top]:
+            print(f"    {cumulative_ms:8.1f}ms  {name}")
+        if heavy:
+            print(f"    Error: 起動時に重い依存を読み込んでいます: {', '.join(heavy)}")
+
+    if not all(results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
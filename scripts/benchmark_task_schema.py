@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+タスクの検証・正規化（TaskSchema）のベンチマーク
+
+有効値・短縮形（"P1"、"M" など）・不正値を混ぜた合成タスクを TaskSchema.normalize_tasks で
+検証・正規化し、スループット（タスク/秒）と補正・デフォルト値・スキップの件数を表示します。
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+SCRIPTS_DIR = Path(__file__).parent
+sys.path[:0] = [str(SCRIPTS_DIR), str(SCRIPTS_DIR / "ai")]
+
+from task_schema import TaskDiagnostics, TaskSchema  # noqa: E402
+
+# 合成タスクの数の既定値
+DEFAULT_TASKS = 100000
+
+
+def synthetic_tasks(count: int) -> List[Dict]:
+    """
+    有効値・短縮形・不正値を混ぜたタスクを作る
+
+    Args:
+        count: タスクの数
+
+    Returns:
+        抽出結果と同じ形式のタスクのリスト（97件に1件はタイトルが空でスキップされる）
+    """
+    priorities = ["P1 (High)", "P1", "p2", "High", "P0 - 緊急", "P9", None]
+    sizes = ["M (3-5日)", "M", "xs", "Large", "XL (2週以上)", "huge"]
+    types = ["Feature", "bug", "調査", "Meeting Action", "other"]
+    teams = ["Engineering", "eng", "Product", "営業", "Marketing"]
+    impacts = ["High", "medium", "低", "Critical"]
+    dates = ["2026-02-15", "2026/2/15", "2026年2月15日", "next week", None, "2026-02-30"]
+    return [
+        {
+            "title": f"タスク {i} を実装する" if i % 97 else "",
+            "description": "  説明  ",
+            "assignee": "kotaishida",
+            "priority": priorities[i % len(priorities)],
+            "size": sizes[i % len(sizes)],
+            "due_date": dates[i % len(dates)],
+            "type": types[i % len(types)],
+            "team": teams[i % len(teams)],
+            "business_impact": impacts[i % len(impacts)],
+            "dependencies": [],
+            "context": "引用"
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="タスクスキーマの検証・正規化のベンチマーク")
+    parser.add_argument("--tasks", type=int, default=DEFAULT_TASKS, help=f"合成タスクの数（デフォルト: {DEFAULT_TASKS}）")
+    parser.add_argument("--runs", type=int, default=3, help="計測する回数（中央値を表示）")
+    args = parser.parse_args()
+
+    tasks = synthetic_tasks(args.tasks)
+    elapsed = []
+    for _ in range(max(1, args.runs)):
+        # 選択肢の解決結果はスキーマごとに覚えるため、毎回新しいスキーマで計測する
+        schema = TaskSchema()
+        started_at = time.perf_counter()
+        normalized_tasks, diagnostics = schema.normalize_tasks(tasks)
+        elapsed.append(time.perf_counter() - started_at)
+
+    median = statistics.median(elapsed)
+    collector = TaskDiagnostics()
+    collector.extend(diagnostics)
+    print(
+        f"{len(tasks)} tasks -> {len(normalized_tasks)} normalized in {median:.3f}s "
+        f"({len(tasks) / median:,.0f} tasks/s, median of {len(elapsed)})"
+    )
+    print(collector.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+テスト共通のフィクスチャ
+
+scripts/ と scripts/ai/、pptxスキルのOOXMLツール（.agent/skills/pptx/ooxml/scripts/）のモジュールを
+スクリプトと同じ名前でimportできるようにし、
+GitHub APIのローカルスタブとキャッシュの一時ディレクトリを用意する。
+"""
+
+import json
+import sys
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent
+SCRIPTS_DIR = ROOT_DIR / "scripts"
+OOXML_SCRIPTS_DIR = ROOT_DIR / ".agent" / "skills" / "pptx" / "ooxml" / "scripts"
+sys.path[:0] = [str(SCRIPTS_DIR), str(SCRIPTS_DIR / "ai"), str(OOXML_SCRIPTS_DIR)]
+
+# (ステータス, 本文, 追加のヘッダー)
+StubResponse = Tuple[int, object, Dict[str, str]]
+
+
+class GitHubStub:
+    """GitHub REST・GraphQLのローカルスタブ（応答はテストごとに rest・graphql を差し替える）"""
+
+    def __init__(self):
+        self.rest: Callable[[str, str, Dict], StubResponse] = lambda method, path, body: (404, {"message": "Not Found"}, {})
+        self.graphql: Callable[[str, Dict], StubResponse] = lambda query, variables: (200, {"data": {}}, {})
+        self.requests: List[Dict] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        self.graphql_url = f"{self.url}/graphql"
+
+    def start(self) -> "GitHubStub":
+        threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def graphql_requests(self) -> List[Dict]:
+        return [request for request in self.requests if request["path"] == "/graphql"]
+
+    def request_headers(self) -> Dict[str, str]:
+        """rest・graphql の中から呼ぶと、処理中のリクエストのヘッダーを返す（If-None-Match など）"""
+        return self._local.headers
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *_):
+                pass
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def _handle(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else {}
+                with stub._lock:
+                    stub.requests.append({"method": method, "path": self.path, "headers": dict(self.headers), "body": body})
+                stub._local.headers = dict(self.headers)
+                if self.path == "/graphql":
+                    status, response, headers = stub.graphql(body.get("query", ""), body.get("variables") or {})
+                else:
+                    status, response, headers = stub.rest(method, self.path, body)
+
+                # 304 は本文を持たない（送るとキープアライブの次のレスポンスが崩れる）
+                payload = b"" if status == 304 else json.dumps(response).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def do_PATCH(self):
+                self._handle("PATCH")
+
+        return Handler
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """キャッシュ（.cache/）をテストごとの一時ディレクトリにする"""
+    import local_cache
+    monkeypatch.setattr(local_cache, "CACHE_DIR", tmp_path / "cache")
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def github_stub(monkeypatch):
+    """GITHUB_API_URL・GITHUB_GRAPHQL_URL をローカルスタブに向ける"""
+    stub = GitHubStub().start()
+    monkeypatch.setenv("GITHUB_API_URL", stub.url)
+    monkeypatch.setenv("GITHUB_GRAPHQL_URL", stub.graphql_url)
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def make_integrator(github_stub):
+    """スタブに接続する GitHubIntegrator を作る"""
+    from github_integrator import GitHubIntegrator
+
+    def make(**kwargs):
+        return GitHubIntegrator("test-token", "owner", "repo", **kwargs)
+
+    return make
+
+
+@pytest.fixture
+def make_office_file():
+    """パーツ名 → 内容の辞書からOfficeファイル（zip）を作る（zipfileで通常どおり圧縮する）"""
+    def make(path, parts: Dict[str, bytes]):
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zip_ref:
+            for name, data in parts.items():
+                zip_ref.writestr(name, data)
+        return path
+
+    return make
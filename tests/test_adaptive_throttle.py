@@ -0,0 +1,150 @@
+"""AdaptiveThrottle（AIMD）と、セカンダリレート制限を返すスタブに対する並列実行のテスト"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import github_integrator
+from github_integrator import AdaptiveThrottle
+
+QUERY = "query { viewer { login } }"
+
+
+def test_limit_is_halved_on_rate_limit_and_never_below_one():
+    throttle = AdaptiveThrottle(8)
+
+    limits = []
+    for _ in range(5):
+        throttle.acquire()
+        throttle.release(retry_after=0)
+        limits.append(throttle.limit)
+
+    assert limits == [4, 2, 1, 1, 1]
+
+
+def test_limit_recovers_additively_after_successes():
+    throttle = AdaptiveThrottle(4)
+    throttle.acquire()
+    throttle.release(retry_after=0)
+    throttle.acquire()
+    throttle.release(retry_after=0)
+    assert throttle.limit == 1
+
+    limits = []
+    for _ in range(7):
+        throttle.acquire()
+        throttle.release()
+        limits.append(throttle.limit)
+
+    # 上限が n のときは n 回成功すると1増える（max_in_flight を超えない）
+    assert limits == [2, 2, 3, 3, 3, 4, 4]
+
+
+def test_acquire_waits_for_retry_after():
+    throttle = AdaptiveThrottle(2)
+    throttle.acquire()
+    throttle.release(retry_after=0.2)
+
+    started_at = time.monotonic()
+    throttle.acquire()
+
+    assert time.monotonic() - started_at >= 0.19
+
+
+def test_in_flight_never_exceeds_limit():
+    throttle = AdaptiveThrottle(3)
+    lock = threading.Lock()
+    state = {"running": 0, "max": 0}
+
+    def work(_):
+        throttle.acquire()
+        with lock:
+            state["running"] += 1
+            state["max"] = max(state["max"], state["running"])
+        time.sleep(0.01)
+        with lock:
+            state["running"] -= 1
+        throttle.release()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(work, range(24)))
+
+    assert state["max"] == 3
+
+
+class SecondaryLimitedGraphQL:
+    """同時実行数が多すぎると403（Retry-After付き）を返すGraphQLのスタブ（max_rejections 回まで）"""
+
+    def __init__(self, max_concurrent: int, latency: float, max_rejections: int = 0):
+        self.max_concurrent = max_concurrent
+        self.max_rejections = max_rejections
+        self.latency = latency
+        self.running = 0
+        self.peak = 0
+        self.rejected = 0
+        self.limits = []
+        self.throttle = None
+        self._lock = threading.Lock()
+
+    def __call__(self, query, variables):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.limits.append(self.throttle.limit)
+            rejected = self.running > self.max_concurrent and self.rejected < self.max_rejections
+            if rejected:
+                self.rejected += 1
+        try:
+            time.sleep(self.latency)
+            if rejected:
+                return 403, {"message": "You have exceeded a secondary rate limit"}, {"Retry-After": "0.05"}
+            return 200, {"data": {"viewer": {"login": "test"}}}, {}
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+@pytest.fixture
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(github_integrator.random, "uniform", lambda a, b: 0.0)
+
+
+def run_queries(integrator, count, workers):
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda _: integrator._graphql(QUERY), range(count)))
+
+
+def test_backs_off_on_secondary_rate_limit_and_recovers(github_stub, make_integrator, no_jitter, capsys):
+    graphql = SecondaryLimitedGraphQL(max_concurrent=2, latency=0.02, max_rejections=3)
+    github_stub.graphql = graphql
+    integrator = make_integrator(max_workers=4)
+    graphql.throttle = integrator.throttle
+
+    results = run_queries(integrator, 60, workers=4)
+
+    # 403になったリクエストも再試行されてすべて成功する
+    assert all(result["data"]["viewer"]["login"] == "test" for result in results)
+    assert graphql.rejected == 3
+    assert "Secondary rate limit hit" in capsys.readouterr().out
+    # 同時実行数を下げてから、成功が続くと上限まで戻る
+    assert min(graphql.limits) < 4
+    assert integrator.throttle.limit == 4
+
+
+def test_parallel_requests_increase_throughput(github_stub, make_integrator):
+    latency = 0.03
+    graphql = SecondaryLimitedGraphQL(max_concurrent=4, latency=latency)
+    github_stub.graphql = graphql
+
+    integrator = make_integrator(max_workers=4)
+    graphql.throttle = integrator.throttle
+    started_at = time.monotonic()
+    run_queries(integrator, 40, workers=4)
+    elapsed = time.monotonic() - started_at
+
+    assert graphql.peak == 4
+    assert graphql.rejected == 0
+    # 逐次なら 40 × 30ms = 1.2s
+    assert elapsed < 40 * latency * 0.6
@@ -0,0 +1,200 @@
+"""IssuePipeline のステージの終了（終端の伝搬・エラー）と実行時間の上限のテスト"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from async_pipeline import STAGE_NAMES, IssuePipeline
+from github_integrator import GitHubIntegrator
+from pipeline_journal import STAGE_FIELDS_SET, STAGE_PROJECT_ADDED, PipelineJournal
+from task_schema import TaskDiagnostics, TaskSchema
+
+
+class FakeIntegrator:
+    """Issue作成・Projects追加・フィールド設定を記録する GitHubIntegrator の代わり"""
+
+    project_progress = staticmethod(GitHubIntegrator.project_progress)
+
+    def __init__(self, max_workers=2, create_delays=None, fail_project=(), latency=0.0):
+        """
+        Args:
+            max_workers: ステージごとのワーカー数
+            create_delays: タイトルごとのIssue作成の遅延（秒）
+            fail_project: Projectsへの追加で例外を送出するタイトル
+            latency: 各API呼び出しの遅延（秒）
+        """
+        self.max_workers = max_workers
+        self.create_delays = create_delays or {}
+        self.fail_project = set(fail_project)
+        self.latency = latency
+        self.semantic_index = None
+        self.created = []
+        self.project_items = []
+        self.fields = []
+        self._lock = threading.Lock()
+        self._titles = {}
+
+    def resolve_project_id(self):
+        return "PVT_1"
+
+    def prepare_issue_index(self):
+        pass
+
+    def process_task_issue(self, task, claimed, dry_run=False, journal=None):
+        time.sleep(self.create_delays.get(task["title"], self.latency))
+        with self._lock:
+            self.created.append(task["title"])
+            number = len(self.created)
+            self._titles[f"I_{number}"] = task["title"]
+        return task["title"], {"number": number, "title": task["title"], "node_id": f"I_{number}", "url": ""}
+
+    def add_project_item(self, node_id, project_id):
+        time.sleep(self.latency)
+        if self._titles[node_id] in self.fail_project:
+            raise RuntimeError("project unavailable")
+        with self._lock:
+            self.project_items.append(node_id)
+        return f"PVTI_{node_id}"
+
+    def add_issue_to_project(self, node_id, task, project_id, dry_run=False, item_id=None, on_stage=None):
+        time.sleep(self.latency)
+        with self._lock:
+            self.fields.append(item_id)
+        if on_stage:
+            on_stage(STAGE_FIELDS_SET, {"fields": ["Status"]})
+
+
+def analyzer():
+    return SimpleNamespace(schema=TaskSchema(), diagnostics=TaskDiagnostics())
+
+
+def tasks(count):
+    return [{"title": f"タスク{i}"} for i in range(count)]
+
+
+def slow_source(items, interval):
+    for item in items:
+        time.sleep(interval)
+        yield item
+
+
+def test_every_task_passes_through_all_stages():
+    integrator = FakeIntegrator()
+    pipeline = IssuePipeline(analyzer(), integrator)
+
+    issues = pipeline.run(iter(tasks(10)))
+
+    assert sorted(issue["title"] for issue in issues) == sorted(task["title"] for task in tasks(10))
+    assert len(integrator.project_items) == len(integrator.fields) == 10
+    assert pipeline.extracted_all and not pipeline.timed_out
+    assert [len(pipeline.stats[name].latencies) for name in STAGE_NAMES] == [10] * 5
+
+
+def test_results_are_in_task_order_regardless_of_completion_order():
+    # 最初のタスクのIssue作成が最後に完了する
+    integrator = FakeIntegrator(max_workers=4, create_delays={"タスク0": 0.1})
+
+    issues = IssuePipeline(analyzer(), integrator).run(iter(tasks(6)))
+
+    assert integrator.created[-1] == "タスク0"
+    assert [issue["title"] for issue in issues] == [f"タスク{i}" for i in range(6)]
+
+
+def test_invalid_tasks_stop_at_normalize():
+    integrator = FakeIntegrator()
+    pipeline = IssuePipeline(analyzer(), integrator)
+
+    issues = pipeline.run(iter([{"title": "A"}, {"title": ""}, "not a task", {"title": "B"}]))
+
+    assert [issue["title"] for issue in issues] == ["A", "B"]
+    assert [task["title"] for task in pipeline.normalized_tasks] == ["A", "B"]
+    assert len(pipeline.analyzer.diagnostics) == 2
+
+
+def test_stage_errors_do_not_stop_other_items():
+    integrator = FakeIntegrator(fail_project={"タスク1"})
+    pipeline = IssuePipeline(analyzer(), integrator)
+
+    issues = pipeline.run(iter(tasks(4)))
+
+    assert len(issues) == 4
+    assert pipeline.stats["project"].errors == 1
+    assert len(integrator.fields) == 3
+
+
+def test_source_error_ends_pipeline_with_tasks_so_far():
+    # 抽出元の RuntimeError はイベントループの終了と区別してエラーとして数える
+    def failing_source():
+        yield from tasks(2)
+        raise RuntimeError("stream closed")
+
+    pipeline = IssuePipeline(analyzer(), FakeIntegrator())
+
+    issues = pipeline.run(failing_source())
+
+    assert len(issues) == 2
+    assert pipeline.stats["extract"].errors == 1
+    assert not pipeline.extracted_all
+
+
+def test_queues_are_bounded():
+    # 下流が遅くても、上流はキューの大きさまでしか先に進まない
+    integrator = FakeIntegrator(max_workers=1, latency=0.005)
+    pipeline = IssuePipeline(analyzer(), integrator, queue_size=2)
+
+    pipeline.run(iter(tasks(20)))
+
+    assert all(pipeline.stats[name].max_depth <= 2 for name in STAGE_NAMES)
+    assert len(integrator.fields) == 20
+
+
+def test_time_limit_stops_slow_source_without_waiting_for_it():
+    integrator = FakeIntegrator()
+    pipeline = IssuePipeline(analyzer(), integrator, time_limit=0.2)
+
+    started_at = time.monotonic()
+    issues = pipeline.run(slow_source(tasks(100), 0.05))
+    elapsed = time.monotonic() - started_at
+
+    assert pipeline.timed_out
+    assert not pipeline.extracted_all
+    # 抽出スレッドの終了を待たずに終わる（全件なら5秒）
+    assert elapsed < 1.0
+    assert 0 < len(issues) < 100
+    assert "時間制限で打ち切り" in pipeline.report()
+
+
+def test_time_limit_finishes_in_flight_requests_and_drops_the_rest():
+    integrator = FakeIntegrator(max_workers=1, latency=0.1)
+    pipeline = IssuePipeline(analyzer(), integrator, time_limit=0.15)
+
+    issues = pipeline.run(iter(tasks(10)))
+
+    assert pipeline.timed_out
+    # 実行中だったIssue作成は完了し、作成したIssueは結果に含まれる
+    assert [issue["title"] for issue in issues] == integrator.created
+    assert len(integrator.created) < 10
+    dropped = sum(pipeline.stats[name].dropped for name in STAGE_NAMES)
+    assert dropped > 0
+
+
+def test_journal_records_project_stages(tmp_path):
+    journal = PipelineJournal(tmp_path / "journal.jsonl")
+
+    IssuePipeline(analyzer(), FakeIntegrator(), journal=journal).run(iter(tasks(3)))
+
+    resumed = PipelineJournal(tmp_path / "journal.jsonl", resume=True)
+    assert resumed.get("タスク1", STAGE_PROJECT_ADDED)["item_id"].startswith("PVTI_I_")
+    assert all(resumed.get(f"タスク{i}", STAGE_FIELDS_SET) for i in range(3))
+
+
+@pytest.mark.parametrize("add_to_project", [True, False])
+def test_without_project_only_issues_are_created(add_to_project):
+    integrator = FakeIntegrator()
+
+    IssuePipeline(analyzer(), integrator, add_to_project=add_to_project).run(iter(tasks(3)))
+
+    assert len(integrator.created) == 3
+    assert len(integrator.fields) == (3 if add_to_project else 0)
@@ -0,0 +1,84 @@
+"""benchmark_pipeline.py を小さいタスク数で実行し、ベースラインとの比較と更新を確かめるテスト"""
+
+import sys
+
+import pytest
+
+import benchmark_pipeline
+import github_integrator
+import meeting_analyzer
+from benchmark_pipeline import BASELINE_FILE, CASES, read_records, update_baseline
+
+# main が書き換える環境変数（テストの後で元に戻す）
+BENCHMARK_ENV = (
+    "GOOGLE_API_KEY", "GITHUB_TOKEN", "GITHUB_OWNER", "GITHUB_REPO", "GITHUB_PROJECT_NUMBER",
+    "GITHUB_API_URL", "GITHUB_GRAPHQL_URL", "GEMINI_MODEL"
+)
+
+
+@pytest.fixture
+def run_benchmark(tmp_path, monkeypatch):
+    """偽のGeminiへの差し替えなど、main が書き換えるグローバルな状態をテストの後で元に戻す"""
+    for name in BENCHMARK_ENV:
+        monkeypatch.setenv(name, "test")
+    monkeypatch.setattr(meeting_analyzer, "_genai", meeting_analyzer._genai)
+    monkeypatch.setattr(github_integrator, "RateLimitGovernor", github_integrator.RateLimitGovernor)
+    baseline = tmp_path / "baseline.jsonl"
+    history = tmp_path / "history.jsonl"
+
+    def run(*args):
+        monkeypatch.setattr(sys, "argv", [
+            "benchmark_pipeline.py", "--sizes", "1,3", "--repeat", "1",
+            "--baseline", str(baseline), "--history", str(history), *args
+        ])
+        benchmark_pipeline.main()
+        return read_records(baseline), read_records(history)
+
+    return run
+
+
+def test_all_cases_run_and_update_baseline(run_benchmark, capsys):
+    baseline, history = run_benchmark("--update-baseline")
+
+    assert len(baseline) == len(history) == 1
+    results = baseline[0]["results"]
+    assert list(results) == list(CASES)
+    assert all(list(by_size) == ["1", "3"] for by_size in results.values())
+    # 1タスクのIssue作成はGraphQLの呼び出しを含む
+    assert results["create"]["1"]["graphql"] > 0
+    assert "ベースラインを更新しました" in capsys.readouterr().out
+
+
+def test_regression_against_baseline_fails(run_benchmark, tmp_path, capsys):
+    baseline, _ = run_benchmark("--update-baseline", "--cases", "create")
+    record = baseline[0]
+    record["results"]["create"]["1"]["median"] = 0.001
+    baseline_file = tmp_path / "baseline.jsonl"
+    update_baseline(baseline_file, record)
+    capsys.readouterr()
+
+    with pytest.raises(SystemExit):
+        run_benchmark("--cases", "create", "--no-record")
+
+    output = capsys.readouterr().out
+    assert "create × 1タスク: 1.0ms" in output
+    assert str(baseline_file) in output
+
+
+def test_update_baseline_replaces_same_params(tmp_path):
+    path = tmp_path / "baseline.jsonl"
+    update_baseline(path, {"params": {"batch": False}, "results": {"old": 1}})
+    update_baseline(path, {"params": {"batch": True}, "results": {}})
+
+    update_baseline(path, {"params": {"batch": False}, "results": {"new": 1}})
+
+    assert [(record["params"]["batch"], record["results"]) for record in read_records(path)] == [
+        (True, {}), (False, {"new": 1})
+    ]
+
+
+def test_tracked_baseline_covers_default_cases():
+    [record] = [record for record in read_records(BASELINE_FILE) if record["params"]["max_workers"] == 1 and not record["params"]["batch"]]
+
+    assert list(record["results"]) == list(CASES)
+    assert all(list(by_size) == ["1", "10", "100", "1000"] for by_size in record["results"].values())
@@ -0,0 +1,173 @@
+"""議事録の分割抽出（MeetingAnalyzer.extract_tasks）の、偽の GenerativeModel に対するテスト"""
+
+import json
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import meeting_analyzer
+from meeting_analyzer import MeetingAnalyzer
+from note_chunker import build_windows
+
+# 議事録の中のタスク（"TASK[タイトル|担当者]"）
+TASK_PATTERN = re.compile(r"TASK\[([^|\]]+)\|([^\]]*)\]")
+
+# 1ウィンドウあたりのトークン予算（テスト用に小さくする）
+CHUNK_TOKENS = 200
+
+
+class FakeModel:
+    """プロンプトに含まれる TASK[...] をタスクとして返す GenerativeModel の代わり"""
+
+    def __init__(self, latency: float = 0.0, delays=None, fail_marker: str = None):
+        """
+        Args:
+            latency: 1回の呼び出しの遅延（秒）
+            delays: プロンプトに含まれる文字列ごとの遅延（秒）。完了順を入れ替えるのに使う
+            fail_marker: この文字列を含むプロンプトには例外を返す
+        """
+        self.latency = latency
+        self.delays = delays or {}
+        self.fail_marker = fail_marker
+        self.calls = 0
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        with self._lock:
+            self.calls += 1
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            delay = next((delay for marker, delay in self.delays.items() if marker in prompt), self.latency)
+            time.sleep(delay)
+            if self.fail_marker and self.fail_marker in prompt:
+                raise RuntimeError("model unavailable")
+            tasks = [
+                {"title": title, "assignee": assignee or None, "dependencies": []}
+                for title, assignee in TASK_PATTERN.findall(prompt)
+            ]
+            return SimpleNamespace(text=json.dumps(tasks, ensure_ascii=False), usage_metadata=None)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    models = []
+
+    def install(**kwargs):
+        model = FakeModel(**kwargs)
+        genai = SimpleNamespace(
+            GenerativeModel=lambda model_name: model,
+            types=SimpleNamespace(GenerationConfig=lambda **config: config)
+        )
+        monkeypatch.setattr(meeting_analyzer, "_genai", genai)
+        models.append(model)
+        return model
+
+    return install
+
+
+def section(number: int, *tasks: str) -> str:
+    body = "議論の内容を記録する。" * 12
+    return f"## 議題 {number}\n\n{body}\n" + "".join(f"- {task}\n" for task in tasks) + "\n"
+
+
+def analyzer(**kwargs) -> MeetingAnalyzer:
+    kwargs.setdefault("chunk_tokens", CHUNK_TOKENS)
+    kwargs.setdefault("chunk_overlap_tokens", 0)
+    return MeetingAnalyzer(model_name="fake", use_cache=False, **kwargs)
+
+
+def test_short_notes_are_extracted_in_one_call(fake_model):
+    model = fake_model()
+
+    tasks = analyzer(chunk_tokens=10_000).extract_tasks(section(1, "TASK[資料を作成する|田中]"))
+
+    assert [task["title"] for task in tasks] == ["資料を作成する"]
+    assert model.calls == 1
+
+
+def test_merged_in_window_order_regardless_of_completion_order(fake_model):
+    notes = "".join(section(i, f"TASK[タスク{i}|]") for i in range(6))
+    windows = build_windows(notes, CHUNK_TOKENS)
+    assert len(windows) >= 3
+    # 最初のウィンドウが最後に完了する
+    model = fake_model(delays={"TASK[タスク0|]": 0.1})
+
+    tasks = analyzer().extract_tasks(notes)
+
+    assert [task["title"] for task in tasks] == [f"タスク{i}" for i in range(6)]
+    assert model.calls == len(windows)
+
+
+def test_duplicates_keep_first_and_fill_empty_fields(fake_model):
+    notes = (
+        section(0, "TASK[資料を作成する|]")
+        + section(1, "TASK[別のタスク|鈴木]")
+        + section(2, "TASK[資料を 作成する。|田中]")
+    )
+    fake_model(delays={"議題 0": 0.05})
+
+    tasks = analyzer().extract_tasks(notes)
+
+    # 表記ゆれは同じタスクとし、最初のウィンドウのタイトルに後のウィンドウの担当者を補う
+    assert [(task["title"], task["assignee"]) for task in tasks] == [
+        ("資料を作成する", "田中"), ("別のタスク", "鈴木")
+    ]
+
+
+def test_overlapping_windows_do_not_duplicate_tasks(fake_model):
+    notes = "".join(section(i, f"TASK[タスク{i}|]") for i in range(6))
+    fake_model()
+
+    tasks = analyzer(chunk_overlap_tokens=100).extract_tasks(notes)
+
+    assert [task["title"] for task in tasks] == [f"タスク{i}" for i in range(6)]
+
+
+def test_failed_window_is_skipped(fake_model, capsys):
+    notes = section(0, "TASK[タスク0|]") + section(1, "TASK[タスク1|]", "FAIL") + section(2, "TASK[タスク2|]")
+    fake_model(fail_marker="FAIL")
+
+    tasks = analyzer().extract_tasks(notes, retry_count=2)
+
+    assert [task["title"] for task in tasks] == ["タスク0", "タスク2"]
+    assert "1個のウィンドウで抽出に失敗しました" in capsys.readouterr().out
+
+
+def test_merge_tasks_ignores_none_chunks():
+    merged = analyzer().merge_tasks([None, [{"title": "A", "dependencies": ["x"]}], None, [{"title": "a", "dependencies": ["y"]}]])
+
+    assert merged == [{"title": "A", "dependencies": ["x", "y"]}]
+
+
+@pytest.mark.parametrize("sections", [4, 8, 16])
+def test_latency_grows_with_windows_over_workers(fake_model, sections):
+    """
+    文書の大きさ（ウィンドウ数）ごとの抽出時間
+
+    ウィンドウは max_workers 件ずつ並列に抽出されるため、逐次の（ウィンドウ数 × 遅延）より短い
+    """
+    latency = 0.05
+    notes = "".join(section(i, f"TASK[タスク{i}|]") for i in range(sections))
+    windows = len(build_windows(notes, CHUNK_TOKENS))
+    model = fake_model(latency=latency)
+
+    started_at = time.monotonic()
+    tasks = analyzer(max_workers=4).extract_tasks(notes)
+    elapsed = time.monotonic() - started_at
+
+    assert len(tasks) == sections
+    assert model.calls == windows
+    assert model.peak == min(4, windows)
+    rounds = -(-windows // 4)
+    assert elapsed < rounds * latency + 0.2
+    if windows > 4:
+        assert elapsed < windows * latency * 0.6
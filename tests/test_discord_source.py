@@ -0,0 +1,191 @@
+"""DiscordExportSource の既読位置からの再開と、process_discord_export の既読位置の更新のテスト"""
+
+import json
+from argparse import Namespace
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import meeting_analyzer
+from auto_create_issues import process_discord_export
+from discord_source import DiscordExportSource
+from meeting_analyzer import MeetingAnalyzer
+
+START = datetime(2026, 1, 30, 9, 0, tzinfo=timezone.utc)
+NOW = START + timedelta(days=1)
+
+
+def message(message_id, minutes, content="", username="alice"):
+    timestamp = START + timedelta(minutes=minutes)
+    return {"id": str(message_id), "username": username, "content": content, "timestamp": timestamp.isoformat()}
+
+
+def conversations(count, start_id=1):
+    """2時間おきの会話（1会話2メッセージ、2件目が TASK:タイトル）"""
+    messages = []
+    for n in range(count):
+        message_id = start_id + n * 2
+        minutes = (message_id // 2) * 120
+        messages.append(message(message_id, minutes, f"会話{message_id}について"))
+        messages.append(message(message_id + 1, minutes + 1, f"TASK:タスク{message_id}", username="bob"))
+    return messages
+
+
+def write_export(path, messages):
+    path.write_text(json.dumps(messages, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def window_ids(source):
+    return [(window["first_id"], window["last_id"]) for window in source.iter_windows(now=NOW)]
+
+
+def test_windows_split_by_gap(tmp_path):
+    export = tmp_path / "export.json"
+    write_export(export, conversations(3))
+
+    assert window_ids(DiscordExportSource(export)) == [("1", "2"), ("3", "4"), ("5", "6")]
+
+
+def test_resumes_from_saved_offset_after_append(tmp_path):
+    export = tmp_path / "export.json"
+    write_export(export, conversations(2))
+    source = DiscordExportSource(export)
+    windows = list(source.iter_windows(now=NOW))
+    source.commit(windows[-1])
+
+    # エクスポートの末尾に追記される（既読位置より前のバイトは変わらない）
+    text = export.read_text(encoding="utf-8").rstrip()
+    appended = ",\n".join(json.dumps(item, ensure_ascii=False) for item in conversations(1, start_id=5))
+    export.write_text(text[:-1].rstrip() + ",\n" + appended + "\n]", encoding="utf-8")
+
+    resumed = DiscordExportSource(export)
+
+    assert resumed.high_water_mark == 4
+    assert window_ids(resumed) == [("5", "6")]
+    assert resumed.stats["resumed_at"] == windows[-1]["end_offset"]
+    # 既読のメッセージは読み込まない
+    assert resumed.stats["scanned"] == 2
+    assert resumed.stats["skipped"] == 0
+
+
+def test_rewritten_export_is_read_from_start(tmp_path):
+    export = tmp_path / "export.json"
+    write_export(export, conversations(2))
+    source = DiscordExportSource(export)
+    source.commit(list(source.iter_windows(now=NOW))[-1])
+
+    # エクスポートが作り直され、既読位置の直前のバイトが変わる
+    messages = conversations(3)
+    messages[0]["content"] = "編集されたメッセージ"
+    write_export(export, messages)
+
+    resumed = DiscordExportSource(export)
+
+    assert window_ids(resumed) == [("5", "6")]
+    assert resumed.stats["resumed_at"] is None
+    # 先頭から読み、既読のメッセージIDは飛ばす
+    assert resumed.stats["scanned"] == 6
+    assert resumed.stats["skipped"] == 4
+
+
+def test_reset_ignores_saved_state(tmp_path):
+    export = tmp_path / "export.json"
+    write_export(export, conversations(2))
+    source = DiscordExportSource(export)
+    source.commit(list(source.iter_windows(now=NOW))[-1])
+
+    assert window_ids(DiscordExportSource(export, reset=True)) == [("1", "2"), ("3", "4")]
+
+
+def test_recent_conversation_is_held_back(tmp_path):
+    export = tmp_path / "export.json"
+    messages = conversations(2)
+    write_export(export, messages)
+    source = DiscordExportSource(export)
+
+    # 最後のメッセージから window_gap が経っていない会話は次回に回す
+    now = datetime.fromisoformat(messages[-1]["timestamp"]) + timedelta(minutes=5)
+    windows = list(source.iter_windows(now=now))
+
+    assert [window["last_id"] for window in windows] == ["2"]
+    assert source.stats["held_back"] == 2
+
+
+def test_commit_does_not_move_mark_backwards(tmp_path):
+    export = tmp_path / "export.json"
+    write_export(export, conversations(2))
+    source = DiscordExportSource(export)
+    first, second = source.iter_windows(now=NOW)
+
+    source.commit(second)
+    source.commit(first)
+
+    assert DiscordExportSource(export).high_water_mark == 4
+
+
+class FakeIntegrator:
+    """指定したタイトルのIssue作成に失敗する GitHubIntegrator の代わり"""
+
+    def __init__(self, fail_titles=()):
+        self.fail_titles = set(fail_titles)
+        self.titles = []
+
+    def create_issues_from_tasks(self, tasks, dry_run=False, add_to_project=True, batch=False):
+        self.titles.extend(task["title"] for task in tasks)
+        return [
+            {"number": number, "title": task["title"]}
+            for number, task in enumerate(tasks, 1)
+            if task["title"] not in self.fail_titles
+        ]
+
+
+@pytest.fixture
+def discord_run(tmp_path, monkeypatch):
+    """偽のモデルで抽出し、process_discord_export を実行する"""
+    def generate_content(prompt, **kwargs):
+        tasks = [{"title": line.split("TASK:", 1)[1].strip()} for line in prompt.splitlines() if line.startswith("TASK:")]
+        return SimpleNamespace(text=json.dumps(tasks, ensure_ascii=False), usage_metadata=None)
+
+    monkeypatch.setattr(meeting_analyzer, "_genai", SimpleNamespace(
+        GenerativeModel=lambda model_name: SimpleNamespace(generate_content=generate_content),
+        types=SimpleNamespace(GenerationConfig=lambda **config: config)
+    ))
+    export = tmp_path / "export.json"
+    write_export(export, conversations(2))
+
+    def run(integrator, dry_run=False):
+        args = Namespace(
+            discord_export=str(export), discord_gap=30, discord_reset=False, output_dir=str(tmp_path),
+            dry_run=dry_run, no_project=True, batch=False
+        )
+        analyzer = MeetingAnalyzer(model_name="fake", use_cache=False)
+        return process_discord_export(analyzer, integrator, args)
+
+    run.export = export
+    return run
+
+
+def test_mark_advances_when_every_task_has_an_issue(discord_run):
+    assert discord_run(FakeIntegrator()) is True
+
+    assert DiscordExportSource(discord_run.export).high_water_mark == 4
+
+
+def test_mark_is_kept_when_issue_creation_fails(discord_run, capsys):
+    integrator = FakeIntegrator(fail_titles={"タスク3"})
+
+    assert discord_run(integrator) is False
+
+    assert DiscordExportSource(discord_run.export).high_water_mark is None
+    assert "既読位置を更新しません" in capsys.readouterr().out
+    # 次回は同じ会話を再抽出する
+    retry = FakeIntegrator()
+    assert discord_run(retry) is True
+    assert retry.titles == ["タスク1", "タスク3"]
+
+
+def test_dry_run_does_not_move_mark(discord_run):
+    assert discord_run(FakeIntegrator(), dry_run=True) is True
+
+    assert DiscordExportSource(discord_run.export).high_water_mark is None
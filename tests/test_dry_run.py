@@ -0,0 +1,107 @@
+"""--dry-run がトークンなしで、GitHubに接続せずキャッシュ済みのメタデータだけで動くことのテスト"""
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import github_integrator
+import meeting_analyzer
+
+SAMPLE_TASKS_FILE = Path(__file__).parent / "sample_tasks.json"
+
+
+def metadata_rest(method, path, body):
+    if path.startswith("/repos/owner/repo/assignees"):
+        return 200, [{"login": "kochan17"}], {"ETag": '"a1"'}
+    if path.startswith("/repos/owner/repo/labels"):
+        return 200, [{"name": "meeting-action", "color": "ededed"}], {"ETag": '"l1"'}
+    return 404, {"message": "Not Found"}, {}
+
+
+@pytest.fixture
+def offline_env(github_stub, monkeypatch):
+    """GITHUB_TOKEN を消し、スタブのリポジトリ・プロジェクト番号を設定する"""
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.setenv("GITHUB_OWNER", "owner")
+    monkeypatch.setenv("GITHUB_REPO", "repo")
+    monkeypatch.setenv("GITHUB_PROJECT_NUMBER", "1")
+    # .env の GITHUB_TOKEN を読み込まない
+    monkeypatch.setattr("dotenv.load_dotenv", lambda *args, **kwargs: False)
+    github_stub.rest = metadata_rest
+    return github_stub
+
+
+@pytest.fixture
+def cached_metadata(offline_env, make_integrator):
+    """一度オンラインで実行したときと同じように、アサイン可能なユーザー・ラベル・Project IDをキャッシュする"""
+    integrator = make_integrator()
+    integrator.metadata.assignable_users()
+    integrator.metadata.labels()
+    integrator.metadata.set_project_id(1, "PVT_1", "Board")
+    offline_env.requests.clear()
+
+
+def run_main(module, monkeypatch, argv):
+    monkeypatch.setattr(sys, "argv", argv)
+    module.main()
+
+
+def test_integrator_dry_run_needs_no_token_or_network(cached_metadata, offline_env, monkeypatch, capsys):
+    run_main(github_integrator, monkeypatch, ["github_integrator.py", "--input", str(SAMPLE_TASKS_FILE), "--dry-run"])
+
+    output = capsys.readouterr().out
+    assert offline_env.requests == []
+    assert output.count("[DRY RUN] Would create issue") == 5
+    # キャッシュ済みのアサイン可能なユーザーで担当者を確認する
+    assert "Assignee: kochan17" in output
+    assert "codesigncompany cannot be assigned" in output
+    assert "is not cached" not in output
+
+
+def test_dry_run_without_cache_warns_and_stays_offline(offline_env, monkeypatch, capsys):
+    run_main(github_integrator, monkeypatch, ["github_integrator.py", "--input", str(SAMPLE_TASKS_FILE), "--dry-run", "--sync-index"])
+
+    output = capsys.readouterr().out
+    assert offline_env.requests == []
+    assert "Project #1 is not cached" in output
+    assert "--sync-index は使わず" in output
+    assert output.count("[DRY RUN] Would create issue") == 5
+
+
+def test_non_dry_run_still_requires_token(offline_env, monkeypatch, capsys):
+    with pytest.raises(SystemExit):
+        run_main(github_integrator, monkeypatch, ["github_integrator.py", "--input", str(SAMPLE_TASKS_FILE)])
+
+    assert "GITHUB_TOKEN not found" in capsys.readouterr().out
+
+
+def test_auto_create_issues_dry_run_needs_no_token_or_network(cached_metadata, offline_env, monkeypatch, tmp_path, capsys):
+    import auto_create_issues
+
+    with open(SAMPLE_TASKS_FILE, 'r', encoding='utf-8') as f:
+        tasks = json.load(f)["tasks"]
+    model = SimpleNamespace(generate_content=lambda prompt, **kwargs: SimpleNamespace(
+        text=json.dumps(tasks, ensure_ascii=False), usage_metadata=None
+    ))
+    monkeypatch.setattr(meeting_analyzer, "_genai", SimpleNamespace(
+        GenerativeModel=lambda model_name: model,
+        types=SimpleNamespace(GenerationConfig=lambda **config: config)
+    ))
+    monkeypatch.setenv("GOOGLE_API_KEY", "test")
+    monkeypatch.setattr(auto_create_issues, "load_dotenv", lambda *args, **kwargs: False)
+    meeting_file = tmp_path / "2026_01_30_議事録.md"
+    meeting_file.write_text("# 定例\n\n## アクションアイテム\n\n- 資料を作成する\n", encoding='utf-8')
+
+    run_main(auto_create_issues, monkeypatch, [
+        "auto_create_issues.py", "--meeting-file", str(meeting_file), "--output-dir", str(tmp_path),
+        "--no-cache", "--dry-run"
+    ])
+
+    output = capsys.readouterr().out
+    assert offline_env.requests == []
+    assert output.count("[DRY RUN] Would create issue") == 5
+    # Dry-runでは議事録にIssueのリンクを追記しない
+    assert "作成されたGitHub Issues" not in meeting_file.read_text(encoding='utf-8')
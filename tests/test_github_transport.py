@@ -0,0 +1,153 @@
+"""GitHubTransport のリトライ方針と接続の再利用のテスト"""
+
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from github import GithubException
+
+from github_transport import GitHubTransport
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(GitHubTransport, "_retry_delay", lambda self, response, attempt: 0.0)
+
+
+def responses(*statuses):
+    """ステータスを順に返すRESTのスタブ（最後のステータスを繰り返す）"""
+    remaining = list(statuses)
+
+    def rest(method, path, body):
+        status = remaining.pop(0) if len(remaining) > 1 else remaining[0]
+        return status, {"status": status}, {}
+
+    return rest
+
+
+def closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/graphql"
+
+
+@pytest.mark.parametrize("status", [500, 502, 503, 504, 429])
+def test_get_is_retried_on_server_errors(github_stub, status):
+    github_stub.rest = responses(status, 200)
+    transport = GitHubTransport("test-token")
+
+    response = transport.get(f"{github_stub.url}/repos/owner/repo")
+
+    assert response.status_code == 200
+    assert transport.stats == {"requests": 2, "retries": 1}
+
+
+@pytest.mark.parametrize("status", [500, 502, 503, 504])
+def test_post_is_not_retried_on_server_errors(github_stub, status):
+    github_stub.rest = responses(status, 201)
+    transport = GitHubTransport("test-token")
+
+    response = transport.post(f"{github_stub.url}/repos/owner/repo/issues", json={"title": "t"})
+
+    # 処理済みの可能性があるため再送しない（重複作成を防ぐ）
+    assert response.status_code == status
+    assert len(github_stub.requests) == 1
+
+
+def test_post_is_retried_on_429(github_stub):
+    github_stub.rest = responses(429, 201)
+    transport = GitHubTransport("test-token")
+
+    response = transport.post(f"{github_stub.url}/repos/owner/repo/issues", json={"title": "t"})
+
+    assert response.status_code == 201
+    assert len(github_stub.requests) == 2
+
+
+def test_idempotent_post_is_retried_on_server_errors(github_stub):
+    github_stub.rest = responses(502, 200)
+    transport = GitHubTransport("test-token")
+
+    response = transport.post(f"{github_stub.url}/search", json={}, idempotent=True)
+
+    assert response.status_code == 200
+    assert len(github_stub.requests) == 2
+
+
+def test_post_is_not_retried_after_read_timeout(github_stub):
+    def slow(method, path, body):
+        time.sleep(0.3)
+        return 201, {}, {}
+
+    github_stub.rest = slow
+    transport = GitHubTransport("test-token", timeout=(1.0, 0.05))
+
+    with pytest.raises(requests.ReadTimeout):
+        transport.post(f"{github_stub.url}/repos/owner/repo/issues", json={"title": "t"})
+
+    assert len(github_stub.requests) == 1
+    assert transport.stats["retries"] == 0
+
+
+def test_post_is_retried_when_connection_fails_before_sending():
+    transport = GitHubTransport("test-token", max_retries=2)
+
+    with pytest.raises(requests.ConnectionError):
+        transport.post(closed_port_url(), json={})
+
+    assert transport.stats == {"requests": 3, "retries": 2}
+
+
+def test_sequential_requests_reuse_one_connection(github_stub):
+    github_stub.rest = responses(200)
+    transport = GitHubTransport("test-token")
+
+    for _ in range(20):
+        transport.get(f"{github_stub.url}/repos/owner/repo")
+
+    assert github_stub.connections == 1
+
+
+def test_parallel_requests_reuse_pooled_connections(github_stub):
+    """keep-alive接続はプールの大きさまでしか増えない（毎回接続すると40接続）"""
+    github_stub.rest = responses(200)
+    transport = GitHubTransport("test-token", pool_size=4)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: transport.get(f"{github_stub.url}/repos/owner/repo"), range(40)))
+
+    assert len(github_stub.requests) == 40
+    assert github_stub.connections <= 4
+
+
+def test_without_session_every_request_connects(github_stub):
+    github_stub.rest = responses(200)
+
+    for _ in range(5):
+        requests.get(f"{github_stub.url}/repos/owner/repo", timeout=5)
+
+    assert github_stub.connections == 5
+
+
+def test_pygithub_keeps_its_own_connection_alive(github_stub, make_integrator):
+    """PyGithubはトランスポートのセッションを通らないが、自前のkeep-alive接続を再利用する"""
+    github_stub.rest = lambda method, path, body: (200, {"login": path.rsplit("/", 1)[-1]}, {})
+    integrator = make_integrator()
+
+    logins = [integrator.github.get_user(f"user{i}").login for i in range(5)]
+
+    assert logins == [f"user{i}" for i in range(5)]
+    assert github_stub.connections == 1
+
+
+def test_pygithub_does_not_retry_post_on_server_errors(github_stub, make_integrator):
+    github_stub.rest = responses(502, 201)
+    integrator = make_integrator()
+
+    with pytest.raises(GithubException):
+        integrator.github.requester.requestJsonAndCheck("POST", "/repos/owner/repo/issues", input={"title": "t"})
+
+    assert len(github_stub.requests) == 1
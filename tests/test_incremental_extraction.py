@@ -0,0 +1,144 @@
+"""自動追記セクションの除外（strip_generated_sections）と、変更されたセクションだけの再抽出のテスト"""
+
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+import meeting_analyzer
+from meeting_analyzer import MeetingAnalyzer
+from note_chunker import ISSUES_SECTION_HEADING, split_sections, strip_generated_sections
+
+# 議事録の中のタスク（"TASK[タイトル]"）
+TASK_PATTERN = re.compile(r"TASK\[([^\]]+)\]")
+
+ISSUES_SECTION = (
+    f"{ISSUES_SECTION_HEADING}\n\n"
+    "_自動生成: 2026-01-30 10:00:00_\n\n"
+    "- #1: [資料を作成する](https://github.com/owner/repo/issues/1)\n"
+    "### 補足\n\n- TASK[リンクの補足]\n"
+)
+
+
+def test_strip_removes_issues_section_until_next_same_level_heading():
+    notes = "# 定例\n\n## 議題1\n\n- TASK[資料]\n\n" + ISSUES_SECTION + "\n## 次回\n\n- TASK[予約]\n"
+
+    stripped = strip_generated_sections(notes)
+
+    assert ISSUES_SECTION_HEADING not in stripped
+    assert "リンクの補足" not in stripped
+    assert stripped == "# 定例\n\n## 議題1\n\n- TASK[資料]\n\n## 次回\n\n- TASK[予約]\n"
+
+
+def test_strip_removes_trailing_issues_section():
+    notes = "# 定例\n\n- TASK[資料]\n\n" + ISSUES_SECTION
+
+    assert strip_generated_sections(notes) == "# 定例\n\n- TASK[資料]\n"
+
+
+def test_strip_keeps_notes_without_issues_section():
+    notes = "# 定例\n\n```\n## 作成されたGitHub Issues\n```\n\n- TASK[資料]\n"
+
+    # コードブロック内の見出しは自動追記のセクションではない
+    assert strip_generated_sections(notes) == notes
+
+
+def test_split_sections_round_trips():
+    notes = "前文\n# 定例\n\n```\n# コメント\n```\n## 議題\n本文"
+
+    sections = split_sections(notes)
+
+    assert "".join(sections) == notes
+    assert [section.split("\n", 1)[0] for section in sections] == ["前文", "# 定例", "## 議題"]
+
+
+class SectionModel:
+    """プロンプトの TASK[...] を返し、呼ばれたプロンプトの見出しを記録する GenerativeModel の代わり"""
+
+    def __init__(self):
+        self.headings = []
+        self.fail_marker = None
+
+    def generate_content(self, prompt, generation_config=None):
+        self.headings.extend(re.findall(r"^#+ (.+)$", prompt, flags=re.M))
+        if self.fail_marker and self.fail_marker in prompt:
+            raise RuntimeError("model unavailable")
+        tasks = [{"title": title} for title in TASK_PATTERN.findall(prompt)]
+        return SimpleNamespace(text=json.dumps(tasks, ensure_ascii=False), usage_metadata=None)
+
+
+@pytest.fixture
+def model(monkeypatch):
+    model = SectionModel()
+    monkeypatch.setattr(meeting_analyzer, "_genai", SimpleNamespace(
+        GenerativeModel=lambda model_name: model,
+        types=SimpleNamespace(GenerationConfig=lambda **config: config)
+    ))
+    return model
+
+
+def extract(notes, source, model_name="fake"):
+    analyzer = MeetingAnalyzer(model_name=model_name, use_cache=False)
+    return [task["title"] for task in analyzer.extract_tasks_incremental(notes, str(source), retry_count=1)]
+
+
+NOTES = "## 議題1\n\n- TASK[資料を作成する]\n\n## 議題2\n\n- TASK[会場を予約する]\n\n## 空の議題\n"
+
+
+def test_first_run_extracts_every_section_with_body(model, tmp_path):
+    assert extract(NOTES, tmp_path / "notes.md") == ["資料を作成する", "会場を予約する"]
+    # 見出しだけのセクションは送らない
+    assert sorted(model.headings) == ["議題1", "議題2"]
+
+
+def test_only_changed_sections_are_reextracted(model, tmp_path):
+    source = tmp_path / "notes.md"
+    extract(NOTES, source)
+    model.headings.clear()
+
+    edited = NOTES.replace("会場を予約する", "会場を予約して案内する") + "\n## 議題3\n\n- TASK[議事録を共有する]\n"
+    titles = extract(edited, source)
+
+    assert titles == ["資料を作成する", "会場を予約して案内する", "議事録を共有する"]
+    assert sorted(model.headings) == ["議題2", "議題3"]
+
+
+def test_appended_issues_section_does_not_trigger_extraction(model, tmp_path):
+    source = tmp_path / "notes.md"
+    extract(NOTES, source)
+    model.headings.clear()
+
+    assert extract(NOTES.rstrip() + "\n\n" + ISSUES_SECTION, source) == ["資料を作成する", "会場を予約する"]
+    assert model.headings == []
+
+
+def test_failed_section_is_retried_next_run(model, tmp_path):
+    source = tmp_path / "notes.md"
+    model.fail_marker = "会場"
+
+    assert extract(NOTES, source) == ["資料を作成する"]
+
+    model.fail_marker = None
+    model.headings.clear()
+    assert extract(NOTES, source) == ["資料を作成する", "会場を予約する"]
+    assert model.headings == ["議題2"]
+
+
+def test_other_model_does_not_reuse_previous_results(model, tmp_path):
+    source = tmp_path / "notes.md"
+    extract(NOTES, source)
+    model.headings.clear()
+
+    extract(NOTES, source, model_name="other")
+
+    assert sorted(model.headings) == ["議題1", "議題2"]
+
+
+def test_state_is_kept_per_source_file(model, tmp_path):
+    extract(NOTES, tmp_path / "a.md")
+    model.headings.clear()
+
+    extract(NOTES, tmp_path / "b.md")
+
+    assert sorted(model.headings) == ["議題1", "議題2"]
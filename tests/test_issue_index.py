@@ -0,0 +1,166 @@
+"""IssueIndex の既存Issueからの同期と参照のテスト"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from issue_index import IssueIndex, task_fingerprint
+
+
+def issue(number, title, state="open", pull_request=None):
+    return SimpleNamespace(
+        number=number, title=title, state=state, pull_request=pull_request,
+        node_id=f"I_{number}", html_url=f"https://github.com/owner/repo/issues/{number}"
+    )
+
+
+def created(number, title, project_item_id=None):
+    return {
+        "number": number, "node_id": f"I_{number}", "url": f"https://github.com/owner/repo/issues/{number}",
+        "title": title, "project_item_id": project_item_id
+    }
+
+
+@pytest.fixture
+def index():
+    return IssueIndex("owner", "repo")
+
+
+@pytest.mark.parametrize("title", ["資料を作成する", "資料を 作成する。", "資料を作成する!!", "　資料を作成する　"])
+def test_fingerprint_ignores_width_case_spaces_and_symbols(title):
+    assert task_fingerprint(title) == task_fingerprint("資料を作成する")
+
+
+def test_fingerprint_of_empty_title_is_none():
+    assert task_fingerprint("") is None
+    assert task_fingerprint(" 。") is None
+    assert task_fingerprint(None) is None
+
+
+def test_record_and_get(index):
+    index.record(task_fingerprint("ログイン画面を修正する"), created(3, "ログイン画面を修正する"))
+
+    assert index.get(task_fingerprint("ログイン画面を修正する。"))["number"] == 3
+    assert index.get(task_fingerprint("別のタスク")) is None
+    assert index.get(None) is None
+
+
+def test_set_project_item_is_kept_when_recorded_again(index):
+    fingerprint = task_fingerprint("A")
+    index.record(fingerprint, created(1, "A"))
+    index.set_project_item("I_1", "PVTI_1")
+
+    index.record(fingerprint, created(1, "A"))
+
+    assert index.get(fingerprint)["project_item_id"] == "PVTI_1"
+
+
+def test_sync_indexes_only_open_issues(index):
+    count = index.sync([
+        issue(1, "資料を作成する", state="closed"),
+        issue(2, "ログイン画面を修正する"),
+        issue(3, "プルリクエスト", pull_request=SimpleNamespace(url="https://example.com")),
+    ])
+
+    assert count == 1
+    assert len(index) == 1
+    # クローズ済みのIssueと同じタイトルの新しいタスクは既存扱いにしない
+    assert index.get(task_fingerprint("資料を作成する")) is None
+    assert index.get(task_fingerprint("ログイン画面を修正する"))["number"] == 2
+
+
+def test_sync_removes_issues_closed_since_last_sync(index):
+    index.record(task_fingerprint("資料を作成する"), created(1, "資料を作成する"))
+
+    index.sync([issue(1, "資料を作成する", state="closed")])
+
+    assert index.get(task_fingerprint("資料を作成する")) is None
+
+
+def test_sync_keeps_oldest_duplicate_and_logs_it(index, capsys):
+    index.sync([issue(5, "資料を作成する"), issue(2, "資料を 作成する。"), issue(7, "資料を作成する")])
+
+    assert index.get(task_fingerprint("資料を作成する"))["number"] == 2
+    output = capsys.readouterr().out
+    assert "Skip: #5 資料を作成する is a duplicate of #2" in output
+    assert "Skip: #7 資料を作成する is a duplicate of #2" in output
+
+
+def test_sync_keeps_project_item_of_same_issue(index):
+    fingerprint = task_fingerprint("資料を作成する")
+    index.record(fingerprint, created(4, "資料を作成する", project_item_id="PVTI_4"))
+
+    index.sync([issue(4, "資料を作成する")])
+    assert index.get(fingerprint)["project_item_id"] == "PVTI_4"
+
+    # 古い同じタスクのIssueに置き換わった場合は別のIssueのItem IDを引き継がない
+    index.sync([issue(2, "資料を作成する")])
+    assert index.get(fingerprint) == dict(created(2, "資料を作成する"), project_item_id=None)
+
+
+def test_index_is_persisted(index):
+    index.record(task_fingerprint("A"), created(1, "A"))
+
+    assert IssueIndex("owner", "repo").get(task_fingerprint("A"))["number"] == 1
+    assert IssueIndex("owner", "other").get(task_fingerprint("A")) is None
+
+
+def test_disabled_index_bypasses_everything():
+    index = IssueIndex("owner", "repo", enabled=False)
+    index.record(task_fingerprint("A"), created(1, "A"))
+
+    assert index.sync([issue(2, "B")]) == 0
+    assert index.get(task_fingerprint("A")) is None
+    assert len(index) == 0
+
+
+def issues_rest(github_stub, issues):
+    """既存Issueの一覧（1ページ）を返すRESTのスタブ"""
+    for issue in issues:
+        issue["url"] = f"{github_stub.url}/repos/owner/repo/issues/{issue['number']}"
+
+    def rest(method, path, body):
+        if path.startswith("/repos/owner/repo/issues"):
+            return 200, issues, {}
+        if path.startswith("/repos/owner/repo"):
+            return 200, {"full_name": "owner/repo", "name": "repo", "owner": {"login": "owner"}}, {"ETag": '"r1"'}
+        return 404, {"message": "Not Found"}, {}
+
+    return rest
+
+
+def issue_json(number, title, state="open"):
+    return {
+        "number": number, "title": title, "state": state, "node_id": f"I_{number}",
+        "html_url": f"https://github.com/owner/repo/issues/{number}"
+    }
+
+
+def test_integrator_sync_fetches_all_states_but_indexes_open(github_stub, make_integrator, capsys):
+    github_stub.rest = issues_rest(github_stub, [
+        issue_json(1, "資料を作成する", state="closed"),
+        issue_json(2, "ログイン画面を修正する"),
+        issue_json(3, "ログイン画面を修正する"),
+    ])
+    integrator = make_integrator()
+
+    assert integrator.sync_issue_index() == 3
+
+    list_request = next(request for request in github_stub.requests if request["path"].startswith("/repos/owner/repo/issues"))
+    assert "state=all" in list_request["path"]
+    assert len(integrator.issue_index) == 1
+    output = capsys.readouterr().out
+    assert "Skip: #3 ログイン画面を修正する is a duplicate of #2" in output
+    assert "Indexed 1 open issues" in output
+
+
+def test_integrator_skips_task_matching_open_issue_with_its_number(github_stub, make_integrator, capsys):
+    github_stub.rest = issues_rest(github_stub, [issue_json(2, "ログイン画面を修正する")])
+    integrator = make_integrator()
+    integrator.sync_issue_index()
+
+    fingerprint, issue_info = integrator.process_task_issue({"title": "ログイン画面を修正する。"}, set(), dry_run=True)
+
+    assert issue_info["number"] == 2
+    assert issue_info["existing"] is True
+    assert "Skip: already created as #2" in capsys.readouterr().out
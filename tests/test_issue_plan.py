@@ -0,0 +1,213 @@
+"""プラン（JSON Lines）の書き出し・読み込みの往復と、build_plan → apply_plan のテスト"""
+
+import json
+import re
+
+import pytest
+
+from issue_plan import (
+    ACTION_COMMENT,
+    ACTION_CREATE,
+    ACTION_SKIP,
+    ACTION_UPDATE,
+    PLAN_FORMAT,
+    PLAN_VERSION,
+    plan_summary,
+    read_plan,
+    write_plan,
+)
+
+HEADER = {
+    "repository": "owner/repo",
+    "project_id": "PVT_1",
+    "fields": {
+        "Status": {"id": "F_STATUS", "data_type": "SINGLE_SELECT", "options": {"Todo": "OPT_TODO"}},
+        "Due": {"id": "F_DUE", "data_type": "DATE", "options": {}}
+    }
+}
+
+TASKS = [
+    {"title": "資料を作成する", "description": "定例の資料", "assignee": "", "priority": "P1 (High)", "dependencies": []},
+    {"title": "会場を予約する", "description": "来月の会場", "assignee": "", "priority": "P2 (Medium)", "dependencies": []},
+    {"title": "資料を作成する", "description": "重複", "assignee": "", "priority": "P1 (High)", "dependencies": []},
+]
+
+MUTATION_PATTERN = re.compile(r"(\w+): (addProjectV2ItemById|updateProjectV2ItemFieldValue)\(")
+
+
+def create_entry(index, title, warnings=()):
+    return {
+        "index": index,
+        "fingerprint": f"fp{index}",
+        "action": ACTION_CREATE,
+        "title": title,
+        "warnings": list(warnings),
+        "request": {"method": "POST", "path": "/repos/owner/repo/issues", "body": {"title": title, "body": "", "assignees": [], "labels": []}},
+        "project": {
+            "content_id": None,
+            "field_values": [
+                {"field_name": "Status", "field_id": "F_STATUS", "data_type": "SINGLE_SELECT", "value": "OPT_TODO", "label": "Todo"},
+                {"field_name": "Due", "field_id": "F_DUE", "data_type": "DATE", "value": "2026-02-15", "label": "2026-02-15"}
+            ]
+        }
+    }
+
+
+def repository_rest(github_stub):
+    """Issueを作成するRESTのスタブ（作成したIssueのペイロードを created に記録する）"""
+    created = []
+
+    def rest(method, path, body):
+        if method == "POST" and path == "/repos/owner/repo/issues":
+            created.append(body)
+            number = len(created)
+            return 201, {
+                "number": number, "title": body["title"], "node_id": f"I_{number}",
+                "html_url": f"https://github.com/owner/repo/issues/{number}",
+                "url": f"{github_stub.url}/repos/owner/repo/issues/{number}"
+            }, {}
+        if path == "/repos/owner/repo":
+            return 200, {"full_name": "owner/repo", "name": "repo", "url": f"{github_stub.url}/repos/owner/repo"}, {}
+        return 404, {"message": "Not Found"}, {}
+
+    github_stub.rest = rest
+    return created
+
+
+def project_graphql(query, variables):
+    """Projectsへの追加とフィールド設定を成功させるGraphQLのスタブ"""
+    data = {}
+    for alias, field in MUTATION_PATTERN.findall(query):
+        if field == "addProjectV2ItemById":
+            data[alias] = {"item": {"id": f"PVTI_{variables[f'{alias}_contentId']}"}}
+        else:
+            data[alias] = {"projectV2Item": {"id": variables[f"{alias}_itemId"]}}
+    return 200, {"data": data}, {}
+
+
+def test_written_plan_reads_back_the_same_entries(tmp_path):
+    path = tmp_path / "plan.jsonl"
+    entries = [create_entry(1, "資料を作成する", ["担当者が未設定"]), {"index": 2, "fingerprint": "fp2", "action": ACTION_SKIP, "title": "会場を予約する", "warnings": [], "reason": "duplicate"}]
+
+    write_plan(path, HEADER, iter(entries))
+    header, read_entries = read_plan(path)
+
+    assert header == {"format": PLAN_FORMAT, "version": PLAN_VERSION, **HEADER}
+    assert list(read_entries) == entries
+
+
+def test_records_keep_only_field_names_and_values(tmp_path):
+    path = tmp_path / "plan.jsonl"
+
+    write_plan(path, HEADER, [create_entry(1, "資料を作成する")])
+
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 2
+    # フィールドIDと型はヘッダーにだけ書く
+    assert json.loads(lines[1])["project"] == {"content_id": None, "fields": {"Status": "OPT_TODO", "Due": "2026-02-15"}}
+    assert "F_STATUS" not in lines[1]
+
+
+def test_failed_write_keeps_previous_plan(tmp_path):
+    path = tmp_path / "plan.jsonl"
+    write_plan(path, HEADER, [create_entry(1, "資料を作成する")])
+
+    def broken_entries():
+        yield create_entry(2, "会場を予約する")
+        raise RuntimeError("extraction failed")
+
+    with pytest.raises(RuntimeError):
+        write_plan(path, HEADER, broken_entries())
+
+    _, entries = read_plan(path)
+    assert [entry["title"] for entry in entries] == ["資料を作成する"]
+    assert [p.name for p in tmp_path.iterdir()] == ["plan.jsonl"]
+
+
+@pytest.mark.parametrize("first_line, message", [
+    ('{"format": "something-else"}', "Not an issue plan"),
+    ('[1, 2]', "Not an issue plan"),
+    ("", "Not an issue plan"),
+    ("# 議事録", "Not an issue plan"),
+    (json.dumps({"format": PLAN_FORMAT, "version": PLAN_VERSION - 1}), "Unsupported plan version"),
+])
+def test_read_plan_rejects_other_files(tmp_path, first_line, message):
+    path = tmp_path / "plan.jsonl"
+    path.write_text(first_line + "\n", encoding='utf-8')
+
+    with pytest.raises(ValueError, match=message):
+        read_plan(path)
+
+
+def test_plan_summary_counts_actions_and_warnings(tmp_path):
+    entries = [
+        create_entry(1, "A", ["警告1", "警告2"]),
+        create_entry(2, "B"),
+        dict(create_entry(3, "C"), action=ACTION_UPDATE),
+        dict(create_entry(4, "D"), action=ACTION_COMMENT),
+        {"index": 5, "fingerprint": "fp5", "action": ACTION_SKIP, "title": "E", "warnings": []},
+    ]
+
+    stats = write_plan(tmp_path / "plan.jsonl", HEADER, entries)
+
+    assert plan_summary(stats) == "プラン: 作成 2 / 更新 1 / コメント 1 / スキップ 1（警告: 2件）"
+
+
+def test_built_plan_is_applied_with_its_payloads(github_stub, make_integrator, tmp_path, monkeypatch):
+    monkeypatch.delenv("GITHUB_PROJECT_NUMBER", raising=False)
+    path = tmp_path / "plan.jsonl"
+    planner = make_integrator(offline=True)
+
+    write_plan(path, *planner.build_plan(iter(TASKS), add_to_project=False, source_file="議事録.md"))
+
+    # 計画はGitHubに接続せずに作る
+    assert github_stub.requests == []
+    header, entries = read_plan(path)
+    entries = list(entries)
+    assert header["source_file"] == "議事録.md"
+    assert [(entry["action"], entry.get("reason")) for entry in entries] == [
+        (ACTION_CREATE, None), (ACTION_CREATE, None), (ACTION_SKIP, "duplicate")
+    ]
+
+    created = repository_rest(github_stub)
+    issues = make_integrator().apply_plan(header, iter(entries))
+
+    assert created == [entry["request"]["body"] for entry in entries[:2]]
+    assert [issue["title"] for issue in issues] == ["資料を作成する", "会場を予約する"]
+
+
+def test_applied_plan_adds_issues_to_project_with_planned_fields(github_stub, make_integrator, tmp_path):
+    path = tmp_path / "plan.jsonl"
+    write_plan(path, HEADER, [create_entry(1, "資料を作成する"), create_entry(2, "会場を予約する")])
+    repository_rest(github_stub)
+    github_stub.graphql = project_graphql
+
+    issues = make_integrator().apply_plan(*read_plan(path))
+
+    assert [issue["project_item_id"] for issue in issues] == ["PVTI_I_1", "PVTI_I_2"]
+    field_request = github_stub.graphql_requests()[-1]["body"]
+    assert sorted(value for name, value in field_request["variables"].items() if name.endswith("_fieldId")) == [
+        "F_DUE", "F_DUE", "F_STATUS", "F_STATUS"
+    ]
+
+
+def test_plan_for_another_repository_is_rejected(github_stub, make_integrator, tmp_path):
+    path = tmp_path / "plan.jsonl"
+    write_plan(path, dict(HEADER, repository="someone/else"), [create_entry(1, "資料を作成する")])
+
+    with pytest.raises(ValueError, match="someone/else"):
+        make_integrator().apply_plan(*read_plan(path))
+    assert github_stub.requests == []
+
+
+def test_task_created_after_planning_is_skipped(github_stub, make_integrator, tmp_path):
+    path = tmp_path / "plan.jsonl"
+    write_plan(path, dict(HEADER, project_id=None), [create_entry(1, "資料を作成する")])
+    created = repository_rest(github_stub)
+    integrator = make_integrator()
+    integrator.issue_index.record("fp1", {"number": 9, "url": "https://github.com/owner/repo/issues/9", "title": "資料を作成する", "node_id": "I_9"})
+
+    issues = integrator.apply_plan(*read_plan(path))
+
+    assert created == []
+    assert issues[0]["number"] == 9 and issues[0]["existing"]
@@ -0,0 +1,116 @@
+"""json_stream のJSON配列のインクリメンタルパーサーと逐次読み込みのテスト"""
+
+import io
+import json
+
+import pytest
+
+from json_stream import JSONArrayStreamParser, iter_json_array
+
+ITEMS = [
+    {"id": "1", "content": "こんにちは", "nested": {"list": [1, 2, {"a": "]"}]}},
+    "文字列,の要素]",
+    12345,
+    -1.5e3,
+    True,
+    None,
+    [],
+    {"id": "2", "content": "エスケープ \"\\\" と \\u3042"}
+]
+
+
+def encoded(items, indent=None):
+    return json.dumps(items, ensure_ascii=False, indent=indent).encode("utf-8")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_items_match_json_loads_for_any_chunk_size(chunk_size, indent):
+    data = encoded(ITEMS, indent)
+
+    items = [item for _, item in iter_json_array(io.BytesIO(data), chunk_size=chunk_size)]
+
+    assert items == json.loads(data)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 20])
+def test_offsets_point_just_after_each_item(chunk_size):
+    """マルチバイト文字を含んでもバイト位置を返す"""
+    data = encoded(ITEMS, indent=2)
+
+    for count, (offset, item) in enumerate(iter_json_array(io.BytesIO(data), chunk_size=chunk_size), 1):
+        # 要素の直後で切って配列を閉じると、そこまでの要素の配列になる
+        assert json.loads(data[:offset] + b"]") == ITEMS[:count]
+        assert item == ITEMS[count - 1]
+
+
+def test_resume_from_offset_reads_remaining_items():
+    data = encoded(ITEMS, indent=2)
+    offsets = [offset for offset, _ in iter_json_array(io.BytesIO(data))]
+
+    stream = io.BytesIO(data)
+    stream.seek(offsets[2])
+    resumed = list(iter_json_array(stream, chunk_size=4, in_array=True))
+
+    assert [item for _, item in resumed] == ITEMS[3:]
+    assert [offset for offset, _ in resumed] == offsets[3:]
+
+
+def test_empty_array():
+    assert list(iter_json_array(io.BytesIO(b" [ \n ] "))) == []
+
+
+@pytest.mark.parametrize("data", [b'{"id": 1}', b'[{"id": 1}, {"id": ', b'[1, 2', b'[{"id": 1,}]'])
+def test_invalid_json_raises(data):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.BytesIO(data), chunk_size=4))
+
+
+def feed_in_chunks(text, size):
+    parser = JSONArrayStreamParser()
+    items = []
+    for start in range(0, len(text), size):
+        items.extend(parser.feed(text[start:start + size]))
+    return parser, items
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 17, 10_000])
+def test_parser_yields_items_for_any_chunking(size):
+    text = "```json\n" + json.dumps(ITEMS, ensure_ascii=False, indent=2) + "\n```"
+
+    parser, items = feed_in_chunks(text, size)
+
+    assert items == ITEMS
+    assert parser.finished
+
+
+def test_parser_returns_each_item_as_soon_as_it_closes():
+    parser = JSONArrayStreamParser()
+
+    assert parser.feed('[{"title": "A"}, {"title": ') == [{"title": "A"}]
+    assert parser.feed('"B"}') == [{"title": "B"}]
+    # スカラーは区切り（, か ]）が届くまで閉じたか分からない
+    assert parser.feed(", 12") == []
+    assert parser.feed("3]") == [123]
+    assert parser.finished
+
+
+def test_parser_ignores_text_after_array():
+    parser = JSONArrayStreamParser()
+
+    assert parser.feed('[1] [2]') == [1]
+    assert parser.feed(', 3]') == []
+
+
+def test_parser_without_closing_bracket_is_not_finished():
+    parser, items = feed_in_chunks('[{"title": "A"}, {"title": "B"', 4)
+
+    assert items == [{"title": "A"}]
+    assert not parser.finished
+
+
+def test_parser_raises_on_invalid_item():
+    parser = JSONArrayStreamParser()
+
+    with pytest.raises(json.JSONDecodeError):
+        parser.feed("[{'title': 'A'}]")
@@ -0,0 +1,144 @@
+"""batch.py のドキュメントの指定（パターン・マニフェスト）と、プロセスプールでの一括処理・エラーの分離のテスト"""
+
+import json
+import sys
+import zipfile
+
+import pytest
+
+import batch
+from batch import expand_patterns, load_transform, read_manifest, run_batch
+
+PARTS = {
+    "[Content_Types].xml": b'<Types xmlns="t"/>',
+    "ppt/slides/slide1.xml": b'<p:sld xmlns:p="p">' + b"<a:t>Draft</a:t>" * 50 + b"</p:sld>",
+}
+
+TRANSFORMS = '''
+import os
+
+
+def finalize(unpacked_dir, source_path):
+    name = os.path.basename(source_path)
+    if name == "broken.pptx":
+        raise ValueError("cannot edit " + name)
+    if name == "crash.pptx":
+        # ワーカープロセスが強制終了した場合
+        os._exit(1)
+    slide = os.path.join(unpacked_dir, "ppt", "slides", "slide1.xml")
+    with open(slide, encoding="utf-8") as f:
+        xml = f.read()
+    with open(slide, "w", encoding="utf-8") as f:
+        f.write(xml.replace("Draft", "Final"))
+'''
+
+
+@pytest.fixture
+def transform(tmp_path):
+    path = tmp_path / "transforms.py"
+    path.write_text(TRANSFORMS, encoding="utf-8")
+    return f"{path}:finalize"
+
+
+def decks(tmp_path, make_office_file, names):
+    directory = tmp_path / "decks"
+    directory.mkdir(exist_ok=True)
+    return [str(make_office_file(directory / name, PARTS)) for name in names]
+
+
+def slide(path):
+    with zipfile.ZipFile(path) as zip_ref:
+        return zip_ref.read("ppt/slides/slide1.xml")
+
+
+def test_expand_patterns_keeps_order_without_duplicates(tmp_path, make_office_file):
+    sources = decks(tmp_path, make_office_file, ["b.pptx", "a.pptx"])
+    (tmp_path / "decks" / "sub").mkdir()
+    nested = str(make_office_file(tmp_path / "decks" / "sub" / "c.pptx", PARTS))
+
+    expanded = expand_patterns([sources[0], str(tmp_path / "decks" / "**" / "*.pptx")])
+
+    assert expanded == [sources[0], sources[1], nested]
+
+
+def test_read_manifest(tmp_path):
+    manifest = tmp_path / "decks.txt"
+    manifest.write_text("# 研修資料\n\na.pptx\nb.pptx\tout/b.pptx\n", encoding="utf-8")
+
+    jobs = read_manifest(str(manifest))
+
+    assert jobs == [(str(tmp_path / "a.pptx"), None), (str(tmp_path / "b.pptx"), str(tmp_path / "out" / "b.pptx"))]
+
+
+def test_load_transform_rejects_spec_without_function():
+    with pytest.raises(ValueError, match="module:function"):
+        load_transform("transforms.py")
+
+
+def test_documents_are_transformed_in_input_order(tmp_path, make_office_file, transform):
+    sources = decks(tmp_path, make_office_file, [f"deck{i}.pptx" for i in range(5)])
+    jobs = [(source, str(tmp_path / "out" / f"deck{i}.pptx")) for i, source in enumerate(sources)]
+    temp_root = tmp_path / "tmp"
+    temp_root.mkdir()
+
+    results = run_batch(jobs, transform, workers=2, temp_root=str(temp_root))
+
+    assert [result["source"] for result in results] == sources
+    assert all(result["status"] == "ok" and result["output_bytes"] > 0 for result in results)
+    assert all(b"Final" in slide(output) for _, output in jobs)
+    # 元のファイルは変更しない
+    assert b"Draft" in slide(sources[0])
+    # 展開に使った一時ディレクトリは残らない
+    assert list(temp_root.iterdir()) == []
+
+
+def test_failures_are_reported_per_document(tmp_path, make_office_file, transform):
+    sources = decks(tmp_path, make_office_file, ["ok.pptx", "broken.pptx"])
+    not_a_zip = tmp_path / "decks" / "notes.pptx"
+    not_a_zip.write_text("議事録", encoding="utf-8")
+    jobs = [(source, source) for source in sources + [str(not_a_zip), str(tmp_path / "missing.pptx")]]
+
+    results = run_batch(jobs, transform, workers=2)
+
+    assert [result["status"] for result in results] == ["ok", "error", "error", "error"]
+    assert results[1]["error"] == "ValueError: cannot edit broken.pptx"
+    assert "BadZipFile" in results[2]["error"]
+    assert "SystemExit" in results[3]["error"]
+    assert b"Final" in slide(sources[0])
+
+
+def test_crashed_worker_fails_only_its_document(tmp_path, make_office_file, transform):
+    sources = decks(tmp_path, make_office_file, ["a.pptx", "crash.pptx", "b.pptx", "c.pptx"])
+
+    results = run_batch([(source, source) for source in sources], transform, workers=2)
+
+    assert [result["status"] for result in results] == ["ok", "error", "ok", "ok"]
+    assert results[1]["error"] == "Worker process terminated abruptly"
+
+
+def test_main_writes_outputs_and_report(tmp_path, make_office_file, transform, monkeypatch, capsys):
+    sources = decks(tmp_path, make_office_file, ["a.pptx", "b.pptx"])
+    report = tmp_path / "report.json"
+    monkeypatch.setattr(sys, "argv", [
+        "batch.py", str(tmp_path / "decks" / "*.pptx"), "--transform", transform,
+        "--output-dir", str(tmp_path / "out"), "--workers", "2", "--report", str(report)
+    ])
+
+    batch.main()
+
+    output = capsys.readouterr().out
+    assert "Documents: 2 (2 ok, 0 failed)" in output
+    assert [result["source"] for result in json.loads(report.read_text(encoding="utf-8"))] == sources
+    assert b"Final" in slide(tmp_path / "out" / "a.pptx")
+
+
+def test_main_rejects_outputs_that_collide(tmp_path, make_office_file, monkeypatch, capsys):
+    decks(tmp_path, make_office_file, ["a.pptx"])
+    (tmp_path / "other").mkdir()
+    other = str(make_office_file(tmp_path / "other" / "a.pptx", PARTS))
+    monkeypatch.setattr(sys, "argv", ["batch.py", str(tmp_path / "decks" / "a.pptx"), other, "--output-dir", str(tmp_path / "out")])
+
+    with pytest.raises(SystemExit):
+        batch.main()
+
+    assert "would both be written to" in capsys.readouterr().out
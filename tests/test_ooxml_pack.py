@@ -0,0 +1,132 @@
+"""pack.py の決定的な出力・メディアの無圧縮格納（zip_raw.compression_method）・--previous の再利用のテスト"""
+
+import os
+import zipfile
+
+import pytest
+
+from pack import entry_names, pack
+from zip_raw import ZIP_DEFLATED, ZIP_STORED, compression_method
+
+SLIDE_XML = b'<p:sld xmlns:p="p">' + b"<a:t>Draft</a:t>" * 200 + b"</p:sld>"
+
+PARTS = {
+    "[Content_Types].xml": b'<Types xmlns="t"><Default Extension="png"/></Types>',
+    "_rels/.rels": b"<Relationships/>" * 20,
+    "ppt/slides/slide2.xml": SLIDE_XML,
+    "ppt/slides/slide1.xml": SLIDE_XML.replace(b"Draft", b"Title"),
+    # 圧縮済みのPNG（乱数で圧縮できない）と、描画レコードで圧縮が効くEMF
+    "ppt/media/image1.png": os.urandom(100_000),
+    "ppt/media/image2.emf": b"\x01\x00\x00\x00" * 20_000,
+    # 圧縮の弱いエンコーダーが書いたPNG
+    "ppt/media/image3.png": b"\x00" * 50_000,
+}
+
+
+def unpacked_dir(tmp_path, parts=PARTS):
+    directory = tmp_path / "unpacked"
+    for name, data in parts.items():
+        path = directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return directory
+
+
+def compress_types(path):
+    with zipfile.ZipFile(path) as zip_ref:
+        return {info.filename: info.compress_type for info in zip_ref.infolist()}
+
+
+def test_entries_are_ordered_with_content_types_first(tmp_path):
+    names = entry_names(unpacked_dir(tmp_path))
+
+    assert names[0] == "[Content_Types].xml"
+    assert names[1:] == sorted(names[1:])
+    assert set(names) == set(PARTS)
+
+
+def test_output_is_deterministic_and_readable(tmp_path):
+    directory = unpacked_dir(tmp_path)
+    first, second = tmp_path / "first.pptx", tmp_path / "second.pptx"
+
+    pack(str(directory), str(first), workers=4)
+    os.utime(directory / "ppt/slides/slide1.xml", (0, 0))
+    pack(str(directory), str(second), workers=1)
+
+    assert first.read_bytes() == second.read_bytes()
+    with zipfile.ZipFile(first) as zip_ref:
+        assert zip_ref.testzip() is None
+        assert {name: zip_ref.read(name) for name in zip_ref.namelist()} == PARTS
+        # ファイルの更新日時によらず固定のタイムスタンプ
+        assert {info.date_time for info in zip_ref.infolist()} == {(1980, 1, 1, 0, 0, 0)}
+
+
+def test_compressed_media_is_stored(tmp_path):
+    output = tmp_path / "deck.pptx"
+
+    pack(str(unpacked_dir(tmp_path)), str(output))
+
+    methods = compress_types(output)
+    assert methods["ppt/media/image1.png"] == ZIP_STORED
+    assert methods["ppt/media/image2.emf"] == ZIP_DEFLATED
+    assert methods["ppt/media/image3.png"] == ZIP_DEFLATED
+    assert methods["ppt/slides/slide1.xml"] == ZIP_DEFLATED
+
+
+@pytest.mark.parametrize("name, data, expected", [
+    ("ppt/media/image.JPG", os.urandom(1000), ZIP_STORED),
+    ("ppt/embeddings/sheet.xlsx", os.urandom(1000), ZIP_STORED),
+    ("ppt/media/image.png", b"\x00" * 1000, ZIP_DEFLATED),
+    ("ppt/media/image.wmf", os.urandom(1000), ZIP_DEFLATED),
+    ("ppt/slides/slide1.xml", os.urandom(1000), ZIP_DEFLATED),
+])
+def test_compression_method(name, data, expected):
+    assert compression_method(name, data) == expected
+
+
+def test_previous_archive_entries_are_reused(tmp_path, capsys):
+    directory = unpacked_dir(tmp_path)
+    previous = tmp_path / "previous.pptx"
+    pack(str(directory), str(previous))
+    (directory / "ppt/slides/slide2.xml").write_bytes(SLIDE_XML.replace(b"Draft", b"Final"))
+    capsys.readouterr()
+
+    output = tmp_path / "deck.pptx"
+    pack(str(directory), str(output), previous=str(previous))
+
+    assert f"(1 deflated, 0 stored, {len(PARTS) - 1} reused)" in capsys.readouterr().out
+    with zipfile.ZipFile(output) as zip_ref:
+        assert zip_ref.testzip() is None
+        assert b"Final" in zip_ref.read("ppt/slides/slide2.xml")
+
+
+def test_unchanged_repack_is_identical_to_previous(tmp_path):
+    directory = unpacked_dir(tmp_path)
+    previous, output = tmp_path / "previous.pptx", tmp_path / "deck.pptx"
+    pack(str(directory), str(previous))
+
+    pack(str(directory), str(output), previous=str(previous))
+
+    assert output.read_bytes() == previous.read_bytes()
+
+
+def test_previous_may_be_the_output(tmp_path):
+    directory = unpacked_dir(tmp_path)
+    output = tmp_path / "deck.pptx"
+    pack(str(directory), str(output))
+    (directory / "ppt/slides/slide1.xml").write_bytes(b"<p:sld/>")
+
+    pack(str(directory), str(output), previous=str(output))
+
+    with zipfile.ZipFile(output) as zip_ref:
+        assert zip_ref.read("ppt/slides/slide1.xml") == b"<p:sld/>"
+        assert zip_ref.read("ppt/media/image1.png") == PARTS["ppt/media/image1.png"]
+    assert sorted(os.listdir(tmp_path)) == ["deck.pptx", "unpacked"]
+
+
+def test_missing_input_exits(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        pack(str(tmp_path / "missing"), str(tmp_path / "deck.pptx"))
+
+    assert "not found" in capsys.readouterr().out
+
@@ -0,0 +1,140 @@
+"""ArchiveWorkspace の遅延読み込みと未変更エントリの圧縮済みのままのコピー、unpack.py --parts・pack.py --base のテスト"""
+
+import os
+import zipfile
+
+import pytest
+
+from pack import pack_onto
+from unpack import unpack
+from workspace import ArchiveWorkspace
+from zip_raw import UTF8_FLAG, ZIP_STORED, RawZipWriter, read_raw
+
+SLIDE_XML = '<p:sld xmlns:p="p">' + "<a:t>Draft</a:t>" * 200 + "</p:sld>"
+
+PARTS = {
+    "[Content_Types].xml": b'<Types xmlns="t"/>',
+    "ppt/slides/slide1.xml": SLIDE_XML.encode("utf-8"),
+    "ppt/slides/slide2.xml": SLIDE_XML.replace("Draft", "Title").encode("utf-8"),
+    "ppt/media/image1.png": os.urandom(50_000),
+}
+
+
+@pytest.fixture
+def deck(tmp_path, make_office_file):
+    return make_office_file(tmp_path / "deck.pptx", PARTS)
+
+
+def raw_entries(path):
+    """エントリ名 → 圧縮済みのバイト列"""
+    with zipfile.ZipFile(path) as zip_ref, open(path, "rb") as fp:
+        return {info.filename: read_raw(fp, info) for info in zip_ref.infolist()}
+
+
+def test_read_and_write_parts(deck):
+    with ArchiveWorkspace(deck) as workspace:
+        assert workspace.read_text("ppt/slides/slide1.xml") == SLIDE_XML
+        workspace.write("ppt/slides/slide1.xml", SLIDE_XML.replace("Draft", "Final"))
+        workspace.write("ppt/slides/slide3.xml", "<p:sld/>")
+        workspace.delete("ppt/slides/slide2.xml")
+
+        assert "Final" in workspace.read_text("ppt/slides/slide1.xml")
+        assert "ppt/slides/slide2.xml" not in workspace
+        assert workspace.names() == ["[Content_Types].xml", "ppt/slides/slide1.xml", "ppt/media/image1.png", "ppt/slides/slide3.xml"]
+        assert workspace.modified == ["ppt/slides/slide1.xml", "ppt/slides/slide2.xml", "ppt/slides/slide3.xml"]
+        assert workspace.info("ppt/slides/slide3.xml") is None
+        with pytest.raises(KeyError):
+            workspace.read("ppt/slides/slide2.xml")
+
+
+def test_writing_identical_bytes_is_not_a_change(deck):
+    with ArchiveWorkspace(deck) as workspace:
+        workspace.write("ppt/slides/slide1.xml", SLIDE_XML.replace("Draft", "Final"))
+        workspace.write("ppt/slides/slide1.xml", SLIDE_XML)
+
+        assert workspace.modified == []
+
+
+def test_save_copies_untouched_entries_verbatim(deck, tmp_path):
+    output = tmp_path / "final.pptx"
+
+    with ArchiveWorkspace(deck) as workspace:
+        workspace.write("ppt/slides/slide1.xml", SLIDE_XML.replace("Draft", "Final"))
+        workspace.save(output)
+        # 保存後は保存先を開き直し、変更はなくなる
+        assert workspace.path == output
+        assert workspace.modified == []
+
+    before, after = raw_entries(deck), raw_entries(output)
+    assert after.keys() == before.keys()
+    assert all(after[name] == before[name] for name in before if name != "ppt/slides/slide1.xml")
+    with zipfile.ZipFile(output) as zip_ref:
+        assert zip_ref.testzip() is None
+        assert b"Final" in zip_ref.read("ppt/slides/slide1.xml")
+        assert zip_ref.getinfo("ppt/media/image1.png").compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_added_media_is_stored(deck):
+    with ArchiveWorkspace(deck) as workspace:
+        workspace.write("ppt/media/image2.png", os.urandom(10_000))
+        workspace.save()
+
+    with zipfile.ZipFile(deck) as zip_ref:
+        assert zip_ref.getinfo("ppt/media/image2.png").compress_type == ZIP_STORED
+
+
+def test_save_over_the_source(deck, tmp_path):
+    with ArchiveWorkspace(deck) as workspace:
+        workspace.delete("ppt/media/image1.png")
+        workspace.save()
+        assert workspace.read_text("ppt/slides/slide2.xml").count("Title") == 200
+
+    with zipfile.ZipFile(deck) as zip_ref:
+        assert zip_ref.namelist() == ["[Content_Types].xml", "ppt/slides/slide1.xml", "ppt/slides/slide2.xml"]
+    assert os.listdir(tmp_path) == ["deck.pptx"]
+
+
+def test_missing_file_is_rejected(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ArchiveWorkspace(tmp_path / "missing.pptx")
+
+
+def test_unpack_parts_and_pack_onto_base(deck, tmp_path, capsys):
+    parts_dir = tmp_path / "parts"
+
+    unpack(str(deck), str(parts_dir), parts=["ppt/slides/slide2.xml"])
+
+    assert [path.name for path in parts_dir.rglob("*") if path.is_file()] == ["slide2.xml"]
+    slide = parts_dir / "ppt" / "slides" / "slide2.xml"
+    slide.write_text(slide.read_text(encoding="utf-8").replace("Title", "Final"), encoding="utf-8")
+    output = tmp_path / "final.pptx"
+
+    pack_onto(str(parts_dir), str(deck), str(output))
+
+    assert "(1 parts changed, other entries copied)" in capsys.readouterr().out
+    with zipfile.ZipFile(output) as zip_ref:
+        assert zip_ref.namelist() == list(PARTS)
+        assert b"Final" in zip_ref.read("ppt/slides/slide2.xml")
+        assert zip_ref.read("ppt/media/image1.png") == PARTS["ppt/media/image1.png"]
+
+
+def test_unpack_unknown_part_exits(deck, tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        unpack(str(deck), str(tmp_path / "parts"), parts=["ppt/slides/slide9.xml"])
+
+    assert "ppt/slides/slide9.xml not found" in capsys.readouterr().out
+
+
+def test_raw_writer_copy_entry(tmp_path, make_office_file):
+    source = make_office_file(tmp_path / "source.zip", {"a.xml": SLIDE_XML.encode("utf-8"), "スライド.xml": b"<x/>"})
+    output = tmp_path / "copy.zip"
+
+    with zipfile.ZipFile(source) as zip_ref, open(source, "rb") as fp, RawZipWriter(output) as writer:
+        for info in zip_ref.infolist():
+            writer.copy_entry(fp, info)
+
+    assert raw_entries(output) == raw_entries(source)
+    with zipfile.ZipFile(output) as zip_ref:
+        assert zip_ref.testzip() is None
+        assert zip_ref.read("スライド.xml") == b"<x/>"
+        assert zip_ref.getinfo("スライド.xml").flag_bits & UTF8_FLAG
@@ -0,0 +1,130 @@
+"""PipelineJournal の記録・読み込みと、--resume で完了済みのステージをスキップするテスト"""
+
+import json
+
+import pytest
+
+from github_integrator import GitHubIntegrator
+from issue_index import task_fingerprint
+from pipeline_journal import STAGE_FIELDS_SET, STAGE_ISSUE_CREATED, STAGE_PROJECT_ADDED, PipelineJournal
+
+TASKS = [
+    {"title": "資料を作成する", "description": "定例の資料", "assignee": "", "priority": "中", "dependencies": []},
+    {"title": "会場を予約する", "description": "来月の会場", "assignee": "", "priority": "中", "dependencies": []},
+]
+
+
+def issue_info(number, title):
+    return {"number": number, "url": f"https://github.com/owner/repo/issues/{number}", "title": title, "node_id": f"I_{number}"}
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return tmp_path / "journal.jsonl"
+
+
+def test_recorded_stages_are_loaded_on_resume(journal_path):
+    journal = PipelineJournal(journal_path)
+    journal.record_extracted(TASKS)
+    journal.record("fp1", STAGE_ISSUE_CREATED, issue_info(1, "資料を作成する"))
+    journal.record("fp1", STAGE_PROJECT_ADDED, {"item_id": "PVTI_1"})
+    journal.record(None, STAGE_ISSUE_CREATED, issue_info(2, "無題"))
+
+    resumed = PipelineJournal(journal_path, resume=True)
+
+    assert resumed.tasks == TASKS
+    assert resumed.get("fp1", STAGE_ISSUE_CREATED)["number"] == 1
+    assert resumed.get("fp1", STAGE_PROJECT_ADDED) == {"item_id": "PVTI_1"}
+    assert resumed.get("fp1", STAGE_FIELDS_SET) is None
+    assert resumed.get("fp2", STAGE_ISSUE_CREATED) is None
+    assert resumed.summary() == "ジャーナル: Issue作成 1 / Projects追加 1 / フィールド設定 0"
+
+
+def test_torn_last_line_is_ignored(journal_path):
+    journal = PipelineJournal(journal_path)
+    journal.record("fp1", STAGE_ISSUE_CREATED, issue_info(1, "資料を作成する"))
+    # 書き込み途中でクラッシュした最終行
+    with open(journal_path, 'a', encoding='utf-8') as f:
+        f.write('{"event": "issue_created", "fingerprint": "fp2", "da')
+
+    resumed = PipelineJournal(journal_path, resume=True)
+
+    assert resumed.get("fp1", STAGE_ISSUE_CREATED)["number"] == 1
+    assert resumed.get("fp2", STAGE_ISSUE_CREATED) is None
+
+
+def test_without_resume_journal_starts_over(journal_path):
+    PipelineJournal(journal_path).record("fp1", STAGE_ISSUE_CREATED, issue_info(1, "資料を作成する"))
+
+    journal = PipelineJournal(journal_path)
+
+    assert journal.get("fp1", STAGE_ISSUE_CREATED) is None
+    assert not journal_path.exists()
+
+
+def test_resume_continues_appending(journal_path):
+    PipelineJournal(journal_path).record("fp1", STAGE_ISSUE_CREATED, issue_info(1, "A"))
+    PipelineJournal(journal_path, resume=True).record("fp1", STAGE_PROJECT_ADDED, {"item_id": "PVTI_1"})
+
+    events = [json.loads(line)["event"] for line in journal_path.read_text(encoding='utf-8').splitlines()]
+
+    assert events == [STAGE_ISSUE_CREATED, STAGE_PROJECT_ADDED]
+
+
+def test_journal_is_kept_per_source(tmp_path):
+    PipelineJournal.for_source(str(tmp_path / "a.md")).record("fp1", STAGE_ISSUE_CREATED, issue_info(1, "A"))
+
+    assert PipelineJournal.for_source(str(tmp_path / "a.md"), resume=True).get("fp1", STAGE_ISSUE_CREATED)
+    assert PipelineJournal.for_source(str(tmp_path / "b.md"), resume=True).get("fp1", STAGE_ISSUE_CREATED) is None
+
+
+@pytest.mark.parametrize("stages, expected", [
+    ({}, (None, True)),
+    ({STAGE_PROJECT_ADDED: {"item_id": "PVTI_1"}}, ("PVTI_1", True)),
+    ({STAGE_PROJECT_ADDED: {"item_id": "PVTI_1"}, STAGE_FIELDS_SET: {"fields": ["Status"]}}, ("PVTI_1", False)),
+])
+def test_project_progress_resumes_after_last_stage(journal_path, stages, expected):
+    journal = PipelineJournal(journal_path)
+    for stage, data in stages.items():
+        journal.record("fp1", stage, data)
+
+    assert GitHubIntegrator.project_progress("fp1", issue_info(1, "A"), journal) == expected
+
+
+def repository_rest(github_stub):
+    """Issueを作成するRESTのスタブ（作成したIssueを created に記録する）"""
+    created = []
+
+    def rest(method, path, body):
+        if method == "POST" and path == "/repos/owner/repo/issues":
+            number = len(created) + 1
+            created.append(body["title"])
+            return 201, {
+                "number": number, "title": body["title"], "node_id": f"I_{number}",
+                "html_url": f"https://github.com/owner/repo/issues/{number}",
+                "url": f"{github_stub.url}/repos/owner/repo/issues/{number}"
+            }, {}
+        if path.startswith("/repos/owner/repo/assignees") or path.startswith("/repos/owner/repo/labels"):
+            return 200, [], {}
+        if path == "/repos/owner/repo":
+            return 200, {"full_name": "owner/repo", "name": "repo", "url": f"{github_stub.url}/repos/owner/repo"}, {}
+        return 404, {"message": "Not Found"}, {}
+
+    github_stub.rest = rest
+    return created
+
+
+def test_resumed_run_does_not_recreate_journaled_issue(github_stub, make_integrator, journal_path, capsys):
+    created = repository_rest(github_stub)
+    journal = PipelineJournal(journal_path)
+    journal.record(task_fingerprint(TASKS[0]["title"]), STAGE_ISSUE_CREATED, issue_info(7, TASKS[0]["title"]))
+    # インデックスを使わず、ジャーナルだけで作成済みのIssueをスキップする
+    integrator = make_integrator(use_index=False)
+
+    issues = integrator.create_issues_from_tasks(TASKS, add_to_project=False, journal=PipelineJournal(journal_path, resume=True))
+
+    assert created == ["会場を予約する"]
+    assert [issue["number"] for issue in issues] == [7, 1]
+    assert "Resume: issue #7 already created" in capsys.readouterr().out
+    resumed = PipelineJournal(journal_path, resume=True)
+    assert resumed.get(task_fingerprint(TASKS[1]["title"]), STAGE_ISSUE_CREATED)["number"] == 1
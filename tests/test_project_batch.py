@@ -0,0 +1,173 @@
+"""Projects v2のmutationのバッチ送信（エイリアス付きドキュメント）のテスト"""
+
+import re
+
+import pytest
+
+from github_integrator import MUTATION_COST
+
+MUTATION_PATTERN = re.compile(r"(\w+): (addProjectV2ItemById|updateProjectV2ItemFieldValue)\(")
+
+
+def batch_graphql(fail_aliases=(), document_errors=()):
+    """
+    エイリアスごとに結果を返すGraphQLのスタブ
+
+    Args:
+        fail_aliases: pathにエイリアスを付けたエラーを返すエイリアス
+        document_errors: pathのないエラー（ドキュメント全体のエラー）のメッセージ
+    """
+    def graphql(query, variables):
+        data = {}
+        errors = [{"message": message} for message in document_errors]
+        for alias, field in MUTATION_PATTERN.findall(query):
+            if alias in fail_aliases:
+                data[alias] = None
+                errors.append({"message": f"{alias} failed", "path": [alias]})
+            elif field == "addProjectV2ItemById":
+                data[alias] = {"item": {"id": f"PVTI_{variables[f'{alias}_contentId']}"}}
+            else:
+                data[alias] = {"projectV2Item": {"id": variables[f"{alias}_itemId"]}}
+        body = {"data": data}
+        if errors:
+            body["errors"] = errors
+        return 200, body, {}
+
+    return graphql
+
+
+def entries(count, fields=3):
+    return [
+        {
+            "node_id": f"I_{i}",
+            "field_values": [
+                {"field_name": f"Field {j}", "field_id": f"F{j}", "data_type": "TEXT", "value": f"v{i}_{j}", "label": f"v{i}_{j}"}
+                for j in range(fields)
+            ]
+        }
+        for i in range(count)
+    ]
+
+
+def test_split_batches_by_operation_count(make_integrator):
+    integrator = make_integrator(batch_max_operations=3, batch_max_cost=1000)
+    operations = [{"alias": f"op{i}"} for i in range(7)]
+
+    batches = integrator._split_batches(operations)
+
+    assert [[operation["alias"] for operation in batch] for batch in batches] == [
+        ["op0", "op1", "op2"], ["op3", "op4", "op5"], ["op6"]
+    ]
+
+
+def test_split_batches_by_cost_budget(make_integrator):
+    integrator = make_integrator(batch_max_operations=100, batch_max_cost=4 * MUTATION_COST)
+    operations = [{"alias": "a"}, {"alias": "b", "cost": 15}, {"alias": "c"}, {"alias": "d", "cost": 50}, {"alias": "e"}]
+
+    batches = integrator._split_batches(operations)
+
+    # 予算を超える操作は単独のリクエストにする
+    assert [[operation["alias"] for operation in batch] for batch in batches] == [["a", "b"], ["c"], ["d"], ["e"]]
+
+
+def test_split_batches_limits_are_clamped(make_integrator):
+    integrator = make_integrator(batch_max_operations=0, batch_max_cost=1)
+
+    assert integrator.batch_max_operations == 1
+    assert integrator.batch_max_cost == MUTATION_COST
+    assert len(integrator._split_batches([{"alias": f"op{i}"} for i in range(3)])) == 3
+
+
+def test_batched_mutations_use_aliases_and_renamed_variables(github_stub, make_integrator):
+    github_stub.graphql = batch_graphql()
+    integrator = make_integrator(batch_max_operations=2)
+
+    results = integrator.add_issues_to_project_batch(entries(3, fields=0), "PVT_1")
+
+    assert [result["item_id"] for result in results] == ["PVTI_I_0", "PVTI_I_1", "PVTI_I_2"]
+    assert all(result["added"] and not result["errors"] for result in results)
+    requests = github_stub.graphql_requests()
+    assert len(requests) == 2
+    first = requests[0]["body"]
+    assert "add0: addProjectV2ItemById(input: {projectId: $add0_projectId, contentId: $add0_contentId})" in first["query"]
+    assert "add1: addProjectV2ItemById" in first["query"]
+    assert first["variables"] == {
+        "add0_projectId": "PVT_1", "add0_contentId": "I_0",
+        "add1_projectId": "PVT_1", "add1_contentId": "I_1"
+    }
+
+
+def test_batched_fields_are_set_per_item(github_stub, make_integrator):
+    github_stub.graphql = batch_graphql()
+    integrator = make_integrator()
+
+    results = integrator.add_issues_to_project_batch(entries(2, fields=2), "PVT_1")
+
+    assert results[0]["fields"] == {"Field 0": "v0_0", "Field 1": "v0_1"}
+    assert results[1]["fields"] == {"Field 0": "v1_0", "Field 1": "v1_1"}
+    field_request = github_stub.graphql_requests()[1]["body"]
+    assert field_request["variables"]["field1_0_value"] == "v1_0"
+    assert field_request["variables"]["field1_0_itemId"] == "PVTI_I_1"
+    assert "$field1_0_value: String!" in field_request["query"]
+
+
+def test_partial_errors_are_assigned_to_their_alias(github_stub, make_integrator):
+    github_stub.graphql = batch_graphql(fail_aliases={"add1", "field2_1"})
+    integrator = make_integrator()
+
+    results = integrator.add_issues_to_project_batch(entries(3, fields=2), "PVT_1")
+
+    assert results[0]["added"] and not results[0]["errors"]
+    assert not results[1]["added"] and results[1]["item_id"] is None
+    assert results[1]["errors"] == ["add1 failed"]
+    assert results[1]["fields"] == {}
+    assert results[2]["fields"] == {"Field 0": "v2_0"}
+    assert results[2]["failed_fields"] == ["Field 1"]
+    assert results[2]["errors"] == ["Field 1: field2_1 failed"]
+
+
+def test_errors_without_path_apply_to_whole_batch(github_stub, make_integrator):
+    github_stub.graphql = batch_graphql(document_errors=["Something went wrong"])
+    integrator = make_integrator(batch_max_operations=2)
+
+    results = integrator._run_batched_mutations([
+        {
+            "alias": f"add{i}",
+            "field": "addProjectV2ItemById(input: {projectId: $projectId, contentId: $contentId})",
+            "selection": "item { id }",
+            "variables": {"projectId": ("ID!", "PVT_1"), "contentId": ("ID!", f"I_{i}")}
+        }
+        for i in range(3)
+    ])
+
+    assert all(result["errors"] == ["Something went wrong"] for result in results.values())
+
+
+def test_http_failure_fails_only_its_batch(github_stub, make_integrator):
+    ok = batch_graphql()
+
+    def graphql(query, variables):
+        if "add0:" in query:
+            return 400, {"message": "Bad Request"}, {}
+        return ok(query, variables)
+
+    github_stub.graphql = graphql
+    integrator = make_integrator(batch_max_operations=2)
+
+    results = integrator.add_issues_to_project_batch(entries(4, fields=0), "PVT_1")
+
+    assert [result["added"] for result in results] == [False, False, True, True]
+    assert "400" in results[0]["errors"][0]
+
+
+@pytest.mark.parametrize("count, expected_round_trips", [(1, 2), (20, 4), (45, 10)])
+def test_round_trips(github_stub, make_integrator, count, expected_round_trips):
+    """既定の上限（20件・コスト100）でのGraphQLの往復回数（1件ずつ送ると count × 4 回）"""
+    github_stub.graphql = batch_graphql()
+    integrator = make_integrator()
+
+    results = integrator.add_issues_to_project_batch(entries(count, fields=3), "PVT_1")
+
+    assert all(len(result["fields"]) == 3 for result in results)
+    assert integrator.graphql_round_trips == expected_round_trips
+    assert len(github_stub.graphql_requests()) == expected_round_trips
@@ -0,0 +1,131 @@
+"""ProjectSchemaResolver のキャッシュと、見つからないフィールドの1回だけの再取得のテスト"""
+
+import time
+
+import pytest
+
+from project_schema import SCHEMA_CACHE_TTL, ProjectSchemaResolver
+
+
+class FakeGraphQL:
+    """フィールド構成を返すGraphQLの代わり（fields を書き換えるとプロジェクトの変更になる）"""
+
+    def __init__(self):
+        self.fields = [
+            {"id": "F_status", "name": "Status", "dataType": "SINGLE_SELECT", "options": [
+                {"id": "O_todo", "name": "Todo"}, {"id": "O_done", "name": "Done"}
+            ]},
+            {"id": "F_due", "name": "Due Date", "dataType": "DATE"},
+            {},
+        ]
+        self.calls = 0
+
+    def __call__(self, query, variables):
+        self.calls += 1
+        return {"data": {"node": {"id": variables["projectId"], "fields": {"nodes": self.fields}}}}
+
+
+@pytest.fixture
+def graphql():
+    return FakeGraphQL()
+
+
+def test_resolves_field_and_option_ids(graphql):
+    resolver = ProjectSchemaResolver(graphql)
+
+    assert resolver.resolve("PVT_1", "Status", "Done") == {"field_id": "F_status", "data_type": "SINGLE_SELECT", "option_id": "O_done"}
+    assert resolver.resolve("PVT_1", "Due Date") == {"field_id": "F_due", "data_type": "DATE", "option_id": None}
+    assert graphql.calls == 1
+
+
+def test_schema_is_cached_on_disk(graphql):
+    ProjectSchemaResolver(graphql).get_schema("PVT_1")
+
+    schema = ProjectSchemaResolver(graphql).get_schema("PVT_1")
+
+    assert set(schema["fields"]) == {"Status", "Due Date"}
+    assert graphql.calls == 1
+
+
+def test_expired_cache_is_refetched(graphql):
+    ProjectSchemaResolver(graphql).get_schema("PVT_1")
+
+    ProjectSchemaResolver(graphql, ttl=0).get_schema("PVT_1")
+
+    assert graphql.calls == 2
+
+
+def test_missing_option_refreshes_once_and_finds_new_option(graphql):
+    ProjectSchemaResolver(graphql).get_schema("PVT_1")
+    # キャッシュした後にプロジェクトに選択肢が追加される
+    graphql.fields[0]["options"].append({"id": "O_progress", "name": "In Progress"})
+    resolver = ProjectSchemaResolver(graphql)
+
+    assert resolver.resolve("PVT_1", "Status", "In Progress")["option_id"] == "O_progress"
+    assert graphql.calls == 2
+
+
+def test_missing_field_refreshes_only_once_per_run(graphql):
+    resolver = ProjectSchemaResolver(graphql)
+    resolver.get_schema("PVT_1")
+
+    assert resolver.resolve("PVT_1", "Priority") is None
+    assert resolver.resolve("PVT_1", "Priority") is None
+    assert resolver.resolve("PVT_1", "Status", "Blocked") is None
+
+    # 最初の取得で再取得済みのため、見つからなくても取得し直さない
+    assert graphql.calls == 1
+
+
+def test_missing_field_in_cached_schema_refetches_once(graphql):
+    ProjectSchemaResolver(graphql).get_schema("PVT_1")
+    resolver = ProjectSchemaResolver(graphql)
+
+    assert resolver.resolve("PVT_1", "Priority") is None
+    assert resolver.resolve("PVT_1", "Sprint") is None
+
+    assert graphql.calls == 2
+
+
+def test_fetch_errors_return_none(graphql):
+    resolver = ProjectSchemaResolver(lambda query, variables: {"errors": [{"message": "NOT_FOUND"}], "data": {"node": None}})
+
+    assert resolver.get_schema("PVT_1") is None
+    assert resolver.resolve("PVT_1", "Status") is None
+
+
+def test_offline_uses_expired_cache_and_never_fetches(graphql, capsys):
+    ProjectSchemaResolver(graphql).get_schema("PVT_1")
+    resolver = ProjectSchemaResolver(graphql, ttl=0, offline=True)
+
+    assert resolver.resolve("PVT_1", "Status", "Todo")["option_id"] == "O_todo"
+    assert resolver.resolve("PVT_1", "Priority") is None
+    assert resolver.get_schema("PVT_2") is None
+    assert resolver.get_schema("PVT_2") is None
+
+    assert graphql.calls == 1
+    assert capsys.readouterr().out.count("PVT_2 are not cached") == 1
+
+
+def test_cache_for_other_project_is_not_used(graphql):
+    resolver = ProjectSchemaResolver(graphql)
+    resolver.get_schema("PVT_1")
+    cache_file = resolver._cache_file("PVT_1")
+    cache_file.write_text(cache_file.read_text().replace('"PVT_1"', '"PVT_other"'), encoding="utf-8")
+
+    ProjectSchemaResolver(graphql).get_schema("PVT_1")
+
+    assert graphql.calls == 2
+
+
+def test_ttl_default_is_one_day(graphql, monkeypatch):
+    ProjectSchemaResolver(graphql).get_schema("PVT_1")
+    now = time.time()
+
+    monkeypatch.setattr(time, "time", lambda: now + SCHEMA_CACHE_TTL - 60)
+    ProjectSchemaResolver(graphql).get_schema("PVT_1")
+    assert graphql.calls == 1
+
+    monkeypatch.setattr(time, "time", lambda: now + SCHEMA_CACHE_TTL + 60)
+    ProjectSchemaResolver(graphql).get_schema("PVT_1")
+    assert graphql.calls == 2
@@ -0,0 +1,305 @@
+"""RateLimitGovernor のテスト（偽の時計で待機時間と送信の順序を確認する）"""
+
+import itertools
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from rate_limiter import (
+    RESOURCE_CORE,
+    RESOURCE_GRAPHQL,
+    RateLimitGovernor,
+    SlidingWindow,
+    creates_content
+)
+
+
+class FakeClock:
+    """sleep で進む時計"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def make_governor(clock: FakeClock, **kwargs) -> RateLimitGovernor:
+    return RateLimitGovernor(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_content_per_minute_waits_for_oldest_request_to_leave_window():
+    clock = FakeClock()
+    governor = make_governor(clock, content_per_minute=3)
+
+    sent_at = []
+    for _ in range(5):
+        if sent_at:
+            clock.sleep(10)
+        governor.acquire(RESOURCE_CORE, write=True)
+        sent_at.append(clock.now)
+
+    # 0, 10, 20 で上限に達し、4件目は0の記録が外れる60まで待つ（5件目の70には10の記録が外れている）
+    assert sent_at == [0, 10, 20, 60, 70]
+    assert governor.metrics()["secondary_waits"] == 1
+    assert governor.metrics()["wait_seconds"] == pytest.approx(30)
+
+
+def test_full_minute_budget_is_available_as_burst():
+    clock = FakeClock()
+    governor = make_governor(clock)
+
+    waits = [governor.acquire(RESOURCE_CORE, write=True) for _ in range(80)]
+
+    assert sum(waits) == 0
+    assert governor.acquire(RESOURCE_CORE, write=True) == pytest.approx(60)
+
+
+def test_content_per_hour_limit():
+    clock = FakeClock()
+    governor = make_governor(clock, content_per_minute=1000, content_per_hour=5, points_per_minute={RESOURCE_CORE: 10 ** 6})
+
+    for _ in range(5):
+        assert governor.acquire(RESOURCE_CORE, write=True) == 0
+    assert governor.acquire(RESOURCE_CORE, write=True) == pytest.approx(3600)
+
+
+def test_batched_mutation_is_charged_once():
+    clock = FakeClock()
+    governor = make_governor(clock, content_per_minute=2)
+    document = "mutation {\n" + "\n".join(
+        f"  add{i}: addProjectV2ItemById(input: {{projectId: $p, contentId: $c{i}}}) {{ item {{ id }} }}" for i in range(20)
+    ) + "\n}"
+
+    for _ in range(2):
+        assert governor.acquire(RESOURCE_GRAPHQL, write=True, content=creates_content(document)) == 0
+    assert governor.metrics()["calls"] == {RESOURCE_GRAPHQL: 2}
+
+
+def test_field_updates_do_not_count_as_content_creation():
+    clock = FakeClock()
+    governor = make_governor(clock, content_per_minute=1)
+    document = """
+    mutation($projectId: ID!, $itemId: ID!, $fieldId: ID!, $value: String) {
+      updateProjectV2ItemFieldValue(input: {
+        projectId: $projectId, itemId: $itemId, fieldId: $fieldId, value: { text: $value }
+      }) { projectV2Item { id } }
+    }
+    """
+
+    assert not creates_content(document)
+    assert creates_content("mutation { a: addProjectV2ItemById(input: {}) { item { id } } b: updateProjectV2ItemFieldValue(input: {}) { projectV2Item { id } } }")
+    for _ in range(50):
+        assert governor.acquire(RESOURCE_GRAPHQL, write=True, content=creates_content(document)) == 0
+
+
+def test_points_per_minute():
+    clock = FakeClock()
+    governor = make_governor(clock, points_per_minute={RESOURCE_CORE: 10, RESOURCE_GRAPHQL: 10})
+
+    assert governor.acquire(RESOURCE_CORE, write=True, content=False) == 0
+    for _ in range(5):
+        assert governor.acquire(RESOURCE_CORE) == 0
+    # 5 + 5 = 10 ポイントを使い切ったので、次のGETは最初の記録が外れるまで待つ
+    assert governor.acquire(RESOURCE_CORE) == pytest.approx(60)
+    # リソースごとに別の上限
+    assert governor.acquire(RESOURCE_GRAPHQL) == 0
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_meeting_with_40_tasks_does_not_wait(batched):
+    """Issue作成・Projectsへの追加・フィールド6件を40タスク分（既定の上限）"""
+    clock = FakeClock()
+    governor = make_governor(clock)
+
+    for _ in range(40):
+        governor.acquire(RESOURCE_CORE, write=True)
+        if not batched:
+            governor.acquire(RESOURCE_GRAPHQL, write=True, content=True)
+            for _ in range(6):
+                governor.acquire(RESOURCE_GRAPHQL, write=True, content=False)
+    if batched:
+        # 20件ずつのエイリアス付きmutation: 追加2回・フィールド設定12回
+        for _ in range(2):
+            governor.acquire(RESOURCE_GRAPHQL, write=True, content=True)
+        for _ in range(12):
+            governor.acquire(RESOURCE_GRAPHQL, write=True, content=False)
+
+    assert governor.metrics()["wait_seconds"] == 0
+    assert clock.now == 0
+
+
+def test_requests_are_sent_in_order_and_never_exceed_limits():
+    clock = FakeClock()
+    governor = make_governor(clock, content_per_minute=7, content_per_hour=30, points_per_minute={RESOURCE_CORE: 40})
+
+    sent = []
+    for i in range(200):
+        write = i % 3 == 0
+        governor.acquire(RESOURCE_CORE, write=write)
+        sent.append((clock.now, write))
+        clock.sleep(0.5)
+
+    times = [at for at, _ in sent]
+    assert times == sorted(times)
+    for start, _ in sent:
+        minute = [write for at, write in sent if start <= at < start + 60]
+        hour = [write for at, write in sent if start <= at < start + 3600]
+        assert sum(minute) <= 7
+        assert sum(hour) <= 30
+        assert sum(5 if write else 1 for write in minute) <= 40
+
+
+def test_primary_rate_limit_waits_until_reset():
+    clock = FakeClock()
+    governor = make_governor(clock)
+    governor.update(RESOURCE_CORE, limit=5000, remaining=0, reset=time.time() + 30)
+
+    waited = governor.acquire(RESOURCE_CORE)
+
+    assert waited == pytest.approx(30, abs=1)
+    assert governor.metrics()["primary_waits"] == 1
+
+
+def test_primary_rate_limit_spreads_remaining_requests():
+    clock = FakeClock()
+    governor = make_governor(clock)
+    governor.update(RESOURCE_CORE, limit=100, remaining=4, reset=time.time() + 40)
+
+    waits = [governor.acquire(RESOURCE_CORE) for _ in range(3)]
+
+    # 残り4件でリセットまで40秒: 最初はすぐ送り、以降はおよそ10秒ずつ空ける
+    assert waits[0] == 0
+    assert waits[1] == pytest.approx(10, abs=1)
+    assert waits[2] == pytest.approx(13.3, abs=1)
+
+
+def test_sliding_window_single_request_over_limit_waits_for_empty_window():
+    window = SlidingWindow(limit=5, period=60)
+    window.record(3, now=0)
+
+    assert window.wait_time(10, now=1) == pytest.approx(59)
+    assert window.wait_time(10, now=60) == 0
+
+
+def test_observe_reads_rest_headers_case_insensitively():
+    governor = make_governor(FakeClock())
+
+    governor.observe({
+        "x-ratelimit-limit": "5000", "X-RateLimit-Remaining": "4990",
+        "X-RateLimit-Used": "10", "X-RateLimit-Reset": "1800000000", "X-RateLimit-Resource": "core"
+    })
+
+    assert governor.budgets[RESOURCE_CORE] == {"limit": 5000, "remaining": 4990, "used": 10, "reset": 1800000000}
+
+
+@pytest.mark.parametrize("headers", [None, {}, {"X-RateLimit-Limit": "5000"}, {"X-RateLimit-Remaining": "many"}])
+def test_observe_ignores_missing_or_invalid_headers(headers):
+    governor = make_governor(FakeClock())
+
+    governor.observe(headers)
+
+    assert governor.budgets == {}
+
+
+def test_observe_keeps_lower_remaining_within_same_window():
+    governor = make_governor(FakeClock())
+
+    # 並列に送ったリクエストのレスポンスは順不同で届く
+    governor.observe({"X-RateLimit-Remaining": "90", "X-RateLimit-Reset": "1000"})
+    governor.observe({"X-RateLimit-Remaining": "95", "X-RateLimit-Reset": "1000"})
+    assert governor.budgets[RESOURCE_CORE]["remaining"] == 90
+
+    governor.observe({"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "4600"})
+    assert governor.budgets[RESOURCE_CORE]["remaining"] == 4999
+
+
+def test_observe_graphql_rate_limit():
+    governor = make_governor(FakeClock())
+
+    governor.observe_graphql({"cost": 3, "remaining": 4997, "limit": 5000, "resetAt": "2027-01-15T08:00:00Z"})
+    governor.observe_graphql(None)
+
+    budget = governor.budgets[RESOURCE_GRAPHQL]
+    assert (budget["limit"], budget["remaining"]) == (5000, 4997)
+    assert budget["reset"] == datetime(2027, 1, 15, 8, tzinfo=timezone.utc).timestamp()
+    assert governor.metrics()["graphql_cost"] == 3
+
+
+RESET_AT = int(time.time()) + 3600
+
+
+def rate_limit_headers(resource: str, remaining: int) -> dict:
+    return {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Used": str(5000 - remaining),
+        "X-RateLimit-Reset": str(RESET_AT),
+        "X-RateLimit-Resource": resource
+    }
+
+
+def test_integrator_reads_rest_rate_limit_headers(github_stub, make_integrator):
+    github_stub.rest = lambda method, path, body: (200, [{"login": "octocat"}], rate_limit_headers("core", 4321))
+    integrator = make_integrator()
+
+    # メタデータの条件付きGET（トランスポート経由）
+    assert integrator.metadata.assignable_users() == {"octocat"}
+
+    assert integrator.governor.budgets[RESOURCE_CORE] == {"limit": 5000, "remaining": 4321, "used": 679, "reset": RESET_AT}
+
+
+def test_integrator_reads_pygithub_rate_limit(github_stub, make_integrator):
+    github_stub.rest = lambda method, path, body: (200, {"login": "octocat"}, rate_limit_headers("core", 4100))
+    integrator = make_integrator()
+
+    integrator._rest(integrator.github.get_user, "octocat", write=False)
+
+    budget = integrator.governor.budgets[RESOURCE_CORE]
+    assert (budget["limit"], budget["remaining"], budget["reset"]) == (5000, 4100, RESET_AT)
+
+
+def graphql_with_rate_limit():
+    """query の rateLimit の選択に応じて残量を返すGraphQLのスタブ（mutationはヘッダーのみ）"""
+    remaining = itertools.count(4999, -1)
+
+    def graphql(query, variables):
+        if query.lstrip().startswith("mutation"):
+            return 200, {"data": {"addProjectV2ItemById": {"item": {"id": "PVTI_1"}}}}, rate_limit_headers("graphql", next(remaining))
+        data = {}
+        if "projectV2(number" in query:
+            data["user"] = {"projectV2": {"id": "PVT_1", "title": "Board"}}
+        if "fields(first" in query:
+            data["node"] = {"id": "PVT_1", "fields": {"nodes": []}}
+        if "rateLimit" in query:
+            data["rateLimit"] = {"cost": 1, "remaining": next(remaining), "limit": 5000, "resetAt": "2027-01-15T08:00:00Z"}
+        return 200, {"data": data}, {}
+
+    return graphql
+
+
+def test_graphql_queries_select_rate_limit(github_stub, make_integrator):
+    github_stub.graphql = graphql_with_rate_limit()
+    integrator = make_integrator()
+
+    assert integrator.get_project_id(1) == "PVT_1"
+    integrator.schema_resolver.get_schema("PVT_1")
+
+    assert all("rateLimit { cost remaining resetAt limit }" in request["body"]["query"] for request in github_stub.graphql_requests())
+    assert len(github_stub.graphql_requests()) == 2
+    assert integrator.governor.budgets[RESOURCE_GRAPHQL]["remaining"] == 4998
+    assert integrator.governor.metrics()["graphql_cost"] == 2
+
+
+def test_graphql_mutation_budget_comes_from_headers(github_stub, make_integrator):
+    github_stub.graphql = graphql_with_rate_limit()
+    integrator = make_integrator()
+
+    assert integrator.add_project_item("I_1", "PVT_1") == "PVTI_1"
+
+    budget = integrator.governor.budgets[RESOURCE_GRAPHQL]
+    assert (budget["limit"], budget["remaining"], budget["reset"]) == (5000, 4999, RESET_AT)
@@ -0,0 +1,138 @@
+"""RepoMetadataCache の ETag による再検証（304 Not Modified）・ページ分割・オフラインでの利用のテスト"""
+
+import threading
+
+import pytest
+
+from repo_metadata import RepoMetadataCache
+
+LABELS_PATH = "/repos/owner/repo/labels?per_page=100"
+ASSIGNEES_PATH = "/repos/owner/repo/assignees?per_page=100"
+
+
+class MetadataServer:
+    """ETagが一致すれば304を返すメタデータのREST（etags・data を書き換えると変更を表せる）"""
+
+    def __init__(self, github_stub):
+        self.stub = github_stub
+        self.etags = {LABELS_PATH: '"l1"', ASSIGNEES_PATH: '"a1"', "/repos/owner/repo": '"r1"'}
+        self.data = {
+            LABELS_PATH: [{"name": "meeting-action", "color": "ededed"}],
+            ASSIGNEES_PATH: [{"login": "Kochan17"}],
+            "/repos/owner/repo": {"id": 1, "node_id": "R_1", "full_name": "owner/repo", "default_branch": "main"}
+        }
+        self.links = {}
+        self.fail = False
+        github_stub.rest = self.rest
+
+    def rest(self, method, path, body):
+        if self.fail or path not in self.data:
+            return 404, {"message": "Not Found"}, {}
+        if self.stub.request_headers().get("If-None-Match") == self.etags[path]:
+            return 304, None, {"ETag": self.etags[path]}
+        headers = {"ETag": self.etags[path]}
+        if path in self.links:
+            headers["Link"] = f'<{self.stub.url}{self.links[path]}>; rel="next"'
+        return 200, self.data[path], headers
+
+    def requests(self):
+        return [(request["path"], request["headers"].get("If-None-Match")) for request in self.stub.requests]
+
+
+@pytest.fixture
+def server(github_stub):
+    return MetadataServer(github_stub)
+
+
+def test_second_run_revalidates_with_if_none_match(server, make_integrator):
+    first = make_integrator().metadata
+    assert first.labels() == {"meeting-action": {"name": "meeting-action", "color": "ededed"}}
+    assert first.assignable_users() == {"kochan17"}
+    server.stub.requests.clear()
+
+    second = make_integrator().metadata
+
+    assert second.labels() == first.labels()
+    assert second.assignable_users() == {"kochan17"}
+    assert server.requests() == [(LABELS_PATH, '"l1"'), (ASSIGNEES_PATH, '"a1"')]
+    assert (second.not_modified, second.fetched) == (2, 0)
+    assert second.summary() == "メタデータの再検証: 304 Not Modified 2件 / 取得 0件"
+
+
+def test_changed_resource_is_fetched_again(server, make_integrator):
+    make_integrator().metadata.labels()
+    server.etags[LABELS_PATH] = '"l2"'
+    server.data[LABELS_PATH] = [{"name": "meeting-action"}, {"name": "bug", "color": "d73a4a"}]
+
+    metadata = make_integrator().metadata
+
+    assert set(metadata.labels()) == {"meeting-action", "bug"}
+    assert (metadata.not_modified, metadata.fetched) == (0, 1)
+    assert '"l2"' in metadata.describe()
+
+
+def test_each_page_is_revalidated(server, make_integrator):
+    page2 = "/repos/owner/repo/labels?per_page=100&page=2"
+    server.links[LABELS_PATH] = page2
+    server.data[page2] = [{"name": "bug"}]
+    server.etags[page2] = '"p2"'
+    make_integrator().metadata.labels()
+    server.etags[page2] = '"p2b"'
+    server.data[page2] = [{"name": "bug"}, {"name": "docs"}]
+    server.stub.requests.clear()
+
+    metadata = make_integrator().metadata
+
+    assert list(metadata.labels()) == ["meeting-action", "bug", "docs"]
+    assert server.requests() == [(LABELS_PATH, '"l1"'), (page2, '"p2"')]
+    assert (metadata.not_modified, metadata.fetched) == (1, 1)
+
+
+def test_revalidated_once_per_run(server, make_integrator):
+    metadata = make_integrator().metadata
+
+    threads = [threading.Thread(target=metadata.assignable_users) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    metadata.assignable_users()
+
+    assert server.requests() == [(ASSIGNEES_PATH, None)]
+
+
+def test_failed_revalidation_uses_cached_values(server, make_integrator, capsys):
+    make_integrator().metadata.repository()
+    server.fail = True
+
+    metadata = make_integrator().metadata
+
+    assert metadata.repository()["node_id"] == "R_1"
+    assert "Could not revalidate repository" in capsys.readouterr().out
+    # この実行では再試行しない
+    metadata.repository()
+    assert len(server.stub.requests) == 2
+
+
+def test_offline_uses_cache_without_requests(server, make_integrator):
+    make_integrator().metadata.labels()
+    server.stub.requests.clear()
+
+    metadata = RepoMetadataCache("owner", "repo", server.stub.url, offline=True)
+
+    assert set(metadata.labels()) == {"meeting-action"}
+    assert metadata.assignable_users() is None
+    assert server.stub.requests == []
+
+
+def test_project_id_is_kept_until_invalidated(server, make_integrator):
+    make_integrator().metadata.set_project_id(1, "PVT_1", "Board")
+    metadata = RepoMetadataCache("owner", "repo", server.stub.url, offline=True)
+    assert metadata.project_id(1) == "PVT_1"
+    assert metadata.project_id(2) is None
+    assert "Project #1: Board (ID: PVT_1" in metadata.describe()
+
+    metadata.invalidate()
+
+    assert RepoMetadataCache("owner", "repo", server.stub.url, offline=True).project_id(1) is None
+    assert "(empty)" in metadata.describe()
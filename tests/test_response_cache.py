@@ -0,0 +1,146 @@
+"""ResponseCache のキー・期限切れ・エビクションと、MeetingAnalyzer のキャッシュの利用のテスト"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import meeting_analyzer
+import response_cache
+from meeting_analyzer import MeetingAnalyzer
+from response_cache import ResponseCache
+
+KEY_ARGS = ("gemini-2.0-flash", "テンプレート {meeting_notes}", 0.1, "議事録")
+
+
+class Clock:
+    """time.time の代わり（advance で進める）"""
+
+    def __init__(self):
+        self.now = 1_800_000_000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    # time.time 自体は置き換えず、モジュールから見える time だけを差し替える
+    monkeypatch.setattr(response_cache, "time", SimpleNamespace(time=clock))
+    return clock
+
+
+def test_key_is_stable():
+    assert ResponseCache.make_key(*KEY_ARGS) == ResponseCache.make_key(*KEY_ARGS)
+    # temperature は int と float で同じキー
+    assert ResponseCache.make_key("m", "t", 1, "x") == ResponseCache.make_key("m", "t", 1.0, "x")
+
+
+@pytest.mark.parametrize("changed", [
+    ("gemini-1.5-pro", *KEY_ARGS[1:]),
+    (KEY_ARGS[0], "別のテンプレート {meeting_notes}", *KEY_ARGS[2:]),
+    (*KEY_ARGS[:2], 0.2, KEY_ARGS[3]),
+    (*KEY_ARGS[:3], "議事録 "),
+])
+def test_key_changes_with_each_part(changed):
+    assert ResponseCache.make_key(*changed) != ResponseCache.make_key(*KEY_ARGS)
+
+
+def test_key_is_not_ambiguous_across_part_boundaries():
+    assert ResponseCache.make_key("ab", "c", 0, "x") != ResponseCache.make_key("a", "bc", 0, "x")
+
+
+def test_put_and_get_round_trip():
+    cache = ResponseCache()
+    tasks = [{"title": "資料を作成する", "assignee": None, "dependencies": []}]
+
+    cache.put("k", tasks)
+
+    assert cache.get("k") == tasks
+    assert cache.get("missing") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.summary() == "LLMキャッシュ: ヒット 1 / ミス 1"
+
+
+def test_entries_are_persisted():
+    ResponseCache().put("k", [1, 2])
+
+    assert ResponseCache().get("k") == [1, 2]
+
+
+def test_expired_entries_are_not_returned_and_are_purged(clock):
+    cache = ResponseCache(max_age=60)
+    cache.put("old", "value")
+    clock.advance(61)
+
+    assert cache.get("old") is None
+
+    cache.put("new", "value")
+    assert cache._conn.execute("SELECT key FROM responses").fetchall() == [("new",)]
+
+
+def test_least_recently_used_entries_are_evicted(clock):
+    cache = ResponseCache(max_entries=3)
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+        clock.advance(1)
+    # a を使うと、最終利用が最も古いのは b になる
+    assert cache.get("a") == "a"
+    clock.advance(1)
+
+    cache.put("d", "d")
+
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in ("a", "c", "d")] == ["a", "c", "d"]
+
+
+def test_disabled_cache_bypasses_reads_and_writes():
+    cache = ResponseCache(enabled=False)
+    cache.put("k", "value")
+
+    assert cache.get("k") is None
+    assert (cache.hits, cache.misses) == (0, 0)
+    assert cache.summary() == "LLMキャッシュ: 無効"
+
+
+@pytest.fixture
+def counting_model(monkeypatch):
+    model = SimpleNamespace(calls=0)
+
+    def generate_content(prompt, **kwargs):
+        model.calls += 1
+        return SimpleNamespace(text=json.dumps([{"title": "資料を作成する"}], ensure_ascii=False), usage_metadata=None)
+
+    model.generate_content = generate_content
+    monkeypatch.setattr(meeting_analyzer, "_genai", SimpleNamespace(
+        GenerativeModel=lambda model_name: model,
+        types=SimpleNamespace(GenerationConfig=lambda **config: config)
+    ))
+    return model
+
+
+def test_analyzer_reuses_cached_response(counting_model):
+    notes = "# 定例\n\n- 資料を作成する\n"
+
+    first = MeetingAnalyzer(model_name="fake").extract_tasks(notes)
+    second = MeetingAnalyzer(model_name="fake").extract_tasks(notes)
+    MeetingAnalyzer(model_name="fake").extract_tasks(notes + "- 追記\n")
+    MeetingAnalyzer(model_name="other").extract_tasks(notes)
+
+    assert first == second
+    # 同じモデル・同じ議事録の2回目だけAPIを呼ばない
+    assert counting_model.calls == 3
+
+
+def test_analyzer_without_cache_always_calls_model(counting_model):
+    notes = "# 定例\n\n- 資料を作成する\n"
+
+    MeetingAnalyzer(model_name="fake", use_cache=False).extract_tasks(notes)
+    MeetingAnalyzer(model_name="fake", use_cache=False).extract_tasks(notes)
+
+    assert counting_model.calls == 2
+
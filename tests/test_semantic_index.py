@@ -0,0 +1,121 @@
+"""SemanticIndex の検索用の統計の差分更新のテスト"""
+
+import numpy as np
+import pytest
+
+import semantic_index
+from semantic_index import SemanticIndex
+
+
+class FixedEmbedder:
+    """IDFを使わない埋め込み（タイトルの文字ごとに次元を立てる）"""
+
+    name = "fixed-8"
+    dim = 8
+    uses_idf = False
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for char in text.split("\n", 1)[0]:
+                vectors[row, ord(char) % self.dim] += 1.0
+        return vectors
+
+
+def issue(number, title, body="", updated_at="2026-01-01T00:00:00", state="open"):
+    return {"number": number, "title": title, "body": body, "url": None, "state": state, "updated_at": updated_at}
+
+
+def issues(count, start=1):
+    return [issue(number, f"会議資料{number}の作成と共有", f"## 説明\n第{number}回の定例の資料") for number in range(start, start + count)]
+
+
+def rebuilt_scores(index, title):
+    """行列全体からIDFと正規化をやり直して計算した類似度（差分更新の結果と比べる基準）"""
+    vectors = index._vectors[:len(index)]
+    query = index.embedder.embed([f"{title}\n"])[0]
+    if index.embedder.uses_idf:
+        idf = np.log((1.0 + len(vectors)) / (1.0 + np.count_nonzero(vectors, axis=0))) + 1.0
+        vectors = vectors * idf
+        query = query * idf
+    norms = np.linalg.norm(vectors, axis=1)
+    norms[norms == 0] = 1.0
+    return (vectors / norms[:, None]) @ (query / np.linalg.norm(query))
+
+
+def search_scores(index, title):
+    index.threshold = -1.0
+    results = index.find_similar(title, limit=len(index))
+    scores = np.zeros(len(index))
+    for result in results:
+        scores[index._positions[result["number"]]] = result["score"]
+    return scores
+
+
+def test_per_task_updates_match_full_rebuild():
+    index = SemanticIndex("owner", "repo")
+    index.update(issues(300))
+    index.find_similar("会議資料の作成")
+
+    # タスクごとにIssueを1件追加・更新して次のタスクを検索する
+    for number in range(301, 341):
+        index.update([issue(number, f"ログイン画面{number}の修正")])
+        index.update([issue(number - 300, f"会議資料{number}の更新", updated_at="2026-02-01T00:00:00")])
+        index.find_similar("ログイン画面の修正")
+
+    expected = rebuilt_scores(index, "ログイン画面320の修正")
+    assert search_scores(index, "ログイン画面320の修正") == pytest.approx(expected, abs=1e-5)
+
+
+def test_updates_without_idf_match_full_rebuild():
+    index = SemanticIndex("owner", "repo", embedder=FixedEmbedder())
+    index.update([issue(1, "abc"), issue(2, "bcd"), issue(3, "")])
+    index.update([issue(4, "cde"), issue(1, "aaa", updated_at="2026-02-01T00:00:00")])
+
+    assert search_scores(index, "abd") == pytest.approx(rebuilt_scores(index, "abd"), abs=1e-6)
+
+
+def test_appended_issue_is_found():
+    index = SemanticIndex("owner", "repo")
+    index.update(issues(100))
+    index.find_similar("会議資料の作成")
+
+    index.update([issue(1000, "ログイン画面のバリデーションを修正する")])
+    results = index.find_similar("ログイン画面のバリデーション修正")
+
+    assert results[0]["number"] == 1000
+
+
+def test_closed_issues_are_not_returned():
+    index = SemanticIndex("owner", "repo")
+    index.update([issue(1, "ログイン画面のバリデーションを修正する", state="closed")])
+
+    assert index.find_similar("ログイン画面のバリデーションを修正する") == []
+
+
+def test_appends_grow_buffers_geometrically():
+    index = SemanticIndex("owner", "repo")
+    capacities = set()
+    for number in range(1, 1001):
+        index.update([issue(number, f"タスク{number}")])
+        capacities.add(len(index._vectors))
+
+    # 1件ずつ追加しても配列のコピーは倍々に広げたときだけ（1000件で11回）
+    assert len(capacities) <= 11
+    assert index._document_frequency.sum() == np.count_nonzero(index._vectors[:len(index)])
+
+
+def test_save_writes_only_used_rows():
+    index = SemanticIndex("owner", "repo")
+    for number in range(1, 6):
+        index.update([issue(number, f"タスク{number}")])
+    assert len(index._vectors) > len(index)
+    index.save()
+
+    reloaded = SemanticIndex("owner", "repo")
+
+    assert len(reloaded) == 5
+    assert np.array_equal(reloaded._vectors[:5], index._vectors[:5])
+    assert np.array_equal(reloaded._document_frequency, index._document_frequency)
+    assert np.load(reloaded._vectors_file).shape == (5, semantic_index.HASHING_DIM)
+    assert reloaded.find_similar("タスク3")[0]["number"] == 3
@@ -0,0 +1,135 @@
+"""ストリーミング抽出（MeetingAnalyzer.extract_tasks_stream）の、偽の GenerativeModel に対するテスト"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import meeting_analyzer
+from meeting_analyzer import MeetingAnalyzer
+
+TASKS = [{"title": f"タスク{i}", "assignee": None, "dependencies": []} for i in range(3)]
+
+
+class StreamingModel:
+    """応答のテキストを指定した大きさのチャンクに分けて返す GenerativeModel の代わり"""
+
+    def __init__(self, responses, chunk_size=7):
+        """
+        Args:
+            responses: 呼び出しごとの応答テキスト。チャンクのリストも可（リスト中の例外は受信中に送出する）。
+                例外を入れるとその呼び出しで送出する
+            chunk_size: 応答テキストを分ける1チャンクの文字数
+        """
+        self.responses = list(responses)
+        self.chunk_size = chunk_size
+        self.calls = []
+        self.consumed = []
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        self.calls.append(stream)
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        if not stream:
+            return SimpleNamespace(text=response, usage_metadata=None)
+        if isinstance(response, str):
+            response = [response[start:start + self.chunk_size] for start in range(0, len(response), self.chunk_size)]
+        return StreamingResponse(self, response)
+
+
+class StreamingResponse:
+    def __init__(self, model, chunks):
+        self.model = model
+        self.chunks = chunks
+        self.usage_metadata = None
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            if isinstance(chunk, Exception):
+                raise chunk
+            self.model.consumed.append(chunk)
+            yield SimpleNamespace(text=chunk)
+
+
+@pytest.fixture
+def install(monkeypatch):
+    def install(*responses, chunk_size=7):
+        model = StreamingModel(responses, chunk_size=chunk_size)
+        monkeypatch.setattr(meeting_analyzer, "_genai", SimpleNamespace(
+            GenerativeModel=lambda model_name: model,
+            types=SimpleNamespace(GenerationConfig=lambda **config: config)
+        ))
+        return model
+
+    return install
+
+
+def analyzer(**kwargs):
+    return MeetingAnalyzer(model_name="fake", use_cache=False, **kwargs)
+
+
+def test_tasks_are_yielded_before_response_completes(install):
+    text = "```json\n" + json.dumps(TASKS, ensure_ascii=False) + "\n```"
+    model = install(text)
+
+    stream = analyzer().extract_tasks_stream("# 定例\n")
+    first = next(stream)
+
+    assert first == TASKS[0]
+    # 最初のタスクは応答をすべて受け取る前に届く
+    assert len("".join(model.consumed)) < len(text)
+    assert [first, *stream] == TASKS
+    assert model.calls == [True]
+
+
+def test_stream_stats_are_recorded(install):
+    install(json.dumps(TASKS))
+    extractor = analyzer()
+
+    tasks = list(extractor.extract_tasks_stream("# 定例\n"))
+
+    assert len(tasks) == 3
+    assert extractor.stream_stats["tasks"] == 3
+    assert 0 <= extractor.stream_stats["time_to_first_task"] <= extractor.stream_stats["total_time"]
+
+
+def test_error_before_first_task_is_retried(install):
+    model = install(RuntimeError("unavailable"), json.dumps(TASKS))
+
+    assert list(analyzer().extract_tasks_stream("# 定例\n", retry_count=2)) == TASKS
+    assert model.calls == [True, True]
+
+
+def test_incomplete_array_is_retried_when_no_task_was_yielded(install):
+    model = install('[{"title": "タス', json.dumps(TASKS))
+
+    assert list(analyzer().extract_tasks_stream("# 定例\n", retry_count=2)) == TASKS
+    assert len(model.calls) == 2
+
+
+def test_error_after_first_task_is_not_retried(install, capsys):
+    chunks = [json.dumps(TASKS[:1], ensure_ascii=False)[:-1] + ", ", ConnectionError("stream closed")]
+    model = install(chunks, json.dumps(TASKS))
+
+    # 途中で切れた場合、既に渡したタスクを重複させないため、リトライしない
+    assert list(analyzer().extract_tasks_stream("# 定例\n", retry_count=3)) == TASKS[:1]
+    assert model.calls == [True]
+    assert "1個のタスクを返した後に中断しました" in capsys.readouterr().out
+
+
+def test_non_task_items_are_skipped(install):
+    install(json.dumps([TASKS[0], "説明文", 1, TASKS[1]], ensure_ascii=False))
+
+    assert list(analyzer().extract_tasks_stream("# 定例\n")) == TASKS[:2]
+
+
+def test_long_notes_fall_back_to_chunked_extraction(install, capsys):
+    model = install(json.dumps(TASKS[:1], ensure_ascii=False))
+    notes = "".join(f"## 議題{i}\n\n" + "議論の内容を記録する。" * 20 + "\n\n" for i in range(4))
+
+    tasks = list(analyzer(chunk_tokens=200, chunk_overlap_tokens=0).extract_tasks_stream(notes))
+
+    assert [task["title"] for task in tasks] == ["タスク0"]
+    assert len(model.calls) > 1 and not any(model.calls)
+    assert "ストリーミングせずに分割抽出します" in capsys.readouterr().out
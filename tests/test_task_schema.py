@@ -0,0 +1,198 @@
+"""TaskSchema の別名・先頭トークンによる補正、デフォルト値への置き換え、診断情報のテスト"""
+
+import pytest
+
+from task_schema import (
+    ACTION_DEFAULTED,
+    ACTION_REPAIRED,
+    ACTION_SKIPPED,
+    CHOICE_FIELDS,
+    RESOLVED_CACHE_SIZE,
+    TaskDiagnostics,
+    TaskSchema,
+)
+
+VALID_TASK = {
+    "title": "資料を作成する",
+    "description": "定例の資料",
+    "assignee": "kotaishida",
+    "priority": "P1 (High)",
+    "size": "M (3-5日)",
+    "due_date": "2026-02-15",
+    "type": "Feature",
+    "team": "Engineering",
+    "business_impact": "High",
+    "dependencies": ["会場を予約する"],
+    "context": "来週までに"
+}
+
+
+@pytest.fixture
+def schema():
+    return TaskSchema()
+
+
+def normalize_field(schema, field, value):
+    task, diagnostics = schema.normalize(dict(VALID_TASK, **{field: value}), index=3)
+    return task[field], diagnostics
+
+
+def test_valid_task_has_no_diagnostics(schema):
+    task, diagnostics = schema.normalize(VALID_TASK)
+
+    assert task == VALID_TASK
+    assert diagnostics == []
+    assert list(task) == list(VALID_TASK)
+
+
+@pytest.mark.parametrize("field, value, expected", [
+    # 有効値の先頭部分・括弧内
+    ("priority", "P1", "P1 (High)"),
+    ("priority", "p0", "P0 (Critical)"),
+    ("priority", "High", "P1 (High)"),
+    ("size", "M", "M (3-5日)"),
+    ("size", "xs", "XS (< 1日)"),
+    # 別名（全角・大文字小文字・空白・記号の違いを無視）
+    ("priority", "緊急", "P0 (Critical)"),
+    ("priority", "ＵＲＧＥＮＴ", "P0 (Critical)"),
+    ("size", "Large", "L (1-2週)"),
+    ("type", "bug", "Bug"),
+    ("type", "調査", "Research"),
+    ("type", "Action Item", "Meeting Action"),
+    ("team", "eng", "Engineering"),
+    ("team", "営業", "Sales"),
+    ("business_impact", "medium", "Medium"),
+    ("business_impact", "低", "Low"),
+    # 先頭のトークンで判別できるもの
+    ("priority", "P1 - 高優先度", "P1 (High)"),
+    ("size", "M (3-5 days)", "M (3-5日)"),
+    ("type", "bug: ログイン画面", "Bug"),
+])
+def test_shorthand_and_aliases_are_repaired(schema, field, value, expected):
+    result, diagnostics = normalize_field(schema, field, value)
+
+    assert result == expected
+    assert diagnostics == [{
+        "task": 3, "title": "資料を作成する", "field": field, "value": value,
+        "action": ACTION_REPAIRED, "result": expected
+    }]
+
+
+@pytest.mark.parametrize("field, value", [
+    ("priority", "P9"),
+    ("size", "huge"),
+    ("type", "other"),
+    ("team", "Marketing"),
+    ("business_impact", ["High"]),
+    ("priority", {"level": 1}),
+])
+def test_unknown_values_are_defaulted(schema, field, value):
+    result, diagnostics = normalize_field(schema, field, value)
+
+    assert result == CHOICE_FIELDS[field]["default"]
+    assert [(entry["field"], entry["action"]) for entry in diagnostics] == [(field, ACTION_DEFAULTED)]
+
+
+@pytest.mark.parametrize("value", [None, ""])
+def test_missing_choice_uses_default_without_diagnostics(schema, value):
+    result, diagnostics = normalize_field(schema, "priority", value)
+
+    assert result == "P2 (Medium)"
+    assert diagnostics == []
+
+
+def test_same_input_is_resolved_once_and_reported_each_time(schema):
+    first = normalize_field(schema, "priority", "P1")
+    second = normalize_field(schema, "priority", "P1")
+
+    assert first == second
+    assert "P1" in schema.fields["priority"].resolved
+
+
+def test_resolved_cache_is_bounded(schema):
+    field = schema.fields["team"]
+    for i in range(RESOLVED_CACHE_SIZE + 10):
+        field.resolve(f"team-{i}")
+
+    assert len(field.resolved) == RESOLVED_CACHE_SIZE
+
+
+@pytest.mark.parametrize("value, expected, action", [
+    ("2026-02-15", "2026-02-15", None),
+    ("2026/2/15", "2026-02-15", ACTION_REPAIRED),
+    ("2026年2月15日", "2026-02-15", ACTION_REPAIRED),
+    ("２０２６－０２－１５", "2026-02-15", ACTION_REPAIRED),
+    ("2026-02-30", None, ACTION_DEFAULTED),
+    ("next week", None, ACTION_DEFAULTED),
+    ("未定", None, None),
+    ("TBD", None, None),
+    (None, None, None),
+])
+def test_due_date_is_repaired_or_cleared(schema, value, expected, action):
+    result, diagnostics = normalize_field(schema, "due_date", value)
+
+    assert result == expected
+    assert [entry["action"] for entry in diagnostics] == ([action] if action else [])
+
+
+@pytest.mark.parametrize("task", [None, "資料を作成する", ["title"]])
+def test_non_dict_task_is_skipped(schema, task):
+    result, diagnostics = schema.normalize(task, index=2)
+
+    assert result is None
+    assert [(entry["task"], entry["field"], entry["action"]) for entry in diagnostics] == [(2, None, ACTION_SKIPPED)]
+
+
+@pytest.mark.parametrize("title", [None, "", "   "])
+def test_task_without_title_is_skipped(schema, title):
+    result, diagnostics = schema.normalize(dict(VALID_TASK, title=title))
+
+    assert result is None
+    assert [(entry["field"], entry["action"]) for entry in diagnostics] == [("title", ACTION_SKIPPED)]
+
+
+@pytest.mark.parametrize("dependencies, expected", [
+    ("会場を予約する", ["会場を予約する"]),
+    ("  ", []),
+    (None, []),
+    (3, []),
+])
+def test_dependencies_become_a_list(schema, dependencies, expected):
+    task, _ = schema.normalize(dict(VALID_TASK, dependencies=dependencies))
+
+    assert task["dependencies"] == expected
+
+
+def test_text_fields_are_stripped(schema):
+    task, diagnostics = schema.normalize(dict(VALID_TASK, title="  資料を作成する ", description=None, assignee=" sat "))
+
+    assert (task["title"], task["description"], task["assignee"]) == ("資料を作成する", "", "sat")
+    assert diagnostics == []
+
+
+def test_normalize_tasks_numbers_tasks_and_collects_diagnostics(schema):
+    tasks = [VALID_TASK, dict(VALID_TASK, title=""), dict(VALID_TASK, title="調査する", priority="P9", size="S")]
+
+    normalized_tasks, diagnostics = schema.normalize_tasks(tasks)
+
+    assert [task["title"] for task in normalized_tasks] == ["資料を作成する", "調査する"]
+    assert [(entry["task"], entry["field"], entry["action"]) for entry in diagnostics] == [
+        (2, "title", ACTION_SKIPPED),
+        (3, "priority", ACTION_DEFAULTED),
+        (3, "size", ACTION_REPAIRED),
+    ]
+
+    collector = TaskDiagnostics()
+    collector.extend(diagnostics)
+    assert len(collector) == 3
+    assert collector.summary() == "タスク検証: 補正 1 / デフォルト値 1 / スキップ 1"
+
+
+def test_custom_choice_fields():
+    choice_fields = dict(CHOICE_FIELDS, priority={"values": ["Now", "Later"], "default": "Later", "aliases": {"Now": ["asap"]}})
+    schema = TaskSchema(choice_fields)
+
+    task, diagnostics = schema.normalize({"title": "A", "priority": "ASAP"})
+
+    assert task["priority"] == "Now"
+    assert diagnostics[0]["action"] == ACTION_REPAIRED
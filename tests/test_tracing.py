@@ -0,0 +1,163 @@
+"""Tracer のスパンの親子関係・属性・エラーと、JSON Lines・OTLP/JSON の書き出しのテスト"""
+
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import meeting_analyzer
+from meeting_analyzer import MeetingAnalyzer
+from tracing import SERVICE_NAME, TRACE_FORMAT_JSONL, TRACE_FORMAT_OTLP, Tracer
+
+
+def test_nested_spans_record_their_parent():
+    tracer = Tracer()
+
+    with tracer.span("extract") as outer:
+        with tracer.span("model.call") as inner:
+            assert tracer.current() is inner
+        assert tracer.current() is outer
+    assert tracer.current() is None
+
+    spans = {span.name: span for span in tracer.finished_spans()}
+    assert spans["model.call"].parent_id == spans["extract"].span_id
+    assert spans["extract"].parent_id is None
+    assert {span.trace_id for span in spans.values()} == {tracer.trace_id}
+
+
+def test_current_span_is_per_thread():
+    tracer = Tracer()
+    seen = []
+
+    with tracer.span("extract"):
+        thread = threading.Thread(target=lambda: seen.append(tracer.current()))
+        thread.start()
+        thread.join()
+
+    assert seen == [None]
+
+
+def test_started_span_is_not_current_and_records_on_end():
+    tracer = Tracer()
+
+    with tracer.span("extract") as parent:
+        span = tracer.start("model.call", stream=True)
+        assert tracer.current() is parent
+    assert [s.name for s in tracer.spans] == ["extract"]
+
+    span.end()
+    span.end()
+
+    assert [s.name for s in tracer.spans] == ["extract", "model.call"]
+    assert span.parent_id == parent.span_id
+
+
+def test_attributes_skip_none_and_add_accumulates():
+    tracer = Tracer()
+
+    with tracer.span("rest.create_issue", write=True, request_bytes=None) as span:
+        span.set(status_code=201, response_bytes=None)
+        span.add("retries")
+        span.add("retries")
+        span.add("rate_limit_wait", 0.5)
+
+    assert span.attributes == {"write": True, "status_code": 201, "retries": 2, "rate_limit_wait": 0.5}
+
+
+def test_error_is_recorded_and_raised():
+    tracer = Tracer()
+
+    with pytest.raises(ValueError):
+        with tracer.span("json.parse"):
+            raise ValueError("Response is not a JSON array")
+
+    [span] = tracer.finished_spans()
+    assert span.error == "ValueError: Response is not a JSON array"
+    assert span.to_dict()["status"] == "error"
+
+
+def test_jsonl_export_writes_one_span_per_line(tmp_path, capsys):
+    tracer = Tracer()
+    with tracer.span("extract", notes_chars=120):
+        with tracer.span("model.call", model="fake"):
+            pass
+    path = tmp_path / "traces" / "run.jsonl"
+
+    tracer.export(path, TRACE_FORMAT_JSONL)
+
+    rows = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert [row["name"] for row in rows] == ["extract", "model.call"]
+    assert rows[1]["parent_id"] == rows[0]["span_id"]
+    assert rows[0]["attributes"] == {"notes_chars": 120}
+    assert rows[0]["status"] == "ok" and rows[0]["error"] is None
+    assert rows[0]["duration_ms"] >= rows[1]["duration_ms"] >= 0
+    assert "2スパン" in capsys.readouterr().out
+
+
+def test_otlp_export(tmp_path):
+    tracer = Tracer()
+    with tracer.span("extract", tasks=3, stream=True, ratio=0.5, labels=["a", "b"]):
+        with pytest.raises(RuntimeError):
+            with tracer.span("model.call"):
+                raise RuntimeError("quota")
+    path = tmp_path / "run.json"
+
+    tracer.export(path, TRACE_FORMAT_OTLP)
+
+    resource_spans = json.loads(path.read_text(encoding='utf-8'))["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"] == [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]
+    extract, call = resource_spans["scopeSpans"][0]["spans"]
+    attributes = {attribute["key"]: attribute["value"] for attribute in extract["attributes"]}
+    # 64ビット整数は文字列で表す
+    assert attributes["tasks"] == {"intValue": "3"}
+    assert attributes["stream"] == {"boolValue": True}
+    assert attributes["ratio"] == {"doubleValue": 0.5}
+    assert attributes["labels"] == {"arrayValue": {"values": [{"stringValue": "a"}, {"stringValue": "b"}]}}
+    assert attributes["thread.name"] == {"stringValue": threading.current_thread().name}
+    assert len(extract["traceId"]) == 32 and len(extract["spanId"]) == 16
+    assert int(extract["endTimeUnixNano"]) >= int(extract["startTimeUnixNano"])
+    assert "parentSpanId" not in extract
+    assert extract["status"] == {"code": 1}
+    assert call["parentSpanId"] == extract["spanId"]
+    assert call["status"] == {"code": 2, "message": "RuntimeError: quota"}
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unknown trace format"):
+        Tracer().export(tmp_path / "run.txt", "csv")
+
+
+def test_summary_totals_retries_and_tokens():
+    tracer = Tracer()
+    for prompt_tokens in (100, 200):
+        with tracer.span("model.call") as span:
+            span.set(prompt_tokens=prompt_tokens, output_tokens=10)
+            span.add("retries")
+
+    row = next(line for line in tracer.summary().splitlines() if line.startswith("model.call"))
+
+    assert row.split()[1] == "2"
+    assert row.split()[-2:] == ["2", "300/20"]
+
+
+def test_analyzer_records_extraction_stages(monkeypatch):
+    response = SimpleNamespace(
+        text=json.dumps([{"title": "資料を作成する"}], ensure_ascii=False),
+        usage_metadata=SimpleNamespace(prompt_token_count=120, candidates_token_count=30, total_token_count=150)
+    )
+    model = SimpleNamespace(generate_content=lambda prompt, **kwargs: response)
+    monkeypatch.setattr(meeting_analyzer, "_genai", SimpleNamespace(
+        GenerativeModel=lambda model_name: model,
+        types=SimpleNamespace(GenerationConfig=lambda **config: config)
+    ))
+    tracer = Tracer()
+
+    MeetingAnalyzer(model_name="fake", use_cache=False, tracer=tracer).extract_tasks("# 定例\n\n- 資料を作成する\n")
+
+    spans = {span.name: span for span in tracer.finished_spans()}
+    assert {"extract", "prompt.build", "model.call", "json.parse"} <= set(spans)
+    assert spans["model.call"].parent_id == spans["extract"].span_id
+    assert spans["model.call"].attributes["prompt_tokens"] == 120
+    assert spans["model.call"].attributes["output_tokens"] == 30
+    assert spans["json.parse"].attributes["tasks"] == 1